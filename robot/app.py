@@ -48,8 +48,8 @@ def check_binance_keys():
             return False
             
         # Only validate if keys are provided
-        from binance.client import Client
-        client = Client(api_key, api_secret)
+        from src.binance_rate_governor import GovernedClient
+        client = GovernedClient(api_key, api_secret)
         status = client.get_account_status()
         print('✅ Binance API keys are valid. Account status:', status)
         return True
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Backfill Cycle Rollups
+One-off job computing the daily/weekly/monthly rollups of portfolios and
+simulations whose cycles were recorded before rollups were maintained.
+New cycles are folded in as they are written; run this once after the
+upgrade (or with --rebuild to recompute every rollup).
+
+Usage:
+    python backfill_rollups.py                  # portfolios and simulations without rollups
+    python backfill_rollups.py --rebuild        # recompute everything
+    python backfill_rollups.py --simulation 12  # one simulation
+"""
+
+import os
+import sys
+import time
+import argparse
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+import fast_json
+from database import get_db_manager, CycleRollup, Simulation, SimulationCycle, TradingCycle
+from cycle_rollups import rollup_cycle, SCOPE_PORTFOLIO, SCOPE_SIMULATION
+from simulation_archive import SimulationArchive
+
+
+def archive_batches(archive: SimulationArchive, path: str, batch_size: int = 2000):
+    """Rollup inputs of an archived simulation, read from its archive"""
+    data = archive.read_columns(path, ('cycle_date', 'total_value', 'trading_costs', 'actions_taken'))
+    cycles = [rollup_cycle(number, date, total_value, fees, fast_json.loads(actions) if actions else None)
+              for number, date, total_value, fees, actions in zip(data['cycle_number'], data['cycle_date'],
+                                                                  data['total_value'], data['trading_costs'],
+                                                                  data['actions_taken'])]
+    for start in range(0, len(cycles), batch_size):
+        yield cycles[start:start + batch_size]
+
+
+def backfill(rebuild: bool = False, portfolio_id: int = None, simulation_id: int = None) -> int:
+    db_manager = get_db_manager()
+    db_manager.create_tables()
+    archive = SimulationArchive()
+    session = db_manager.get_session()
+    try:
+        done = {(scope, scope_id) for scope, scope_id in
+                session.query(CycleRollup.scope, CycleRollup.scope_id).distinct()}
+        targets = []
+        if simulation_id is None:
+            portfolios = session.query(TradingCycle.portfolio_id).distinct()
+            if portfolio_id is not None:
+                portfolios = portfolios.filter(TradingCycle.portfolio_id == portfolio_id)
+            targets += [(SCOPE_PORTFOLIO, pid, None) for (pid,) in portfolios]
+        if portfolio_id is None:
+            simulations = session.query(Simulation.id, Simulation.archive_path)
+            if simulation_id is not None:
+                simulations = simulations.filter(Simulation.id == simulation_id)
+            live = {sid for (sid,) in session.query(SimulationCycle.simulation_id).distinct()}
+            targets += [(SCOPE_SIMULATION, sid, path) for sid, path in simulations if sid in live or path]
+    finally:
+        session.close()
+
+    folded = 0
+    for scope, scope_id, archive_path in targets:
+        if not rebuild and (scope, scope_id) in done:
+            continue
+        started = time.monotonic()
+        batches = archive_batches(archive, archive_path) if archive_path and os.path.exists(archive_path) else None
+        if archive_path and batches is None:
+            print(f"⚠️ Skipping {scope} {scope_id}: archive {archive_path} not found")
+            continue
+        count = db_manager.rebuild_cycle_rollups(scope, scope_id, batches)
+        folded += count
+        print(f"✅ {scope} {scope_id}: {count} cycles rolled up in {time.monotonic() - started:.1f}s")
+    return folded
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfill the daily/weekly/monthly cycle rollups')
+    parser.add_argument('--rebuild', action='store_true', help='Recompute rollups that already exist')
+    parser.add_argument('--portfolio', type=int, help='Only this portfolio')
+    parser.add_argument('--simulation', type=int, help='Only this simulation')
+    args = parser.parse_args()
+
+    print("📊 CYCLE ROLLUP BACKFILL")
+    print("=" * 40)
+    folded = backfill(args.rebuild, args.portfolio, args.simulation)
+    print(f"🎯 Done: {folded} cycles rolled up")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON encoding and response compression of chart/API payloads
+
+Compares the previous encoders (json + PlotlyJSONEncoder / DateTimeEncoder)
+with fast_json (orjson and stdlib backends) on synthetic payloads shaped like
+the simulation history: a Plotly figure and a list of cycles with portfolio
+breakdowns. Reports encode time and bytes on the wire (raw, gzip, brotli).
+
+Usage:
+    python development_tools/benchmark_serialization.py --cycles 20000 --repeat 5
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import datetime, timedelta
+
+import numpy as np
+import plotly.graph_objs as go
+import plotly.utils
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import fast_json
+from response_compression import compress, brotli
+
+COINS = ['ETH', 'ADA', 'SOL', 'XRP', 'DOT', 'LINK', 'AVAX', 'MATIC', 'ATOM', 'LTC']
+
+
+class DateTimeEncoder(json.JSONEncoder):
+    """Encoder previously used by the database JSON column"""
+    def default(self, obj):
+        if isinstance(obj, datetime):
+            return obj.isoformat()
+        return super().default(obj)
+
+
+def build_payloads(cycles: int):
+    rng = np.random.default_rng(42)
+    values = 10.0 * np.cumprod(1.0 + rng.normal(0.0005, 0.01, cycles))
+    start = datetime(2025, 1, 1)
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=np.arange(1, cycles + 1), y=values, mode='lines+markers', name='Total Value'))
+    fig.add_trace(go.Scatter(x=np.arange(1, cycles + 1), y=values * 0.9, mode='lines', name='Portfolio Value'))
+
+    rows = [
+        {
+            'cycle_number': i + 1,
+            'cycle_date': start + timedelta(hours=i),
+            'total_value': float(values[i]),
+            'portfolio_breakdown': {coin: {'value': float(values[i]) / len(COINS), 'performance': float(rng.normal())}
+                                    for coin in COINS}
+        }
+        for i in range(cycles)
+    ]
+    return {'plotly figure': fig, 'cycle rows': rows}
+
+
+def timed(encode, repeat: int):
+    best = float('inf')
+    data = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        data = encode()
+        best = min(best, time.perf_counter() - started)
+    return best, data
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark JSON encoding and compression')
+    parser.add_argument('--cycles', type=int, default=20000, help='Cycles in the synthetic payloads')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (best is kept)')
+    args = parser.parse_args()
+
+    print(f"📊 JSON SERIALIZATION BENCHMARK ({args.cycles} cycles, best of {args.repeat})")
+    print("=" * 78)
+    payloads = build_payloads(args.cycles)
+    baselines = {
+        'plotly figure': lambda obj: json.dumps(obj, cls=plotly.utils.PlotlyJSONEncoder).encode('utf-8'),
+        'cycle rows': lambda obj: json.dumps(obj, cls=DateTimeEncoder).encode('utf-8')
+    }
+
+    backends = ['stdlib'] + (['orjson'] if fast_json.orjson is not None else [])
+    for name, payload in payloads.items():
+        print(f"\n{name}")
+        print(f"  {'encoder':<22}{'encode ms':>12}{'raw KB':>12}")
+        encoders = [('json (previous)', lambda: baselines[name](payload))]
+        for backend in backends:
+            encoders.append((f"fast_json/{backend}", lambda backend=backend: (fast_json.set_backend(backend),
+                                                                             fast_json.dumps_bytes(payload))[1]))
+        data = None
+        for label, encode in encoders:
+            seconds, data = timed(encode, args.repeat)
+            print(f"  {label:<22}{seconds * 1000:>12.1f}{len(data) / 1024:>12.1f}")
+
+        print(f"  {'encoding':<22}{'compress ms':>12}{'wire KB':>12}")
+        for encoding in ['gzip'] + (['br'] if brotli is not None else []):
+            seconds, compressed = timed(lambda: compress(data, encoding), args.repeat)
+            print(f"  {encoding:<22}{seconds * 1000:>12.1f}{len(compressed) / 1024:>12.1f}")
+
+    if brotli is None:
+        print("\nℹ️  brotli not installed: only gzip measured (pip install brotli)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent SQLite access with and without the pragma profile
+
+Models the deployment: one worker process committing cycles (the robot or a
+simulation) while web processes read chart series and cycle pages. Runs the
+same workload against the previous engine setup (rollback journal, no
+pooling) and the DatabaseManager defaults (WAL profile, pooled connections),
+and reports throughput, read latency and 'database is locked' errors.
+
+Usage:
+    python development_tools/benchmark_sqlite_profile.py --seconds 10 --readers 4 --cycles 20000
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import multiprocessing
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from database import Base, DatabaseManager, Simulation, SimulationCycle
+from chart_series import load_cycle_series, paginate_cycles
+
+BREAKDOWN = {coin: {'value': 1.0, 'performance': 0.5} for coin in ('ETH', 'ADA', 'SOL', 'XRP', 'DOT')}
+
+
+def open_engine(url: str, profile: str):
+    if profile == 'baseline':
+        # Engine setup before the profile: default journal mode, a new connection per session
+        return create_engine(url, poolclass=NullPool, connect_args={'check_same_thread': False})
+    return DatabaseManager(url).engine
+
+
+def open_sessions(url: str, profile: str):
+    return sessionmaker(bind=open_engine(url, profile))
+
+
+def seed(url: str, profile: str, cycles: int):
+    engine = open_engine(url, profile)
+    Base.metadata.create_all(bind=engine)
+    start = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(Simulation.__table__.insert(), [dict(
+            id=1, name='bench', start_date=start, duration_days=1, cycle_length_minutes=1,
+            starting_reserve=100.0, status='running')])
+        conn.execute(SimulationCycle.__table__.insert(), [dict(
+            simulation_id=1, cycle_number=n, portfolio_value=50.0, bnb_reserve=50.0, total_value=100.0,
+            cycle_date=start + timedelta(minutes=n), portfolio_breakdown=BREAKDOWN)
+            for n in range(1, cycles + 1)])
+    engine.dispose()
+
+
+def writer(url, profile, seconds, first_cycle, results):
+    SessionLocal = open_sessions(url, profile)
+    done, errors, cycle_number = 0, 0, first_cycle
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        session = SessionLocal()
+        try:
+            session.add(SimulationCycle(simulation_id=1, cycle_number=cycle_number, portfolio_value=50.0,
+                                        bnb_reserve=50.0, total_value=100.0, cycle_date=datetime.utcnow(),
+                                        portfolio_breakdown=BREAKDOWN))
+            session.commit()
+            done += 1
+            cycle_number += 1
+        except OperationalError:
+            session.rollback()
+            errors += 1
+        finally:
+            session.close()
+    results.put(('write', done, errors, []))
+
+
+def reader(url, profile, seconds, results):
+    SessionLocal = open_sessions(url, profile)
+    done, errors, latencies = 0, 0, []
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        started = time.monotonic()
+        session = SessionLocal()
+        try:
+            # One dashboard refresh: the chart series and the latest page of cycles
+            load_cycle_series(session, SimulationCycle, simulation_id=1)
+            paginate_cycles(session, SimulationCycle, after=0, limit=100, simulation_id=1)
+            done += 1
+            latencies.append(time.monotonic() - started)
+        except OperationalError:
+            errors += 1
+        finally:
+            session.close()
+    results.put(('read', done, errors, latencies))
+
+
+def run_profile(profile: str, args) -> dict:
+    directory = tempfile.mkdtemp(prefix='sqlite-bench-')
+    url = f"sqlite:///{directory}/bench.db"
+    try:
+        seed(url, profile, args.cycles)
+        results = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=writer, args=(url, profile, args.seconds, args.cycles + 1, results))]
+        processes += [multiprocessing.Process(target=reader, args=(url, profile, args.seconds, results))
+                      for _ in range(args.readers)]
+        for process in processes:
+            process.start()
+        outcomes = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    latencies = sorted(l for kind, _, _, ls in outcomes if kind == 'read' for l in ls)
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000 if latencies else 0.0
+    return {
+        'writes': sum(done for kind, done, _, _ in outcomes if kind == 'write'),
+        'reads': sum(done for kind, done, _, _ in outcomes if kind == 'read'),
+        'errors': sum(errors for _, _, errors, _ in outcomes),
+        'p50': percentile(0.50),
+        'p95': percentile(0.95)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark concurrent SQLite access with the pragma profile')
+    parser.add_argument('--seconds', type=float, default=10, help='Duration of each run')
+    parser.add_argument('--readers', type=int, default=4, help='Concurrent reader (web) processes')
+    parser.add_argument('--cycles', type=int, default=20000, help='Cycles seeded before the run')
+    args = parser.parse_args()
+
+    print(f"🗄️ SQLITE CONCURRENCY BENCHMARK (1 writer, {args.readers} readers, {args.seconds:g}s, "
+          f"{args.cycles} seeded cycles)")
+    print("=" * 78)
+    print(f"  {'profile':<12}{'writes/s':>10}{'reads/s':>10}{'read p50 ms':>14}{'read p95 ms':>14}{'locked':>10}")
+    for profile in ('baseline', 'tuned'):
+        r = run_profile(profile, args)
+        print(f"  {profile:<12}{r['writes'] / args.seconds:>10.1f}{r['reads'] / args.seconds:>10.1f}"
+              f"{r['p50']:>14.1f}{r['p95']:>14.1f}{r['errors']:>10}")
+
+
+if __name__ == '__main__':
+    main()
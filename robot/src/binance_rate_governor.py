@@ -0,0 +1,338 @@
+"""
+Binance Request Weight Governor
+
+Process-wide token bucket shared by every Binance caller (EnhancedBinanceClient,
+MarketAnalyzer, exchange-info helpers and the web routes). Each request draws
+its endpoint weight from the bucket, the bucket is re-synchronised from the
+X-MBX-USED-WEIGHT headers returned by Binance, and 429/418 responses freeze
+all callers until Retry-After expires.
+
+Callers are tagged with a priority. The live robot may drain the bucket to
+zero, simulations keep a reserve for it and dashboard calls are shed
+immediately once the bucket runs low. Setting BINANCE_GOVERNOR_STATE_FILE
+shares the bucket between processes (robot + web app) through a locked file.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from binance.client import Client
+from dotenv import load_dotenv
+
+try:
+    import fcntl
+except ImportError:  # Windows: cross-process sharing is unavailable
+    fcntl = None
+
+load_dotenv()
+
+# Keep a single governor whether this module is imported as
+# `src.binance_rate_governor` (web app) or `binance_rate_governor` (engines)
+sys.modules.setdefault('binance_rate_governor', sys.modules[__name__])
+sys.modules.setdefault('src.binance_rate_governor', sys.modules[__name__])
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_LIVE = 'live'
+PRIORITY_SIMULATION = 'simulation'
+PRIORITY_DASHBOARD = 'dashboard'
+PRIORITIES = (PRIORITY_LIVE, PRIORITY_SIMULATION, PRIORITY_DASHBOARD)
+
+# Request weights of the spot endpoints used by the robot
+# (https://binance-docs.github.io/apidocs/spot/en/#limits)
+ENDPOINT_WEIGHTS = {
+    'ping': 1,
+    'time': 1,
+    'exchangeInfo': 20,
+    'klines': 2,
+    'depth': 5,
+    'avgPrice': 2,
+    'ticker/price': 2,
+    'ticker/24hr': 2,
+    'ticker/bookTicker': 2,
+    'account': 20,
+    'myTrades': 20,
+    'order': 1,
+    'openOrders': 6,
+    'allOrders': 20,
+}
+
+# Weights when the endpoint is called without a symbol (all markets)
+ALL_SYMBOLS_WEIGHTS = {
+    'ticker/price': 4,
+    'ticker/24hr': 80,
+    'ticker/bookTicker': 4,
+    'openOrders': 80,
+}
+
+
+def get_binance_api_url() -> str:
+    """Base URL of the Binance REST API (BINANCE_API_URL points it at a replay server)"""
+    return (os.getenv('BINANCE_API_URL') or 'https://api.binance.com').rstrip('/')
+
+
+# python-binance base URLs -> path prefix on the BINANCE_API_URL server; the
+# replay server routes each prefix back to its Binance host when recording
+CLIENT_URL_PREFIXES = {
+    'API_URL': '/api',
+    'MARGIN_API_URL': '/sapi',
+    'WEBSITE_URL': '/website',
+    'FUTURES_URL': '/fapi',
+    'FUTURES_DATA_URL': '/futures/data',
+    'FUTURES_COIN_URL': '/dapi',
+    'FUTURES_COIN_DATA_URL': '/coin/futures/data',
+    'OPTIONS_URL': '/eapi',
+}
+
+
+def client_base_urls(base_url: str = None) -> Dict[str, str]:
+    """Every python-binance base URL (spot, sapi/margin, futures, options, testnets) on one server"""
+    base_url = (base_url or get_binance_api_url()).rstrip('/')
+    urls = {}
+    for name in dir(Client):
+        prefix = CLIENT_URL_PREFIXES.get(name.replace('_TESTNET', ''))
+        if name.endswith('_URL') and prefix is not None:
+            urls[name] = f"{base_url}{prefix}"
+    return urls
+
+
+class BinanceRequestShed(Exception):
+    """Raised when a request is dropped to protect the Binance weight budget"""
+
+
+def estimate_weight(path: str, params: Optional[Dict] = None) -> int:
+    """Estimate the request weight of a Binance REST path such as /api/v3/klines"""
+    endpoint = path.split('/v3/', 1)[-1].split('/v1/', 1)[-1].strip('/')
+    has_symbol = bool(params) and ('symbol' in params or 'symbols' in params)
+    if not has_symbol and endpoint in ALL_SYMBOLS_WEIGHTS:
+        return ALL_SYMBOLS_WEIGHTS[endpoint]
+    return ENDPOINT_WEIGHTS.get(endpoint, 1)
+
+
+_priority_context = threading.local()
+
+
+def current_priority() -> str:
+    """Priority of the calling thread (falls back to BINANCE_DEFAULT_PRIORITY)"""
+    return getattr(_priority_context, 'priority', None) or get_binance_governor().default_priority
+
+
+def set_thread_priority(priority: Optional[str]):
+    """Tag the calling thread; None restores the process default"""
+    _priority_context.priority = priority
+
+
+@contextmanager
+def request_priority(priority: str):
+    """Run a block of Binance calls under the given priority"""
+    previous = getattr(_priority_context, 'priority', None)
+    _priority_context.priority = priority
+    try:
+        yield
+    finally:
+        _priority_context.priority = previous
+
+
+class BinanceRateGovernor:
+    """Token bucket over the Binance 1-minute request weight budget"""
+
+    def __init__(self, weight_limit: int = None, state_file: str = None):
+        self.weight_limit = weight_limit or int(os.getenv('BINANCE_WEIGHT_LIMIT', '6000'))
+        self.safety_margin = float(os.getenv('BINANCE_WEIGHT_SAFETY_MARGIN', '0.8'))
+        self.capacity = self.weight_limit * self.safety_margin
+        self.refill_rate = self.capacity / 60.0  # weight per second
+        self.default_priority = os.getenv('BINANCE_DEFAULT_PRIORITY', PRIORITY_LIVE)
+
+        # Share of the bucket each priority must leave untouched
+        self.reserves = {
+            PRIORITY_LIVE: 0.0,
+            PRIORITY_SIMULATION: float(os.getenv('BINANCE_SIMULATION_RESERVE', '0.25')),
+            PRIORITY_DASHBOARD: float(os.getenv('BINANCE_DASHBOARD_RESERVE', '0.5')),
+        }
+        # Longest a caller queues for weight before its request is shed
+        self.max_wait = {
+            PRIORITY_LIVE: float(os.getenv('BINANCE_LIVE_MAX_WAIT', '120')),
+            PRIORITY_SIMULATION: float(os.getenv('BINANCE_SIMULATION_MAX_WAIT', '30')),
+            PRIORITY_DASHBOARD: float(os.getenv('BINANCE_DASHBOARD_MAX_WAIT', '0')),
+        }
+
+        self.state_file = state_file if state_file is not None else os.getenv('BINANCE_GOVERNOR_STATE_FILE')
+        if self.state_file and fcntl is None:
+            logger.warning("Cross-process Binance governor needs fcntl; using in-process state")
+            self.state_file = None
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._local_state = self._fresh_state()
+        self._metrics = {
+            priority: {'requests': 0, 'weight': 0, 'shed': 0, 'wait_seconds': 0.0}
+            for priority in PRIORITIES
+        }
+        self._server_used_weight = None
+        self._rate_limited_responses = 0
+
+    def _fresh_state(self) -> Dict:
+        return {'tokens': self.capacity, 'updated_at': time.time(), 'banned_until': 0.0}
+
+    @contextmanager
+    def _state(self):
+        """Yield the bucket state, locked in-process and (optionally) across processes"""
+        with self._lock:
+            if not self.state_file:
+                yield self._local_state
+                return
+
+            os.makedirs(os.path.dirname(os.path.abspath(self.state_file)), exist_ok=True)
+            with open(self.state_file, 'a+') as fh:
+                fcntl.flock(fh, fcntl.LOCK_EX)
+                fh.seek(0)
+                raw = fh.read()
+                try:
+                    state = json.loads(raw) if raw else self._fresh_state()
+                except ValueError:
+                    state = self._fresh_state()
+                yield state
+                fh.seek(0)
+                fh.truncate()
+                json.dump(state, fh)
+                fh.flush()
+
+    def _refill(self, state: Dict, now: float):
+        elapsed = max(0.0, now - state['updated_at'])
+        state['tokens'] = min(self.capacity, state['tokens'] + elapsed * self.refill_rate)
+        state['updated_at'] = now
+
+    def acquire(self, weight: int, priority: str = None) -> float:
+        """
+        Take `weight` from the bucket, queueing while allowed by the priority.
+        Returns the seconds spent waiting; raises BinanceRequestShed otherwise.
+        """
+        priority = priority if priority in PRIORITIES else self.default_priority
+        weight = min(weight, self.capacity)
+        floor = self.reserves[priority] * self.capacity
+        started = time.time()
+        deadline = started + self.max_wait[priority]
+
+        while True:
+            with self._state() as state:
+                now = time.time()
+                self._refill(state, now)
+                if now < state['banned_until']:
+                    wait_for = state['banned_until'] - now
+                elif state['tokens'] - weight >= floor:
+                    state['tokens'] -= weight
+                    waited = now - started
+                    self._record(priority, weight, waited)
+                    return waited
+                else:
+                    wait_for = (weight + floor - state['tokens']) / self.refill_rate
+
+            if now + wait_for > deadline:
+                with self._lock:
+                    self._metrics[priority]['shed'] += 1
+                raise BinanceRequestShed(
+                    f"Binance weight budget exhausted: {priority} request of weight {weight} shed"
+                )
+            self._wakeup.wait(min(wait_for, 1.0))
+
+    def observe(self, status_code: int, headers) -> None:
+        """Resynchronise the bucket from a Binance response"""
+        used = headers.get('X-MBX-USED-WEIGHT-1M') or headers.get('X-MBX-USED-WEIGHT')
+        with self._state() as state:
+            now = time.time()
+            self._refill(state, now)
+            if used is not None:
+                try:
+                    self._server_used_weight = int(used)
+                    state['tokens'] = min(state['tokens'], self.capacity - self._server_used_weight)
+                except ValueError:
+                    pass
+            if status_code in (418, 429):
+                retry_after = float(headers.get('Retry-After', 60))
+                state['banned_until'] = max(state['banned_until'], now + retry_after)
+                state['tokens'] = min(state['tokens'], 0.0)
+                self._rate_limited_responses += 1
+                logger.warning(f"Binance returned {status_code}, pausing requests for {retry_after:.0f}s")
+
+    def _record(self, priority: str, weight: int, waited: float):
+        metrics = self._metrics[priority]
+        metrics['requests'] += 1
+        metrics['weight'] += weight
+        metrics['wait_seconds'] += waited
+
+    def get_metrics(self) -> Dict:
+        """Snapshot of the bucket and per-priority counters for monitoring"""
+        with self._state() as state:
+            now = time.time()
+            self._refill(state, now)
+            tokens = state['tokens']
+            banned_for = max(0.0, state['banned_until'] - now)
+            by_priority = {p: dict(m) for p, m in self._metrics.items()}
+
+        return {
+            'weight_limit': self.weight_limit,
+            'capacity': self.capacity,
+            'tokens_available': round(tokens, 1),
+            'utilization': round(1 - tokens / self.capacity, 3),
+            'server_used_weight': self._server_used_weight,
+            'rate_limited_responses': self._rate_limited_responses,
+            'banned_for_seconds': round(banned_for, 1),
+            'shared': bool(self.state_file),
+            'priorities': by_priority,
+        }
+
+
+class GovernedClient(Client):
+    """python-binance Client whose every REST call goes through the governor
+    and which honours BINANCE_API_URL (record/replay server)"""
+
+    def __init__(self, api_key: str = None, api_secret: str = None, priority: str = None,
+                 governor: BinanceRateGovernor = None, **kwargs):
+        self.governor = governor or get_binance_governor()
+        self.priority = priority
+        if os.getenv('BINANCE_API_URL'):
+            # Not only /api: sapi (account status, margin) must not reach production either
+            for name, url in client_base_urls().items():
+                setattr(self, name, url)
+        super().__init__(api_key, api_secret, **kwargs)
+
+    def _request(self, method, uri: str, signed: bool, force_params: bool = False, **kwargs):
+        weight = estimate_weight(urlparse(uri).path, kwargs.get('data') or kwargs.get('params'))
+        self.governor.acquire(weight, self.priority or current_priority())
+        self.response = None
+        try:
+            return super()._request(method, uri, signed, force_params, **kwargs)
+        finally:
+            if self.response is not None:
+                self.governor.observe(self.response.status_code, self.response.headers)
+
+
+def governed_get(url: str, params: Dict = None, priority: str = None, **kwargs) -> requests.Response:
+    """requests.get for public Binance endpoints, accounted against the shared budget"""
+    governor = get_binance_governor()
+    governor.acquire(estimate_weight(urlparse(url).path, params), priority or current_priority())
+    response = requests.get(url, params=params, **kwargs)
+    governor.observe(response.status_code, response.headers)
+    return response
+
+
+_binance_governor = None
+_governor_lock = threading.Lock()
+
+
+def get_binance_governor() -> BinanceRateGovernor:
+    """Get global Binance rate governor instance"""
+    global _binance_governor
+    if _binance_governor is None:
+        with _governor_lock:
+            if _binance_governor is None:
+                _binance_governor = BinanceRateGovernor()
+    return _binance_governor
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Binance Record/Replay Server
+
+Local stand-in for the Binance REST API used to benchmark trading cycles and
+simulations offline. In `record` mode it proxies every call to the real API
+and stores the responses (klines, tickers, exchange info, account, orders)
+in a JSON cassette. In `replay` mode it serves the cassette deterministically
+with configurable latency, so runs can be compared reproducibly.
+
+Point the robot at it with BINANCE_API_URL=http://127.0.0.1:8765; the
+governed python-binance Client (spot, sapi, futures and options endpoints),
+MarketAnalyzer and the pair filter all use that base URL.
+"""
+
+import os
+import json
+import time
+import random
+import logging
+import argparse
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+import requests
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Parameters that change on every call and must not be part of the lookup key
+VOLATILE_PARAMS = {'timestamp', 'signature', 'recvWindow', 'newClientOrderId'}
+# Additionally ignored when a query misses exactly (relative time windows,
+# order sizes that differ from run to run)
+LOOSE_PARAMS = {'startTime', 'endTime', 'quantity', 'quoteOrderQty', 'price'}
+# Response headers worth replaying (weight accounting, content type)
+KEPT_HEADERS = ('Content-Type', 'X-MBX-USED-WEIGHT', 'X-MBX-USED-WEIGHT-1M',
+                'X-MBX-ORDER-COUNT-10S', 'X-MBX-ORDER-COUNT-1D', 'Retry-After')
+
+CONTROL_PREFIX = '/__replay__'
+
+# GovernedClient maps every python-binance base URL onto BINANCE_API_URL
+# (binance_rate_governor.CLIENT_URL_PREFIXES); in record mode these prefixes
+# go back to their own Binance host, anything else (/api, /sapi) to the
+# spot upstream. (prefix, host, prefix stripped before forwarding)
+UPSTREAM_ROUTES = (
+    ('/coin/futures/data', 'https://dapi.binance.com', '/coin'),
+    ('/futures/data', 'https://fapi.binance.com', ''),
+    ('/fapi', 'https://fapi.binance.com', ''),
+    ('/dapi', 'https://dapi.binance.com', ''),
+    ('/eapi', 'https://eapi.binance.com', ''),
+    ('/website', 'https://www.binance.com', '/website'),
+)
+
+
+def _request_key(method: str, path: str, params: List[Tuple[str, str]], loose: bool = False) -> str:
+    ignored = VOLATILE_PARAMS | LOOSE_PARAMS if loose else VOLATILE_PARAMS
+    kept = sorted((k, v) for k, v in params if k not in ignored)
+    return f"{method} {path}?{urlencode(kept)}"
+
+
+class BinanceCassette:
+    """Ordered store of recorded Binance interactions"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.interactions: List[Dict] = []
+        self._exact: Dict[str, List[Dict]] = {}
+        self._loose: Dict[str, List[Dict]] = {}
+        self._cursors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'loose_hits': 0, 'misses': 0, 'recorded': 0}
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        for interaction in data.get('interactions', []):
+            self._index(interaction)
+        logger.info(f"Loaded {len(self.interactions)} Binance interactions from {self.path}")
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'version': 1,
+                'saved_at': datetime.utcnow().isoformat(),
+                'interactions': self.interactions
+            }, f)
+        os.replace(tmp_path, self.path)
+
+    def _index(self, interaction: Dict):
+        params = [tuple(p) for p in interaction['params']]
+        self.interactions.append(interaction)
+        self._exact.setdefault(_request_key(interaction['method'], interaction['path'], params), []).append(interaction)
+        self._loose.setdefault(_request_key(interaction['method'], interaction['path'], params, loose=True), []).append(interaction)
+
+    def record(self, method: str, path: str, params: List[Tuple[str, str]],
+               status: int, headers, body: str):
+        interaction = {
+            'method': method,
+            'path': path,
+            'params': [[k, v] for k, v in params if k not in VOLATILE_PARAMS],
+            'status': status,
+            'headers': {k: headers[k] for k in KEPT_HEADERS if k in headers},
+            'body': body,
+        }
+        with self._lock:
+            self._index(interaction)
+            self.stats['recorded'] += 1
+            if self.stats['recorded'] % 50 == 0:
+                self.save()
+
+    def lookup(self, method: str, path: str, params: List[Tuple[str, str]]) -> Tuple[Optional[Dict], str, int]:
+        """
+        Return the next recorded response for this request. Repeated identical
+        requests walk through the recordings in order and then stick to the last one.
+        """
+        with self._lock:
+            key = _request_key(method, path, params)
+            candidates = self._exact.get(key)
+            if candidates:
+                self.stats['hits'] += 1
+            else:
+                key = _request_key(method, path, params, loose=True)
+                candidates = self._loose.get(key)
+                if not candidates:
+                    self.stats['misses'] += 1
+                    return None, key, 0
+                self.stats['loose_hits'] += 1
+
+            index = self._cursors.get(key, 0)
+            self._cursors[key] = index + 1
+            return candidates[min(index, len(candidates) - 1)], key, index
+
+    def reset(self):
+        """Rewind every request sequence (start of a new benchmark run)"""
+        with self._lock:
+            self._cursors.clear()
+            for name in ('hits', 'loose_hits', 'misses'):
+                self.stats[name] = 0
+
+
+class BinanceReplayServer:
+    """HTTP server that records from or replays to Binance REST clients"""
+
+    def __init__(self, cassette_path: str = None, mode: str = 'replay', host: str = '127.0.0.1',
+                 port: int = None, upstream: str = None, latency_ms: float = None,
+                 jitter_ms: float = None, seed: int = None):
+        self.cassette = BinanceCassette(cassette_path or os.getenv('BINANCE_REPLAY_CASSETTE', 'data/binance_cassette.json'))
+        self.mode = mode
+        self.upstream = (upstream or os.getenv('BINANCE_REPLAY_UPSTREAM', 'https://api.binance.com')).rstrip('/')
+        self.latency_ms = latency_ms if latency_ms is not None else float(os.getenv('BINANCE_REPLAY_LATENCY_MS', '0'))
+        self.jitter_ms = jitter_ms if jitter_ms is not None else float(os.getenv('BINANCE_REPLAY_JITTER_MS', '0'))
+        self.seed = seed if seed is not None else int(os.getenv('BINANCE_REPLAY_SEED', '0'))
+        self.session = requests.Session()
+
+        port = port if port is not None else int(os.getenv('BINANCE_REPLAY_PORT', '8765'))
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _latency_for(self, key: str, index: int) -> float:
+        """Deterministic per-request delay (seconds), independent of thread scheduling"""
+        if not self.latency_ms and not self.jitter_ms:
+            return 0.0
+        rng = random.Random(f"{self.seed}:{key}:{index}")
+        delay_ms = self.latency_ms + rng.uniform(-self.jitter_ms, self.jitter_ms)
+        return max(0.0, delay_ms) / 1000.0
+
+    def _upstream_url(self, path: str) -> str:
+        for prefix, host, strip in UPSTREAM_ROUTES:
+            if path == prefix or path.startswith(prefix + '/'):
+                return f"{host}{path[len(strip):]}"
+        return f"{self.upstream}{path}"
+
+    def _forward(self, method: str, path: str, query: str, body: bytes, headers):
+        url = self._upstream_url(path) + (f"?{query}" if query else '')
+        forward_headers = {k: headers.get(k) for k in ('X-MBX-APIKEY', 'Content-Type') if headers.get(k)}
+        response = self.session.request(method, url, data=body or None, headers=forward_headers, timeout=30)
+        # response.headers is case-insensitive; Binance sends lower-case names
+        return response.status_code, response.headers, response.text
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+            def _send(self, status: int, body: str, headers: Dict[str, str] = None):
+                payload = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json;charset=UTF-8')
+                for name, value in (headers or {}).items():
+                    if name != 'Content-Type':
+                        self.send_header(name, value)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _handle(self):
+                parts = urlsplit(self.path)
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                params = parse_qsl(parts.query, keep_blank_values=True)
+                params += parse_qsl(body.decode('utf-8'), keep_blank_values=True)
+
+                if parts.path.startswith(CONTROL_PREFIX):
+                    return self._control(parts.path[len(CONTROL_PREFIX):])
+
+                if server.mode == 'record':
+                    status, headers, text = server._forward(self.command, parts.path, parts.query,
+                                                            body, self.headers)
+                    server.cassette.record(self.command, parts.path, params, status, headers, text)
+                    return self._send(status, text, {k: headers[k] for k in KEPT_HEADERS if k in headers})
+
+                interaction, key, index = server.cassette.lookup(self.command, parts.path, params)
+                delay = server._latency_for(key, index)
+                if delay:
+                    time.sleep(delay)
+                if interaction is None:
+                    logger.warning(f"No recorded Binance response for {key}")
+                    return self._send(404, json.dumps({'code': -1121, 'msg': f'No recorded response for {key}'}))
+                self._send(interaction['status'], interaction['body'], interaction['headers'])
+
+            def _control(self, action: str):
+                if action == '/reset':
+                    server.cassette.reset()
+                    return self._send(200, json.dumps({'reset': True}))
+                stats = dict(server.cassette.stats, mode=server.mode,
+                             interactions=len(server.cassette.interactions))
+                return self._send(200, json.dumps(stats))
+
+            do_GET = _handle
+            do_POST = _handle
+            do_PUT = _handle
+            do_DELETE = _handle
+
+        return Handler
+
+    def start(self) -> str:
+        """Serve in a background thread (for in-process benchmarks); returns the base URL"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Binance {self.mode} server listening on {self.url}")
+        return self.url
+
+    def serve_forever(self):
+        logger.info(f"Binance {self.mode} server listening on {self.url}")
+        self.httpd.serve_forever()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.mode == 'record':
+            with self.cassette._lock:
+                self.cassette.save()
+
+
+# CLI interface
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Binance record/replay server')
+    parser.add_argument('mode', choices=['record', 'replay'],
+                        help='record: proxy to Binance and store responses; replay: serve the cassette')
+    parser.add_argument('--cassette', help='Cassette file (default: BINANCE_REPLAY_CASSETTE)')
+    parser.add_argument('--host', default='127.0.0.1', help='Listen address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, help='Listen port (default: BINANCE_REPLAY_PORT or 8765)')
+    parser.add_argument('--latency-ms', type=float, help='Added latency per replayed response')
+    parser.add_argument('--jitter-ms', type=float, help='Deterministic +/- jitter around the latency')
+    parser.add_argument('--seed', type=int, help='Seed for the latency jitter')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    replay_server = BinanceReplayServer(
+        cassette_path=args.cassette, mode=args.mode, host=args.host, port=args.port,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, seed=args.seed
+    )
+    print(f"🎞️  Binance {args.mode} server on {replay_server.url}")
+    print(f"   Set BINANCE_API_URL={replay_server.url} for the robot, simulations and web app")
+
+    try:
+        replay_server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Stopped by user")
+        replay_server.stop()
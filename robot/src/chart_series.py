@@ -0,0 +1,176 @@
+"""
+Bounded chart data for cycle history pages
+
+History charts used to inline every cycle, with its full portfolio breakdown,
+into the page. These helpers keep the payload bounded whatever the number of
+cycles:
+
+- load_cycle_series: column-only query (no breakdown JSON) of a cycle table
+- decimate_series: reduce a series to at most N points with LTTB (shape
+  preserving) or min/max per bucket (keeps every extreme)
+- paginate_cycles: keyset pagination on cycle_number
+- normalize_breakdown: the {asset: {value, performance}} shape the breakdown
+  popup expects, fetched lazily for one cycle
+"""
+
+import os
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+DECIMATION_METHODS = ('lttb', 'minmax')
+SERIES_COLUMNS = ('total_value', 'portfolio_value', 'bnb_reserve')
+
+
+def default_chart_points() -> int:
+    return int(os.getenv('CHART_MAX_POINTS', '1000'))
+
+
+def max_page_size() -> int:
+    return int(os.getenv('CYCLES_PAGE_MAX', '500'))
+
+
+def lttb_indices(xs: Sequence[float], ys: Sequence[float], threshold: int) -> List[int]:
+    """Largest-Triangle-Three-Buckets: indices of `threshold` points preserving the visual shape"""
+    n = len(ys)
+    if threshold >= n:
+        return list(range(n))
+    threshold = max(threshold, 3)
+
+    x = np.asarray(xs, dtype=np.float64)
+    y = np.asarray(ys, dtype=np.float64)
+    # First and last points are always kept; the rest is split into threshold - 2 buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], max(edges[i + 2], edges[i + 1] + 1)
+            avg_x, avg_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+        # Point in the bucket forming the largest triangle with the previous pick and the next bucket's mean
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(areas))
+        selected.append(a)
+    selected.append(n - 1)
+    return selected
+
+
+def minmax_indices(ys: Sequence[float], buckets: int) -> List[int]:
+    """Indices of the minimum and maximum of each bucket (at most 2 * buckets points)"""
+    n = len(ys)
+    if buckets <= 0 or 2 * buckets >= n:
+        return list(range(n))
+
+    y = np.asarray(ys, dtype=np.float64)
+    edges = np.linspace(0, n, buckets + 1).astype(int)
+    selected = set([0, n - 1])
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end <= start:
+            continue
+        chunk = y[start:end]
+        selected.add(start + int(np.argmin(chunk)))
+        selected.add(start + int(np.argmax(chunk)))
+    return sorted(selected)
+
+
+def decimate_series(series: Dict[str, List[Any]], points: int, method: str = 'lttb',
+                    x_key: str = 'cycle_number', y_key: str = 'total_value') -> Dict[str, Any]:
+    """
+    Reduce every column of `series` to the same at most `points` rows,
+    choosing rows from the (x_key, y_key) curve
+    """
+    if method not in DECIMATION_METHODS:
+        raise ValueError(f"Unknown decimation method '{method}' (use one of {', '.join(DECIMATION_METHODS)})")
+
+    total = len(series.get(x_key, []))
+    if method == 'lttb':
+        indices = lttb_indices(series[x_key], series[y_key], points)
+    else:
+        indices = minmax_indices(series[y_key], max(1, points // 2))
+
+    decimated = {column: [values[i] for i in indices] for column, values in series.items()}
+    decimated.update({
+        'total_points': total,
+        'returned_points': len(indices),
+        'method': method if len(indices) < total else 'none'
+    })
+    return decimated
+
+
+def load_cycle_series(session, model, columns: Sequence[str] = SERIES_COLUMNS,
+                      cycle_numbers: Optional[Sequence[int]] = None, **filters) -> Dict[str, List[float]]:
+    """All cycles (or only `cycle_numbers`) of a cycle table as column lists, without loading breakdown JSON"""
+    query = session.query(model.cycle_number, *[getattr(model, column) for column in columns])
+    if filters:
+        query = query.filter_by(**filters)
+    if cycle_numbers is not None:
+        query = query.filter(model.cycle_number.in_(list(cycle_numbers)))
+    rows = query.order_by(model.cycle_number).all()
+
+    series: Dict[str, List[float]] = {'cycle_number': [row[0] for row in rows]}
+    for position, column in enumerate(columns, start=1):
+        series[column] = [float(row[position] or 0.0) for row in rows]
+    return series
+
+
+def paginate_cycles(session, model, after: Optional[int] = None, limit: int = 100, **filters) -> Dict[str, Any]:
+    """
+    One page of cycle summaries ordered by cycle_number, resuming after the
+    `after` cursor (keyset pagination: cost does not grow with the page number)
+    """
+    limit = max(1, min(limit, max_page_size()))
+    query = session.query(model.cycle_number, model.cycle_date, model.portfolio_value,
+                          model.bnb_reserve, model.total_value)
+    if filters:
+        query = query.filter_by(**filters)
+    if after is not None:
+        query = query.filter(model.cycle_number > after)
+    rows = query.order_by(model.cycle_number).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        'cycles': [
+            {
+                'cycle_number': row.cycle_number,
+                'date': row.cycle_date.isoformat() if row.cycle_date else None,
+                'portfolio_value': float(row.portfolio_value or 0.0),
+                'bnb_reserve': float(row.bnb_reserve or 0.0),
+                'total_value': float(row.total_value or 0.0)
+            }
+            for row in rows
+        ],
+        'next_cursor': rows[-1].cycle_number if has_more and rows else None,
+        'limit': limit
+    }
+
+
+def normalize_breakdown(breakdown) -> Dict[str, Dict[str, float]]:
+    """Always output {asset: {value, performance}} for the breakdown popup"""
+    if isinstance(breakdown, str):
+        try:
+            breakdown = json.loads(breakdown)
+        except Exception:
+            breakdown = {}
+    if not isinstance(breakdown, dict):
+        breakdown = {}
+
+    normalized = {}
+    for coin, val in breakdown.items():
+        if isinstance(val, dict) and 'value' in val:
+            # Already new format, but ensure performance exists
+            normalized[coin] = {'value': val.get('value', 0), 'performance': val.get('performance', 0)}
+        elif isinstance(val, dict) and 'quantity' in val and ('price' in val or 'entry_price' in val):
+            # Legacy format: convert
+            price = val.get('price', val.get('entry_price', 0))
+            normalized[coin] = {'value': val['quantity'] * price, 'performance': 0}
+        elif isinstance(val, (int, float)):
+            normalized[coin] = {'value': val, 'performance': 0}
+    # If portfolio is empty, add a placeholder
+    if not normalized:
+        normalized['NO_ASSETS'] = {'value': 0, 'performance': 0}
+    return normalized
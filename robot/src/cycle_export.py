@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Streaming Cycle Export
+
+Bulk export of simulation cycles, trading cycles and cycle positions as CSV,
+gzip CSV or Parquet (when pyarrow is installed). Rows are read through a
+server-side cursor (stream_results: a named cursor on PostgreSQL, a lazily
+fetched cursor on SQLite) in batches of EXPORT_BATCH_SIZE and encoded batch
+by batch, so memory stays constant whatever the row count. The web app
+serves stream_export() as a chunked response; the CLI writes it to a file:
+
+    python src/cycle_export.py trading-cycles -o trading.csv.gz
+    python src/cycle_export.py simulation-cycles --simulation 12 -f parquet -o sim12.parquet
+"""
+
+import os
+import io
+import csv
+import sys
+import zlib
+import logging
+import argparse
+from datetime import datetime, date
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Boolean, DateTime, Float, Integer, Text, cast, select
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # optional dependency: Parquet export unavailable
+    pyarrow = None
+
+try:
+    from src import fast_json
+    from src.database import get_db_manager, JSON, Simulation, SimulationCycle, TradingCycle, CyclePosition
+    from src.simulation_archive import SimulationArchive, ARCHIVE_COLUMNS
+except ImportError:
+    import fast_json
+    from database import get_db_manager, JSON, Simulation, SimulationCycle, TradingCycle, CyclePosition
+    from simulation_archive import SimulationArchive, ARCHIVE_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+DATASETS = ('simulation-cycles', 'trading-cycles', 'cycle-positions')
+
+# format -> (mimetype, file extension)
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'csv.gz': ('application/gzip', 'csv.gz'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+
+def export_batch_size() -> int:
+    return int(os.getenv('EXPORT_BATCH_SIZE', '2000'))
+
+
+def available_formats() -> List[str]:
+    return [fmt for fmt in EXPORT_FORMATS if fmt != 'parquet' or pyarrow is not None]
+
+
+def _export_columns(table) -> list:
+    """Columns of a table; JSON columns are read as text (no decode/re-encode; JSONB is rendered by the server)"""
+    return [cast(column, Text).label(column.name) if isinstance(column.type, JSON) else column
+            for column in table.c]
+
+
+def build_export_query(dataset: str, simulation_id: int = None,
+                       from_cycle: int = None, to_cycle: int = None):
+    """SELECT of one dataset in cycle order; from/to_cycle bound the cycle_number"""
+    if dataset == 'simulation-cycles':
+        if simulation_id is None:
+            raise ValueError('simulation-cycles export needs a simulation id')
+        table = SimulationCycle.__table__
+        statement = select(*_export_columns(table)).where(table.c.simulation_id == simulation_id)
+        cycle_number, order = table.c.cycle_number, (table.c.cycle_number, table.c.id)
+    elif dataset == 'trading-cycles':
+        table = TradingCycle.__table__
+        statement = select(*_export_columns(table))
+        cycle_number, order = table.c.cycle_number, (table.c.cycle_number, table.c.id)
+    elif dataset == 'cycle-positions':
+        positions, cycles = CyclePosition.__table__, TradingCycle.__table__
+        statement = select(cycles.c.cycle_number, *_export_columns(positions)) \
+            .select_from(positions.join(cycles, positions.c.cycle_id == cycles.c.id))
+        cycle_number, order = cycles.c.cycle_number, (cycles.c.cycle_number, positions.c.id)
+    else:
+        raise ValueError(f"Unknown dataset '{dataset}' (expected one of {', '.join(DATASETS)})")
+
+    if from_cycle is not None:
+        statement = statement.where(cycle_number >= from_cycle)
+    if to_cycle is not None:
+        statement = statement.where(cycle_number <= to_cycle)
+    return statement.order_by(*order)
+
+
+def iter_row_batches(engine, statement, batch_size: int = None) -> Iterator[List[Tuple]]:
+    """Rows of a SELECT in batches, through a server-side cursor on its own connection"""
+    batch_size = batch_size or export_batch_size()
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, max_row_buffer=batch_size).execute(statement)
+        for partition in result.partitions(batch_size):
+            yield partition
+
+
+def _cell(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return fast_json.dumps(value)
+    return value
+
+
+def _arrow_type(column_type):
+    if isinstance(column_type, Boolean):
+        return pyarrow.bool_()
+    if isinstance(column_type, Integer):
+        return pyarrow.int64()
+    if isinstance(column_type, Float):
+        return pyarrow.float64()
+    if isinstance(column_type, DateTime):
+        return pyarrow.timestamp('us', tz='UTC' if column_type.timezone else None)
+    return pyarrow.string()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object collecting what the Parquet writer produced since the last drain"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._chunks = b''.join(self._chunks), []
+        return data
+
+
+def _csv_chunks(statement, batches: Iterable[List[Tuple]]) -> Iterator[bytes]:
+    columns = list(statement.selected_columns)
+    # Only dates need converting; the csv module writes numbers, text and None ('') itself
+    dates = [i for i, column in enumerate(columns) if isinstance(column.type, DateTime)]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.name for column in columns])
+    for batch in batches:
+        if dates:
+            batch = [list(row) for row in batch]
+            for row in batch:
+                for i in dates:
+                    if row[i] is not None:
+                        row[i] = row[i].isoformat()
+        writer.writerows(batch)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    remainder = buffer.getvalue()
+    if remainder:
+        yield remainder.encode('utf-8')
+
+
+def _gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def _parquet_chunks(statement, batches: Iterable[List[Tuple]]) -> Iterator[bytes]:
+    columns = list(statement.selected_columns)
+    schema = pyarrow.schema([(column.name, _arrow_type(column.type)) for column in columns])
+    string_columns = {i for i, field in enumerate(schema) if field.type == pyarrow.string()}
+    sink = _ChunkSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema, compression='zstd')
+    try:
+        for batch in batches:
+            values = list(zip(*batch)) if batch else [[] for _ in columns]
+            arrays = [
+                pyarrow.array([_cell(v) if i in string_columns and v is not None else v for v in column],
+                              type=field.type)
+                for i, (column, field) in enumerate(zip(values, schema))
+            ]
+            writer.write_table(pyarrow.Table.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def _check_format(fmt: str):
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}' (expected one of {', '.join(EXPORT_FORMATS)})")
+    if fmt == 'parquet' and pyarrow is None:
+        raise ValueError('Parquet export needs pyarrow (pip install pyarrow)')
+
+
+def _encode(statement, batches: Iterable[List[Tuple]], fmt: str) -> Iterator[bytes]:
+    if fmt == 'parquet':
+        return _parquet_chunks(statement, batches)
+    chunks = _csv_chunks(statement, batches)
+    return _gzip_chunks(chunks) if fmt == 'csv.gz' else chunks
+
+
+def stream_export(engine, statement, fmt: str = 'csv', batch_size: int = None) -> Iterator[bytes]:
+    """Encoded export of a SELECT, one chunk per batch of rows"""
+    _check_format(fmt)
+    return _encode(statement, iter_row_batches(engine, statement, batch_size), fmt)
+
+
+def _archive_batches(archive, path: str, from_cycle: int = None, to_cycle: int = None,
+                     batch_size: int = None) -> Iterator[List[Tuple]]:
+    batch_size = batch_size or export_batch_size()
+    data = archive.read_columns(path, tuple(ARCHIVE_COLUMNS))
+    rows = [row for row in zip(*(data[name] for name in ARCHIVE_COLUMNS))
+            if (from_cycle is None or row[0] >= from_cycle) and (to_cycle is None or row[0] <= to_cycle)]
+    for start in range(0, len(rows), batch_size):
+        yield rows[start:start + batch_size]
+
+
+def stream_archive_export(archive, path: str, fmt: str = 'csv', from_cycle: int = None, to_cycle: int = None,
+                          batch_size: int = None) -> Iterator[bytes]:
+    """Encoded export of an archived simulation, through the same encoders (archived columns only)"""
+    _check_format(fmt)
+    columns = {column.name: column for column in _export_columns(SimulationCycle.__table__)}
+    statement = select(*(columns[name] for name in ARCHIVE_COLUMNS))
+    return _encode(statement, _archive_batches(archive, path, from_cycle, to_cycle, batch_size), fmt)
+
+
+def export_filename(dataset: str, fmt: str, simulation_id: int = None) -> str:
+    stem = f"simulation_{simulation_id}_cycles" if dataset == 'simulation-cycles' else dataset.replace('-', '_')
+    return f"{stem}.{EXPORT_FORMATS[fmt][1]}"
+
+
+def _write_chunks(path: str, chunks: Iterable[bytes]) -> Dict[str, Any]:
+    written = 0
+    with open(path, 'wb') as handle:
+        for chunk in chunks:
+            handle.write(chunk)
+            written += len(chunk)
+    return {'path': path, 'bytes': written}
+
+
+def export_to_file(db_manager, path: str, dataset: str, fmt: str = None, simulation_id: int = None,
+                   from_cycle: int = None, to_cycle: int = None) -> Dict[str, Any]:
+    """Write one dataset to a file (format from the extension when not given)"""
+    fmt = fmt or next((f for f in ('csv.gz', 'parquet', 'csv') if path.endswith(f".{f}")), 'csv')
+
+    if dataset == 'simulation-cycles':
+        session = db_manager.get_session()
+        try:
+            archive_path = session.query(Simulation.archive_path).filter(Simulation.id == simulation_id).scalar()
+        finally:
+            session.close()
+        if archive_path:
+            # Archived cycles are no longer in the database: read them from the archive
+            chunks = stream_archive_export(SimulationArchive(), archive_path, fmt, from_cycle, to_cycle)
+            return {**_write_chunks(path, chunks), 'archived': True, 'source': archive_path, 'format': fmt}
+
+    chunks = stream_export(db_manager.engine, build_export_query(dataset, simulation_id, from_cycle, to_cycle), fmt)
+    return {**_write_chunks(path, chunks), 'archived': False, 'format': fmt}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Export cycle data as CSV, gzip CSV or Parquet')
+    parser.add_argument('dataset', choices=DATASETS, help='Rows to export')
+    parser.add_argument('-o', '--output', help='Output file (default: <dataset>.<format> in the current directory)')
+    parser.add_argument('-f', '--format', choices=list(EXPORT_FORMATS), help='Output format (default: from the extension, else csv)')
+    parser.add_argument('--simulation', type=int, help='Simulation id (simulation-cycles)')
+    parser.add_argument('--from-cycle', type=int, help='First cycle number to export')
+    parser.add_argument('--to-cycle', type=int, help='Last cycle number to export')
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.dataset == 'simulation-cycles' and args.simulation is None:
+        parser.error('simulation-cycles needs --simulation')
+
+    output = args.output or export_filename(args.dataset, args.format or 'csv', args.simulation)
+    try:
+        result = export_to_file(get_db_manager(), output, args.dataset, args.format, args.simulation,
+                                args.from_cycle, args.to_cycle)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    if result['archived']:
+        print(f"📦 Simulation {args.simulation} is archived; exporting from {result['source']}")
+    print(f"✅ Exported {args.dataset} to {output} ({result['bytes']:,} bytes, {result['format']})")
+    return 0
+
+
+# CLI interface
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+Time-series rollups of trading and simulation cycles
+
+Long-range views used to aggregate every raw TradingCycle/SimulationCycle
+row at request time. Instead, cycles are folded into cycle_rollups as they
+are written: one row per portfolio or simulation, grain (day, week, month)
+and period, holding
+
+- open/high/low/close of the total value
+- fees (simulation trading costs; live trading cycles do not record fees)
+- peak_value: running all-time peak of the total value at the end of the
+  period, and max_drawdown: deepest fall below that running peak during
+  the period (fraction of the peak)
+- protection_cycles / protection_days: cycles and distinct days spent in
+  USDC protection
+
+Folding is incremental and assumes the cycles of one scope arrive in time
+order (they are appended); rebuild_rollups recomputes a scope from scratch
+(backfill job: robot/backfill_rollups.py).
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import bindparam, func
+
+SCOPE_PORTFOLIO = 'portfolio'
+SCOPE_SIMULATION = 'simulation'
+GRAINS = ('day', 'week', 'month')
+
+# Columns carried by every rollup row besides its key and id
+ROLLUP_VALUES = ('open_value', 'high_value', 'low_value', 'close_value', 'first_cycle', 'last_cycle',
+                 'cycle_count', 'fees', 'peak_value', 'max_drawdown', 'protection_cycles',
+                 'protection_days', 'last_protection_at')
+
+
+class RollupCycle(NamedTuple):
+    """What a rollup needs from one cycle"""
+    cycle_number: int
+    cycle_date: datetime
+    total_value: float
+    fees: float
+    protected: bool
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def period_start(moment: datetime, grain: str) -> datetime:
+    """Start of the day, ISO week (Monday) or month containing `moment`"""
+    day = datetime(moment.year, moment.month, moment.day)
+    if grain == 'day':
+        return day
+    if grain == 'week':
+        return day - timedelta(days=day.weekday())
+    if grain == 'month':
+        return day.replace(day=1)
+    raise ValueError(f"Unknown grain '{grain}' (use one of {', '.join(GRAINS)})")
+
+
+def is_protection_cycle(actions_taken) -> bool:
+    """Whether a cycle's actions record USDC protection ('USDC_PROTECTION', 'DRY_RUN: USDC Protection ...')"""
+    if isinstance(actions_taken, dict):
+        actions_taken = actions_taken.get('actions', [])
+    if isinstance(actions_taken, str):
+        actions_taken = [actions_taken]
+    if not isinstance(actions_taken, (list, tuple)):
+        return False
+    return any('usdc protection' in str(action).lower().replace('_', ' ') for action in actions_taken)
+
+
+def rollup_cycle(cycle_number, cycle_date, total_value, fees, actions_taken) -> RollupCycle:
+    return RollupCycle(cycle_number, _naive_utc(cycle_date), float(total_value or 0.0), float(fees or 0.0),
+                       is_protection_cycle(actions_taken))
+
+
+def _new_row(cycle: RollupCycle, peak: float) -> Dict[str, Any]:
+    return {
+        'open_value': cycle.total_value, 'high_value': cycle.total_value, 'low_value': cycle.total_value,
+        'close_value': cycle.total_value, 'first_cycle': cycle.cycle_number, 'last_cycle': cycle.cycle_number,
+        'cycle_count': 0, 'fees': 0.0, 'peak_value': peak, 'max_drawdown': 0.0,
+        'protection_cycles': 0, 'protection_days': 0, 'last_protection_at': None
+    }
+
+
+def _fold(row: Dict[str, Any], cycle: RollupCycle):
+    value = cycle.total_value
+    row['high_value'] = max(row['high_value'], value)
+    row['low_value'] = min(row['low_value'], value)
+    row['close_value'] = value
+    row['last_cycle'] = cycle.cycle_number
+    row['cycle_count'] += 1
+    row['fees'] += cycle.fees
+    row['peak_value'] = max(row['peak_value'] or 0.0, value)
+    if row['peak_value'] > 0:
+        row['max_drawdown'] = max(row['max_drawdown'], (row['peak_value'] - value) / row['peak_value'])
+    if cycle.protected:
+        row['protection_cycles'] += 1
+        last = row['last_protection_at']
+        if last is None or last.date() != cycle.cycle_date.date():
+            row['protection_days'] += 1
+        row['last_protection_at'] = cycle.cycle_date
+
+
+def apply_cycles(conn, table, scope: str, scope_id: int, cycles: Sequence[RollupCycle]) -> int:
+    """Fold cycles of one portfolio/simulation into its rollups at every grain; returns the rows written"""
+    if not cycles:
+        return 0
+    cycles = sorted(cycles, key=lambda c: (c.cycle_date, c.cycle_number))
+    key = (table.c.scope == scope) & (table.c.scope_id == scope_id)
+    written = 0
+    for grain in GRAINS:
+        starts = [period_start(c.cycle_date, grain) for c in cycles]
+        rows = {
+            row.period_start: dict(row._mapping)
+            for row in conn.execute(table.select().where(key, table.c.grain == grain,
+                                                         table.c.period_start >= starts[0]))
+        }
+        # Running peak carried over from the last period before this batch
+        peak = conn.execute(
+            table.select().with_only_columns(table.c.peak_value)
+            .where(key, table.c.grain == grain, table.c.period_start < starts[0])
+            .order_by(table.c.period_start.desc()).limit(1)).scalar() or 0.0
+
+        for start, cycle in zip(starts, cycles):
+            row = rows.get(start)
+            if row is None:
+                row = rows[start] = dict(_new_row(cycle, peak), id=None, period_start=start)
+            _fold(row, cycle)
+            peak = row['peak_value']
+
+        touched, now = set(starts), datetime.utcnow()
+        inserts = [dict({name: row[name] for name in ROLLUP_VALUES}, scope=scope, scope_id=scope_id, grain=grain,
+                        period_start=start, updated_at=now)
+                   for start, row in rows.items() if row['id'] is None]
+        updates = [dict({name: row[name] for name in ROLLUP_VALUES}, rollup_id=row['id'], updated_at=now)
+                   for start, row in rows.items() if row['id'] is not None and start in touched]
+        if inserts:
+            conn.execute(table.insert(), inserts)
+        if updates:
+            conn.execute(table.update().where(table.c.id == bindparam('rollup_id')), updates)
+        written += len(inserts) + len(updates)
+    return written
+
+
+def rebuild_rollups(engine, table, scope: str, scope_id: int, batches: Iterable[Sequence[RollupCycle]]) -> int:
+    """Recompute the rollups of one scope from its cycles, in time-ordered batches; returns the cycles folded"""
+    with engine.begin() as conn:
+        conn.execute(table.delete().where(table.c.scope == scope, table.c.scope_id == scope_id))
+    folded = 0
+    for batch in batches:
+        with engine.begin() as conn:
+            apply_cycles(conn, table, scope, scope_id, batch)
+        folded += len(batch)
+    return folded
+
+
+def load_rollups(session, model, scope: str, scope_id: int, grain: str = 'day',
+                 start: Optional[datetime] = None, end: Optional[datetime] = None) -> Dict[str, List[Any]]:
+    """Rollup rows of one scope as columnar series ordered by period"""
+    if grain not in GRAINS:
+        raise ValueError(f"Unknown grain '{grain}' (use one of {', '.join(GRAINS)})")
+    query = session.query(model.period_start, model.open_value, model.high_value, model.low_value,
+                          model.close_value, model.fees, model.max_drawdown, model.protection_days,
+                          model.first_cycle, model.last_cycle) \
+        .filter(model.scope == scope, model.scope_id == scope_id, model.grain == grain)
+    if start is not None:
+        query = query.filter(model.period_start >= period_start(start, grain))
+    if end is not None:
+        query = query.filter(model.period_start <= end)
+    rows = query.order_by(model.period_start).all()
+    return {
+        'grain': grain,
+        'period_start': [row.period_start.isoformat() for row in rows],
+        'open': [row.open_value for row in rows],
+        'high': [row.high_value for row in rows],
+        'low': [row.low_value for row in rows],
+        'close': [row.close_value for row in rows],
+        'fees': [row.fees for row in rows],
+        'max_drawdown': [row.max_drawdown for row in rows],
+        'protection_days': [row.protection_days for row in rows],
+        'first_cycle': [row.first_cycle for row in rows],
+        'last_cycle': [row.last_cycle for row in rows]
+    }
+
+
+def rollup_period_cycles(session, model, scope: str, scope_id: int, points: int) -> Optional[List[int]]:
+    """Closing cycle number of each period, at the finest grain with at most `points` periods (None without rollups)"""
+    counts = dict(session.query(model.grain, func.count(model.id))
+                  .filter(model.scope == scope, model.scope_id == scope_id).group_by(model.grain))
+    if not counts:
+        return None
+    grain = next((grain for grain in GRAINS if counts.get(grain, 0) <= points), GRAINS[-1])
+    return load_rollups(session, model, scope, scope_id, grain)['last_cycle']
+
+
+def rollup_totals(session, model, scope: str, scope_ids: Sequence[int] = None) -> Dict[int, tuple]:
+    """{scope_id: (last cycle number, total fees)} from the monthly rollups (a few rows per scope)"""
+    query = session.query(model.scope_id, func.max(model.last_cycle), func.sum(model.fees)) \
+        .filter(model.scope == scope, model.grain == 'month')
+    if scope_ids is not None:
+        query = query.filter(model.scope_id.in_(list(scope_ids)))
+    return {scope_id: (last_cycle or 0, fees or 0.0)
+            for scope_id, last_cycle, fees in query.group_by(model.scope_id)}
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Aligned Cycle Scheduler
+
+Runs trading cycles on fixed UTC boundaries (the Unix epoch + REBALANCE_HOUR_UTC /
+REBALANCE_MINUTE_UTC, every CYCLE_DURATION minutes) instead of polling. A
+CYCLE_DURATION that divides a day puts boundaries at the same times every day;
+any other duration keeps a constant period across midnight. The
+scheduler sleeps until the next boundary, calls an optional warm-up shortly
+before it so the cycle starts with prices and balances already fetched,
+retries transient failures inside the cycle window and applies a catch-up
+policy for boundaries missed while the robot was down or busy.
+"""
+
+import os
+import random
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+CATCH_UP_NONE = 'none'      # skip missed boundaries
+CATCH_UP_LATEST = 'latest'  # run once for the most recent missed boundary
+CATCH_UP_ALL = 'all'        # run once per missed boundary
+
+
+class CycleScheduler:
+    """
+    Sleeps until aligned cycle boundaries and runs the cycle callback there
+    """
+
+    def __init__(self, period_minutes: int = None, offset_minutes: int = None,
+                 jitter_seconds: float = None, warmup_seconds: float = None,
+                 catch_up: str = None, max_retries: int = None,
+                 retry_delay_seconds: float = None, run_on_start: bool = None):
+        self.period = timedelta(minutes=period_minutes or int(os.getenv('CYCLE_DURATION', '1440')))
+        if offset_minutes is None:
+            offset_minutes = (int(os.getenv('REBALANCE_HOUR_UTC', '0')) * 60
+                              + int(os.getenv('REBALANCE_MINUTE_UTC', '0')))
+        self.offset = timedelta(minutes=offset_minutes)
+        self.jitter_seconds = jitter_seconds if jitter_seconds is not None else float(os.getenv('CYCLE_JITTER_SECONDS', '0'))
+        self.warmup_seconds = warmup_seconds if warmup_seconds is not None else float(os.getenv('CYCLE_WARMUP_SECONDS', '30'))
+        self.catch_up = catch_up or os.getenv('CYCLE_CATCH_UP', CATCH_UP_LATEST).lower()
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('CYCLE_MAX_RETRIES', '3'))
+        self.retry_delay_seconds = retry_delay_seconds if retry_delay_seconds is not None else float(os.getenv('CYCLE_RETRY_DELAY_SECONDS', '30'))
+        if run_on_start is None:
+            run_on_start = os.getenv('CYCLE_RUN_ON_START', 'true').lower() == 'true'
+        self.run_on_start = run_on_start
+
+        self._cancel_event = threading.Event()
+        self.start_latencies = deque(maxlen=100)  # seconds between boundary and cycle start
+
+    # ------------------------------------------------------------------
+    # Boundary arithmetic
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _as_utc(moment: datetime) -> datetime:
+        # Naive datetimes are UTC, like the rest of the cycle series (rollups, archives)
+        if moment.tzinfo is None:
+            return moment.replace(tzinfo=timezone.utc)
+        return moment.astimezone(timezone.utc)
+
+    def previous_boundary(self, moment: datetime) -> datetime:
+        """Latest boundary at or before `moment`"""
+        moment = self._as_utc(moment)
+        anchor = EPOCH + self.offset
+        periods = (moment - anchor) // self.period
+        return anchor + periods * self.period
+
+    def next_boundary(self, moment: datetime) -> datetime:
+        """First boundary strictly after `moment`"""
+        return self.previous_boundary(moment) + self.period
+
+    def missed_boundaries(self, last_run: datetime, now: datetime) -> List[datetime]:
+        """Boundaries in (last_run, now] that did not get a cycle"""
+        missed = []
+        boundary = self.next_boundary(last_run)
+        now = self._as_utc(now)
+        while boundary <= now:
+            missed.append(boundary)
+            boundary += self.period
+        return missed
+
+    def _apply_catch_up(self, missed: List[datetime]) -> List[datetime]:
+        if not missed or self.catch_up == CATCH_UP_NONE:
+            if missed:
+                logger.warning(f"⏭️ Skipping {len(missed)} missed cycle(s)")
+            return []
+        if self.catch_up == CATCH_UP_ALL:
+            return missed
+        if len(missed) > 1:
+            logger.warning(f"⏭️ Skipping {len(missed) - 1} missed cycle(s), catching up the latest")
+        return missed[-1:]
+
+    # ------------------------------------------------------------------
+    # Cancellation and sleeping
+    # ------------------------------------------------------------------
+
+    def cancel(self):
+        """Stop the scheduler; wakes any pending sleep immediately"""
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def _sleep_until(self, when: datetime) -> bool:
+        """Sleep until `when` (UTC); returns False if cancelled first"""
+        while not self.cancelled:
+            remaining = (when - datetime.now(timezone.utc)).total_seconds()
+            if remaining <= 0:
+                return True
+            # Re-check the wall clock at least every minute (clock adjustments, suspend)
+            self._cancel_event.wait(min(remaining, 60))
+        return False
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    def _run_cycle(self, cycle_fn: Callable, boundary: datetime) -> bool:
+        """Run one cycle with in-window retries; returns True on success"""
+        started = datetime.now(timezone.utc)
+        latency = max(0.0, (started - boundary).total_seconds())
+        self.start_latencies.append(latency)
+        logger.info(f"⏰ Cycle for boundary {boundary:%Y-%m-%d %H:%M} UTC started {latency:.3f}s after boundary")
+
+        retry_deadline = self.next_boundary(boundary) - timedelta(seconds=self.warmup_seconds)
+        for attempt in range(self.max_retries + 1):
+            try:
+                result = cycle_fn(boundary)
+                if result is not None and getattr(result, 'success', True):
+                    return True
+                reason = getattr(result, 'error_message', '') or 'cycle reported failure'
+            except Exception as e:
+                reason = str(e)
+                logger.error(f"❌ Cycle raised: {e}")
+
+            if attempt >= self.max_retries or self.cancelled:
+                break
+            delay = self.retry_delay_seconds * (2 ** attempt)
+            retry_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+            if retry_at >= retry_deadline:
+                logger.warning("⚠️ No time left before the next cycle, giving up retries")
+                break
+            logger.warning(f"⚠️ Cycle attempt {attempt + 1} failed ({reason}), retrying in {delay:.0f}s")
+            if not self._sleep_until(retry_at):
+                break
+
+        logger.error(f"❌ Cycle for boundary {boundary:%Y-%m-%d %H:%M} UTC failed")
+        return False
+
+    def run(self, cycle_fn: Callable, warmup_fn: Optional[Callable] = None,
+            last_run: Optional[datetime] = None):
+        """
+        Run `cycle_fn(boundary)` at every boundary until cancel() is called.
+        `warmup_fn(boundary)` runs CYCLE_WARMUP_SECONDS before each boundary.
+        """
+        self._cancel_event.clear()
+        now = datetime.now(timezone.utc)
+
+        if last_run is None:
+            pending = [now] if self.run_on_start else []
+        else:
+            pending = self._apply_catch_up(self.missed_boundaries(last_run, now))
+
+        last_boundary = self.previous_boundary(now)
+        while not self.cancelled:
+            for boundary in pending:
+                if self.cancelled:
+                    return
+                self._run_cycle(cycle_fn, boundary)
+                last_boundary = max(last_boundary, boundary)
+
+            boundary = self.next_boundary(max(last_boundary, datetime.now(timezone.utc)))
+            target = boundary
+            if self.jitter_seconds > 0:
+                target += timedelta(seconds=random.uniform(0, self.jitter_seconds))
+            logger.info(f"💤 Next cycle at {target:%Y-%m-%d %H:%M:%S} UTC")
+
+            if warmup_fn and self.warmup_seconds > 0:
+                if not self._sleep_until(target - timedelta(seconds=self.warmup_seconds)):
+                    return
+                try:
+                    warmup_fn(boundary)
+                except Exception as e:
+                    logger.warning(f"⚠️ Pre-cycle warm-up failed: {e}")
+
+            if not self._sleep_until(target):
+                return
+            self._run_cycle(cycle_fn, boundary)
+            last_boundary = boundary
+
+            # Boundaries that passed while the cycle (and its retries) ran
+            pending = self._apply_catch_up(self.missed_boundaries(boundary, datetime.now(timezone.utc)))
@@ -20,6 +20,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from daily_rebalance_volatile_strategy import DailyRebalanceVolatileStrategy
 from calibration_manager import get_calibration_manager
+from price_warm_start import is_simulation_warm_start_enabled, load_kline_price_history
 
 class EnhancedCoinSelector:
     """Dynamic coin selection based on momentum and volatility"""
@@ -396,6 +397,9 @@ class DailyRebalanceSimulationEngine:
     - Hybrid momentum + mean reversion strategy
     """
     
+    # Days of prices kept per coin for AI analysis
+    PRICE_WINDOW_DAYS = 30
+    
     def __init__(self, realistic_mode: bool = True, calibration_profile: str = None, enable_usdc_protection: bool = True):
         self.strategy = DailyRebalanceVolatileStrategy(realistic_mode=realistic_mode)
         
@@ -436,6 +440,18 @@ class DailyRebalanceSimulationEngine:
         print("[AI] Hybrid momentum + mean reversion strategy enabled")
         print("[INTELLIGENCE] Advanced market analysis and adaptive optimization active")
     
+    def warm_start(self, history):
+        """Seed price history (oldest first) so regime detection works from the first day"""
+        seeded = 0
+        for coin, prices in history.items():
+            if self.price_history.get(coin) or not prices:
+                continue
+            self.price_history[coin] = list(prices[-self.PRICE_WINDOW_DAYS:])
+            seeded += 1
+        if seeded:
+            print(f"[WARM START] Price history loaded for {seeded} coins")
+        return seeded
+    
     def run_simulation(
         self,
         start_date,
@@ -443,15 +459,25 @@ class DailyRebalanceSimulationEngine:
         cycle_length_minutes,
         starting_reserve,
         max_cycles=50000,
-        verbose=False
+        verbose=False,
+        progress_callback=None
     ):
-        """Run daily rebalancing simulation"""
+        """Run daily rebalancing simulation
+
+        progress_callback, if given, is called with each completed cycle's result
+        (used to push live progress to the dashboard).
+        """
         
         # Set simulation mode flags IMMEDIATELY to prevent live price fetching
         self.strategy._current_simulation_mode = True
         self.strategy._simulation_data_generated = True
         self.strategy._force_historical_only = True
         
+        # Opt-in: seed price history with daily klines that closed before the start (no look-ahead)
+        if is_simulation_warm_start_enabled():
+            self.warm_start(load_kline_price_history('USDT', self.PRICE_WINDOW_DAYS, interval='1d',
+                                                     end_time=start_date))
+        
         # Override cycle length for daily rebalancing
         daily_cycle_length = 1440  # Force daily cycles
         
@@ -583,6 +609,12 @@ class DailyRebalanceSimulationEngine:
                     results.append(formatted_result)
                     current_capital = net_capital
                     
+                    if progress_callback:
+                        try:
+                            progress_callback(formatted_result)
+                        except Exception as e:
+                            print(f"[SIM] Progress callback failed: {e}")
+                    
                     if show_detailed_logs:
                         total_return = (((portfolio_value + bnb_reserve) / starting_reserve) - 1) * 100
                         print(f"\n{'_'*80}")
@@ -699,7 +731,7 @@ class DailyRebalanceSimulationEngine:
                 print(f"[WARNING] No Binance API keys - using AI-enhanced synthetic data")
                 return self._get_ai_enhanced_synthetic_return(allocations, current_date)
             
-            client = EnhancedBinanceClient(api_key, secret_key)
+            client = EnhancedBinanceClient(api_key, secret_key, priority='simulation')
             
             # Update price history for AI analysis
             self._update_price_history(client, current_date)
@@ -804,9 +836,9 @@ class DailyRebalanceSimulationEngine:
                 new_price = base_price * (1 + daily_change)
                 self.price_history[coin].append(new_price)
                 
-                # Keep only last 30 days of data
-                if len(self.price_history[coin]) > 30:
-                    self.price_history[coin] = self.price_history[coin][-30:]
+                # Keep only last PRICE_WINDOW_DAYS days of data
+                if len(self.price_history[coin]) > self.PRICE_WINDOW_DAYS:
+                    self.price_history[coin] = self.price_history[coin][-self.PRICE_WINDOW_DAYS:]
         except Exception as e:
             print(f"[AI] Error updating price history: {e}")
     
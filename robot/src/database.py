@@ -2,9 +2,11 @@
 Database models for the crypto trading robot using SQLAlchemy 1.4
 Supports both PostgreSQL and SQLite databases
 """
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, text
+from sqlalchemy import create_engine, event, inspect, Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.sql import func
 from sqlalchemy.types import TypeDecorator, TEXT
 import json
@@ -12,39 +14,91 @@ from datetime import datetime
 import os
 from dotenv import load_dotenv
 
-load_dotenv()
+try:
+    from src import fast_json
+    from src.db_pool_monitor import PoolMonitor
+    from src.database_enhancements import apply_sqlite_profile
+    from src.chart_series import normalize_breakdown
+    from src.cycle_rollups import apply_cycles, rebuild_rollups, rollup_cycle, SCOPE_PORTFOLIO, SCOPE_SIMULATION
+except ImportError:
+    import fast_json
+    from db_pool_monitor import PoolMonitor
+    from database_enhancements import apply_sqlite_profile
+    from chart_series import normalize_breakdown
+    from cycle_rollups import apply_cycles, rebuild_rollups, rollup_cycle, SCOPE_PORTFOLIO, SCOPE_SIMULATION
 
-class DateTimeEncoder(json.JSONEncoder):
-    """Custom JSON encoder that handles datetime objects"""
-    def default(self, obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        return super().default(obj)
+load_dotenv()
 
 Base = declarative_base()
 
 # Custom JSON type that works with both PostgreSQL and SQLite
 class JSON(TypeDecorator):
-    """JSON type for cross-database compatibility"""
+    """JSON type for cross-database compatibility
+
+    Stored as JSONB on PostgreSQL (queryable, GIN indexed) and as TEXT on
+    SQLite. Strings that already hold a JSON object or array are stored as
+    the document they encode rather than as a JSON string, so callers passing
+    json.dumps() output get the same queryable value as callers passing dicts.
+    Other strings ("42", "true") stay strings.
+    """
     impl = TEXT
     cache_ok = True
 
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(JSONB())
+        return dialect.type_descriptor(TEXT())
+
     def process_bind_param(self, value, dialect):
-        if value is not None:
-            value = json.dumps(value, cls=DateTimeEncoder)
-        return value
+        if isinstance(value, str):
+            if value == '':
+                return None
+            if value.lstrip()[:1] in ('{', '['):
+                try:
+                    value = fast_json.loads(value)
+                except (json.JSONDecodeError, ValueError):
+                    pass  # plain text: stored as a JSON string
+        if value is None or dialect.name == 'postgresql':
+            # JSONB encodes through the engine's json_serializer (fast_json)
+            return value
+        # datetimes and NumPy values are encoded natively by fast_json
+        return fast_json.dumps(value)
 
     def process_result_value(self, value, dialect):
+        if dialect.name == 'postgresql':
+            return value  # already decoded by the driver
         if value is not None and value != '':
             try:
-                value = json.loads(value)
+                value = fast_json.loads(value)
             except (json.JSONDecodeError, ValueError):
-                # Handle invalid JSON by returning None
-                value = None
+                pass  # legacy plain text (e.g. free-text market_conditions): returned as is
         else:
             value = None
         return value
 
+# Legacy TEXT columns may hold free text (market_conditions was e.g. "high
+# volatility, up trend"); a plain ::jsonb cast aborts the whole ALTER on it
+JSONB_TRY_CAST_FUNCTION = (
+    "CREATE OR REPLACE FUNCTION pg_temp.try_jsonb(value text) RETURNS jsonb AS $$ "
+    "BEGIN RETURN value::jsonb; EXCEPTION WHEN others THEN RETURN NULL; END "
+    "$$ LANGUAGE plpgsql IMMUTABLE"
+)
+
+
+def jsonb_conversion_statements(table: str, column: str) -> list:
+    """PostgreSQL statements converting a TEXT column to JSONB; non-JSON text becomes a JSON string"""
+    return [
+        f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB USING CASE "
+        f"WHEN {column} IS NULL OR btrim({column}) = '' THEN NULL "
+        f"ELSE COALESCE(pg_temp.try_jsonb({column}), to_jsonb({column})) END",
+        # Values written through json.dumps() were stored double encoded
+        f"UPDATE {table} SET {column} = pg_temp.try_jsonb({column} #>> '{{}}') "
+        f"WHERE jsonb_typeof({column}) = 'string' "
+        f"AND left(ltrim({column} #>> '{{}}'), 1) IN ('{{', '[') "
+        f"AND pg_temp.try_jsonb({column} #>> '{{}}') IS NOT NULL"
+    ]
+
+
 class Portfolio(Base):
     """Portfolio table - stores current portfolio state"""
     __tablename__ = 'portfolios'
@@ -104,6 +158,9 @@ class Position(Base):
 class TradingCycle(Base):
     """Trading cycle table - stores historical cycle data"""
     __tablename__ = 'trading_cycles'
+    __table_args__ = (
+        Index('ix_trading_cycles_portfolio_cycle', 'portfolio_id', 'cycle_number'),
+    )
     
     id = Column(Integer, primary_key=True)
     portfolio_id = Column(Integer, ForeignKey('portfolios.id'), nullable=False)
@@ -125,7 +182,7 @@ class CyclePosition(Base):
     __tablename__ = 'cycle_positions'
     
     id = Column(Integer, primary_key=True)
-    cycle_id = Column(Integer, ForeignKey('trading_cycles.id'), nullable=False)
+    cycle_id = Column(Integer, ForeignKey('trading_cycles.id'), nullable=False, index=True)
     symbol = Column(String(20), nullable=False)
     quantity = Column(Float, nullable=False)
     entry_price = Column(Float, nullable=False)
@@ -137,6 +194,50 @@ class CyclePosition(Base):
     # Relationships
     cycle = relationship("TradingCycle", back_populates="cycle_positions")
 
+# schema_migrations name of the simulation_cycle_holdings backfill
+BACKFILL_CYCLE_HOLDINGS = 'backfill_cycle_holdings'
+
+# Primary key of the single materialized status row
+LATEST_STATUS_ID = 1
+
+class LatestStatus(Base):
+    """Latest robot status - single row rewritten in the same transaction as each committed cycle"""
+    __tablename__ = 'latest_status'
+    
+    id = Column(Integer, primary_key=True, default=LATEST_STATUS_ID)
+    portfolio_id = Column(Integer, ForeignKey('portfolios.id'), nullable=True)
+    current_cycle = Column(Integer, nullable=False, default=0)
+    bnb_reserve = Column(Float, nullable=False, default=0.0)
+    portfolio_value = Column(Float, nullable=False, default=0.0)
+    total_value = Column(Float, nullable=False, default=0.0)
+    last_cycle_date = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+    
+    def to_dict(self) -> dict:
+        return {
+            'current_cycle': self.current_cycle,
+            'bnb_reserve': self.bnb_reserve,
+            'portfolio_value': self.portfolio_value,
+            'total_value': self.total_value,
+            'last_cycle_date': self.last_cycle_date.isoformat() if self.last_cycle_date else None
+        }
+
+class LeaderLease(Base):
+    """Leader election lease - one row per background role, renewed by the worker holding it"""
+    __tablename__ = 'leader_leases'
+    
+    name = Column(String(100), primary_key=True)
+    holder = Column(String(200), nullable=False)
+    expires_at = Column(DateTime, nullable=False)  # naive UTC
+    acquired_at = Column(DateTime, nullable=True)
+
+class SchemaMigration(Base):
+    """Data migrations already run on this database - one row each, written when it completes"""
+    __tablename__ = 'schema_migrations'
+    
+    name = Column(String(100), primary_key=True)
+    applied_at = Column(DateTime, nullable=False)  # naive UTC
+
 class Simulation(Base):
     """Simulation table - stores simulation runs and parameters"""
     __tablename__ = 'simulations'
@@ -169,6 +270,10 @@ class Simulation(Base):
     calibration_profile = Column(String(100), nullable=True)  # Name of calibration profile used
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
+    # Archival: 'queued' -> 'archived' (cycles served from archive_path); archived_at once purged
+    archive_state = Column(String(20), nullable=True)
+    archive_path = Column(String(500), nullable=True)
+    archived_at = Column(DateTime, nullable=True)
     
     # Relationships
     simulation_cycles = relationship("SimulationCycle", back_populates="simulation", cascade="all, delete-orphan")
@@ -176,6 +281,9 @@ class Simulation(Base):
 class SimulationCycle(Base):
     """Simulation cycle table - stores cycle data for simulations"""
     __tablename__ = 'simulation_cycles'
+    __table_args__ = (
+        Index('ix_simulation_cycles_sim_cycle', 'simulation_id', 'cycle_number'),
+    )
     
     id = Column(Integer, primary_key=True)
     simulation_id = Column(Integer, ForeignKey('simulations.id'), nullable=False)
@@ -189,13 +297,126 @@ class SimulationCycle(Base):
     trading_costs = Column(Float, default=0.0, nullable=True)
     execution_delay = Column(Float, default=0.0, nullable=True)
     failed_orders = Column(Integer, default=0, nullable=True)
-    market_conditions = Column(Text, nullable=True)
+    market_conditions = Column(JSON, nullable=True)
     cycle_date = Column(DateTime(timezone=True), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
     simulation = relationship("Simulation", back_populates="simulation_cycles")
 
+class SimulationCycleHolding(Base):
+    """Simulation cycle holdings - one row per asset of each cycle's portfolio breakdown
+
+    Written with the cycle (see write_cycle_holdings) so per-asset questions
+    such as "cycles where BTC is above 20%" are answered by an index instead
+    of decoding every breakdown. weight is the asset value over the cycle
+    total value (reserve included), between 0 and 1.
+    """
+    __tablename__ = 'simulation_cycle_holdings'
+    __table_args__ = (
+        Index('ix_simulation_cycle_holdings_sim_symbol', 'simulation_id', 'symbol', 'cycle_number'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    cycle_id = Column(Integer, ForeignKey('simulation_cycles.id', ondelete='CASCADE'), nullable=False, index=True)
+    simulation_id = Column(Integer, nullable=False)
+    cycle_number = Column(Integer, nullable=False)
+    symbol = Column(String(20), nullable=False)
+    weight = Column(Float, nullable=False)
+    value = Column(Float, nullable=False)
+
+def cycle_holding_rows(cycle_id, simulation_id, cycle_number, total_value, breakdown) -> list:
+    """simulation_cycle_holdings rows of one cycle's portfolio breakdown (any stored shape)"""
+    rows = []
+    for symbol, holding in normalize_breakdown(breakdown).items():
+        if symbol == 'NO_ASSETS':
+            continue
+        value = float(holding.get('value') or 0.0)
+        rows.append({
+            'cycle_id': cycle_id,
+            'simulation_id': simulation_id,
+            'cycle_number': cycle_number,
+            'symbol': str(symbol)[:20],
+            'weight': value / total_value if total_value else 0.0,
+            'value': value
+        })
+    return rows
+
+def write_cycle_holdings(session, flush_context):
+    """after_flush hook: bulk-write the holdings of the cycles inserted, changed or deleted by the flush"""
+    holdings = SimulationCycleHolding.__table__
+    stale_ids, rows = [], []
+    for cycle in session.deleted:
+        if isinstance(cycle, SimulationCycle):
+            stale_ids.append(cycle.id)
+    for cycle in session.dirty:
+        if isinstance(cycle, SimulationCycle):
+            state = inspect(cycle)
+            if state.attrs.portfolio_breakdown.history.has_changes() or state.attrs.total_value.history.has_changes():
+                stale_ids.append(cycle.id)
+                rows.extend(cycle_holding_rows(cycle.id, cycle.simulation_id, cycle.cycle_number,
+                                               cycle.total_value, cycle.portfolio_breakdown))
+    for cycle in session.new:
+        if isinstance(cycle, SimulationCycle):
+            rows.extend(cycle_holding_rows(cycle.id, cycle.simulation_id, cycle.cycle_number,
+                                           cycle.total_value, cycle.portfolio_breakdown))
+    if not stale_ids and not rows:
+        return
+    conn = session.connection()
+    if stale_ids:
+        conn.execute(holdings.delete().where(holdings.c.cycle_id.in_(stale_ids)))
+    if rows:
+        conn.execute(holdings.insert(), rows)  # one executemany for the whole flush
+
+class CycleRollup(Base):
+    """Cycle rollups - OHLC of total value, fees, drawdown and protection days per period
+
+    One row per portfolio or simulation (scope, scope_id), grain ('day',
+    'week', 'month') and period, maintained as cycles are written (see
+    write_cycle_rollups and cycle_rollups.py).
+    """
+    __tablename__ = 'cycle_rollups'
+    __table_args__ = (
+        Index('ix_cycle_rollups_scope_grain_period', 'scope', 'scope_id', 'grain', 'period_start', unique=True),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    scope = Column(String(20), nullable=False)  # 'portfolio' or 'simulation'
+    scope_id = Column(Integer, nullable=False)
+    grain = Column(String(10), nullable=False)
+    period_start = Column(DateTime, nullable=False)  # naive UTC
+    open_value = Column(Float, nullable=False)
+    high_value = Column(Float, nullable=False)
+    low_value = Column(Float, nullable=False)
+    close_value = Column(Float, nullable=False)
+    first_cycle = Column(Integer, nullable=False)
+    last_cycle = Column(Integer, nullable=False)
+    cycle_count = Column(Integer, nullable=False, default=0)
+    fees = Column(Float, nullable=False, default=0.0)
+    peak_value = Column(Float, nullable=False, default=0.0)  # running all-time peak at the end of the period
+    max_drawdown = Column(Float, nullable=False, default=0.0)  # fraction of the running peak
+    protection_cycles = Column(Integer, nullable=False, default=0)
+    protection_days = Column(Integer, nullable=False, default=0)
+    last_protection_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, nullable=True)
+
+def write_cycle_rollups(session, flush_context):
+    """after_flush hook: fold the trading and simulation cycles inserted by the flush into their rollups"""
+    scopes = {}
+    for cycle in session.new:
+        if isinstance(cycle, SimulationCycle):
+            key, fees = (SCOPE_SIMULATION, cycle.simulation_id), cycle.trading_costs
+        elif isinstance(cycle, TradingCycle):
+            key, fees = (SCOPE_PORTFOLIO, cycle.portfolio_id), None
+        else:
+            continue
+        scopes.setdefault(key, []).append(
+            rollup_cycle(cycle.cycle_number, cycle.cycle_date, cycle.total_value, fees, cycle.actions_taken))
+    if scopes:
+        conn = session.connection()
+        for (scope, scope_id), cycles in scopes.items():
+            apply_cycles(conn, CycleRollup.__table__, scope, scope_id, cycles)
+
 class StrategyPerformance(Base):
     """Strategy performance table - tracks performance metrics for each strategy"""
     __tablename__ = 'strategy_performance'
@@ -259,15 +480,38 @@ class DatabaseManager:
                 'pool_pre_ping': True,
                 'connect_args': {'check_same_thread': False}
             })
+            if ':memory:' not in database_url and database_url.rstrip('/') != 'sqlite:':
+                # Keep file connections open: the per-connection cache and mmap of the
+                # pragma profile only pay off when connections are reused
+                engine_kwargs.update({
+                    'poolclass': QueuePool,
+                    'pool_size': int(os.getenv('SQLITE_POOL_SIZE', '5')),
+                    'max_overflow': int(os.getenv('SQLITE_MAX_OVERFLOW', '10')),
+                    'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', '30'))
+                })
         elif self.db_type == 'postgresql':
-            # PostgreSQL specific configurations
+            # PostgreSQL specific configurations: size the pool explicitly so a
+            # busy web tier queues for a connection instead of exhausting the server
             engine_kwargs.update({
+                'json_serializer': fast_json.dumps,
                 'pool_pre_ping': True,
-                'pool_recycle': 300
+                'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', '300')),
+                'pool_size': int(os.getenv('DB_POOL_SIZE', '10')),
+                'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', '20')),
+                'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', '30'))
             })
         
         self.engine = create_engine(database_url, **engine_kwargs)
+        if self.db_type == 'sqlite':
+            # WAL, synchronous, cache, mmap and busy timeout on every connection
+            apply_sqlite_profile(self.engine)
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        event.listen(self.SessionLocal, 'after_flush', write_cycle_holdings)
+        event.listen(self.SessionLocal, 'after_flush', write_cycle_rollups)
+        self.pool_monitor = PoolMonitor(self.engine)
+        # Optional callback(session) run for every session handed out (web app request tracking)
+        self.session_tracker = None
+        self._database_info = None
         
     def _build_database_url(self, db_type: str) -> str:
         """Build database URL based on type and environment variables"""
@@ -317,10 +561,37 @@ class DatabaseManager:
         except Exception as e:
             # Don't crash application if upgrade fails; just log
             print(f"Schema upgrade (simulation metrics) skipped/failed: {e}")
+        try:
+            self.upgrade_schema_add_simulation_archive_columns()
+        except Exception as e:
+            print(f"Schema upgrade (simulation archive) skipped/failed: {e}")
+        try:
+            self.upgrade_schema_add_cycle_indexes()
+        except Exception as e:
+            print(f"Schema upgrade (cycle indexes) skipped/failed: {e}")
+        try:
+            self.upgrade_schema_backfill_latest_status()
+        except Exception as e:
+            print(f"Schema upgrade (latest status) skipped/failed: {e}")
+        try:
+            self.upgrade_schema_jsonb_columns()
+        except Exception as e:
+            print(f"Schema upgrade (JSONB columns) skipped/failed: {e}")
+        try:
+            self.upgrade_schema_backfill_cycle_holdings()
+        except Exception as e:
+            print(f"Schema upgrade (cycle holdings) skipped/failed: {e}")
         
     def get_session(self):
         """Get a database session"""
-        return self.SessionLocal()
+        session = self.SessionLocal()
+        if self.session_tracker is not None:
+            self.session_tracker(session)
+        return session
+
+    def get_pool_stats(self) -> dict:
+        """Connection pool counters, sizing and long checkouts"""
+        return self.pool_monitor.get_stats()
     
     def drop_tables(self):
         """Drop all database tables (use with caution)"""
@@ -328,12 +599,19 @@ class DatabaseManager:
     
     def get_database_info(self) -> dict:
         """Get information about the current database configuration"""
-        return {
-            'type': self.db_type,
-            'url': str(self.engine.url).replace(self.engine.url.password or '', '***') if self.engine.url.password else str(self.engine.url),
-            'driver': self.engine.dialect.name
-        }
-        return self.SessionLocal()
+        if self._database_info is None:
+            self._database_info = {
+                'type': self.db_type,
+                'url': str(self.engine.url).replace(self.engine.url.password or '', '***') if self.engine.url.password else str(self.engine.url),
+                'driver': self.engine.dialect.name
+            }
+        return dict(self._database_info)
+    
+    def get_latest_status(self) -> dict:
+        """Latest committed cycle status (primary key lookup), or None before the first cycle"""
+        with self.get_session() as session:
+            row = session.get(LatestStatus, LATEST_STATUS_ID)
+            return row.to_dict() if row else None
     
     def drop_tables(self):
         """Drop all database tables (use with caution)"""
@@ -377,6 +655,162 @@ class DatabaseManager:
             # Unsupported DB type for automatic upgrade; ignore silently
             pass
 
+    def upgrade_schema_add_simulation_archive_columns(self):
+        """Ensure the simulation archival columns exist (idempotent). Works for SQLite and PostgreSQL."""
+        required_columns = {
+            'archive_state': 'VARCHAR(20)',
+            'archive_path': 'VARCHAR(500)',
+            'archived_at': 'TIMESTAMP'
+        }
+        with self.engine.begin() as conn:
+            if self.db_type == 'sqlite':
+                existing = {row[1] for row in conn.execute(text('PRAGMA table_info(simulations)'))}
+                for col_name, col_type in required_columns.items():
+                    if col_name not in existing:
+                        conn.execute(text(f'ALTER TABLE simulations ADD COLUMN {col_name} {col_type} NULL'))
+            elif self.db_type == 'postgresql':
+                for col_name, col_type in required_columns.items():
+                    conn.execute(text(f'ALTER TABLE simulations ADD COLUMN IF NOT EXISTS {col_name} {col_type}'))
+
+    def upgrade_schema_add_cycle_indexes(self):
+        """Ensure the indexes used by cycle history queries exist (idempotent).
+
+        New databases get them from the models; this covers databases created
+        before the indexes were declared. Works for SQLite and PostgreSQL.
+        """
+        statements = [
+            'CREATE INDEX IF NOT EXISTS ix_cycle_positions_cycle_id ON cycle_positions (cycle_id)',
+            'CREATE INDEX IF NOT EXISTS ix_trading_cycles_portfolio_cycle ON trading_cycles (portfolio_id, cycle_number)',
+            'CREATE INDEX IF NOT EXISTS ix_simulation_cycles_sim_cycle ON simulation_cycles (simulation_id, cycle_number)'
+        ]
+        with self.engine.begin() as conn:
+            for statement in statements:
+                conn.execute(text(statement))
+
+    def upgrade_schema_backfill_latest_status(self):
+        """Seed the latest_status row from the newest trading cycle (idempotent).
+
+        Databases with cycles recorded before the status row existed would
+        otherwise report no status until the next cycle commits.
+        """
+        with self.get_session() as session:
+            if session.get(LatestStatus, LATEST_STATUS_ID) is not None:
+                return
+            latest = session.query(TradingCycle).order_by(TradingCycle.cycle_number.desc()).first()
+            if latest is None:
+                return
+            session.add(LatestStatus(
+                id=LATEST_STATUS_ID,
+                portfolio_id=latest.portfolio_id,
+                current_cycle=latest.cycle_number,
+                bnb_reserve=latest.bnb_reserve,
+                portfolio_value=latest.portfolio_value,
+                total_value=latest.total_value,
+                last_cycle_date=latest.cycle_date,
+                updated_at=datetime.now()
+            ))
+            session.commit()
+            print(f"Backfilled latest status from cycle #{latest.cycle_number}")
+
+    def upgrade_schema_jsonb_columns(self):
+        """Convert the JSON columns of PostgreSQL databases to JSONB and GIN index them (idempotent).
+
+        Databases created before the JSON type mapped to JSONB hold these
+        columns as TEXT. SQLite keeps TEXT storage; nothing to do there.
+        """
+        if self.db_type != 'postgresql':
+            return
+        json_columns = {
+            'simulation_cycles': ('portfolio_breakdown', 'actions_taken', 'market_conditions'),
+            'trading_cycles': ('portfolio_breakdown', 'actions_taken'),
+            'strategy_switches': ('market_conditions',)
+        }
+        gin_indexes = {
+            'ix_simulation_cycles_breakdown_gin': ('simulation_cycles', 'portfolio_breakdown'),
+            'ix_simulation_cycles_actions_gin': ('simulation_cycles', 'actions_taken'),
+            'ix_simulation_cycles_market_gin': ('simulation_cycles', 'market_conditions'),
+            'ix_trading_cycles_breakdown_gin': ('trading_cycles', 'portfolio_breakdown')
+        }
+        with self.engine.begin() as conn:
+            text_columns = {(row[0], row[1]) for row in conn.execute(text(
+                "SELECT table_name, column_name FROM information_schema.columns "
+                "WHERE table_schema = current_schema() AND data_type = 'text'"))}
+            if any((table, column) in text_columns for table, columns in json_columns.items() for column in columns):
+                # Session-local helper: NULL instead of an error for text that is not JSON
+                conn.execute(text(JSONB_TRY_CAST_FUNCTION))
+            for table, columns in json_columns.items():
+                for column in columns:
+                    if (table, column) not in text_columns:
+                        continue
+                    for statement in jsonb_conversion_statements(table, column):
+                        conn.execute(text(statement))
+                    print(f"Converted {table}.{column} to JSONB")
+            for name, (table, column) in gin_indexes.items():
+                conn.execute(text(f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({column})'))
+
+    def upgrade_schema_backfill_cycle_holdings(self, batch_size: int = 2000):
+        """Fill simulation_cycle_holdings from the stored breakdowns, once per database.
+
+        Completion is recorded in schema_migrations so later startups skip the
+        scan even when there are no holdings. An interrupted run resumes after
+        the last cycle it wrote holdings for.
+        """
+        cycles = SimulationCycle.__table__
+        holdings = SimulationCycleHolding.__table__
+        migrations = SchemaMigration.__table__
+        with self.engine.connect() as conn:
+            if conn.execute(migrations.select().where(migrations.c.name == BACKFILL_CYCLE_HOLDINGS)).first():
+                return
+            last_id = conn.execute(holdings.select().with_only_columns(func.max(holdings.c.cycle_id))).scalar() or 0
+        written = 0
+        columns = (cycles.c.id, cycles.c.simulation_id, cycles.c.cycle_number, cycles.c.total_value,
+                   cycles.c.portfolio_breakdown)
+        while True:
+            with self.engine.begin() as conn:
+                batch = conn.execute(cycles.select().with_only_columns(*columns)
+                                     .where(cycles.c.id > last_id).order_by(cycles.c.id).limit(batch_size)).all()
+                if not batch:
+                    conn.execute(migrations.insert().values(name=BACKFILL_CYCLE_HOLDINGS, applied_at=datetime.utcnow()))
+                    break
+                rows = [row for cycle in batch for row in cycle_holding_rows(*cycle)]
+                if rows:
+                    conn.execute(holdings.insert(), rows)
+                written += len(rows)
+                last_id = batch[-1][0]
+        if written:
+            print(f"Backfilled {written} simulation cycle holdings")
+
+    # ------------------ Rollups ------------------ #
+    def iter_rollup_cycles(self, scope: str, scope_id: int, batch_size: int = 2000):
+        """Cycles of one portfolio or simulation as rollup inputs, in cycle order and batches"""
+        if scope == SCOPE_SIMULATION:
+            table = SimulationCycle.__table__
+            columns = (table.c.cycle_number, table.c.cycle_date, table.c.total_value, table.c.trading_costs,
+                       table.c.actions_taken)
+            owner = table.c.simulation_id
+        else:
+            table = TradingCycle.__table__
+            columns = (table.c.cycle_number, table.c.cycle_date, table.c.total_value, text('NULL'),
+                       table.c.actions_taken)
+            owner = table.c.portfolio_id
+        last = None
+        while True:
+            statement = table.select().with_only_columns(*columns).where(owner == scope_id)
+            if last is not None:
+                statement = statement.where(table.c.cycle_number > last)
+            with self.engine.connect() as conn:
+                rows = conn.execute(statement.order_by(table.c.cycle_number).limit(batch_size)).all()
+            if not rows:
+                return
+            yield [rollup_cycle(*row) for row in rows]
+            last = rows[-1][0]
+
+    def rebuild_cycle_rollups(self, scope: str, scope_id: int, batches=None) -> int:
+        """Recompute the rollups of one portfolio or simulation (from its cycles unless batches are given)"""
+        if batches is None:
+            batches = self.iter_rollup_cycles(scope, scope_id)
+        return rebuild_rollups(self.engine, CycleRollup.__table__, scope, scope_id, batches)
+
 # Global database manager instance
 db_manager = None
 
@@ -4,12 +4,20 @@ Database Enhancements for Robot Trading
 
 Implements SQLite WAL mode, transaction support, and rollback capability
 for safe robot operations with resume functionality.
+
+DatabaseManager applies the SQLite pragma profile (apply_sqlite_profile) to
+every connection it opens; SQLiteMaintenance runs the periodic upkeep (WAL
+checkpoint, ANALYZE, incremental vacuum, integrity check) in the web app's
+leader worker.
 """
 
 import os
+import time
 import logging
 import sqlite3
-from typing import Optional, Any
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Optional, Any
 from contextlib import contextmanager
 from sqlalchemy import event, text
 from sqlalchemy.engine import Engine
@@ -94,19 +102,15 @@ class DatabaseEnhancer:
         """Setup connection pooling for better performance"""
         
         try:
-            # SQLite-specific connection setup
+            # SQLite-specific connection setup: the shared pragma profile plus foreign keys
+            if 'sqlite' in str(engine.url).lower() and not getattr(engine, 'sqlite_profile', None):
+                apply_sqlite_profile(engine)
+            
             @event.listens_for(engine, "connect")
             def set_sqlite_pragma(dbapi_connection, connection_record):
                 if 'sqlite' in str(engine.url).lower():
                     cursor = dbapi_connection.cursor()
-                    
-                    # Enable WAL mode on each connection
-                    cursor.execute("PRAGMA journal_mode=WAL")
-                    cursor.execute("PRAGMA synchronous=NORMAL")
                     cursor.execute("PRAGMA foreign_keys=ON")
-                    cursor.execute("PRAGMA cache_size=10000")
-                    cursor.execute("PRAGMA temp_store=MEMORY")
-                    
                     cursor.close()
             
             logger.info("✅ Connection pooling configured")
@@ -114,6 +118,152 @@ class DatabaseEnhancer:
         except Exception as e:
             logger.error(f"Error setting up connection pooling: {e}")
 
+
+def sqlite_cache_size_kb() -> int:
+    """Page cache of one connection: SQLITE_CACHE_SIZE_KB, else SQLITE_CACHE_BUDGET_KB split across the pool"""
+    if os.getenv('SQLITE_CACHE_SIZE_KB'):
+        return int(os.getenv('SQLITE_CACHE_SIZE_KB'))
+    # Every pooled connection (overflow included) holds its own cache
+    connections = int(os.getenv('SQLITE_POOL_SIZE', '5')) + int(os.getenv('SQLITE_MAX_OVERFLOW', '10'))
+    return max(2048, int(os.getenv('SQLITE_CACHE_BUDGET_KB', '65536')) // max(1, connections))
+
+
+def sqlite_profile() -> Dict[str, Any]:
+    """Per-connection SQLite pragmas from the environment (SQLITE_PROFILE=false disables them)"""
+    if os.getenv('SQLITE_PROFILE', 'true').lower() != 'true':
+        return {}
+    wal = os.getenv('ENABLE_WAL_MODE', 'true').lower() == 'true'
+    return {
+        # Persistent; must precede the first write of a new file (switching to WAL is
+        # one), existing files pick it up at their next full VACUUM
+        'auto_vacuum': 'INCREMENTAL',
+        'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL' if wal else 'DELETE').upper(),
+        'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL').upper(),
+        'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000')),
+        # Negative cache_size is in KiB
+        'cache_size': -sqlite_cache_size_kb(),
+        'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', '268435456')),
+        'temp_store': 'MEMORY',
+        # Bounds the WAL file left on disk after a checkpoint
+        'journal_size_limit': int(os.getenv('SQLITE_JOURNAL_SIZE_LIMIT', '67108864')),
+    }
+
+
+def apply_sqlite_profile(engine: Engine, profile: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Run the pragma profile on every new connection of a SQLite engine"""
+    profile = sqlite_profile() if profile is None else profile
+    engine.sqlite_profile = profile
+    if not profile:
+        return profile
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_profile(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            # busy_timeout first: switching the journal mode may wait for other connections
+            cursor.execute(f"PRAGMA busy_timeout={profile['busy_timeout']}")
+            for name, value in profile.items():
+                if name == 'busy_timeout':
+                    continue
+                if name == 'journal_mode':
+                    # Persistent setting: only switch when needed (it takes a write lock)
+                    current = cursor.execute("PRAGMA journal_mode").fetchone()[0]
+                    if current.upper() == value or current.lower() == 'memory':
+                        continue
+                cursor.execute(f"PRAGMA {name}={value}")
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ SQLite profile not fully applied: {e}")
+        finally:
+            cursor.close()
+
+    return profile
+
+
+class SQLiteMaintenance:
+    """
+    Periodic SQLite upkeep; each task runs when its interval has elapsed:
+    - checkpoint: copy the WAL back into the database and truncate it
+    - analyze: refresh planner statistics (bounded by analysis_limit)
+    - vacuum: release up to SQLITE_VACUUM_PAGES free pages (incremental auto_vacuum)
+    - integrity: PRAGMA quick_check
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.intervals = {
+            'checkpoint': float(os.getenv('SQLITE_CHECKPOINT_SECONDS', '300')),
+            'analyze': float(os.getenv('SQLITE_ANALYZE_SECONDS', '3600')),
+            'vacuum': float(os.getenv('SQLITE_VACUUM_SECONDS', '3600')),
+            'integrity': float(os.getenv('SQLITE_INTEGRITY_SECONDS', '86400')),
+        }
+        self.vacuum_pages = int(os.getenv('SQLITE_VACUUM_PAGES', '2000'))
+        self.last_run: Dict[str, float] = {}
+        self.last_results: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _checkpoint(self, conn) -> Dict[str, Any]:
+        busy, wal_pages, checkpointed = conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)")).fetchone()
+        return {'busy': bool(busy), 'wal_pages': wal_pages, 'checkpointed': checkpointed}
+
+    def _analyze(self, conn) -> Dict[str, Any]:
+        conn.execute(text("PRAGMA analysis_limit=1000"))
+        conn.execute(text("ANALYZE"))
+        return {}
+
+    def _vacuum(self, conn) -> Dict[str, Any]:
+        mode = conn.execute(text("PRAGMA auto_vacuum")).scalar()
+        free_before = conn.execute(text("PRAGMA freelist_count")).scalar()
+        if mode != 2:
+            # Files created before the profile keep auto_vacuum=NONE until a full VACUUM
+            return {'skipped': 'auto_vacuum is not incremental', 'free_pages': free_before}
+        conn.execute(text(f"PRAGMA incremental_vacuum({self.vacuum_pages})"))
+        free_after = conn.execute(text("PRAGMA freelist_count")).scalar()
+        return {'released_pages': free_before - free_after, 'free_pages': free_after}
+
+    def _integrity(self, conn) -> Dict[str, Any]:
+        problems = [row[0] for row in conn.execute(text("PRAGMA quick_check")).fetchall()]
+        ok = problems == ['ok']
+        if not ok:
+            logger.error(f"❌ SQLite integrity check failed: {problems[:10]}")
+        return {'ok': ok, 'problems': [] if ok else problems[:10]}
+
+    def run_task(self, name: str) -> Dict[str, Any]:
+        task = getattr(self, f"_{name}")
+        started = time.monotonic()
+        with self._lock, self.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+            result = task(conn)
+        result.update(seconds=round(time.monotonic() - started, 3), at=datetime.utcnow().isoformat())
+        self.last_run[name] = time.monotonic()
+        self.last_results[name] = result
+        logger.info(f"🧹 SQLite {name}: {result}")
+        return result
+
+    def run_due(self) -> Dict[str, Dict[str, Any]]:
+        """Run every task whose interval has elapsed (all of them on the first call)"""
+        now = time.monotonic()
+        results = {}
+        for name, interval in self.intervals.items():
+            if interval <= 0 or now - self.last_run.get(name, float('-inf')) < interval:
+                continue
+            try:
+                results[name] = self.run_task(name)
+            except Exception as e:
+                self.last_run[name] = now
+                self.last_results[name] = {'error': str(e), 'at': datetime.utcnow().isoformat()}
+                logger.warning(f"⚠️ SQLite {name} failed: {e}")
+        return results
+
+    def run_forever(self, poll_seconds: float = 60, is_active: Callable[[], bool] = None):
+        """Run due tasks every poll_seconds while is_active() holds"""
+        while True:
+            if is_active is None or is_active():
+                self.run_due()
+            time.sleep(poll_seconds)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'intervals': dict(self.intervals), 'last_results': dict(self.last_results),
+                'profile': getattr(self.engine, 'sqlite_profile', None)}
+
 class TransactionManager:
     """Manages database transactions with rollback capability"""
     
@@ -0,0 +1,114 @@
+"""
+Connection pool metrics and leak detection
+
+PoolMonitor listens to the pool events of an engine and keeps live counters
+(connections opened, checked out, returned, invalidated) plus one record per
+checked-out connection: when and by which thread it was taken. A connection
+held longer than the leak threshold is reported by find_leaks() (and logged
+once by check_leaks()), which points at code that opened a session or
+connection and never closed it.
+
+DB_LEAK_TRACE=true also records the stack at checkout, to find the caller.
+"""
+
+import os
+import time
+import logging
+import threading
+import traceback
+from typing import Any, Dict, List
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMonitor:
+    """Pool event counters and long-checkout (leak) detection for one engine"""
+
+    def __init__(self, engine, leak_threshold: float = None, trace: bool = None):
+        self.engine = engine
+        self.leak_threshold = leak_threshold if leak_threshold is not None else \
+            float(os.getenv('DB_LEAK_THRESHOLD_SECONDS', '30'))
+        self.trace = trace if trace is not None else os.getenv('DB_LEAK_TRACE', 'false').lower() == 'true'
+        self._lock = threading.Lock()
+        self._checked_out: Dict[int, Dict[str, Any]] = {}
+        self._reported = set()
+        self.counters = {'connects': 0, 'checkouts': 0, 'checkins': 0, 'invalidations': 0, 'leaks_reported': 0}
+        self.peak_checked_out = 0
+
+        event.listen(engine, 'connect', self._on_connect)
+        event.listen(engine, 'checkout', self._on_checkout)
+        event.listen(engine, 'checkin', self._on_checkin)
+        event.listen(engine, 'invalidate', self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.counters['connects'] += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        record = {
+            'since': time.monotonic(),
+            'thread': threading.current_thread().name,
+            'stack': ''.join(traceback.format_stack(limit=12)[:-2]) if self.trace else None
+        }
+        with self._lock:
+            self.counters['checkouts'] += 1
+            self._checked_out[id(connection_record)] = record
+            self.peak_checked_out = max(self.peak_checked_out, len(self._checked_out))
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.counters['checkins'] += 1
+            self._checked_out.pop(id(connection_record), None)
+            self._reported.discard(id(connection_record))
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.counters['invalidations'] += 1
+
+    def find_leaks(self, threshold: float = None) -> List[Dict[str, Any]]:
+        """Connections checked out for longer than the threshold"""
+        threshold = self.leak_threshold if threshold is None else threshold
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {'key': key, 'held_seconds': round(now - record['since'], 1),
+                 'thread': record['thread'], 'stack': record['stack']}
+                for key, record in self._checked_out.items()
+                if now - record['since'] > threshold
+            ]
+
+    def check_leaks(self) -> List[Dict[str, Any]]:
+        """Log each newly detected leak once; returns the current leaks"""
+        leaks = self.find_leaks()
+        for leak in leaks:
+            with self._lock:
+                if leak['key'] in self._reported:
+                    continue
+                self._reported.add(leak['key'])
+                self.counters['leaks_reported'] += 1
+            logger.warning(f"⚠️ DB connection held {leak['held_seconds']}s by thread {leak['thread']} "
+                           f"(possible session leak){chr(10) + leak['stack'] if leak['stack'] else ''}")
+        return leaks
+
+    def get_stats(self) -> Dict[str, Any]:
+        pool = self.engine.pool
+        stats = {
+            'pool_class': type(pool).__name__,
+            'checked_out': len(self._checked_out),
+            'peak_checked_out': self.peak_checked_out,
+            'long_checkouts': len(self.find_leaks()),
+            'leak_threshold_seconds': self.leak_threshold
+        }
+        with self._lock:
+            stats.update(self.counters)
+        # QueuePool sizing (PostgreSQL); other pools do not expose these
+        for name in ('size', 'overflow', 'checkedin', 'timeout'):
+            attr = getattr(pool, name, None)
+            if callable(attr):
+                stats[f"pool_{name}"] = attr()
+        max_overflow = getattr(pool, '_max_overflow', None)
+        if max_overflow is not None:
+            stats['pool_max_overflow'] = max_overflow
+        return stats
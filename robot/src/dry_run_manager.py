@@ -18,6 +18,11 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 from decimal import Decimal, ROUND_DOWN
 
+try:
+    from src.transaction_journal import TransactionJournal
+except ImportError:
+    from transaction_journal import TransactionJournal
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -96,15 +101,29 @@ class DryRunManager:
     def __init__(self):
         self.is_dry_run = self._check_dry_run_mode()
         self.portfolio_file = "data/dry_run_portfolio.json"
-        self.transactions_file = "data/dry_run_transactions.json"
+        self.transactions_file = "data/dry_run_transactions.jsonl"
+        self.legacy_transactions_file = "data/dry_run_transactions.json"
         self.state_file = "data/dry_run_state.json"
         
         # Ensure data directory exists
         os.makedirs("data", exist_ok=True)
         
+        # Append-only transaction journal; status updates share (transaction_id, timestamp)
+        self.journal = TransactionJournal(
+            self.transactions_file,
+            key_fields=('transaction_id', 'timestamp'),
+            fsync_every=int(os.getenv('DRY_RUN_JOURNAL_FSYNC_EVERY', '50')),
+            fsync_interval=float(os.getenv('DRY_RUN_JOURNAL_FSYNC_INTERVAL', '1.0')),
+            compact_every=int(os.getenv('DRY_RUN_JOURNAL_COMPACT_EVERY', '10000'))
+        )
+        self._migrate_legacy_transactions()
+        
         # Initialize or load portfolio
         self.portfolio = self._load_or_create_portfolio()
         self.pending_transactions = []
+        self.group_cycle: Optional[int] = None  # set while a transaction group is open
+        self._dirty = False
+        self.snapshot_writes = 0
         
         logger.info(f"Dry-Run Manager initialized: {'DRY-RUN' if self.is_dry_run else 'LIVE'} mode")
     
@@ -166,8 +185,23 @@ class DryRunManager:
         logger.info(f"Created new dry-run portfolio: {initial_reserve} {reserve_asset}")
         return portfolio
     
+    @property
+    def in_transaction_group(self) -> bool:
+        return self.group_cycle is not None
+    
+    def _mark_dirty(self):
+        """Record an in-memory change; outside a transaction group it is saved right away"""
+        self._dirty = True
+        if not self.in_transaction_group:
+            self._flush_portfolio()
+    
+    def _flush_portfolio(self):
+        """Write the snapshot only if something changed since the last write"""
+        if self._dirty:
+            self._save_portfolio()
+    
     def _save_portfolio(self):
-        """Save portfolio to file"""
+        """Atomically save the portfolio snapshot (temp file + rename)"""
         try:
             # Convert to JSON-serializable format
             positions_data = {}
@@ -191,46 +225,66 @@ class DryRunManager:
                 'last_update': datetime.now().isoformat()
             }
             
-            with open(self.portfolio_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            tmp_file = f"{self.portfolio_file}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.portfolio_file)
+            self._dirty = False
+            self.snapshot_writes += 1
                 
         except Exception as e:
             logger.error(f"Error saving portfolio: {e}")
     
+    def _migrate_legacy_transactions(self):
+        """Import the old JSON-array transaction file into an empty journal (once)"""
+        if not self.journal.is_empty() or not os.path.exists(self.legacy_transactions_file):
+            return
+        try:
+            with open(self.legacy_transactions_file, 'r') as f:
+                transactions = json.load(f)
+            for transaction_data in transactions:
+                self.journal.append(transaction_data)
+            self.journal.sync()
+            logger.info(f"Migrated {len(transactions)} transactions to {self.transactions_file}")
+        except Exception as e:
+            logger.error(f"Error migrating legacy transactions: {e}")
+    
+    def _transaction_to_dict(self, transaction: DryRunTransaction) -> Dict[str, Any]:
+        return {
+            'transaction_id': transaction.transaction_id,
+            'timestamp': transaction.timestamp.isoformat(),
+            'transaction_type': transaction.transaction_type,
+            'from_asset': transaction.from_asset,
+            'to_asset': transaction.to_asset,
+            'from_quantity': str(transaction.from_quantity),
+            'to_quantity': str(transaction.to_quantity),
+            'price': str(transaction.price),
+            'fee': str(transaction.fee),
+            'fee_asset': transaction.fee_asset,
+            'status': transaction.status,
+            'cycle_number': transaction.cycle_number
+        }
+    
     def _save_transaction(self, transaction: DryRunTransaction):
-        """Save transaction to file"""
+        """Append transaction to the journal (fsync is batched)"""
         try:
-            transactions = []
-            
-            # Load existing transactions
-            if os.path.exists(self.transactions_file):
-                with open(self.transactions_file, 'r') as f:
-                    transactions = json.load(f)
-            
-            # Add new transaction
-            transaction_data = {
-                'transaction_id': transaction.transaction_id,
-                'timestamp': transaction.timestamp.isoformat(),
-                'transaction_type': transaction.transaction_type,
-                'from_asset': transaction.from_asset,
-                'to_asset': transaction.to_asset,
-                'from_quantity': str(transaction.from_quantity),
-                'to_quantity': str(transaction.to_quantity),
-                'price': str(transaction.price),
-                'fee': str(transaction.fee),
-                'fee_asset': transaction.fee_asset,
-                'status': transaction.status,
-                'cycle_number': transaction.cycle_number
-            }
-            
-            transactions.append(transaction_data)
-            
-            with open(self.transactions_file, 'w') as f:
-                json.dump(transactions, f, indent=2)
-                
+            self.journal.append(self._transaction_to_dict(transaction))
         except Exception as e:
             logger.error(f"Error saving transaction: {e}")
     
+    def iter_transactions(self, cycle_number: Optional[int] = None):
+        """Stream journaled transactions in order, optionally for one cycle"""
+        predicate = None
+        if cycle_number is not None:
+            predicate = lambda record: record.get('cycle_number') == cycle_number
+        return self.journal.iter_records(predicate=predicate)
+    
+    def get_recent_transactions(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Last `limit` journaled transactions without reading the whole history"""
+        return self.journal.tail(limit)
+    
     def get_current_prices(self, symbols: List[str]) -> Dict[str, Decimal]:
         """Get current prices for symbols (simulated in dry-run)"""
         
@@ -274,7 +328,7 @@ class DryRunManager:
                 position.last_update = datetime.now()
         
         self.portfolio.last_update = datetime.now()
-        self._save_portfolio()
+        self._mark_dirty()
     
     def simulate_buy_order(self, symbol: str, quantity: Decimal, price: Decimal, 
                           cycle_number: Optional[int] = None) -> DryRunTransaction:
@@ -337,9 +391,7 @@ class DryRunManager:
                 last_update=datetime.now()
             )
         
-        transaction.status = 'COMPLETED'
-        self._save_transaction(transaction)
-        self._save_portfolio()
+        self._record_transaction(transaction)
         
         logger.info(f"DRY-RUN BUY: {quantity} {symbol} @ {price} (fee: {fee})")
         return transaction
@@ -394,9 +446,7 @@ class DryRunManager:
         if position.quantity == 0:
             del self.portfolio.positions[symbol]
         
-        transaction.status = 'COMPLETED'
-        self._save_transaction(transaction)
-        self._save_portfolio()
+        self._record_transaction(transaction)
         
         logger.info(f"DRY-RUN SELL: {quantity} {symbol} @ {price} (fee: {fee})")
         return transaction
@@ -430,9 +480,24 @@ class DryRunManager:
             'last_update': self.portfolio.last_update.isoformat()
         }
     
+    def _record_transaction(self, transaction: DryRunTransaction):
+        """Journal the transaction now, or hold it until the open group commits"""
+        if self.in_transaction_group:
+            self.pending_transactions.append(transaction)
+        else:
+            transaction.status = 'COMPLETED'
+            self._save_transaction(transaction)
+        self._mark_dirty()
+    
     def begin_transaction_group(self, cycle_number: int):
-        """Begin a transaction group (for rollback capability)"""
+        """
+        Begin a transaction group (for rollback capability).
+        Until commit, orders only change the in-memory portfolio; commit writes
+        one snapshot and rollback restores the last committed one.
+        """
+        self._flush_portfolio()
         self.pending_transactions = []
+        self.group_cycle = cycle_number
         logger.info(f"Started transaction group for cycle {cycle_number}")
     
     def commit_transaction_group(self):
@@ -441,8 +506,11 @@ class DryRunManager:
             transaction.status = 'COMPLETED'
             self._save_transaction(transaction)
         
+        # Commit point: make every journaled transaction durable, then snapshot once
+        self.journal.sync()
         self.pending_transactions = []
-        self._save_portfolio()
+        self.group_cycle = None
+        self._flush_portfolio()
         logger.info("Committed transaction group")
     
     def rollback_transaction_group(self):
@@ -453,10 +521,13 @@ class DryRunManager:
         for transaction in self.pending_transactions:
             transaction.status = 'ROLLED_BACK'
             self._save_transaction(transaction)
+        self.journal.sync()
         
         # Reload portfolio from last saved state
         self.portfolio = self._load_or_create_portfolio()
         self.pending_transactions = []
+        self.group_cycle = None
+        self._dirty = False
         
         logger.info("Transaction group rolled back")
 
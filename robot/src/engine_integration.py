@@ -0,0 +1,108 @@
+"""
+Integration between the Unified Trading Engine and real Binance execution
+
+The engine decides the target portfolio; the adapter turns the difference
+between the current and target portfolio into netted market orders, runs
+them through the concurrent OrderExecutor and reconciles the target with
+what actually filled.
+"""
+
+import os
+import logging
+from typing import Dict, List, Tuple
+
+from src.unified_trading_engine import (
+    UnifiedTradingEngine, EngineMode, EngineConfig, Portfolio, CryptoPosition, RebalanceResult
+)
+from src.order_executor import OrderExecutor, net_order_deltas
+
+logger = logging.getLogger(__name__)
+
+
+def convert_db_portfolio_to_engine_portfolio(db_positions, reserve: float, initial_value: float) -> Portfolio:
+    """Build an engine Portfolio from active database Position rows"""
+    positions = {
+        pos.symbol: CryptoPosition(
+            symbol=pos.symbol,
+            quantity=pos.quantity,
+            entry_price=pos.entry_price,
+            current_price=pos.current_price
+        )
+        for pos in db_positions
+    }
+    return Portfolio(positions, reserve, initial_value)
+
+
+class RealTradingEngineAdapter:
+    """
+    Runs a unified engine cycle against live Binance prices and executes the resulting trades
+    """
+
+    def __init__(self, binance_client, config: EngineConfig = None):
+        self.binance_client = binance_client
+        self.config = config or EngineConfig.from_env()
+        self.engine = UnifiedTradingEngine(EngineMode.REAL_TRADING, self.config)
+        self.executor = OrderExecutor(binance_client, self.config.reserve_asset)
+        self.min_notional = float(os.getenv('ORDER_MIN_NOTIONAL', '0'))
+
+    def get_market_snapshot(self) -> Tuple[List[str], Dict[str, float]]:
+        """Candidate coins and their prices in the reserve asset (two API calls)"""
+        reserve = self.config.reserve_asset
+        available_coins = self.binance_client.get_top_market_cap_coins(self.config.top_coins_count)
+        all_prices = self.binance_client.get_all_prices()
+        prices = {
+            coin: all_prices[f"{coin}{reserve}"]
+            for coin in available_coins
+            if f"{coin}{reserve}" in all_prices
+        }
+        return available_coins, prices
+
+    def run_trading_cycle(self, current_portfolio: Portfolio) -> Tuple[RebalanceResult, Dict]:
+        """
+        Decide the target portfolio, execute the trades and return the
+        reconciled result plus the execution report
+        """
+        available_coins, prices = self.get_market_snapshot()
+        for symbol, position in current_portfolio.positions.items():
+            if symbol not in prices:
+                ticker_price = self.binance_client.get_current_price_in_bnb(symbol)
+                if ticker_price > 0:
+                    prices[symbol] = ticker_price
+
+        # Snapshot before the engine mutates positions in place
+        current_quantities = {s: p.quantity for s, p in current_portfolio.positions.items()}
+        starting_reserve = current_portfolio.reserve
+
+        result = self.engine.run_cycle(current_portfolio, available_coins, prices)
+        if not result.success:
+            return result, {}
+
+        target_quantities = {s: p.quantity for s, p in result.new_portfolio.positions.items()}
+        intents = net_order_deltas(current_quantities, target_quantities, prices, self.min_notional)
+        report = self.executor.execute(intents, available_quote=starting_reserve)
+
+        self._reconcile(result.new_portfolio, current_quantities, report, starting_reserve, prices)
+        result.actions_taken = result.actions_taken + report.summary_lines()
+        if report.failed:
+            logger.warning(f"{len(report.failed)} orders failed; portfolio reconciled with actual fills")
+
+        return result, report.to_dict()
+
+    def _reconcile(self, portfolio: Portfolio, current_quantities: Dict[str, float],
+                   report, starting_reserve: float, prices: Dict[str, float]):
+        """Replace planned quantities and reserve with what actually executed"""
+        executed = report.executed_deltas()
+        positions = {}
+        for symbol in set(current_quantities) | set(portfolio.positions):
+            quantity = current_quantities.get(symbol, 0.0) + executed.get(symbol, 0.0)
+            if quantity <= 0:
+                continue
+            planned = portfolio.positions.get(symbol)
+            positions[symbol] = CryptoPosition(
+                symbol=symbol,
+                quantity=quantity,
+                entry_price=planned.entry_price if planned else prices.get(symbol, 0.0),
+                current_price=prices.get(symbol, planned.current_price if planned else 0.0)
+            )
+        portfolio.positions = positions
+        portfolio.reserve = starting_reserve + report.sold_quote - report.bought_quote
@@ -10,17 +10,37 @@ from binance.exceptions import BinanceAPIException
 import pandas as pd
 from datetime import datetime, timedelta
 
+try:
+    from src.binance_rate_governor import GovernedClient
+except ImportError:
+    from binance_rate_governor import GovernedClient
+
 logger = logging.getLogger(__name__)
 
 class EnhancedBinanceClient:
-    def __init__(self, api_key: str = None, secret_key: str = None):
+    def __init__(self, api_key: str = None, secret_key: str = None, priority: str = None):
         """
-        Initialize Enhanced Binance API client with advanced features
+        Initialize Enhanced Binance API client with advanced features.
+        `priority` (live / simulation / dashboard) ranks this client's calls
+        in the shared Binance weight governor.
         """
-        self.client = Client(api_key, secret_key)
+        self.client = GovernedClient(api_key, secret_key, priority=priority)
         self.trading_fee = 0.001  # 0.10% VIP fee default
         self.base_asset = os.getenv('RESERVE_ASSET', 'BNB')
         
+    def get_account(self) -> Dict:
+        """Get raw account information (balances, permissions)"""
+        return self.client.get_account()
+    
+    def get_all_prices(self) -> Dict[str, float]:
+        """Get latest prices for every symbol in a single request"""
+        try:
+            tickers = self.client.get_symbol_ticker()
+            return {ticker['symbol']: float(ticker['price']) for ticker in tickers}
+        except BinanceAPIException as e:
+            logger.error(f"Error getting all prices: {e}")
+            return {}
+    
     def get_account_balance(self, asset: str = None) -> float:
         """Get account balance for specific asset"""
         try:
@@ -346,13 +366,23 @@ class EnhancedBinanceClient:
                 'analysis_timestamp': datetime.now().isoformat()
             }
     
-    def place_market_order(self, symbol: str, side: str, quantity: float) -> Dict:
-        """Place a market order"""
+    def get_exchange_info(self) -> Dict:
+        """Trading rules of every symbol (LOT_SIZE, MIN_NOTIONAL, ...)"""
+        return self.client.get_exchange_info()
+    
+    def place_market_order(self, symbol: str, side: str, quantity, client_order_id: str = None) -> Dict:
+        """
+        Place a market order (quantity step-aligned, ideally as a decimal string).
+        `client_order_id` is sent as newClientOrderId so the order can be looked
+        up with get_order() when the response is lost (timeouts).
+        """
+        params = {'newClientOrderId': client_order_id} if client_order_id else {}
         try:
             order = self.client.order_market(
                 symbol=symbol,
                 side=side,
-                quantity=quantity
+                quantity=quantity,
+                **params
             )
             logger.info(f"Order placed: {side} {quantity} {symbol}")
             return order
@@ -360,6 +390,15 @@ class EnhancedBinanceClient:
             logger.error(f"Error placing order: {e}")
             return {}
     
+    def get_order(self, symbol: str, client_order_id: str) -> Dict:
+        """Order by its client order id; {} when the exchange has no such order"""
+        try:
+            return self.client.get_order(symbol=symbol, origClientOrderId=client_order_id)
+        except BinanceAPIException as e:
+            if e.code == -2013:  # Order does not exist
+                return {}
+            raise
+    
     def get_current_price(self, symbol: str) -> float:
         """Get current price for a symbol"""
         try:
@@ -13,6 +13,7 @@ from datetime import datetime
 from src.unified_trading_engine import EngineConfig, Portfolio, CryptoPosition
 from src.engine_integration import RealTradingEngineAdapter, convert_db_portfolio_to_engine_portfolio
 from src.balance_validator import BalanceValidator, validate_robot_startup_balance
+from src.price_warm_start import is_warm_start_enabled, load_warm_start_history
 
 logger = logging.getLogger(__name__)
 
@@ -35,8 +36,30 @@ class EnhancedRealTradingEngine:
         self.last_cycle_time = None
         self.startup_validated = False
         
+        if is_warm_start_enabled():
+            self.warm_start_price_history()
+        
         logger.info("Enhanced Real Trading Engine initialized with unified trading logic and balance validation")
     
+    def warm_start_price_history(self) -> int:
+        """
+        Fill the engine's price windows from past cycle snapshots (and recent
+        klines at the cycle's cadence) so momentum is available on the first
+        live cycle
+        """
+        try:
+            engine = self.adapter.engine
+            history = load_warm_start_history(
+                max_points=engine.price_history.capacity,
+                quote_asset=self.config.reserve_asset,
+                portfolio_manager=self.portfolio_manager,
+                cycle_minutes=int(os.getenv('CYCLE_DURATION', '1440'))
+            )
+            return engine.warm_start(history) if history else 0
+        except Exception as e:
+            logger.warning(f"Price history warm start failed, starting cold: {e}")
+            return 0
+    
     def get_current_portfolio_from_db(self) -> Portfolio:
         """
         Get current portfolio from database
@@ -68,34 +91,36 @@ class EnhancedRealTradingEngine:
                 logger.warning("No portfolio manager available to save portfolio")
                 return False
             
-            # Update portfolio reserve
-            self.portfolio_manager.update_portfolio_reserve(portfolio.reserve)
+            # One load and one transaction for the whole cycle bookkeeping
+            with self.portfolio_manager.unit_of_work():
+                # Update portfolio reserve
+                self.portfolio_manager.update_portfolio_reserve(portfolio.reserve)
+            
+                # Update positions
+                for symbol, position in portfolio.positions.items():
+                    self.portfolio_manager.update_or_create_position(
+                        symbol=symbol,
+                        quantity=position.quantity,
+                        entry_price=position.entry_price,
+                        current_price=position.current_price
+                    )
             
-            # Update positions
-            for symbol, position in portfolio.positions.items():
-                self.portfolio_manager.update_or_create_position(
-                    symbol=symbol,
-                    quantity=position.quantity,
-                    entry_price=position.entry_price,
-                    current_price=position.current_price
-                )
+                # Deactivate positions that are no longer in the portfolio
+                current_symbols = set(portfolio.positions.keys())
+                db_positions = self.portfolio_manager.get_active_positions()
             
-            # Deactivate positions that are no longer in the portfolio
-            current_symbols = set(portfolio.positions.keys())
-            db_positions = self.portfolio_manager.get_active_positions()
-            
-            for db_pos in db_positions:
-                if db_pos.symbol not in current_symbols:
-                    self.portfolio_manager.deactivate_position(db_pos.symbol)
-            
-            # Create trading cycle record
-            self.portfolio_manager.create_trading_cycle(
-                portfolio_value=portfolio.portfolio_value,
-                bnb_reserve=portfolio.reserve,
-                total_value=portfolio.total_value,
-                actions_taken=actions_taken,
-                portfolio_breakdown=self._create_portfolio_breakdown(portfolio)
-            )
+                for db_pos in db_positions:
+                    if db_pos.symbol not in current_symbols:
+                        self.portfolio_manager.deactivate_position(db_pos.symbol)
+            
+                # Create trading cycle record
+                self.portfolio_manager.create_trading_cycle(
+                    portfolio_value=portfolio.portfolio_value,
+                    bnb_reserve=portfolio.reserve,
+                    total_value=portfolio.total_value,
+                    actions_taken=actions_taken,
+                    portfolio_breakdown=self._create_portfolio_breakdown(portfolio)
+                )
             
             logger.info(f"Portfolio saved to database: {len(portfolio.positions)} positions, "
                        f"reserve: {portfolio.reserve:.6f}")
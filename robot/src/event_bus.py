@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+In-Process Publish/Subscribe Bus
+
+The trading engine and simulation workers publish a message per committed
+cycle; the web app subscribes and forwards them to Socket.IO clients, so
+dashboards are pushed updates instead of polling the database. The last
+message of every (topic, key) is retained, so a client that connects or
+polls gets the current value from memory.
+
+Publishers in another process (the trading robot) reach the web app through
+a cross-process backend. The default `udp` backend is a local stand-in for
+a broker: JSON datagrams on the loopback interface, consumed by the process
+that called start_listening() (the web app). Delivery is best effort; the
+database stays the source of truth. EVENT_BUS_BACKEND=local keeps messages
+in-process.
+"""
+
+import os
+import json
+import uuid
+import socket
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Topics
+TOPIC_STATUS = 'status'                              # latest committed trading cycle
+TOPIC_SIMULATION_PROGRESS = 'simulation.progress'    # keyed by simulation id
+
+# Keep datagrams below the loopback MTU-friendly size
+MAX_DATAGRAM_BYTES = 60000
+
+Handler = Callable[[str, Any, Dict[str, Any]], None]
+
+
+class UdpBackend:
+    """Cross-process stand-in: JSON datagrams to a loopback port"""
+
+    def __init__(self, port: int, host: str = '127.0.0.1'):
+        self.address = (host, port)
+        self._sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._listener = None
+        self.dropped = 0
+
+    def send(self, message: Dict[str, Any]):
+        data = json.dumps(message, separators=(',', ':'), default=str).encode('utf-8')
+        if len(data) > MAX_DATAGRAM_BYTES:
+            self.dropped += 1
+            logger.warning(f"⚠️ Event bus message on {message['topic']} too large ({len(data)} bytes), not forwarded")
+            return
+        try:
+            self._sender.sendto(data, self.address)
+        except OSError as e:
+            self.dropped += 1
+            logger.debug(f"Event bus datagram not sent: {e}")
+
+    def start(self, on_message: Callable[[Dict[str, Any]], None]) -> bool:
+        """Bind the port and deliver received messages from a daemon thread"""
+        if self._listener is not None:
+            return True
+        listener = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            listener.bind(self.address)
+        except OSError as e:
+            listener.close()
+            logger.warning(f"⚠️ Event bus port {self.address[1]} unavailable, cross-process events disabled: {e}")
+            return False
+        self._listener = listener
+
+        def receive_loop():
+            while self._listener is not None:
+                try:
+                    data, _ = listener.recvfrom(65535)
+                    on_message(json.loads(data))
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
+                except OSError:
+                    break
+
+        threading.Thread(target=receive_loop, name='event-bus-udp', daemon=True).start()
+        logger.info(f"📡 Event bus listening on udp://{self.address[0]}:{self.address[1]}")
+        return True
+
+    def stop(self):
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            # Wake the receive thread: the port stays bound while it blocks in recvfrom
+            try:
+                listener.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            listener.close()
+
+
+class EventBus:
+    """
+    Topic-based publish/subscribe with retained last messages
+    """
+
+    def __init__(self, backend: UdpBackend = None):
+        self.backend = backend
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._lock = threading.RLock()
+        self._subscribers: Dict[str, List[Handler]] = {}
+        self._retained: Dict[Tuple[str, Any], Dict[str, Any]] = {}
+        self.published = 0
+        self.delivered = 0
+
+    def subscribe(self, topic: str, handler: Handler):
+        """Call handler(key, payload, message) for every message on topic"""
+        with self._lock:
+            handlers = self._subscribers.setdefault(topic, [])
+            if handler not in handlers:
+                handlers.append(handler)
+
+    def unsubscribe(self, topic: str, handler: Handler):
+        with self._lock:
+            if handler in self._subscribers.get(topic, []):
+                self._subscribers[topic].remove(handler)
+
+    def publish(self, topic: str, payload: Dict[str, Any], key: Any = None) -> Dict[str, Any]:
+        """Deliver to local subscribers now and forward through the backend"""
+        message = {
+            'topic': topic,
+            'key': key,
+            'payload': payload,
+            'published_at': datetime.now().isoformat(),
+            'origin': self.origin
+        }
+        self.published += 1
+        self._deliver(message)
+        if self.backend is not None:
+            self.backend.send(message)
+        return message
+
+    def _deliver(self, message: Dict[str, Any]):
+        topic, key = message['topic'], message.get('key')
+        with self._lock:
+            self._retained[(topic, key)] = message
+            handlers = list(self._subscribers.get(topic, []))
+        for handler in handlers:
+            try:
+                handler(key, message['payload'], message)
+                self.delivered += 1
+            except Exception as e:
+                logger.error(f"❌ Event bus subscriber failed on {topic}: {e}")
+
+    def _on_backend_message(self, message: Dict[str, Any]):
+        if message.get('origin') == self.origin or 'topic' not in message:
+            return  # our own publish, already delivered locally
+        self._deliver(message)
+
+    def start_listening(self) -> bool:
+        """Receive messages published by other processes (web app only)"""
+        if self.backend is None:
+            return False
+        return self.backend.start(self._on_backend_message)
+
+    def stop_listening(self):
+        """Release the listening port (e.g. when this worker loses leadership)"""
+        if self.backend is not None:
+            self.backend.stop()
+
+    def latest(self, topic: str, key: Any = None) -> Optional[Dict[str, Any]]:
+        """Payload of the last message on (topic, key), or None"""
+        with self._lock:
+            message = self._retained.get((topic, key))
+        return message['payload'] if message else None
+
+    def forget(self, topic: str, key: Any = None):
+        with self._lock:
+            self._retained.pop((topic, key), None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'backend': 'udp' if self.backend is not None else 'local',
+                'published': self.published,
+                'delivered': self.delivered,
+                'retained': len(self._retained),
+                'subscribers': {topic: len(handlers) for topic, handlers in self._subscribers.items()},
+                'dropped': self.backend.dropped if self.backend is not None else 0
+            }
+
+
+# Global event bus instance
+_event_bus = None
+_event_bus_lock = threading.Lock()
+
+
+def get_event_bus() -> EventBus:
+    """Get the process-wide event bus (backend from EVENT_BUS_BACKEND)"""
+    global _event_bus
+    with _event_bus_lock:
+        if _event_bus is None:
+            backend = None
+            if os.getenv('EVENT_BUS_BACKEND', 'udp').lower() == 'udp':
+                backend = UdpBackend(int(os.getenv('EVENT_BUS_PORT', '8766')))
+            _event_bus = EventBus(backend)
+        return _event_bus
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Event-Sourced Trading Log
+
+Single append-only log of everything that changes the robot's trading state:
+orders and fills, reserve/holding syncs from the exchange, freezes, robot
+start/stop and cycle boundaries. The current state (TradingState) is a pure
+fold over the events. Every EVENT_SNAPSHOT_EVERY events the state is written
+to a snapshot file (temp file + rename) and the live journal is rotated into
+an archive segment, so startup and crash recovery only replay the events
+appended since the last snapshot.
+
+Snapshot + replay recovers TradingState itself and robot_state.json, which
+subscribes as the only projection: it receives every event after it is
+applied to the state. The portfolio database rows and the dry-run
+portfolio/journal are written directly by their owners, not projected from
+this log; for them the log is an audit trail, and they recover from their
+own storage.
+"""
+
+import os
+import json
+import glob
+import time
+import logging
+import threading
+from datetime import datetime
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+try:
+    from src.transaction_journal import TransactionJournal
+except ImportError:
+    from transaction_journal import TransactionJournal
+
+logger = logging.getLogger(__name__)
+
+# Event types
+EVENT_ORDER_PLACED = 'ORDER_PLACED'
+EVENT_ORDER_FILLED = 'ORDER_FILLED'
+EVENT_ORDER_FAILED = 'ORDER_FAILED'
+EVENT_RESERVE_SYNCED = 'RESERVE_SYNCED'      # absolute reserve balance read from the exchange
+EVENT_HOLDINGS_SYNCED = 'HOLDINGS_SYNCED'    # absolute holdings read from the exchange
+EVENT_ROBOT_FROZEN = 'ROBOT_FROZEN'
+EVENT_ROBOT_UNFROZEN = 'ROBOT_UNFROZEN'
+EVENT_ROBOT_STARTED = 'ROBOT_STARTED'
+EVENT_ROBOT_STOPPED = 'ROBOT_STOPPED'
+EVENT_CYCLE_STARTED = 'CYCLE_STARTED'
+EVENT_CYCLE_COMPLETED = 'CYCLE_COMPLETED'
+
+# Events that are fsynced immediately instead of with the next batch
+DURABLE_EVENTS = {
+    EVENT_ORDER_FILLED, EVENT_ROBOT_FROZEN, EVENT_ROBOT_UNFROZEN, EVENT_CYCLE_COMPLETED
+}
+
+
+@dataclass
+class TradingState:
+    """Trading state rebuilt by folding events in order"""
+    reserve: float = 0.0
+    holdings: Dict[str, float] = field(default_factory=dict)
+    is_frozen: bool = False
+    freeze_reason: Optional[str] = None
+    freeze_timestamp: Optional[str] = None
+    is_running: bool = False
+    cycle_number: int = 0
+    cycle_in_progress: Optional[str] = None   # boundary of a started, not completed cycle
+    last_cycle_time: Optional[str] = None
+    last_cycle_success: Optional[bool] = None
+    current_capital: Optional[float] = None
+    total_return: Optional[float] = None
+    trading_costs: float = 0.0
+    fills: int = 0
+    failed_orders: int = 0
+    last_seq: int = 0
+
+    def apply(self, event: Dict[str, Any]):
+        """Fold one event into the state"""
+        kind = event['type']
+        data = event.get('data', {})
+
+        if kind == EVENT_ORDER_FILLED:
+            symbol = data['symbol']
+            quantity = float(data.get('executed_quantity', 0))
+            quote = float(data.get('quote_quantity', 0))
+            sign = 1 if data['side'] == 'BUY' else -1
+            remaining = self.holdings.get(symbol, 0.0) + sign * quantity
+            if remaining > 0:
+                self.holdings[symbol] = remaining
+            else:
+                self.holdings.pop(symbol, None)
+            self.reserve -= sign * quote
+            self.fills += 1
+        elif kind == EVENT_ORDER_FAILED:
+            self.failed_orders += 1
+        elif kind == EVENT_RESERVE_SYNCED:
+            self.reserve = float(data['reserve'])
+        elif kind == EVENT_HOLDINGS_SYNCED:
+            self.holdings = {s: float(q) for s, q in data['holdings'].items() if float(q) > 0}
+        elif kind == EVENT_ROBOT_FROZEN:
+            self.is_frozen = True
+            self.freeze_reason = data.get('reason')
+            self.freeze_timestamp = event['timestamp']
+        elif kind == EVENT_ROBOT_UNFROZEN:
+            self.is_frozen = False
+            self.freeze_reason = None
+            self.freeze_timestamp = None
+        elif kind == EVENT_ROBOT_STARTED:
+            self.is_running = True
+        elif kind == EVENT_ROBOT_STOPPED:
+            self.is_running = False
+        elif kind == EVENT_CYCLE_STARTED:
+            self.cycle_in_progress = data.get('boundary') or event['timestamp']
+        elif kind == EVENT_CYCLE_COMPLETED:
+            self.cycle_in_progress = None
+            self.last_cycle_success = bool(data.get('success', True))
+            if self.last_cycle_success:
+                self.cycle_number += 1
+                self.last_cycle_time = data.get('time') or event['timestamp']
+                for key in ('current_capital', 'total_return'):
+                    if data.get(key) is not None:
+                        setattr(self, key, float(data[key]))
+                self.trading_costs += float(data.get('trading_costs', 0.0) or 0.0)
+
+        self.last_seq = event.get('seq', self.last_seq)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TradingState':
+        known = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
+        return cls(**known)
+
+
+class EventStore:
+    """
+    Append-only event log with periodic state snapshots and fast replay
+    """
+
+    def __init__(self, path: str = None, snapshot_every: int = None):
+        self.path = path or os.getenv('EVENT_LOG_FILE', 'data/robot_events.jsonl')
+        base = os.path.splitext(self.path)[0]
+        self.state_snapshot_path = f"{base}.state.json"
+        self.archive_pattern = f"{base}.segment-*.jsonl"
+        self.snapshot_every = snapshot_every or int(os.getenv('EVENT_SNAPSHOT_EVERY', '1000'))
+
+        self._lock = threading.RLock()
+        self._projections: List[Callable[[Dict[str, Any], TradingState], None]] = []
+        self.replayed_events = 0
+        self.recovery_seconds = 0.0
+
+        self.state = self._recover()
+
+    # ------------------------------------------------------------------
+    # Recovery
+    # ------------------------------------------------------------------
+
+    def _load_state_snapshot(self) -> TradingState:
+        if not os.path.exists(self.state_snapshot_path):
+            return self._rebuild_from_archives()
+        try:
+            with open(self.state_snapshot_path, 'r') as f:
+                return TradingState.from_dict(json.load(f))
+        except (json.JSONDecodeError, TypeError, ValueError) as e:
+            logger.error(f"❌ Unreadable state snapshot {self.state_snapshot_path}: {e}")
+            return self._rebuild_from_archives()
+
+    def _rebuild_from_archives(self) -> TradingState:
+        """Full replay of archived segments (only if the snapshot is lost)"""
+        state = TradingState()
+        for archive in sorted(glob.glob(self.archive_pattern)):
+            for event in TransactionJournal.iter_file(archive):
+                state.apply(self._from_record(event))
+        return state
+
+    def _recover(self) -> TradingState:
+        started = time.monotonic()
+        state = self._load_state_snapshot()
+        self.journal = TransactionJournal(self.path, fsync_every=int(os.getenv('EVENT_FSYNC_EVERY', '20')),
+                                          compact_every=0, start_seq=state.last_seq)
+
+        replayed = 0
+        for record in self.journal.iter_records(raw=True):
+            event = self._from_record(record)
+            if event['seq'] <= state.last_seq:
+                continue  # crash between snapshot and rotation
+            state.apply(event)
+            replayed += 1
+
+        self.replayed_events = replayed
+        self.recovery_seconds = time.monotonic() - started
+        logger.info(f"📼 Event log recovered at seq {state.last_seq}: "
+                    f"{replayed} events replayed in {self.recovery_seconds * 1000:.1f}ms")
+        return state
+
+    @staticmethod
+    def _from_record(record: Dict[str, Any]) -> Dict[str, Any]:
+        event = dict(record)
+        event['seq'] = event.pop('_seq', event.get('seq', 0))
+        return event
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def subscribe(self, projection: Callable[[Dict[str, Any], TradingState], None]):
+        """Register a projection called with (event, state) after every append"""
+        with self._lock:
+            self._projections.append(projection)
+
+    def unsubscribe(self, projection: Callable[[Dict[str, Any], TradingState], None]):
+        with self._lock:
+            if projection in self._projections:
+                self._projections.remove(projection)
+
+    def append(self, event_type: str, durable: bool = None, **data) -> Dict[str, Any]:
+        """Append an event, fold it into the state and notify projections"""
+        with self._lock:
+            record = {
+                'type': event_type,
+                'timestamp': datetime.now().isoformat(),
+                'data': data
+            }
+            seq = self.journal.append(record)
+            if durable if durable is not None else event_type in DURABLE_EVENTS:
+                self.journal.sync()
+
+            event = dict(record, seq=seq)
+            self.state.apply(event)
+
+            for projection in list(self._projections):
+                try:
+                    projection(event, self.state)
+                except Exception as e:
+                    logger.error(f"❌ Projection failed for {event_type}: {e}")
+
+            if self.journal.get_stats()['journal_records'] >= self.snapshot_every:
+                self.snapshot()
+            return event
+
+    def snapshot(self):
+        """Persist the folded state and rotate the journal into an archive segment"""
+        with self._lock:
+            self.journal.sync()
+            tmp_path = f"{self.state_snapshot_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self.state.to_dict(), f, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.state_snapshot_path)
+
+            archive = self.archive_pattern.replace('*', f"{self.state.last_seq:012d}")
+            self.journal.rotate(archive)
+            logger.info(f"📸 Event state snapshot at seq {self.state.last_seq}")
+
+    def close(self):
+        self.journal.close()
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def iter_events(self, since_seq: int = 0, event_types: List[str] = None) -> Iterator[Dict[str, Any]]:
+        """Stream events with seq > since_seq from archives and the live journal"""
+        sources = sorted(glob.glob(self.archive_pattern))
+        for archive in sources:
+            # Segment names carry their last seq; skip segments entirely before since_seq
+            last_in_segment = int(archive.rsplit('segment-', 1)[1].split('.')[0])
+            if last_in_segment <= since_seq:
+                continue
+            for record in TransactionJournal.iter_file(archive):
+                event = self._from_record(record)
+                if event['seq'] > since_seq and (not event_types or event['type'] in event_types):
+                    yield event
+        for record in self.journal.iter_records(raw=True):
+            event = self._from_record(record)
+            if event['seq'] > since_seq and (not event_types or event['type'] in event_types):
+                yield event
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'path': self.path,
+            'last_seq': self.state.last_seq,
+            'events_since_snapshot': self.journal.get_stats()['journal_records'],
+            'replayed_on_startup': self.replayed_events,
+            'recovery_ms': round(self.recovery_seconds * 1000, 2),
+            'projections': len(self._projections)
+        }
+
+
+# Global event store instance
+_event_store = None
+_event_store_lock = threading.Lock()
+
+
+def get_event_store() -> EventStore:
+    """Get the process-wide event store (recovered on first use)"""
+    global _event_store
+    with _event_store_lock:
+        if _event_store is None:
+            _event_store = EventStore()
+        return _event_store
@@ -0,0 +1,140 @@
+"""
+Fast JSON serialization
+
+One serializer for every JSON path of the robot: the JSON column type of the
+database, Flask's jsonify and the Plotly chart payloads. It handles datetimes,
+NumPy arrays/scalars, pandas timestamps and Plotly figures natively, so no
+custom JSONEncoder subclass is needed anywhere.
+
+The backend is pluggable through JSON_BACKEND:
+- auto (default): orjson when installed, stdlib json otherwise
+- orjson: Rust encoder, several times faster on large payloads
+- stdlib: the json module with the same type handling
+
+NaN and infinity are encoded as null by both backends (valid JSON, as with
+PlotlyJSONEncoder).
+"""
+
+import os
+import sys
+import json
+import math
+import logging
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Keep a single backend whether imported as `src.fast_json` (web app) or `fast_json` (engines)
+sys.modules.setdefault('fast_json', sys.modules[__name__])
+sys.modules.setdefault('src.fast_json', sys.modules[__name__])
+
+
+def _default(obj: Any) -> Any:
+    """Types the encoders do not know natively"""
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if hasattr(obj, 'to_plotly_json'):    # Plotly figures and traces
+        return obj.to_plotly_json()
+    if hasattr(obj, 'isoformat'):         # pandas Timestamp and similar
+        return obj.isoformat()
+    if hasattr(obj, 'tolist'):            # pandas Series / Index
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _sanitize(obj: Any) -> Any:
+    """stdlib path: replace NaN/inf with None and expand unknown types"""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key if isinstance(key, str) else str(key): _sanitize(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_sanitize(value) for value in obj]
+    if obj is None or isinstance(obj, (str, int, bool)):
+        return obj
+    return _sanitize(_default(obj))
+
+
+class StdlibBackend:
+    name = 'stdlib'
+
+    def dumps(self, obj: Any, sort_keys: bool = False) -> bytes:
+        return json.dumps(_sanitize(obj), sort_keys=sort_keys, separators=(',', ':'),
+                          ensure_ascii=False, allow_nan=False).encode('utf-8')
+
+    def loads(self, data):
+        return json.loads(data)
+
+
+class OrjsonBackend:
+    name = 'orjson'
+
+    def __init__(self):
+        self.options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any, sort_keys: bool = False) -> bytes:
+        options = self.options | orjson.OPT_SORT_KEYS if sort_keys else self.options
+        try:
+            return orjson.dumps(obj, default=_default, option=options)
+        except TypeError:
+            # Non-contiguous or object arrays and similar edge cases
+            return StdlibBackend().dumps(obj, sort_keys)
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+def _select_backend():
+    requested = os.getenv('JSON_BACKEND', 'auto').lower()
+    if requested in ('auto', 'orjson') and orjson is not None:
+        return OrjsonBackend()
+    if requested == 'orjson':
+        logger.warning("⚠️ JSON_BACKEND=orjson but orjson is not installed, using stdlib json")
+    return StdlibBackend()
+
+
+backend = _select_backend()
+
+
+def set_backend(name: str):
+    """Switch backend at runtime ('orjson' or 'stdlib'), e.g. for benchmarks"""
+    global backend
+    if name == 'orjson':
+        if orjson is None:
+            raise ValueError("orjson is not installed")
+        backend = OrjsonBackend()
+    elif name == 'stdlib':
+        backend = StdlibBackend()
+    else:
+        raise ValueError(f"Unknown JSON backend '{name}' (use orjson or stdlib)")
+
+
+def dumps_bytes(obj: Any, sort_keys: bool = False) -> bytes:
+    """Compact UTF-8 JSON"""
+    return backend.dumps(obj, sort_keys)
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> str:
+    """Compact JSON text"""
+    return backend.dumps(obj, sort_keys).decode('utf-8')
+
+
+def loads(data) -> Any:
+    return backend.loads(data)
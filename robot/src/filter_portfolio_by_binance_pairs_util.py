@@ -1,17 +1,21 @@
-import requests
+try:
+    from src.binance_rate_governor import governed_get, get_binance_api_url
+except ImportError:
+    from binance_rate_governor import governed_get, get_binance_api_url
 
-def filter_portfolio_by_binance_pairs(portfolio_coins, quote_assets=("USDT", "BNB")):
+def filter_portfolio_by_binance_pairs(portfolio_coins, quote_assets=("USDT", "BNB"), priority=None):
     """
     Filters a list of coins, returning only those with at least one valid Binance spot trading pair (e.g., COINUSDT or COINBNB).
     Args:
         portfolio_coins (list[str]): List of coin tickers (e.g., ["ADA", "BTC", ...])
         quote_assets (tuple): Quote assets to check pairs against (default: ("USDT", "BNB"))
+        priority (str): Binance governor priority (default: caller's thread priority)
     Returns:
         dict: {coin: [valid_pairs]} for coins with at least one valid pair
         list: [coin] for coins with no valid pairs
     """
-    url = "https://api.binance.com/api/v3/exchangeInfo"
-    resp = requests.get(url)
+    url = f"{get_binance_api_url()}/api/v3/exchangeInfo"
+    resp = governed_get(url, priority=priority, timeout=10)
     resp.raise_for_status()
     data = resp.json()
     all_symbols = set(s['symbol'] for s in data['symbols'] if s['status'] == 'TRADING')
@@ -0,0 +1,140 @@
+"""
+Per-asset analytics of simulation cycles
+
+Questions such as "how much of the portfolio did BTC weigh over the run" or
+"which cycles held more than 20% BTC" are answered from the normalized
+simulation_cycle_holdings table (one row per asset and cycle, indexed on
+simulation, symbol and cycle) with aggregates computed by the database,
+instead of decoding every portfolio breakdown in Python.
+
+Archived simulations no longer have cycles in the database; the same
+results are computed from the archive's breakdowns.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func
+
+try:
+    from src.chart_series import max_page_size
+    from src.database import SimulationCycle, SimulationCycleHolding, cycle_holding_rows
+except ImportError:
+    from chart_series import max_page_size
+    from database import SimulationCycle, SimulationCycleHolding, cycle_holding_rows
+
+
+def _summary_row(symbol, cycles, avg_weight, min_weight, max_weight, avg_value, first_cycle, last_cycle) -> Dict[str, Any]:
+    return {
+        'symbol': symbol,
+        'cycles': int(cycles),
+        'avg_weight': float(avg_weight or 0.0),
+        'min_weight': float(min_weight or 0.0),
+        'max_weight': float(max_weight or 0.0),
+        'avg_value': float(avg_value or 0.0),
+        'first_cycle': first_cycle,
+        'last_cycle': last_cycle
+    }
+
+
+def asset_summary(session, simulation_id: int) -> List[Dict[str, Any]]:
+    """Weight and value statistics of every asset held during a simulation, heaviest first"""
+    h = SimulationCycleHolding
+    rows = session.query(h.symbol, func.count(h.id), func.avg(h.weight), func.min(h.weight), func.max(h.weight),
+                         func.avg(h.value), func.min(h.cycle_number), func.max(h.cycle_number)) \
+        .filter(h.simulation_id == simulation_id) \
+        .group_by(h.symbol) \
+        .order_by(func.avg(h.weight).desc(), h.symbol).all()
+    return [_summary_row(*row) for row in rows]
+
+
+def asset_cycles(session, simulation_id: int, symbol: str, min_weight: float = None, max_weight: float = None,
+                 after: Optional[int] = None, limit: int = 100) -> Dict[str, Any]:
+    """
+    Cycles holding `symbol` (optionally within [min_weight, max_weight]),
+    keyset paginated on cycle_number like chart_series.paginate_cycles
+    """
+    limit = max(1, min(limit, max_page_size()))
+    h, c = SimulationCycleHolding, SimulationCycle
+    query = session.query(h.cycle_number, c.cycle_date, h.weight, h.value, c.total_value) \
+        .join(c, c.id == h.cycle_id) \
+        .filter(h.simulation_id == simulation_id, h.symbol == symbol)
+    if min_weight is not None:
+        query = query.filter(h.weight >= min_weight)
+    if max_weight is not None:
+        query = query.filter(h.weight <= max_weight)
+    if after is not None:
+        query = query.filter(h.cycle_number > after)
+    rows = query.order_by(h.cycle_number).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        'symbol': symbol,
+        'cycles': [
+            {
+                'cycle_number': row.cycle_number,
+                'date': row.cycle_date.isoformat() if row.cycle_date else None,
+                'weight': float(row.weight),
+                'value': float(row.value),
+                'total_value': float(row.total_value or 0.0)
+            }
+            for row in rows
+        ],
+        'next_cursor': rows[-1].cycle_number if has_more and rows else None,
+        'limit': limit
+    }
+
+
+def archive_holdings(archive, path: str) -> List[Dict[str, Any]]:
+    """Holding rows of an archived simulation, in cycle order, with each cycle's date and total value"""
+    data = archive.read_columns(path, ('cycle_date', 'total_value', 'portfolio_breakdown'))
+    rows = []
+    for number, date, total_value, breakdown in zip(data['cycle_number'], data['cycle_date'],
+                                                    data['total_value'], data['portfolio_breakdown']):
+        for row in cycle_holding_rows(None, None, number, total_value, breakdown):
+            row.update(date=date, total_value=float(total_value or 0.0))
+            rows.append(row)
+    return rows
+
+
+def archive_asset_summary(archive, path: str) -> List[Dict[str, Any]]:
+    """asset_summary of an archived simulation"""
+    assets = OrderedDict()
+    for row in archive_holdings(archive, path):
+        assets.setdefault(row['symbol'], []).append(row)
+    summary = []
+    for symbol, rows in assets.items():
+        weights = [row['weight'] for row in rows]
+        summary.append(_summary_row(symbol, len(rows), sum(weights) / len(rows), min(weights), max(weights),
+                                    sum(row['value'] for row in rows) / len(rows),
+                                    rows[0]['cycle_number'], rows[-1]['cycle_number']))
+    return sorted(summary, key=lambda row: (-row['avg_weight'], row['symbol']))
+
+
+def archive_asset_cycles(archive, path: str, symbol: str, min_weight: float = None, max_weight: float = None,
+                         after: Optional[int] = None, limit: int = 100) -> Dict[str, Any]:
+    """asset_cycles of an archived simulation"""
+    limit = max(1, min(limit, max_page_size()))
+    rows = [row for row in archive_holdings(archive, path)
+            if row['symbol'] == symbol
+            and (min_weight is None or row['weight'] >= min_weight)
+            and (max_weight is None or row['weight'] <= max_weight)
+            and (after is None or row['cycle_number'] > after)]
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        'symbol': symbol,
+        'cycles': [
+            {
+                'cycle_number': row['cycle_number'],
+                'date': row['date'].isoformat() if row['date'] else None,
+                'weight': row['weight'],
+                'value': row['value'],
+                'total_value': row['total_value']
+            }
+            for row in rows
+        ],
+        'next_cursor': rows[-1]['cycle_number'] if has_more and rows else None,
+        'limit': limit
+    }
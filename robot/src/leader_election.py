@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Leader Election for Background Loops
+
+The web app can run as several worker processes. Loops that mutate shared
+state (the simulation watchdog) or bind a shared resource (the event bus
+port) must run in exactly one of them. Every worker runs an elector thread;
+the worker that wins the election runs the loops, the others serve requests
+only and keep retrying, so a new leader takes over when the current one dies.
+Loops pause while leadership is lost; resources such as the event bus port
+are released through on_change callbacks and taken again on re-election.
+
+Backends (LEADER_ELECTION):
+- file (default): non-blocking flock on a lock file. Held for the life of the
+  process and released by the OS when it exits. Workers on one host.
+- db: a lease row in leader_leases, taken with a conditional UPDATE and
+  renewed every LEADER_LEASE_SECONDS / 3. Workers on several hosts sharing
+  the database.
+- none: this process is always the leader (single-process deployments).
+"""
+
+import os
+import uuid
+import socket
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: file locks are unavailable
+    fcntl = None
+
+from sqlalchemy.exc import IntegrityError
+
+try:
+    from src.database import get_db_manager, LeaderLease
+except ImportError:
+    from database import get_db_manager, LeaderLease
+
+logger = logging.getLogger(__name__)
+
+
+def worker_identity() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class AlwaysLeader:
+    """Single-process deployments: no election"""
+    name = 'none'
+
+    def try_acquire(self) -> bool:
+        return True
+
+    def release(self):
+        pass
+
+
+class FileLockBackend:
+    """Leadership = holding an exclusive flock on a lock file"""
+    name = 'file'
+
+    def __init__(self, path: str):
+        self.path = path
+        self._handle = None
+
+    def try_acquire(self) -> bool:
+        if self._handle is not None:
+            return True  # flocks are held until released or the process exits
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        handle = open(self.path, 'a+')
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        handle.seek(0)
+        handle.truncate()
+        handle.write(f"{os.getpid()}\n")
+        handle.flush()
+        self._handle = handle
+        return True
+
+    def release(self):
+        handle, self._handle = self._handle, None
+        if handle is not None:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+            handle.close()
+
+
+class DatabaseLeaseBackend:
+    """Leadership = an unexpired lease row naming this worker"""
+    name = 'db'
+
+    def __init__(self, role: str, holder: str, lease_seconds: float, db_manager=None):
+        self.role = role
+        self.holder = holder
+        self.lease_seconds = lease_seconds
+        self.db_manager = db_manager or get_db_manager()
+
+    def try_acquire(self) -> bool:
+        """Take or renew the lease; one conditional UPDATE, so two workers cannot both win"""
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.lease_seconds)
+        session = self.db_manager.get_session()
+        try:
+            updated = session.query(LeaderLease).filter(
+                LeaderLease.name == self.role,
+                (LeaderLease.holder == self.holder) | (LeaderLease.expires_at < now)
+            ).update({'holder': self.holder, 'expires_at': expires_at}, synchronize_session=False)
+            if updated:
+                session.commit()
+                return True
+            if session.get(LeaderLease, self.role) is not None:
+                session.rollback()
+                return False
+            session.add(LeaderLease(name=self.role, holder=self.holder, expires_at=expires_at, acquired_at=now))
+            session.commit()
+            return True
+        except IntegrityError:
+            session.rollback()  # another worker inserted the lease first
+            return False
+        finally:
+            session.close()
+
+    def release(self):
+        session = self.db_manager.get_session()
+        try:
+            session.query(LeaderLease).filter_by(name=self.role, holder=self.holder) \
+                .update({'expires_at': datetime.utcnow()}, synchronize_session=False)
+            session.commit()
+        finally:
+            session.close()
+
+
+class LeaderElection:
+    """
+    Elects one worker for a background role and runs callbacks when elected
+    """
+
+    def __init__(self, role: str, backend=None, retry_seconds: float = 5.0):
+        self.role = role
+        self.backend = backend or AlwaysLeader()
+        self.retry_seconds = retry_seconds
+        self._is_leader = False
+        self._on_elected: List[Callable[[], None]] = []
+        self._on_change: List[Callable[[bool], None]] = []
+        self._stop = threading.Event()
+        self._thread = None
+        self.elections = 0
+
+    @property
+    def is_leader(self) -> bool:
+        return self._is_leader
+
+    def on_elected(self, callback: Callable[[], None]):
+        """Run callback (once) the first time this worker becomes leader"""
+        self._on_elected.append(callback)
+
+    def on_change(self, callback: Callable[[bool], None]):
+        """Run callback(is_leader) every time this worker gains or loses leadership"""
+        self._on_change.append(callback)
+
+    def _notify(self, callbacks, *args):
+        for callback in callbacks:
+            try:
+                callback(*args)
+            except Exception as e:
+                logger.error(f"❌ Leadership callback for {self.role} failed: {e}")
+
+    def poll(self) -> bool:
+        """One election round: acquire or renew, then start the loops if newly elected"""
+        try:
+            leader = self.backend.try_acquire()
+        except Exception as e:
+            logger.warning(f"⚠️ Leader election for {self.role} failed: {e}")
+            leader = False
+
+        was_leader, self._is_leader = self._is_leader, leader
+        if leader and not was_leader:
+            self.elections += 1
+            logger.info(f"👑 This worker (pid {os.getpid()}) is leader for {self.role}")
+            # is_leader is already set: the loops started here check it on their first pass
+            if self.elections == 1:
+                self._notify(self._on_elected)
+            self._notify(self._on_change, True)
+        elif was_leader and not leader:
+            logger.warning(f"⚠️ Lost leadership for {self.role}, background loops pause")
+            self._notify(self._on_change, False)
+        return leader
+
+    def start(self, spawn: Callable = None):
+        """Run election rounds in the background (spawn: e.g. socketio.start_background_task)"""
+        if self._thread is not None:
+            return
+
+        def elect_loop():
+            while not self._stop.is_set():
+                self.poll()
+                self._stop.wait(self.retry_seconds)
+
+        if spawn is not None:
+            self._thread = spawn(elect_loop)
+        else:
+            self._thread = threading.Thread(target=elect_loop, name=f'leader-{self.role}', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._is_leader:
+            self.backend.release()
+            self._is_leader = False
+            self._notify(self._on_change, False)
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            'role': self.role,
+            'backend': self.backend.name,
+            'is_leader': self._is_leader,
+            'elections': self.elections,
+            'pid': os.getpid()
+        }
+
+
+def create_leader_election(role: str, db_manager=None) -> LeaderElection:
+    """Leader election for `role` with the backend selected by LEADER_ELECTION"""
+    mode = os.getenv('LEADER_ELECTION', 'file').lower()
+    lease_seconds = float(os.getenv('LEADER_LEASE_SECONDS', '30'))
+
+    if mode == 'file' and fcntl is None:
+        logger.warning("⚠️ File-lock leader election needs fcntl; this process runs the background loops")
+        mode = 'none'
+
+    if mode == 'file':
+        lock_dir = os.getenv('LEADER_LOCK_DIR', 'data')
+        backend = FileLockBackend(os.path.join(lock_dir, f"{role}.leader.lock"))
+        retry = 5.0
+    elif mode == 'db':
+        backend = DatabaseLeaseBackend(role, worker_identity(), lease_seconds, db_manager)
+        retry = lease_seconds / 3.0
+    else:
+        backend = AlwaysLeader()
+        retry = 60.0
+    return LeaderElection(role, backend, retry_seconds=retry)
@@ -5,23 +5,103 @@ Implements RSI, MACD, moving averages, and momentum analysis
 to improve coin selection and timing decisions.
 """
 
+import os
+import time
 import logging
+import threading
 import requests
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Optional
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Tuple, Optional
 from datetime import datetime, timedelta
+from binance.helpers import interval_to_milliseconds
+
+try:
+    from src.binance_rate_governor import governed_get, get_binance_api_url
+except ImportError:
+    from binance_rate_governor import governed_get, get_binance_api_url
 
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries also expire after `ttl` seconds
+    """
+    
+    def __init__(self, maxsize: int = 256, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self):
+        return len(self._data)
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'ttl_seconds': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations
+        }
+
+
 class MarketAnalyzer:
     """
     Advanced market analysis with technical indicators and momentum scoring
     """
     
-    def __init__(self):
-        self.price_cache = {}
-        self.indicator_cache = {}
+    def __init__(self, priority: str = None):
+        self.priority = priority  # Binance governor priority for kline requests
+        self.interval = '1d'
+        
+        # Prices keyed by (symbol, interval, days, current candle open time),
+        # indicators by (symbol, interval, last candle time, indicator, params).
+        # The TTL bounds staleness of the still-forming last candle.
+        max_entries = int(os.getenv('MARKET_CACHE_MAX_ENTRIES', '512'))
+        self.price_cache = TTLCache(max_entries, float(os.getenv('MARKET_PRICE_CACHE_TTL', '60')))
+        self.indicator_cache = TTLCache(max_entries * 4, float(os.getenv('MARKET_INDICATOR_CACHE_TTL', '60')))
         
         # Technical analysis parameters
         self.rsi_period = 14
@@ -35,20 +115,30 @@ class MarketAnalyzer:
         
         logger.info("Market Analyzer initialized")
     
-    def fetch_historical_prices(self, symbol: str, days: int = 30) -> pd.DataFrame:
+    def fetch_historical_prices(self, symbol: str, days: int = 30, interval: str = None) -> pd.DataFrame:
         """
-        Fetch historical price data for technical analysis
+        Fetch historical price data for technical analysis (cached until the
+        next candle opens or the price TTL expires)
         """
+        interval = interval or self.interval
+        interval_ms = interval_to_milliseconds(interval)
+        now_ms = int(time.time() * 1000)
+        cache_key = (symbol, interval, days, now_ms - now_ms % interval_ms)
+        
+        cached = self.price_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             # Use Binance API for historical data
-            url = "https://api.binance.com/api/v3/klines"
+            url = f"{get_binance_api_url()}/api/v3/klines"
             params = {
                 'symbol': f"{symbol}USDT",
-                'interval': '1d',
+                'interval': interval,
                 'limit': days
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = governed_get(url, params=params, priority=self.priority, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 
@@ -64,11 +154,11 @@ class MarketAnalyzer:
                     for col in ['open', 'high', 'low', 'close', 'volume']:
                         df[col] = pd.to_numeric(df[col])
                     
-                    # Cache the data
-                    self.price_cache[symbol] = df
+                    df = df[['timestamp', 'open', 'high', 'low', 'close', 'volume']]
+                    self.price_cache.set(cache_key, df)
                     
                     logger.debug(f"Fetched {len(df)} price points for {symbol}")
-                    return df[['timestamp', 'open', 'high', 'low', 'close', 'volume']]
+                    return df
             
         except Exception as e:
             logger.error(f"Error fetching historical prices for {symbol}: {e}")
@@ -136,6 +226,41 @@ class MarketAnalyzer:
                 'sma_long': prices
             }
     
+    def _cached_indicator(self, symbol: str, df: pd.DataFrame, name: str,
+                          compute: Callable, *params) -> Any:
+        """
+        Memoize an indicator computed from `df` under
+        (symbol, interval, last candle time, name, params)
+        """
+        key = (symbol, self.interval, df['timestamp'].iloc[-1], name, params)
+        value = self.indicator_cache.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute(df['close'], *params)
+            self.indicator_cache.set(key, value)
+        return value
+    
+    def get_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Hit/miss statistics of the price and indicator caches
+        """
+        return {
+            'prices': self.price_cache.stats(),
+            'indicators': self.indicator_cache.stats()
+        }
+    
+    def get_momentum_indicators(self, symbol: str) -> Dict[str, Any]:
+        """
+        Latest momentum snapshot (score, RSI, MACD, 7d change) for a symbol,
+        computed at most once per candle and TTL window
+        """
+        df = self.fetch_historical_prices(symbol, 30)
+        if df.empty or len(df) < 21:
+            return {}
+        
+        self.calculate_momentum_score(symbol)
+        key = (symbol, self.interval, df['timestamp'].iloc[-1], 'momentum', ())
+        return self.indicator_cache.get(key, {})
+    
     def calculate_momentum_score(self, symbol: str) -> float:
         """
         Calculate comprehensive momentum score (0-100)
@@ -145,13 +270,20 @@ class MarketAnalyzer:
         if df.empty or len(df) < 21:
             return 50  # Neutral score for insufficient data
         
+        snapshot_key = (symbol, self.interval, df['timestamp'].iloc[-1], 'momentum', ())
+        snapshot = self.indicator_cache.get(snapshot_key)
+        if snapshot is not None:
+            return snapshot['momentum_score']
+        
         try:
             prices = df['close']
             
             # Calculate technical indicators
-            rsi = self.calculate_rsi(prices, self.rsi_period)
-            macd_data = self.calculate_macd(prices, self.macd_fast, self.macd_slow, self.macd_signal)
-            ma_data = self.calculate_moving_averages(prices, self.sma_short, self.sma_long)
+            rsi = self._cached_indicator(symbol, df, 'rsi', self.calculate_rsi, self.rsi_period)
+            macd_data = self._cached_indicator(symbol, df, 'macd', self.calculate_macd,
+                                               self.macd_fast, self.macd_slow, self.macd_signal)
+            ma_data = self._cached_indicator(symbol, df, 'sma', self.calculate_moving_averages,
+                                             self.sma_short, self.sma_long)
             
             # Get latest values
             current_price = prices.iloc[-1]
@@ -200,14 +332,14 @@ class MarketAnalyzer:
             momentum_score = max(0, min(100, momentum_score))
             
             # Cache the result
-            self.indicator_cache[symbol] = {
+            self.indicator_cache.set(snapshot_key, {
                 'momentum_score': momentum_score,
                 'rsi': current_rsi,
                 'macd': current_macd,
                 'signal': current_signal,
                 'price_change_7d': price_change_7d,
                 'timestamp': datetime.now()
-            }
+            })
             
             logger.debug(f"Momentum score for {symbol}: {momentum_score:.1f}")
             return momentum_score
@@ -301,7 +433,7 @@ class MarketAnalyzer:
             # Check momentum threshold
             if momentum_score >= min_momentum_score:
                 # Additional technical filters
-                indicators = self.indicator_cache.get(symbol, {})
+                indicators = self.get_momentum_indicators(symbol)
                 rsi = indicators.get('rsi', 50)
                 
                 # Avoid extremely overbought conditions
@@ -320,11 +452,7 @@ class MarketAnalyzer:
         """
         Generate entry/exit signals based on technical analysis
         """
-        indicators = self.indicator_cache.get(symbol, {})
-        
-        if not indicators:
-            self.calculate_momentum_score(symbol)  # Calculate if not cached
-            indicators = self.indicator_cache.get(symbol, {})
+        indicators = self.get_momentum_indicators(symbol)
         
         signals = {
             'entry_signal': 'NEUTRAL',
@@ -395,4 +523,6 @@ if __name__ == "__main__":
     if filtered:
         print(f"\nEntry/Exit signals for {filtered[0]}:")
         signals = analyzer.get_entry_exit_signals(filtered[0])
-        print(f"  {signals}")
\ No newline at end of file
+        print(f"  {signals}")
+    print(f"\nCache statistics:")
+    print(f"  {analyzer.get_cache_stats()}")
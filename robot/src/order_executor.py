@@ -0,0 +1,418 @@
+"""
+Concurrent Order Executor
+
+Turns a rebalance into market orders and executes them in two waves: every
+sell concurrently, then every buy concurrently, so buys are funded by the
+sells and a 10-asset rebalance takes about as long as its slowest order.
+Deltas are netted per symbol first, so one symbol never gets both a buy and
+a sell in the same cycle. Every quantity is rounded down to the pair's
+LOT_SIZE step after any scaling, and orders below its minQty or MIN_NOTIONAL
+are dropped before submission (exchangeInfo filters are cached per symbol).
+Each order carries a client order id; when placing it raises (a timeout may
+come after the exchange accepted the order) the order is looked up by that
+id before its fill is recorded. Request weight is accounted by the Binance governor; the executor
+additionally caps in-flight orders and orders per second.
+"""
+
+import os
+import time
+import uuid
+import logging
+import threading
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from decimal import Decimal, ROUND_DOWN
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from src.binance_rate_governor import current_priority, request_priority
+    from src.event_store import EVENT_ORDER_PLACED, EVENT_ORDER_FILLED, EVENT_ORDER_FAILED
+except ImportError:
+    from binance_rate_governor import current_priority, request_priority
+    from event_store import EVENT_ORDER_PLACED, EVENT_ORDER_FILLED, EVENT_ORDER_FAILED
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OrderIntent:
+    """A netted market order to place"""
+    symbol: str          # base asset, e.g. 'ETH'
+    side: str            # 'BUY' or 'SELL'
+    quantity: float
+    reference_price: float = 0.0  # price (in quote asset) used to size the order
+
+
+@dataclass
+class OrderFill:
+    """Outcome of one market order"""
+    symbol: str
+    side: str
+    requested_quantity: float
+    executed_quantity: float = 0.0
+    quote_quantity: float = 0.0
+    average_price: float = 0.0
+    commission: float = 0.0
+    status: str = 'FAILED'
+    order_id: Optional[int] = None
+    client_order_id: str = ''
+    error: str = ''
+    latency_seconds: float = 0.0
+
+    @property
+    def is_filled(self) -> bool:
+        return self.status == 'FILLED'
+
+    @property
+    def is_partial(self) -> bool:
+        return 0 < self.executed_quantity < self.requested_quantity and not self.is_filled
+
+
+@dataclass
+class ExecutionReport:
+    """All fills of one rebalance, sells first"""
+    fills: List[OrderFill] = field(default_factory=list)
+    started_at: datetime = field(default_factory=datetime.now)
+    finished_at: Optional[datetime] = None
+    sell_wave_seconds: float = 0.0
+    buy_wave_seconds: float = 0.0
+
+    @property
+    def duration_seconds(self) -> float:
+        if not self.finished_at:
+            return 0.0
+        return (self.finished_at - self.started_at).total_seconds()
+
+    @property
+    def sold_quote(self) -> float:
+        return sum(f.quote_quantity for f in self.fills if f.side == 'SELL')
+
+    @property
+    def bought_quote(self) -> float:
+        return sum(f.quote_quantity for f in self.fills if f.side == 'BUY')
+
+    @property
+    def failed(self) -> List[OrderFill]:
+        return [f for f in self.fills if f.executed_quantity == 0]
+
+    @property
+    def partial(self) -> List[OrderFill]:
+        return [f for f in self.fills if f.is_partial]
+
+    def executed_deltas(self) -> Dict[str, float]:
+        """Signed executed quantity per symbol (+ bought, - sold)"""
+        deltas = {}
+        for f in self.fills:
+            sign = 1 if f.side == 'BUY' else -1
+            deltas[f.symbol] = deltas.get(f.symbol, 0.0) + sign * f.executed_quantity
+        return deltas
+
+    def to_dict(self) -> Dict:
+        return {
+            'started_at': self.started_at.isoformat(),
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'duration_seconds': self.duration_seconds,
+            'sell_wave_seconds': self.sell_wave_seconds,
+            'buy_wave_seconds': self.buy_wave_seconds,
+            'orders': len(self.fills),
+            'filled': sum(1 for f in self.fills if f.is_filled),
+            'partial': len(self.partial),
+            'failed': len(self.failed),
+            'sold_quote': self.sold_quote,
+            'bought_quote': self.bought_quote,
+            'fills': [asdict(f) for f in self.fills]
+        }
+
+    def summary_lines(self) -> List[str]:
+        """Human-readable actions for cycle records"""
+        lines = []
+        for f in self.fills:
+            if f.executed_quantity > 0:
+                tag = 'PARTIAL' if f.is_partial else f.side
+                lines.append(f"{tag} {f.symbol}: {f.executed_quantity:.8f} @ {f.average_price:.8f}")
+            else:
+                lines.append(f"FAILED {f.side} {f.symbol}: {f.error or f.status}")
+        return lines
+
+
+@dataclass
+class SymbolFilters:
+    """Exchange trading rules of one pair that apply to market orders"""
+    step_size: Decimal = Decimal('0')
+    min_qty: float = 0.0
+    max_qty: float = 0.0
+    min_notional: float = 0.0
+
+    @classmethod
+    def from_symbol_info(cls, info: Dict) -> 'SymbolFilters':
+        """LOT_SIZE/MARKET_LOT_SIZE and MIN_NOTIONAL/NOTIONAL of an exchangeInfo symbol (strictest wins)"""
+        filters = cls()
+        for f in info.get('filters', []):
+            kind = f.get('filterType')
+            if kind in ('LOT_SIZE', 'MARKET_LOT_SIZE'):
+                step = Decimal(f.get('stepSize', '0'))
+                if step > filters.step_size:
+                    filters.step_size = step
+                filters.min_qty = max(filters.min_qty, float(f.get('minQty', 0)))
+                max_qty = float(f.get('maxQty', 0))
+                if max_qty > 0:
+                    filters.max_qty = min(filters.max_qty, max_qty) if filters.max_qty else max_qty
+            elif kind == 'MIN_NOTIONAL' and f.get('applyToMarket', True):
+                filters.min_notional = max(filters.min_notional, float(f.get('minNotional', 0)))
+            elif kind == 'NOTIONAL' and f.get('applyMinToMarket', True):
+                filters.min_notional = max(filters.min_notional, float(f.get('minNotional', 0)))
+        return filters
+
+    def round_quantity(self, quantity: float) -> float:
+        """Round down to the lot step (and cap at maxQty)"""
+        if self.max_qty:
+            quantity = min(quantity, self.max_qty)
+        if self.step_size <= 0:
+            return quantity
+        steps = (Decimal(repr(quantity)) / self.step_size).to_integral_value(rounding=ROUND_DOWN)
+        return float(steps * self.step_size)
+
+    def rejection(self, quantity: float, price: float) -> str:
+        """Why the exchange would reject this order ('' when it passes)"""
+        if quantity <= 0 or quantity < self.min_qty:
+            return f"quantity {quantity} below minQty {self.min_qty}"
+        if price > 0 and quantity * price < self.min_notional:
+            return f"notional {quantity * price:.8f} below minNotional {self.min_notional}"
+        return ''
+
+
+def format_quantity(quantity: float) -> str:
+    """Plain decimal string for the order API (str() of small floats uses exponents)"""
+    return format(Decimal(repr(quantity)).normalize(), 'f')
+
+
+class SymbolFilterCache:
+    """
+    exchangeInfo filters per pair, loaded with one call and refreshed every
+    `ttl` seconds (ORDER_FILTERS_TTL); shared by every executor by default
+    """
+
+    def __init__(self, ttl: float = None):
+        self.ttl = ttl if ttl is not None else float(os.getenv('ORDER_FILTERS_TTL', '3600'))
+        self._filters: Dict[str, SymbolFilters] = {}
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def get(self, binance_client, pair: str) -> Optional[SymbolFilters]:
+        with self._lock:
+            if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl:
+                self._load(binance_client)
+            return self._filters.get(pair)
+
+    def _load(self, binance_client):
+        try:
+            exchange_info = binance_client.get_exchange_info()
+        except Exception as e:
+            logger.error(f"❌ Could not load exchange filters: {e}")
+            return
+        self._filters = {info['symbol']: SymbolFilters.from_symbol_info(info)
+                         for info in exchange_info.get('symbols', [])}
+        self._loaded_at = time.monotonic()
+
+
+_shared_filters = SymbolFilterCache()
+
+
+def net_order_deltas(current: Dict[str, float], target: Dict[str, float],
+                     prices: Dict[str, float], min_notional: float = 0.0) -> List[OrderIntent]:
+    """
+    Net current vs target quantities per symbol into one order each.
+    Orders worth less than `min_notional` (quote asset) are dropped.
+    """
+    intents = []
+    for symbol in sorted(set(current) | set(target)):
+        delta = target.get(symbol, 0.0) - current.get(symbol, 0.0)
+        price = prices.get(symbol, 0.0)
+        if delta == 0 or price <= 0:
+            continue
+        if abs(delta) * price < min_notional:
+            continue
+        intents.append(OrderIntent(symbol, 'BUY' if delta > 0 else 'SELL', abs(delta), price))
+    return intents
+
+
+def net_deltas(deltas: Iterable[Tuple[str, float]]) -> Dict[str, float]:
+    """Sum signed (symbol, quantity) deltas into one delta per symbol"""
+    netted = {}
+    for symbol, quantity in deltas:
+        netted[symbol] = netted.get(symbol, 0.0) + quantity
+    return {symbol: qty for symbol, qty in netted.items() if qty != 0}
+
+
+class OrderExecutor:
+    """
+    Executes netted market orders: all sells in parallel, then all buys in parallel
+    """
+
+    def __init__(self, binance_client, quote_asset: str = None, max_workers: int = None,
+                 max_orders_per_second: float = None, event_store=None,
+                 symbol_filters: SymbolFilterCache = None, reconcile_attempts: int = None,
+                 reconcile_delay_seconds: float = None):
+        self.binance_client = binance_client
+        self.event_store = event_store  # optional EventStore receiving order/fill events
+        self.symbol_filters = symbol_filters or _shared_filters
+        self.quote_asset = quote_asset or os.getenv('RESERVE_ASSET', 'BNB')
+        self.max_workers = max_workers or int(os.getenv('ORDER_EXECUTOR_MAX_WORKERS', '10'))
+        rate = max_orders_per_second or float(os.getenv('ORDER_MAX_PER_SECOND', '8'))
+        self._min_interval = 1.0 / rate if rate > 0 else 0.0
+        self.reconcile_attempts = reconcile_attempts if reconcile_attempts is not None else int(os.getenv('ORDER_RECONCILE_ATTEMPTS', '3'))
+        self.reconcile_delay_seconds = reconcile_delay_seconds if reconcile_delay_seconds is not None else float(os.getenv('ORDER_RECONCILE_DELAY_SECONDS', '1'))
+        self._next_slot = 0.0
+        self._slot_lock = threading.Lock()
+
+    def _wait_for_order_slot(self):
+        """Space order submissions to stay under the exchange order-rate limit"""
+        with self._slot_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def _reconcile(self, pair: str, fill: OrderFill) -> Optional[Dict]:
+        """
+        Look up an order whose placement raised; it may have reached the
+        exchange anyway. Returns the order, or None when it does not exist.
+        Leaves fill.status UNKNOWN when the exchange could not be asked.
+        """
+        lookup_error = None
+        for attempt in range(self.reconcile_attempts):
+            time.sleep(self.reconcile_delay_seconds * (attempt + 1))
+            try:
+                order = self.binance_client.get_order(pair, fill.client_order_id)
+            except Exception as e:
+                lookup_error = e
+                continue
+            if order:
+                logger.warning(f"⚠️ {fill.side} {pair} raised ({fill.error}) but reached the exchange: "
+                               f"{order.get('status')}")
+                return order
+            lookup_error = None  # the exchange answered: no such order (yet)
+        if lookup_error is not None:
+            fill.status = 'UNKNOWN'
+            fill.error = f"{fill.error}; order {fill.client_order_id} not reconciled: {lookup_error}"
+        return None
+
+    def _place(self, intent: OrderIntent, priority: str) -> OrderFill:
+        fill = OrderFill(intent.symbol, intent.side, intent.quantity,
+                         client_order_id=f"rb-{uuid.uuid4().hex[:30]}")
+        pair = f"{intent.symbol}{self.quote_asset}"
+        self._wait_for_order_slot()
+        if self.event_store is not None:
+            self.event_store.append(EVENT_ORDER_PLACED, symbol=intent.symbol, side=intent.side,
+                                    quantity=intent.quantity, reference_price=intent.reference_price,
+                                    client_order_id=fill.client_order_id)
+        started = time.monotonic()
+        try:
+            with request_priority(priority):
+                order = self.binance_client.place_market_order(pair, intent.side,
+                                                               format_quantity(intent.quantity),
+                                                               client_order_id=fill.client_order_id)
+        except Exception as e:
+            fill.error = str(e)
+            with request_priority(priority):
+                order = self._reconcile(pair, fill)
+            if order:
+                fill.error = ''
+        fill.latency_seconds = time.monotonic() - started
+
+        if not order:
+            fill.error = fill.error or 'order rejected'
+            logger.error(f"❌ {intent.side} {pair} {intent.quantity} failed: {fill.error}")
+            self._record_fill(fill)
+            return fill
+
+        fill.order_id = order.get('orderId')
+        fill.status = order.get('status', 'UNKNOWN')
+        fill.client_order_id = order.get('clientOrderId', fill.client_order_id)
+        fill.executed_quantity = float(order.get('executedQty', 0) or 0)
+        fill.quote_quantity = float(order.get('cummulativeQuoteQty', 0) or 0)
+        if fill.executed_quantity > 0:
+            fill.average_price = fill.quote_quantity / fill.executed_quantity
+        fill.commission = sum(float(f.get('commission', 0)) for f in order.get('fills', [])
+                              if f.get('commissionAsset') == self.quote_asset)
+        if fill.is_partial:
+            logger.warning(f"⚠️ {intent.side} {pair} partially filled: "
+                           f"{fill.executed_quantity}/{intent.quantity}")
+        self._record_fill(fill)
+        return fill
+
+    def _record_fill(self, fill: OrderFill):
+        if self.event_store is None:
+            return
+        event_type = EVENT_ORDER_FILLED if fill.executed_quantity > 0 else EVENT_ORDER_FAILED
+        self.event_store.append(event_type, **asdict(fill))
+
+    def _run_wave(self, intents: List[OrderIntent], priority: str) -> List[OrderFill]:
+        if not intents:
+            return []
+        workers = min(self.max_workers, len(intents))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='order') as pool:
+            return list(pool.map(lambda intent: self._place(intent, priority), intents))
+
+    @staticmethod
+    def _fund_buys(buys: List[OrderIntent], budget: float) -> List[OrderIntent]:
+        """Scale buys down proportionally when the sells raised less than planned"""
+        needed = sum(i.quantity * i.reference_price for i in buys)
+        if needed <= budget or needed <= 0:
+            return buys
+        scale = max(0.0, budget) / needed
+        logger.warning(f"⚠️ Buy wave needs {needed:.8f}, only {budget:.8f} available; scaling by {scale:.3f}")
+        return [OrderIntent(i.symbol, i.side, i.quantity * scale, i.reference_price)
+                for i in buys if i.quantity * scale > 0]
+
+    def _apply_filters(self, intents: List[OrderIntent]) -> List[OrderIntent]:
+        """Round quantities down to the lot step and drop orders the exchange would reject"""
+        accepted = []
+        for intent in intents:
+            pair = f"{intent.symbol}{self.quote_asset}"
+            filters = self.symbol_filters.get(self.binance_client, pair)
+            if filters is None:
+                reason = f"no exchange filters for {pair}"
+            else:
+                quantity = filters.round_quantity(intent.quantity)
+                reason = filters.rejection(quantity, intent.reference_price)
+            if reason:
+                logger.info(f"⏭️ Skipping {intent.side} {pair} {intent.quantity}: {reason}")
+                continue
+            accepted.append(OrderIntent(intent.symbol, intent.side, quantity, intent.reference_price))
+        return accepted
+
+    def execute(self, intents: List[OrderIntent], available_quote: float = None) -> ExecutionReport:
+        """
+        Execute sells concurrently, then buys concurrently; returns one report.
+        With `available_quote` the buy wave is capped at that balance plus the
+        proceeds actually raised by the sell wave.
+        """
+        report = ExecutionReport()
+        priority = current_priority()
+
+        sells = [i for i in intents if i.side == 'SELL']
+        buys = [i for i in intents if i.side == 'BUY']
+        logger.info(f"📤 Executing {len(sells)} sells then {len(buys)} buys "
+                    f"(up to {self.max_workers} in flight)")
+
+        sells = self._apply_filters(sells)
+        wave_start = time.monotonic()
+        report.fills.extend(self._run_wave(sells, priority))
+        report.sell_wave_seconds = time.monotonic() - wave_start
+
+        if available_quote is not None:
+            buys = self._fund_buys(buys, available_quote + report.sold_quote)
+        buys = self._apply_filters(buys)  # after scaling, which breaks step alignment
+
+        wave_start = time.monotonic()
+        report.fills.extend(self._run_wave(buys, priority))
+        report.buy_wave_seconds = time.monotonic() - wave_start
+
+        report.finished_at = datetime.now()
+        logger.info(f"✅ Orders done in {report.duration_seconds:.2f}s: "
+                    f"{len(report.fills) - len(report.failed)} executed, "
+                    f"{len(report.partial)} partial, {len(report.failed)} failed")
+        return report
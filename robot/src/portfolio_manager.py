@@ -2,16 +2,21 @@
 Portfolio Manager for crypto trading robot using SQLAlchemy ORM
 """
 import logging
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, desc
+from sqlalchemy.orm.exc import NoResultFound, StaleDataError
 
 from src.database import (
     get_db_manager, Portfolio, Position, TradingCycle,
-    CyclePosition, init_database
+    CyclePosition, CycleRollup, LatestStatus, LATEST_STATUS_ID, init_database
 )
+from src.cycle_rollups import SCOPE_PORTFOLIO
+from src.event_bus import get_event_bus, TOPIC_STATUS
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +64,240 @@ class CycleData:
     positions: List[PortfolioPosition]
     actions_taken: List[str]
 
+class PortfolioAggregate:
+    """
+    In-memory unit of work over one portfolio.
+
+    Loads the portfolio row and its active positions once, serves every read
+    from memory and records changes; `flush()` writes them back in a single
+    transaction. Only the portfolio fields that changed are written, and only
+    if they still hold the loaded values (compare-and-set), so a change another
+    process committed meanwhile is never overwritten. An aggregate is used for
+    one cycle and discarded after flushing.
+    """
+
+    PORTFOLIO_FIELDS = ('bnb_reserve', 'current_cycle', 'is_frozen', 'freeze_reason')
+
+    def __init__(self, portfolio: Portfolio, positions: List[Position]):
+        self.portfolio_id = portfolio.id
+        self.bnb_reserve = portfolio.bnb_reserve
+        self.current_cycle = portfolio.current_cycle
+        self.is_frozen = portfolio.is_frozen
+        self.freeze_reason = portfolio.freeze_reason
+        self.positions: Dict[str, PortfolioPosition] = {
+            pos.symbol: PortfolioPosition(
+                symbol=pos.symbol,
+                quantity=pos.quantity,
+                entry_price=pos.entry_price,
+                current_price=pos.current_price,
+                entry_date=pos.entry_date
+            )
+            for pos in positions
+        }
+        self._position_ids: Dict[str, int] = {pos.symbol: pos.id for pos in positions}
+        self._loaded_state = self._portfolio_state()
+
+        # Pending changes
+        self._dirty_symbols = set()
+        self._deactivated_ids: List[int] = []
+        self._pending_cycles: List[Tuple[TradingCycle, List[CyclePosition]]] = []
+
+    @classmethod
+    def load(cls, session: Session, portfolio_id: int) -> 'PortfolioAggregate':
+        """Load the portfolio and its active positions (one query: portfolio outer join positions)"""
+        rows = session.query(Portfolio, Position).outerjoin(
+            Position, and_(Position.portfolio_id == Portfolio.id, Position.is_active == True)
+        ).filter(Portfolio.id == portfolio_id).all()
+        if not rows:
+            raise NoResultFound(f"Portfolio {portfolio_id} not found")
+        return cls(rows[0][0], [position for _, position in rows if position is not None])
+
+    def _portfolio_state(self) -> Tuple:
+        return tuple(getattr(self, name) for name in self.PORTFOLIO_FIELDS)
+
+    def _changed_fields(self) -> Dict[str, Tuple]:
+        """{field: (loaded value, current value)} for portfolio fields changed in memory"""
+        return {
+            name: (loaded, current)
+            for name, loaded, current in zip(self.PORTFOLIO_FIELDS, self._loaded_state, self._portfolio_state())
+            if loaded != current
+        }
+
+    @property
+    def is_dirty(self) -> bool:
+        return bool(self._dirty_symbols or self._deactivated_ids or self._pending_cycles
+                    or self._portfolio_state() != self._loaded_state)
+
+    # -------- Reads -------- #
+    def get_portfolio_value(self) -> float:
+        return sum(pos.current_value for pos in self.positions.values())
+
+    def get_total_value(self) -> float:
+        return self.get_portfolio_value() + self.bnb_reserve
+
+    def get_position_weights(self) -> Dict[str, float]:
+        portfolio_value = self.get_portfolio_value()
+        if portfolio_value == 0:
+            return {}
+        return {
+            symbol: (pos.current_value / portfolio_value) * 100
+            for symbol, pos in self.positions.items()
+        }
+
+    # -------- Writes -------- #
+    def set_position(self, symbol: str, quantity: float, entry_price: float,
+                     current_price: float, entry_date: datetime = None):
+        """Create or overwrite an active position"""
+        existing = self.positions.get(symbol)
+        self.positions[symbol] = PortfolioPosition(
+            symbol=symbol,
+            quantity=quantity,
+            entry_price=entry_price,
+            current_price=current_price,
+            entry_date=entry_date or (existing.entry_date if existing else datetime.now())
+        )
+        self._dirty_symbols.add(symbol)
+
+    def add_position(self, symbol: str, quantity: float, price: float):
+        """Add to a position, averaging the entry price"""
+        existing = self.positions.get(symbol)
+        if existing:
+            total_quantity = existing.quantity + quantity
+            avg_price = (existing.entry_value + quantity * price) / total_quantity
+            self.set_position(symbol, total_quantity, avg_price, price)
+        else:
+            self.set_position(symbol, quantity, price, price)
+
+    def reduce_position(self, symbol: str, quantity: float):
+        """Reduce a position, deactivating it when fully sold"""
+        position = self.positions[symbol]
+        if position.quantity == quantity:
+            self.remove_position(symbol)
+        else:
+            position.quantity -= quantity
+            self._dirty_symbols.add(symbol)
+
+    def remove_position(self, symbol: str) -> bool:
+        if self.positions.pop(symbol, None) is None:
+            return False
+        self._dirty_symbols.discard(symbol)
+        position_id = self._position_ids.pop(symbol, None)
+        if position_id is not None:
+            self._deactivated_ids.append(position_id)
+        return True
+
+    def remove_all_positions(self):
+        for symbol in list(self.positions):
+            self.remove_position(symbol)
+
+    def update_prices(self, price_data: Dict[str, float]):
+        for symbol, position in self.positions.items():
+            if symbol in price_data:
+                position.current_price = price_data[symbol]
+                self._dirty_symbols.add(symbol)
+
+    def record_cycle(self, actions_taken: List[str] = None, portfolio_value: float = None,
+                     total_value: float = None, portfolio_breakdown: Dict = None) -> int:
+        """Snapshot the current state as the next trading cycle"""
+        self.current_cycle += 1
+        now = datetime.now()
+        cycle = TradingCycle(
+            portfolio_id=self.portfolio_id,
+            cycle_number=self.current_cycle,
+            bnb_reserve=self.bnb_reserve,
+            portfolio_value=self.get_portfolio_value() if portfolio_value is None else portfolio_value,
+            total_value=self.get_total_value() if total_value is None else total_value,
+            actions_taken=actions_taken or [],
+            portfolio_breakdown=portfolio_breakdown,
+            cycle_date=now
+        )
+        snapshots = [
+            CyclePosition(
+                symbol=pos.symbol,
+                quantity=pos.quantity,
+                entry_price=pos.entry_price,
+                current_price=pos.current_price,
+                current_value=pos.current_value,
+                pnl_percentage=pos.pnl_percentage,
+                entry_date=pos.entry_date or now
+            )
+            for pos in self.positions.values()
+        ]
+        self._pending_cycles.append((cycle, snapshots))
+        return self.current_cycle
+
+    def flush(self, session: Session) -> Optional[Dict]:
+        """Write all pending changes in one transaction; returns the new status if a cycle was recorded"""
+        if not self.is_dirty:
+            return None
+
+        changed = self._changed_fields()
+        if changed:
+            guards = [getattr(Portfolio, name) == loaded for name, (loaded, _) in changed.items()]
+            updated = session.query(Portfolio).filter(Portfolio.id == self.portfolio_id, *guards).update(
+                {name: current for name, (_, current) in changed.items()}, synchronize_session=False
+            )
+            if updated != 1:
+                raise StaleDataError(
+                    f"Portfolio {self.portfolio_id} changed since it was loaded ({', '.join(changed)}); "
+                    f"discarding this unit of work"
+                )
+
+        if self._deactivated_ids:
+            session.query(Position).filter(Position.id.in_(self._deactivated_ids)).update(
+                {'is_active': False}, synchronize_session=False
+            )
+
+        # One executemany UPDATE for every changed existing position
+        updates = [
+            {
+                'id': self._position_ids[symbol],
+                'quantity': self.positions[symbol].quantity,
+                'entry_price': self.positions[symbol].entry_price,
+                'current_price': self.positions[symbol].current_price,
+                'entry_date': self.positions[symbol].entry_date
+            }
+            for symbol in self._dirty_symbols if symbol in self._position_ids
+        ]
+        if updates:
+            session.bulk_update_mappings(Position, updates)
+
+        for symbol in self._dirty_symbols - set(self._position_ids):
+            pos = self.positions[symbol]
+            session.add(Position(
+                portfolio_id=self.portfolio_id,
+                symbol=symbol,
+                quantity=pos.quantity,
+                entry_price=pos.entry_price,
+                current_price=pos.current_price,
+                entry_date=pos.entry_date,
+                is_active=True
+            ))
+
+        for cycle, snapshots in self._pending_cycles:
+            cycle.cycle_positions = snapshots
+            session.add(cycle)
+
+        status = None
+        if self._pending_cycles:
+            # Status readers see the new cycle exactly when it commits
+            latest = self._pending_cycles[-1][0]
+            status = LatestStatus(
+                id=LATEST_STATUS_ID,
+                portfolio_id=self.portfolio_id,
+                current_cycle=latest.cycle_number,
+                bnb_reserve=latest.bnb_reserve,
+                portfolio_value=latest.portfolio_value,
+                total_value=latest.total_value,
+                last_cycle_date=latest.cycle_date,
+                updated_at=datetime.now()
+            )
+            session.merge(status)
+
+        session.commit()
+        return status.to_dict() if status else None
+
+
 class PortfolioManager:
     def __init__(self):
         """Initialize portfolio manager with database"""
@@ -66,6 +305,7 @@ class PortfolioManager:
         self.db_manager.create_tables()
         self.portfolio_id = None
         self.trading_fee = 0.001  # 0.10% trading fee
+        self._local = threading.local()  # active unit of work, per thread
 
         # Load or create portfolio
         self._load_or_create_portfolio()
@@ -92,122 +332,102 @@ class PortfolioManager:
             self.portfolio_id = portfolio.id
             logger.info(f"Using portfolio ID: {self.portfolio_id}")
     
+    @property
+    def _unit_of_work(self) -> Optional[PortfolioAggregate]:
+        return getattr(self._local, 'unit_of_work', None)
+
+    @_unit_of_work.setter
+    def _unit_of_work(self, aggregate: Optional[PortfolioAggregate]):
+        self._local.unit_of_work = aggregate
+
+    @contextmanager
+    def unit_of_work(self):
+        """
+        Load the portfolio once and batch every change until the block ends.
+
+        Inside the block all reads are served from memory and writes are
+        recorded; on exit they are flushed in a single transaction. If the
+        block raises, pending changes are discarded. Nested blocks on the same
+        thread join the outer unit of work; other threads get their own.
+        """
+        if self._unit_of_work is not None:
+            yield self._unit_of_work
+            return
+
+        with self.db_manager.get_session() as session:
+            aggregate = PortfolioAggregate.load(session, self.portfolio_id)
+
+        self._unit_of_work = aggregate
+        try:
+            yield aggregate
+        except Exception:
+            if aggregate.is_dirty:
+                logger.warning("Discarding unflushed portfolio changes after error")
+            raise
+        finally:
+            self._unit_of_work = None
+
+        with self.db_manager.get_session() as session:
+            try:
+                status = aggregate.flush(session)
+            except Exception:
+                session.rollback()
+                raise
+
+        if status:
+            get_event_bus().publish(TOPIC_STATUS, status)
+
     def initialize_portfolio(self, initial_reserve: float):
         """Initialize portfolio with initial reserve (in configured base asset)"""
-        with self.db_manager.get_session() as session:
-            portfolio = session.query(Portfolio).filter_by(id=self.portfolio_id).first()
-            if portfolio:
-                portfolio.bnb_reserve = initial_reserve
-                portfolio.current_cycle = 0
-                portfolio.is_frozen = False
-                portfolio.freeze_reason = None
-                session.commit()
-                
-                # Clear existing positions
-                session.query(Position).filter_by(portfolio_id=self.portfolio_id, is_active=True).update({
-                    'is_active': False
-                })
-                session.commit()
+        with self.unit_of_work() as uow:
+            uow.bnb_reserve = initial_reserve
+            uow.current_cycle = 0
+            uow.is_frozen = False
+            uow.freeze_reason = None
+            uow.remove_all_positions()
         
         logger.info(f"Portfolio initialized with {initial_reserve} reserve units")
     
     def add_position(self, symbol: str, quantity: float, price: float):
         """Add a new position to the portfolio"""
-        with self.db_manager.get_session() as session:
-            # Check if position already exists
-            existing_position = session.query(Position).filter_by(
-                portfolio_id=self.portfolio_id,
-                symbol=symbol,
-                is_active=True
-            ).first()
-            
-            if existing_position:
-                # Average the position
-                total_quantity = existing_position.quantity + quantity
-                total_value = existing_position.entry_value + (quantity * price)
-                avg_price = total_value / total_quantity
-                
-                existing_position.quantity = total_quantity
-                existing_position.entry_price = avg_price
-                existing_position.current_price = price
-            else:
-                # Create new position
-                new_position = Position(
-                    portfolio_id=self.portfolio_id,
-                    symbol=symbol,
-                    quantity=quantity,
-                    entry_price=price,
-                    current_price=price,
-                    entry_date=datetime.now(),
-                    is_active=True
-                )
-                session.add(new_position)
-            
-            session.commit()
+        with self.unit_of_work() as uow:
+            uow.add_position(symbol, quantity, price)
             
         logger.info(f"Added position: {quantity} {symbol} at {price}")
     
     def remove_position(self, symbol: str) -> bool:
         """Remove a position from the portfolio"""
-        with self.db_manager.get_session() as session:
-            position = session.query(Position).filter_by(
-                portfolio_id=self.portfolio_id,
-                symbol=symbol,
-                is_active=True
-            ).first()
+        with self.unit_of_work() as uow:
+            removed = uow.remove_position(symbol)
             
-            if position:
-                position.is_active = False
-                session.commit()
-                logger.info(f"Removed position: {symbol}")
-                return True
-            
-        return False
+        if removed:
+            logger.info(f"Removed position: {symbol}")
+        return removed
     
     def update_prices(self, price_data: Dict[str, float]):
         """Update current prices for all positions"""
-        with self.db_manager.get_session() as session:
-            positions = session.query(Position).filter_by(
-                portfolio_id=self.portfolio_id,
-                is_active=True
-            ).all()
-            
-            for position in positions:
-                if position.symbol in price_data:
-                    position.current_price = price_data[position.symbol]
-            
-            session.commit()
+        with self.unit_of_work() as uow:
+            uow.update_prices(price_data)
     
     def get_portfolio_value(self) -> float:
         """Calculate total portfolio value in base asset"""
-        with self.db_manager.get_session() as session:
-            positions = session.query(Position).filter_by(
-                portfolio_id=self.portfolio_id,
-                is_active=True
-            ).all()
-            
-            total_value = sum(pos.current_value for pos in positions)
-            return total_value
+        with self.unit_of_work() as uow:
+            return uow.get_portfolio_value()
     
     def get_total_value(self) -> float:
         """Calculate total value (portfolio + reserve) in base asset"""
-        portfolio_value = self.get_portfolio_value()
-        bnb_reserve = self.get_bnb_reserve()
-        return portfolio_value + bnb_reserve
+        with self.unit_of_work() as uow:
+            return uow.get_total_value()
     
     def get_bnb_reserve(self) -> float:
         """Get current reserve (base asset)"""
-        with self.db_manager.get_session() as session:
-            portfolio = session.query(Portfolio).filter_by(id=self.portfolio_id).first()
-            return portfolio.bnb_reserve if portfolio else 0.0
+        with self.unit_of_work() as uow:
+            return uow.bnb_reserve
     
     def update_bnb_reserve(self, new_reserve: float):
         """Update reserve amount (base asset)"""
-        with self.db_manager.get_session() as session:
-            portfolio = session.query(Portfolio).filter_by(id=self.portfolio_id).first()
-            if portfolio:
-                portfolio.bnb_reserve = new_reserve
-                session.commit()
+        with self.unit_of_work() as uow:
+            uow.bnb_reserve = new_reserve
     
     @property
     def bnb_reserve(self) -> float:
@@ -222,49 +442,59 @@ class PortfolioManager:
     @property
     def positions(self) -> Dict[str, PortfolioPosition]:
         """Get current positions as dictionary"""
-        positions_dict = {}
-        
-        with self.db_manager.get_session() as session:
-            positions = session.query(Position).filter_by(
-                portfolio_id=self.portfolio_id,
-                is_active=True
-            ).all()
-            
-            for pos in positions:
-                positions_dict[pos.symbol] = PortfolioPosition(
-                    symbol=pos.symbol,
-                    quantity=pos.quantity,
-                    entry_price=pos.entry_price,
-                    current_price=pos.current_price,
-                    entry_date=pos.entry_date
-                )
-        
-        return positions_dict
+        with self.unit_of_work() as uow:
+            return dict(uow.positions)
     
     def get_position_weights(self) -> Dict[str, float]:
         """Get position weights as percentage of total portfolio"""
-        portfolio_value = self.get_portfolio_value()
-        if portfolio_value == 0:
-            return {}
-        
-        weights = {}
-        positions = self.positions
-        
-        for symbol, position in positions.items():
-            weights[symbol] = (position.current_value / portfolio_value) * 100
-        
-        return weights
+        with self.unit_of_work() as uow:
+            return uow.get_position_weights()
     
     def get_underperforming_positions(self, threshold: float = -2.0) -> List[str]:
         """Get positions that underperformed by more than threshold percentage"""
-        underperforming = []
-        positions = self.positions
+        return [
+            symbol for symbol, position in self.positions.items()
+            if position.pnl_percentage < threshold
+        ]
         
-        for symbol, position in positions.items():
-            if position.pnl_percentage < threshold:
-                underperforming.append(symbol)
+    # -------- Engine persistence API (used by EnhancedRealTradingEngine) -------- #
+    def get_current_portfolio(self) -> PortfolioAggregate:
+        """
+        Current portfolio state (reserve, cycle, freeze flags). Outside a unit
+        of work this is a fresh, detached snapshot: changes to it are not saved.
+        """
+        if self._unit_of_work is not None:
+            return self._unit_of_work
+        with self.db_manager.get_session() as session:
+            return PortfolioAggregate.load(session, self.portfolio_id)
         
-        return underperforming
+    def get_active_positions(self) -> List[PortfolioPosition]:
+        """Active positions as a list"""
+        return list(self.positions.values())
+
+    def update_portfolio_reserve(self, new_reserve: float):
+        """Alias of update_bnb_reserve"""
+        self.update_bnb_reserve(new_reserve)
+
+    def update_or_create_position(self, symbol: str, quantity: float,
+                                  entry_price: float, current_price: float):
+        """Overwrite a position with the engine's view of it"""
+        with self.unit_of_work() as uow:
+            uow.set_position(symbol, quantity, entry_price, current_price)
+
+    def deactivate_position(self, symbol: str) -> bool:
+        """Alias of remove_position"""
+        return self.remove_position(symbol)
+
+    def create_trading_cycle(self, portfolio_value: float, bnb_reserve: float, total_value: float,
+                             actions_taken: List[str] = None, portfolio_breakdown: Dict = None) -> int:
+        """Record a cycle with values computed by the engine"""
+        with self.unit_of_work() as uow:
+            uow.bnb_reserve = bnb_reserve
+            cycle_number = uow.record_cycle(actions_taken, portfolio_value, total_value, portfolio_breakdown)
+
+        logger.info(f"Cycle {cycle_number} recorded")
+        return cycle_number
     
     def execute_trade(self, symbol: str, action: str, quantity: float, price: float) -> float:
         """
@@ -276,17 +506,12 @@ class PortfolioManager:
         trade_value = quantity * price
         fee = trade_value * self.trading_fee
         
-        with self.db_manager.get_session() as session:
-            portfolio = session.query(Portfolio).filter_by(id=self.portfolio_id).first()
-            
+        with self.unit_of_work() as uow:
             if action == "BUY":
                 total_cost = trade_value + fee
-                if total_cost <= portfolio.bnb_reserve:
-                    portfolio.bnb_reserve -= total_cost
-                    session.commit()
-                    
-                    # Add position after committing reserve change
-                    self.add_position(symbol, quantity, price)
+                if total_cost <= uow.bnb_reserve:
+                    uow.bnb_reserve -= total_cost
+                    uow.add_position(symbol, quantity, price)
                     
                     logger.info(f"Bought {quantity} {symbol} at {price} (Fee: {fee})")
                     return total_cost
@@ -295,23 +520,12 @@ class PortfolioManager:
                     return 0.0
             
             elif action == "SELL":
-                position = session.query(Position).filter_by(
-                    portfolio_id=self.portfolio_id,
-                    symbol=symbol,
-                    is_active=True
-                ).first()
+                position = uow.positions.get(symbol)
                 
                 if position and position.quantity >= quantity:
                     proceeds = trade_value - fee
-                    portfolio.bnb_reserve += proceeds
-                    
-                    # Update or remove position
-                    if position.quantity == quantity:
-                        position.is_active = False
-                    else:
-                        position.quantity -= quantity
-                    
-                    session.commit()
+                    uow.bnb_reserve += proceeds
+                    uow.reduce_position(symbol, quantity)
                     
                     logger.info(f"Sold {quantity} {symbol} at {price} (Fee: {fee})")
                     return fee  # Return only the fee as cost
@@ -334,13 +548,9 @@ class PortfolioManager:
             Tuple of (success, to_quantity_received, error_message)
         """
         try:
-            with self.db_manager.get_session() as session:
+            with self.unit_of_work() as uow:
                 # Check if we have enough of the from_symbol
-                from_position = session.query(Position).filter_by(
-                    portfolio_id=self.portfolio_id,
-                    symbol=from_symbol,
-                    is_active=True
-                ).first()
+                from_position = uow.positions.get(from_symbol)
                 
                 if not from_position or from_position.quantity < from_quantity:
                     return False, 0.0, f"Insufficient {from_symbol} quantity for swap"
@@ -355,93 +565,24 @@ class PortfolioManager:
                 
                 to_quantity_received = swap_result['to_quantity']
                 
-                # Update the from_position (reduce or remove)
-                if from_position.quantity == from_quantity:
-                    from_position.is_active = False
-                else:
-                    from_position.quantity -= from_quantity
-                
-                # Add or update the to_position
-                to_position = session.query(Position).filter_by(
-                    portfolio_id=self.portfolio_id,
-                    symbol=to_symbol,
-                    is_active=True
-                ).first()
+                # Update the from_position (reduce or remove), then add to the to_position
+                uow.reduce_position(from_symbol, from_quantity)
+                if to_quantity_received > 0:
+                    uow.add_position(to_symbol, to_quantity_received, swap_result['price'])
                 
-                if to_position:
-                    # Update existing position (weighted average entry price)
-                    old_value = to_position.quantity * to_position.entry_price
-                    new_value = to_quantity_received * swap_result['price']
-                    total_quantity = to_position.quantity + to_quantity_received
-                    
-                    if total_quantity > 0:
-                        to_position.entry_price = (old_value + new_value) / total_quantity
-                        to_position.quantity = total_quantity
-                else:
-                    # Create new position
-                    new_position = Position(
-                        portfolio_id=self.portfolio_id,
-                        symbol=to_symbol,
-                        quantity=to_quantity_received,
-                        entry_price=swap_result['price'],
-                        current_price=swap_result['price'],
-                        is_active=True
-                    )
-                    session.add(new_position)
-                
-                session.commit()
-                
-                logger.info(f"Swap executed: {from_quantity} {from_symbol} -> {to_quantity_received} {to_symbol}")
-                return True, to_quantity_received, ""
+            logger.info(f"Swap executed: {from_quantity} {from_symbol} -> {to_quantity_received} {to_symbol}")
+            return True, to_quantity_received, ""
                 
         except Exception as e:
             logger.error(f"Error executing swap {from_symbol}->{to_symbol}: {e}")
             return False, 0.0, str(e)
         
-        return 0.0
-    
     def record_cycle(self, actions_taken: List[str] = None):
         """Record current cycle data"""
-        with self.db_manager.get_session() as session:
-            portfolio = session.query(Portfolio).filter_by(id=self.portfolio_id).first()
-            portfolio.current_cycle += 1
-            
-            # Create cycle record
-            cycle = TradingCycle(
-                portfolio_id=self.portfolio_id,
-                cycle_number=portfolio.current_cycle,
-                bnb_reserve=portfolio.bnb_reserve,
-                portfolio_value=self.get_portfolio_value(),
-                total_value=self.get_total_value(),
-                actions_taken=actions_taken or [],
-                cycle_date=datetime.now()
-            )
-            session.add(cycle)
-            session.commit()
-            session.refresh(cycle)
-            
-            # Record position snapshots
-            positions = session.query(Position).filter_by(
-                portfolio_id=self.portfolio_id,
-                is_active=True
-            ).all()
-            
-            for position in positions:
-                cycle_position = CyclePosition(
-                    cycle_id=cycle.id,
-                    symbol=position.symbol,
-                    quantity=position.quantity,
-                    entry_price=position.entry_price,
-                    current_price=position.current_price,
-                    current_value=position.current_value,
-                    pnl_percentage=position.pnl_percentage,
-                    entry_date=position.entry_date
-                )
-                session.add(cycle_position)
+        with self.unit_of_work() as uow:
+            cycle_number = uow.record_cycle(actions_taken)
             
-            session.commit()
-            
-        logger.info(f"Cycle {portfolio.current_cycle} recorded")
+        logger.info(f"Cycle {cycle_number} recorded")
     
     @property
     def cycle_history(self) -> List[CycleData]:
@@ -449,25 +590,24 @@ class PortfolioManager:
         history = []
         
         with self.db_manager.get_session() as session:
+            # Two queries in total: cycles, then all their positions (selectin)
             cycles = session.query(TradingCycle).filter_by(
                 portfolio_id=self.portfolio_id
+            ).options(
+                selectinload(TradingCycle.cycle_positions)
             ).order_by(TradingCycle.cycle_number).all()
             
             for cycle in cycles:
-                # Get positions for this cycle
-                cycle_positions = session.query(CyclePosition).filter_by(
-                    cycle_id=cycle.id
-                ).all()
-                
-                positions = []
-                for cp in cycle_positions:
-                    positions.append(PortfolioPosition(
+                positions = [
+                    PortfolioPosition(
                         symbol=cp.symbol,
                         quantity=cp.quantity,
                         entry_price=cp.entry_price,
                         current_price=cp.current_price,
                         entry_date=cp.entry_date
-                    ))
+                    )
+                    for cp in cycle.cycle_positions
+                ]
                 
                 cycle_data = CycleData(
                     cycle_number=cycle.cycle_number,
@@ -485,32 +625,34 @@ class PortfolioManager:
     @property
     def current_cycle(self) -> int:
         """Get current cycle number"""
-        with self.db_manager.get_session() as session:
-            portfolio = session.query(Portfolio).filter_by(id=self.portfolio_id).first()
-            return portfolio.current_cycle if portfolio else 0
+        with self.unit_of_work() as uow:
+            return uow.current_cycle
     
     def get_portfolio_summary(self) -> Dict:
         """Get a summary of the current portfolio"""
-        positions_data = {}
-        for symbol, pos in self.positions.items():
-            positions_data[symbol] = {
-                'quantity': pos.quantity,
-                'current_price': pos.current_price,
-                'current_value': pos.current_value,
-                'pnl_percentage': pos.pnl_percentage
+        with self.unit_of_work() as uow:
+            positions_data = {}
+            for symbol, pos in uow.positions.items():
+                positions_data[symbol] = {
+                    'quantity': pos.quantity,
+                    'current_price': pos.current_price,
+                    'current_value': pos.current_value,
+                    'pnl_percentage': pos.pnl_percentage
+                }
+
+            return {
+                'cycle': uow.current_cycle,
+                'bnb_reserve': uow.bnb_reserve,
+                'portfolio_value': uow.get_portfolio_value(),
+                'total_value': uow.get_total_value(),
+                'positions_count': len(uow.positions),
+                'positions': positions_data
             }
-        
-        return {
-            'cycle': self.current_cycle,
-            'bnb_reserve': self.bnb_reserve,
-            'portfolio_value': self.get_portfolio_value(),
-            'total_value': self.get_total_value(),
-            'positions_count': len(self.positions),
-            'positions': positions_data
-        }
     
     def clear_all_positions(self):
         """Clear all positions from the database"""
+        if self._unit_of_work is not None:
+            raise RuntimeError("Cannot clear positions inside a portfolio unit of work")
         try:
             db_manager = get_db_manager()
             with db_manager.get_session() as session:
@@ -534,6 +676,8 @@ class PortfolioManager:
             with db_manager.get_session() as session:
                 # Delete all trading cycles
                 session.query(TradingCycle).delete()
+                session.query(LatestStatus).delete()
+                session.query(CycleRollup).filter(CycleRollup.scope == SCOPE_PORTFOLIO).delete()
                 
                 session.commit()
                 logger.info("All trading history cleared from database")
@@ -552,27 +696,39 @@ class PortfolioManager:
                 .limit(k) \
                 .all()
 
-    def get_symbol_recent_cycle_prices(self, symbol: str, max_cycles: int = 5) -> List[float]:
-        """Return recent snapshot prices for a symbol from last trading cycles (ascending by cycle)."""
+    def get_cycle_price_matrix(self, symbols: List[str] = None, max_cycles: int = 5) -> Dict[str, List[float]]:
+        """
+        Return {symbol: recent snapshot prices (ascending by cycle)} for the last
+        `max_cycles` trading cycles in a single query. Cycles where a symbol was not
+        held are skipped. With `symbols=None` every symbol snapshotted in the window
+        is returned.
+        """
+        matrix: Dict[str, List[float]] = {symbol: [] for symbol in symbols or []}
+        if symbols is not None and not symbols:
+            return matrix
+
         with self.db_manager.get_session() as session:
-            cycles = session.query(TradingCycle) \
+            recent = session.query(TradingCycle.id, TradingCycle.cycle_number) \
                 .filter_by(portfolio_id=self.portfolio_id) \
                 .order_by(TradingCycle.cycle_number.desc()) \
                 .limit(max_cycles) \
-                .all()
-            cycles = list(reversed(cycles))
-            prices: List[float] = []
-            for c in cycles:
-                cp = session.query(CyclePosition) \
-                    .filter_by(cycle_id=c.id, symbol=symbol) \
-                    .first()
-                if cp:
-                    prices.append(float(cp.current_price))
-        return prices
+                .subquery()
+            query = session.query(CyclePosition.symbol, CyclePosition.current_price) \
+                .join(recent, CyclePosition.cycle_id == recent.c.id)
+            if symbols is not None:
+                query = query.filter(CyclePosition.symbol.in_(symbols))
+            rows = query.order_by(recent.c.cycle_number, CyclePosition.id).all()
 
-    def compute_symbol_cycle_returns(self, symbol: str, lookback: int = 4) -> List[float]:
-        """Compute up to last `lookback` cycle returns (%) for a symbol using cycle snapshots."""
-        prices = self.get_symbol_recent_cycle_prices(symbol, max_cycles=lookback + 1)
+        for symbol, price in rows:
+            matrix.setdefault(symbol, []).append(float(price))
+        return matrix
+
+    def get_symbol_recent_cycle_prices(self, symbol: str, max_cycles: int = 5) -> List[float]:
+        """Return recent snapshot prices for a symbol from last trading cycles (ascending by cycle)."""
+        return self.get_cycle_price_matrix([symbol], max_cycles)[symbol]
+
+    @staticmethod
+    def _cycle_returns(prices: List[float], lookback: int) -> List[float]:
         returns: List[float] = []
         if len(prices) >= 2:
             for i in range(1, len(prices)):
@@ -580,3 +736,15 @@ class PortfolioManager:
                 if prev and prev > 0:
                     returns.append(((cur - prev) / prev) * 100.0)
         return returns[-lookback:]
+
+    def compute_symbol_cycle_returns(self, symbol: str, lookback: int = 4) -> List[float]:
+        """Compute up to last `lookback` cycle returns (%) for a symbol using cycle snapshots."""
+        prices = self.get_symbol_recent_cycle_prices(symbol, max_cycles=lookback + 1)
+        return self._cycle_returns(prices, lookback)
+
+    def compute_cycle_returns(self, symbols: List[str] = None, lookback: int = 4) -> Dict[str, List[float]]:
+        """compute_symbol_cycle_returns for many symbols (held positions by default) in one query."""
+        if symbols is None:
+            symbols = list(self.positions)
+        matrix = self.get_cycle_price_matrix(symbols, max_cycles=lookback + 1)
+        return {symbol: self._cycle_returns(prices, lookback) for symbol, prices in matrix.items()}
@@ -0,0 +1,106 @@
+"""
+Bounded price history for long-running engines
+
+Per-symbol fixed-capacity NumPy ring buffers. Appending overwrites the oldest
+price once the buffer is full, so memory per symbol is constant no matter how
+long the robot runs. Buffers index like lists (len, negative indexes, slices)
+so code written against List[float] keeps working.
+"""
+
+from typing import Dict, Iterator, List, Tuple, Union
+
+import numpy as np
+
+
+class PriceRingBuffer:
+    """Fixed-capacity float64 ring buffer; index 0 is the oldest retained price"""
+
+    __slots__ = ('_data', '_start', '_size')
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self._data = np.zeros(capacity, dtype=np.float64)
+        self._start = 0
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._data.shape[0]
+
+    def append(self, price: float):
+        capacity = self.capacity
+        if self._size < capacity:
+            self._data[(self._start + self._size) % capacity] = price
+            self._size += 1
+        else:
+            self._data[self._start] = price
+            self._start = (self._start + 1) % capacity
+
+    def extend(self, prices):
+        for price in prices:
+            self.append(price)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return self.to_array()[index].tolist()
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("price history index out of range")
+        return float(self._data[(self._start + index) % self.capacity])
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.to_array().tolist())
+
+    def to_array(self) -> np.ndarray:
+        """Retained prices, oldest first (a copy)"""
+        return np.roll(self._data, -self._start)[:self._size]
+
+    def __repr__(self) -> str:
+        return f"PriceRingBuffer({self.to_array().tolist()}, capacity={self.capacity})"
+
+
+class PriceHistory:
+    """Mapping symbol -> PriceRingBuffer with a shared capacity"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._buffers: Dict[str, PriceRingBuffer] = {}
+
+    def append(self, symbol: str, price: float):
+        buffer = self._buffers.get(symbol)
+        if buffer is None:
+            buffer = self._buffers[symbol] = PriceRingBuffer(self.capacity)
+        buffer.append(price)
+
+    def update(self, prices: Dict[str, float]):
+        for symbol, price in prices.items():
+            self.append(symbol, price)
+
+    def get(self, symbol: str, default=None):
+        return self._buffers.get(symbol, default)
+
+    def __getitem__(self, symbol: str) -> PriceRingBuffer:
+        return self._buffers[symbol]
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._buffers
+
+    def __len__(self) -> int:
+        return len(self._buffers)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._buffers)
+
+    def keys(self):
+        return self._buffers.keys()
+
+    def items(self) -> Iterator[Tuple[str, PriceRingBuffer]]:
+        return iter(self._buffers.items())
+
+    def to_dict(self) -> Dict[str, List[float]]:
+        return {symbol: buffer.to_array().tolist() for symbol, buffer in self._buffers.items()}
@@ -0,0 +1,168 @@
+"""
+Warm start for engine price history
+
+A fresh engine has no price history, so momentum, regime detection and the
+historical data checks stay disabled until enough cycles have run. This module
+rebuilds the rolling windows at startup from data already stored locally, each
+source in one bulk read:
+
+- past trading cycles: the CyclePosition snapshots of the portfolio (one query)
+- persisted klines: the recorded Binance cassette (one file read, cached by mtime)
+
+Sources return {symbol: [prices oldest first]}; the engines' warm_start()
+methods load them into their windows. The live engine seeds from its own
+cycle snapshots; recorded klines are only used when their interval equals the
+cycle length and their newest candle closed within PRICE_WARM_START_MAX_AGE
+minutes (one cycle by default), since the cassette is a benchmarking artifact
+of any age. Simulations only warm start when SIMULATION_WARM_START is set,
+and then from klines that closed before their start date.
+"""
+
+import os
+import json
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from binance.helpers import interval_to_milliseconds
+
+logger = logging.getLogger(__name__)
+
+KLINES_PATH = '/api/v3/klines'
+KLINE_OPEN_TIME = 0
+KLINE_CLOSE = 4
+
+_kline_cache: Dict[str, tuple] = {}
+_kline_cache_lock = threading.Lock()
+
+
+def is_warm_start_enabled() -> bool:
+    return os.getenv('PRICE_WARM_START', 'true').lower() == 'true'
+
+
+def is_simulation_warm_start_enabled() -> bool:
+    return os.getenv('SIMULATION_WARM_START', 'false').lower() == 'true'
+
+
+def load_cycle_price_history(portfolio_manager, max_points: int) -> Dict[str, List[float]]:
+    """Prices of every symbol snapshotted in the last `max_points` trading cycles"""
+    if portfolio_manager is None:
+        return {}
+    try:
+        return portfolio_manager.get_cycle_price_matrix(symbols=None, max_cycles=max_points)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not load cycle snapshots for warm start: {e}")
+        return {}
+
+
+def _read_cassette_klines(path: str) -> Dict[str, Dict[str, Dict[int, float]]]:
+    """{interval: {pair: {open_time: close}}} for every recorded klines response"""
+    with open(path, 'r') as f:
+        data = json.load(f)
+
+    klines: Dict[str, Dict[str, Dict[int, float]]] = {}
+    for interaction in data.get('interactions', []):
+        if interaction.get('path') != KLINES_PATH or interaction.get('status') != 200:
+            continue
+        params = dict(tuple(p) for p in interaction.get('params', []))
+        pair, interval = params.get('symbol'), params.get('interval')
+        if not pair or not interval:
+            continue
+        try:
+            rows = json.loads(interaction['body'])
+        except (json.JSONDecodeError, TypeError):
+            continue
+        closes = klines.setdefault(interval, {}).setdefault(pair, {})
+        for row in rows:
+            closes[int(row[KLINE_OPEN_TIME])] = float(row[KLINE_CLOSE])
+    return klines
+
+
+def _epoch_ms(moment: datetime) -> int:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1000)
+
+
+def load_kline_price_history(quote_asset: str, max_points: int, interval: str = None,
+                             cassette_path: str = None, end_time: datetime = None,
+                             fresh_since: datetime = None) -> Dict[str, List[float]]:
+    """
+    Latest `max_points` closes per base asset quoted in `quote_asset` from the
+    cassette; with `end_time` (naive = UTC) only candles closed by then, with
+    `fresh_since` only pairs whose newest candle closed at or after it
+    """
+    path = cassette_path or os.getenv('BINANCE_REPLAY_CASSETTE', 'data/binance_cassette.json')
+    interval = interval or os.getenv('PRICE_WARM_START_INTERVAL', '1d')
+    if not os.path.exists(path):
+        return {}
+
+    try:
+        mtime = os.path.getmtime(path)
+        with _kline_cache_lock:
+            cached = _kline_cache.get(path)
+            if cached is None or cached[0] != mtime:
+                cached = _kline_cache[path] = (mtime, _read_cassette_klines(path))
+        klines = cached[1].get(interval, {})
+    except (OSError, json.JSONDecodeError, ValueError, IndexError) as e:
+        logger.warning(f"⚠️ Could not read klines from {path} for warm start: {e}")
+        return {}
+
+    interval_ms = interval_to_milliseconds(interval)
+    last_open = _epoch_ms(end_time) - interval_ms if end_time is not None else None
+    first_fresh_open = _epoch_ms(fresh_since) - interval_ms if fresh_since is not None else None
+
+    history = {}
+    for pair, closes in klines.items():
+        if not pair.endswith(quote_asset) or pair == quote_asset:
+            continue
+        open_times = [t for t in sorted(closes) if last_open is None or t <= last_open]
+        if not open_times or (first_fresh_open is not None and open_times[-1] < first_fresh_open):
+            continue
+        history[pair[:-len(quote_asset)]] = [closes[t] for t in open_times[-max_points:]]
+    return history
+
+
+def load_warm_start_history(max_points: int, quote_asset: str, portfolio_manager=None,
+                            cassette_path: str = None, interval: str = None,
+                            cycle_minutes: int = None, now: datetime = None) -> Dict[str, List[float]]:
+    """
+    Cycle snapshots, extended by recorded klines only when the kline interval
+    equals `cycle_minutes` and the klines are fresh (see module docstring);
+    klines then win for symbols they cover with a longer window.
+    """
+    history = load_cycle_price_history(portfolio_manager, max_points)
+
+    interval = interval or os.getenv('PRICE_WARM_START_INTERVAL', '1d')
+    interval_ms = interval_to_milliseconds(interval)
+    if cycle_minutes and interval_ms == cycle_minutes * 60 * 1000:
+        max_age = float(os.getenv('PRICE_WARM_START_MAX_AGE', str(cycle_minutes)))
+        fresh_since = (now or datetime.now(timezone.utc)) - timedelta(minutes=max_age)
+        klines = load_kline_price_history(quote_asset, max_points, interval, cassette_path,
+                                          fresh_since=fresh_since)
+        for symbol, prices in klines.items():
+            if len(prices) > len(history.get(symbol, [])):
+                history[symbol] = prices
+    else:
+        logger.info(f"🔥 Warm start: {interval} klines do not match the {cycle_minutes}-minute cycle, "
+                    f"using cycle snapshots only")
+
+    history = {symbol: prices for symbol, prices in history.items() if prices}
+    if history:
+        depth = max(len(prices) for prices in history.values())
+        logger.info(f"🔥 Warm start: {len(history)} symbols, up to {depth} prices each")
+    return history
+
+
+def warm_start_depth(history: Optional[Dict[str, List[float]]], symbols: Iterable[str] = None) -> int:
+    """
+    Complete past cycles covered for every one of `symbols` (default: every
+    warmed symbol): the shallowest window counts, a symbol without one is 0
+    """
+    if not history:
+        return 0
+    symbols = list(history) if symbols is None else list(symbols)
+    if not symbols:
+        return 0
+    return max(0, min(len(history.get(symbol, [])) for symbol in symbols) - 1)
@@ -6,9 +6,8 @@ Ensures identical logic between simulation and real trading
 
 import os
 import sys
-import time
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 # Add current directory to path
@@ -17,6 +16,8 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from unified_daily_rebalance_engine import UnifiedDailyRebalanceEngine, ExecutionMode, ExecutionResult
 from enhanced_binance_client import EnhancedBinanceClient
 from robot_state import robot_state_manager
+from cycle_scheduler import CycleScheduler
+from event_store import get_event_store, EVENT_CYCLE_STARTED, EVENT_CYCLE_COMPLETED
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +53,18 @@ class RealTradingRobot:
         self.max_executions = int(os.getenv('MAX_EXECUTIONS', '0'))  # 0 = unlimited
         self.starting_capital = float(os.getenv('STARTING_CAPITAL', '100.0'))
         
+        # Aligned scheduler (UTC boundaries, warm-up, retries, catch-up)
+        self.scheduler = CycleScheduler()
+        
+        # Event log: recover state from the last snapshot + events since
+        self.event_store = get_event_store()
+        robot_state_manager.attach_event_store(self.event_store)
+        recovered = self.event_store.state
+        if recovered.last_cycle_time:
+            self.last_execution_time = datetime.fromisoformat(recovered.last_cycle_time)
+        if recovered.cycle_in_progress:
+            logger.warning(f"⚠️ Cycle started at {recovered.cycle_in_progress} did not complete before shutdown")
+        
         logger.info(f"🤖 Real Trading Robot initialized")
         logger.info(f"🔄 Mode: {'DRY RUN' if dry_run else 'LIVE TRADING'}")
         logger.info(f"⏰ Cycle Frequency: {self.cycle_hours} hours")
@@ -99,6 +112,8 @@ class RealTradingRobot:
         logger.info(f"📅 Time: {current_time}")
         logger.info(f"💰 Current Capital: {current_capital:.2f}")
         
+        self.event_store.append(EVENT_CYCLE_STARTED, boundary=current_time.isoformat(),
+                                capital=current_capital)
         try:
             # Execute the rebalance cycle
             result = self.engine.execute_rebalance_cycle(current_time, current_capital)
@@ -116,9 +131,11 @@ class RealTradingRobot:
                 logger.info(f"🛡️ USDC Protection: {result.usdc_protection}")
                 logger.info(f"💸 Trading Costs: ${result.trading_costs:.2f}")
                 
-                # Update robot state
-                robot_state_manager.update_last_execution(current_time)
-                robot_state_manager.update_performance_metrics(
+                # Update robot state (projected from the event)
+                self.event_store.append(
+                    EVENT_CYCLE_COMPLETED,
+                    success=True,
+                    time=current_time.isoformat(),
                     total_return=result.total_return,
                     current_capital=result.ending_capital,
                     trading_costs=result.trading_costs
@@ -126,11 +143,13 @@ class RealTradingRobot:
                 
             else:
                 logger.error(f"❌ Trading cycle failed: {result.error_message}")
+                self.event_store.append(EVENT_CYCLE_COMPLETED, success=False, error=result.error_message)
             
             return result
             
         except Exception as e:
             logger.error(f"❌ Trading cycle execution failed: {e}")
+            self.event_store.append(EVENT_CYCLE_COMPLETED, success=False, error=str(e))
             import traceback
             traceback.print_exc()
             
@@ -165,8 +184,23 @@ class RealTradingRobot:
         
         return hours_since_last >= self.cycle_hours
     
+    def _warm_up(self, boundary: datetime):
+        """Prefetch prices and balances just before the cycle boundary"""
+        logger.info(f"🔥 Warming up for cycle at {boundary:%H:%M} UTC")
+        self.engine.warm_up()
+    
+    def _scheduled_cycle(self, boundary: datetime) -> ExecutionResult:
+        """Scheduler callback: run one cycle and enforce MAX_EXECUTIONS"""
+        result = self.execute_trading_cycle()
+        
+        if self.max_executions > 0 and self.execution_count >= self.max_executions:
+            logger.info(f"🏁 Reached maximum executions ({self.max_executions}), stopping")
+            self.stop()
+        
+        return result
+    
     def run_automated_trading(self):
-        """Run automated trading with the specified cycle frequency"""
+        """Run automated trading on aligned cycle boundaries"""
         
         if not self.validate_startup():
             logger.error("❌ Startup validation failed, cannot start trading")
@@ -181,31 +215,12 @@ class RealTradingRobot:
         self.is_running = True
         
         try:
-            while self.is_running:
-                try:
-                    # Check if it's time to execute
-                    if self.should_execute_cycle():
-                        # Execute trading cycle
-                        result = self.execute_trading_cycle()
-                        
-                        # Check if we should stop
-                        if self.max_executions > 0 and self.execution_count >= self.max_executions:
-                            logger.info(f"🏁 Reached maximum executions ({self.max_executions}), stopping")
-                            break
-                        
-                        if not result.success:
-                            logger.warning("⚠️ Trading cycle failed, but continuing...")
-                    
-                    # Wait before next check (check every minute)
-                    time.sleep(60)
-                    
-                except KeyboardInterrupt:
-                    logger.info("🛑 Received stop signal")
-                    break
-                    
-                except Exception as e:
-                    logger.error(f"❌ Error in trading loop: {e}")
-                    time.sleep(300)  # Wait 5 minutes before retrying
+            # Cycle times are recorded in local time; the scheduler reads naive times as UTC
+            last_run = self.last_execution_time.astimezone(timezone.utc) if self.last_execution_time else None
+            self.scheduler.run(self._scheduled_cycle, warmup_fn=self._warm_up, last_run=last_run)
+        
+        except KeyboardInterrupt:
+            logger.info("🛑 Received stop signal")
         
         finally:
             # Clean shutdown
@@ -294,6 +309,7 @@ class RealTradingRobot:
         """Stop the trading robot"""
         logger.info("🛑 Stopping trading robot...")
         self.is_running = False
+        self.scheduler.cancel()
 
 # Factory functions
 def create_real_trading_robot(dry_run: bool = True) -> RealTradingRobot:
@@ -0,0 +1,102 @@
+"""
+HTTP response compression
+
+Chart pages and JSON endpoints can weigh megabytes. init_compression(app)
+registers an after_request hook that compresses large text responses with
+brotli (when the optional `brotli` package is installed and the client
+accepts it) or gzip.
+
+Strong ETags identify one representation, so a compressed response gets the
+encoding appended to its ETag ("<etag>-gzip"); negotiate_encoding() lets a
+view compute that tag up front for its conditional (304) checks.
+"""
+
+import os
+import gzip
+import logging
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'text/html', 'text/plain', 'text/css', 'text/csv',
+    'application/javascript', 'text/javascript', 'image/svg+xml'
+}
+
+
+def compression_enabled() -> bool:
+    return os.getenv('HTTP_COMPRESSION', 'true').lower() == 'true'
+
+
+def min_compress_bytes() -> int:
+    return int(os.getenv('HTTP_COMPRESSION_MIN_BYTES', '1024'))
+
+
+def _accepted(accept_encoding: str, coding: str) -> bool:
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.strip().partition(';')
+        if name.strip().lower() in (coding, '*'):
+            return params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+    return False
+
+
+def negotiate_encoding(accept_encoding: str, size: int, mimetype: str) -> Optional[str]:
+    """Content-Encoding to use for a response body ('br', 'gzip' or None)"""
+    if not compression_enabled() or size < min_compress_bytes() or mimetype not in COMPRESSIBLE_MIMETYPES:
+        return None
+    if brotli is not None and _accepted(accept_encoding, 'br'):
+        return 'br'
+    if _accepted(accept_encoding, 'gzip'):
+        return 'gzip'
+    return None
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=int(os.getenv('HTTP_BROTLI_QUALITY', '5')))
+    return gzip.compress(data, compresslevel=int(os.getenv('HTTP_GZIP_LEVEL', '1')))
+
+
+def encoded_etag(etag: str, encoding: Optional[str]) -> str:
+    return f"{etag}-{encoding}" if encoding else etag
+
+
+def compress_response(response, accept_encoding: str):
+    """Compress a Flask response in place when worthwhile"""
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers):
+        return response
+
+    data = response.get_data()
+    encoding = negotiate_encoding(accept_encoding, len(data), response.mimetype)
+    response.vary.add('Accept-Encoding')
+    if encoding is None:
+        return response
+
+    response.set_data(compress(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak and not etag.endswith(f"-{encoding}"):
+        response.set_etag(encoded_etag(etag, encoding))
+    return response
+
+
+def init_compression(app):
+    """Compress every eligible response of a Flask app"""
+    from flask import request
+
+    @app.after_request
+    def _compress(response):
+        try:
+            return compress_response(response, request.headers.get('Accept-Encoding', ''))
+        except Exception as e:
+            logger.warning(f"⚠️ Response compression skipped: {e}")
+            return response
+
+    logger.info(f"🗜️ HTTP compression enabled ({'br, gzip' if brotli is not None else 'gzip'})")
+    return app
@@ -11,6 +11,17 @@ from typing import Dict, Optional
 import os
 from dotenv import load_dotenv
 
+try:
+    from src.event_store import (
+        EVENT_ROBOT_FROZEN, EVENT_ROBOT_UNFROZEN, EVENT_ROBOT_STARTED, EVENT_ROBOT_STOPPED,
+        EVENT_CYCLE_COMPLETED
+    )
+except ImportError:
+    from event_store import (
+        EVENT_ROBOT_FROZEN, EVENT_ROBOT_UNFROZEN, EVENT_ROBOT_STARTED, EVENT_ROBOT_STOPPED,
+        EVENT_CYCLE_COMPLETED
+    )
+
 class RobotStateManager:
     """Gestionnaire d'état du robot"""
 
@@ -22,6 +33,7 @@ class RobotStateManager:
         """
         load_dotenv()
         self.state_file = state_file
+        self.event_store = None
         self._ensure_data_directory()
         if not os.path.exists(self.state_file):
             # File does not exist, use .env for initial frozen state
@@ -73,7 +85,12 @@ class RobotStateManager:
             # Trading window state
             "current_trade_number": 1,
             "trade_start_timestamp": None,
-            "trade_start_bnb_reserve": None
+            "trade_start_bnb_reserve": None,
+            # Trading process state (projection of the event log)
+            "robot_running": False,
+            "robot_pid": None,
+            "last_total_return": None,
+            "current_capital": None
         }
     
     def _ensure_state_defaults(self):
@@ -95,6 +112,97 @@ class RobotStateManager:
         except Exception as e:
             print(f"Erreur lors de la sauvegarde de l'état: {e}")
     
+    def reload_state(self) -> bool:
+        """Re-read the state file written by other processes; the current state is kept if it cannot be read"""
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+        self.state.update(state)
+        return True
+    
+    # --- Event log ---
+    def attach_event_store(self, event_store):
+        """
+        Record changes through the event log and update the state file from
+        it. Cycle fields are recovered from the log when it has history; the
+        freeze state stays with the state file, since the dashboard and the
+        portfolio tools freeze and unfreeze without a store. A log that
+        disagrees is brought in line with the file.
+        """
+        recovered = event_store.state
+        if recovered.last_seq > 0:
+            self.state.update({
+                "last_cycle_time": recovered.last_cycle_time,
+                "last_total_return": recovered.total_return,
+                "current_capital": recovered.current_capital
+            })
+            self._save_state()
+        
+        is_frozen = bool(self.state.get("is_frozen"))
+        if is_frozen and (not recovered.is_frozen or recovered.freeze_reason != self.state.get("freeze_reason")):
+            event_store.append(EVENT_ROBOT_FROZEN, reason=self.state.get("freeze_reason"))
+        elif not is_frozen and recovered.is_frozen:
+            event_store.append(EVENT_ROBOT_UNFROZEN)
+        
+        # Subscribed after reconciling so the file keeps its freeze timestamp
+        self.event_store = event_store
+        event_store.subscribe(self.apply_event)
+    
+    def _record(self, event_type: str, **data):
+        """Record a change through the event log, or apply it directly without one"""
+        if self.event_store is not None:
+            self.event_store.append(event_type, **data)
+        else:
+            self.apply_event({'type': event_type, 'timestamp': datetime.now().isoformat(), 'data': data})
+    
+    def apply_event(self, event: Dict, trading_state=None):
+        """Project one event onto the state file"""
+        kind = event['type']
+        data = event.get('data', {})
+        if kind == EVENT_ROBOT_FROZEN:
+            self.state["is_frozen"] = True
+            self.state["freeze_reason"] = data.get('reason')
+            self.state["freeze_timestamp"] = event['timestamp']
+        elif kind == EVENT_ROBOT_UNFROZEN:
+            self.state["is_frozen"] = False
+            self.state["freeze_reason"] = None
+            self.state["freeze_timestamp"] = None
+        elif kind == EVENT_ROBOT_STARTED:
+            self.state["robot_running"] = True
+            self.state["robot_pid"] = data.get('pid')
+        elif kind == EVENT_ROBOT_STOPPED:
+            self.state["robot_running"] = False
+            self.state["robot_pid"] = None
+        elif kind == EVENT_CYCLE_COMPLETED and data.get('success', True):
+            self.state["last_cycle_time"] = data.get('time') or event['timestamp']
+            self.state["last_total_return"] = data.get('total_return')
+            self.state["current_capital"] = data.get('current_capital')
+        else:
+            return
+        self._save_state()
+    
+    def set_robot_running(self, running: bool):
+        """Mark the trading process as running (with its pid) or stopped"""
+        if running:
+            self._record(EVENT_ROBOT_STARTED, pid=os.getpid())
+        else:
+            self._record(EVENT_ROBOT_STOPPED, pid=os.getpid())
+    
+    def is_robot_running(self) -> bool:
+        """True if another live process marked itself running (stale flags from crashes are ignored)"""
+        pid = self.state.get("robot_pid")
+        if not self.state.get("robot_running") or not pid or pid == os.getpid():
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+    
     def is_frozen(self) -> bool:
         """Vérifier si le robot est gelé"""
         return self.state.get("is_frozen", False)
@@ -110,10 +218,7 @@ class RobotStateManager:
             True si le gel a réussi
         """
         try:
-            self.state["is_frozen"] = True
-            self.state["freeze_reason"] = reason
-            self.state["freeze_timestamp"] = datetime.now().isoformat()
-            self._save_state()
+            self._record(EVENT_ROBOT_FROZEN, reason=reason)
             return True
         except Exception as e:
             print(f"Erreur lors du gel du robot: {e}")
@@ -127,10 +232,7 @@ class RobotStateManager:
             True si le dégel a réussi
         """
         try:
-            self.state["is_frozen"] = False
-            self.state["freeze_reason"] = None
-            self.state["freeze_timestamp"] = None
-            self._save_state()
+            self._record(EVENT_ROBOT_UNFROZEN)
             return True
         except Exception as e:
             print(f"Erreur lors du dégel du robot: {e}")
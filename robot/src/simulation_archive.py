@@ -0,0 +1,431 @@
+"""
+Simulation archival pipeline
+
+Deleting a simulation with millions of simulation_cycles rows in one
+statement holds the SQLite write lock for minutes and times out the request.
+Requests now only mark the work; ArchivePipeline (run by the leader worker)
+does it in the background:
+
+- archive: the cycles are exported to a compressed columnar file (Parquet
+  with zstd when pyarrow is installed, otherwise gzip CSV) plus a JSON
+  manifest. Once the file is written, reads of that simulation are served
+  from the archive and its rows are purged from the hot table.
+- delete: the cycles are purged, then the simulation row (and its archive).
+
+Purges run in small batches with a commit and a pause between them, so the
+robot and the web app keep writing. ANALYZE (and VACUUM when enough pages
+are free) runs after a pass that removed rows.
+"""
+
+import os
+import csv
+import gzip
+import time
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import delete, func, select, text
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # optional dependency: archives fall back to gzip CSV
+    pyarrow = None
+
+try:
+    from src import fast_json
+    from src.database import CycleRollup, Simulation, SimulationCycle, SimulationCycleHolding
+    from src.cycle_rollups import SCOPE_SIMULATION
+except ImportError:
+    import fast_json
+    from database import CycleRollup, Simulation, SimulationCycle, SimulationCycleHolding
+    from cycle_rollups import SCOPE_SIMULATION
+
+logger = logging.getLogger(__name__)
+
+# Archived columns and how they are stored in a CSV archive
+ARCHIVE_COLUMNS = OrderedDict([
+    ('cycle_number', 'int'),
+    ('cycle_date', 'datetime'),
+    ('portfolio_value', 'float'),
+    ('bnb_reserve', 'float'),
+    ('total_value', 'float'),
+    ('trading_costs', 'float'),
+    ('execution_delay', 'float'),
+    ('failed_orders', 'int'),
+    ('actions_taken', 'json'),
+    ('portfolio_breakdown', 'json'),
+    ('market_conditions', 'json'),
+])
+
+ARCHIVE_STATE_QUEUED = 'queued'
+ARCHIVE_STATE_ARCHIVED = 'archived'
+STATUS_DELETING = 'deleting'
+ARCHIVABLE_STATUSES = ('completed', 'failed', 'cancelled')
+
+
+def archive_dir() -> str:
+    return os.getenv('SIMULATION_ARCHIVE_DIR', os.path.join('data', 'archive'))
+
+
+def archive_format() -> str:
+    """'parquet' or 'csv' (ARCHIVE_FORMAT=auto picks parquet when pyarrow is installed)"""
+    fmt = os.getenv('ARCHIVE_FORMAT', 'auto').lower()
+    if fmt == 'auto':
+        return 'parquet' if pyarrow is not None else 'csv'
+    if fmt == 'parquet' and pyarrow is None:
+        logger.warning("⚠️ ARCHIVE_FORMAT=parquet needs pyarrow; writing gzip CSV archives")
+        return 'csv'
+    return fmt
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _parquet_schema():
+    types = {'int': pyarrow.int64(), 'float': pyarrow.float64(), 'datetime': pyarrow.timestamp('us'),
+             'json': pyarrow.string(), 'str': pyarrow.string()}
+    return pyarrow.schema([(name, types[kind]) for name, kind in ARCHIVE_COLUMNS.items()])
+
+
+def _parse_csv_value(kind: str, value: str):
+    if value == '':
+        return None
+    if kind == 'int':
+        return int(value)
+    if kind == 'float':
+        return float(value)
+    if kind == 'datetime':
+        return datetime.fromisoformat(value)
+    return value
+
+
+class SimulationArchive:
+    """Writes and reads the cycle archives of simulations"""
+
+    def __init__(self, directory: str = None, fmt: str = None, batch_size: int = None, cache_size: int = 4):
+        self.directory = directory or archive_dir()
+        self.format = fmt or archive_format()
+        self.batch_size = batch_size or int(os.getenv('ARCHIVE_EXPORT_BATCH', '5000'))
+        self._cache: 'OrderedDict[tuple, Dict[str, list]]' = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+    def path_for(self, simulation_id: int) -> str:
+        extension = 'parquet' if self.format == 'parquet' else 'csv.gz'
+        return os.path.join(self.directory, f"simulation_{simulation_id}.{extension}")
+
+    @staticmethod
+    def manifest_path(path: str) -> str:
+        return path.rsplit('.', 2 if path.endswith('.csv.gz') else 1)[0] + '.json'
+
+    # ------------------ Export ------------------ #
+    def iter_batches(self, session, simulation_id: int):
+        """Cycles of a simulation as row tuples, in id-keyset batches (constant memory)"""
+        columns = [SimulationCycle.id] + [getattr(SimulationCycle, name) for name in ARCHIVE_COLUMNS]
+        last_id = 0
+        while True:
+            rows = session.query(*columns) \
+                .filter(SimulationCycle.simulation_id == simulation_id, SimulationCycle.id > last_id) \
+                .order_by(SimulationCycle.id).limit(self.batch_size).all()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield [self._archive_row(row[1:]) for row in rows]
+
+    @staticmethod
+    def _archive_row(row: Sequence[Any]) -> list:
+        values = []
+        for kind, value in zip(ARCHIVE_COLUMNS.values(), row):
+            if kind == 'datetime':
+                value = _naive_utc(value)
+            elif kind == 'json' and value is not None and not isinstance(value, str):
+                value = fast_json.dumps(value)
+            values.append(value)
+        return values
+
+    def export(self, session, simulation) -> Dict[str, Any]:
+        """Write a simulation's cycles and manifest; returns the manifest"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path_for(simulation.id)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        expected = session.query(func.count(SimulationCycle.id)) \
+            .filter(SimulationCycle.simulation_id == simulation.id).scalar()
+
+        stats = {'rows': 0, 'first_cycle_number': None, 'last_cycle_number': 0, 'total_trading_costs': 0.0}
+
+        def account(batch):
+            for row in batch:
+                stats['rows'] += 1
+                number = row[0]
+                if stats['first_cycle_number'] is None or number < stats['first_cycle_number']:
+                    stats['first_cycle_number'] = number
+                stats['last_cycle_number'] = max(stats['last_cycle_number'], number)
+                stats['total_trading_costs'] += row[5] or 0.0
+
+        try:
+            if self.format == 'parquet':
+                schema = _parquet_schema()
+                writer = pyarrow.parquet.ParquetWriter(tmp_path, schema, compression='zstd')
+                try:
+                    for batch in self.iter_batches(session, simulation.id):
+                        account(batch)
+                        columns = list(zip(*batch))
+                        writer.write_table(pyarrow.Table.from_arrays(
+                            [pyarrow.array(column, type=field.type) for column, field in zip(columns, schema)],
+                            schema=schema))
+                finally:
+                    writer.close()
+            else:
+                with gzip.open(tmp_path, 'wt', newline='', compresslevel=6) as handle:
+                    writer = csv.writer(handle)
+                    writer.writerow(ARCHIVE_COLUMNS.keys())
+                    for batch in self.iter_batches(session, simulation.id):
+                        account(batch)
+                        writer.writerows(
+                            ['' if value is None else value.isoformat() if isinstance(value, datetime) else value
+                             for value in row]
+                            for row in batch)
+
+            if stats['rows'] != expected:
+                raise RuntimeError(f"archive of simulation {simulation.id} has {stats['rows']} rows, expected {expected}")
+
+            manifest = {
+                'simulation_id': simulation.id,
+                'name': simulation.name,
+                'format': self.format,
+                'file': os.path.basename(path),
+                'columns': list(ARCHIVE_COLUMNS),
+                'cycle_count': stats['rows'],
+                'first_cycle_number': stats['first_cycle_number'],
+                'last_cycle_number': stats['last_cycle_number'],
+                'total_trading_costs': stats['total_trading_costs'],
+                'exported_at': datetime.utcnow().isoformat()
+            }
+            os.replace(tmp_path, path)
+            with open(self.manifest_path(path), 'w') as handle:
+                handle.write(fast_json.dumps(manifest))
+            return manifest
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    # ------------------ Read ------------------ #
+    def manifest(self, path: str) -> Dict[str, Any]:
+        with open(self.manifest_path(path), 'rb') as handle:
+            return fast_json.loads(handle.read())
+
+    def read_columns(self, path: str, columns: Sequence[str] = None) -> Dict[str, list]:
+        """Archived cycles as {column: values} ordered by cycle_number (recently read archives are cached)"""
+        columns = tuple(columns or ARCHIVE_COLUMNS)
+        if 'cycle_number' not in columns:
+            columns = ('cycle_number',) + columns
+        key = (path, os.path.getmtime(path), columns)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        if path.endswith('.parquet'):
+            data = pyarrow.parquet.read_table(path, columns=list(columns)).to_pydict()
+        else:
+            data = {name: [] for name in columns}
+            with gzip.open(path, 'rt', newline='') as handle:
+                for record in csv.DictReader(handle):
+                    for name in columns:
+                        data[name].append(_parse_csv_value(ARCHIVE_COLUMNS[name], record[name]))
+
+        order = sorted(range(len(data['cycle_number'])), key=data['cycle_number'].__getitem__)
+        data = {name: [values[i] for i in order] for name, values in data.items()}
+        with self._lock:
+            self._cache[key] = data
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return data
+
+    def load_series(self, path: str, columns: Sequence[str]) -> Dict[str, List[float]]:
+        """Same shape as chart_series.load_cycle_series, from an archive"""
+        data = self.read_columns(path, columns)
+        series = {'cycle_number': data['cycle_number']}
+        for column in columns:
+            series[column] = [float(value or 0.0) for value in data[column]]
+        return series
+
+    def paginate(self, path: str, after: Optional[int] = None, limit: int = 100) -> Dict[str, Any]:
+        """Same shape as chart_series.paginate_cycles, from an archive"""
+        data = self.read_columns(path, ('cycle_number', 'cycle_date', 'portfolio_value', 'bnb_reserve', 'total_value'))
+        numbers = data['cycle_number']
+        start = 0
+        if after is not None:
+            while start < len(numbers) and numbers[start] <= after:
+                start += 1
+        end = min(start + limit, len(numbers))
+        return {
+            'cycles': [
+                {
+                    'cycle_number': numbers[i],
+                    'date': data['cycle_date'][i].isoformat() if data['cycle_date'][i] else None,
+                    'portfolio_value': float(data['portfolio_value'][i] or 0.0),
+                    'bnb_reserve': float(data['bnb_reserve'][i] or 0.0),
+                    'total_value': float(data['total_value'][i] or 0.0)
+                }
+                for i in range(start, end)
+            ],
+            'next_cursor': numbers[end - 1] if end < len(numbers) and end > start else None,
+            'limit': limit
+        }
+
+    def find_cycle(self, path: str, cycle_number: int) -> Optional[Dict[str, Any]]:
+        """One archived cycle with its breakdown, or None"""
+        data = self.read_columns(path, ('portfolio_value', 'bnb_reserve', 'portfolio_breakdown'))
+        try:
+            i = data['cycle_number'].index(cycle_number)
+        except ValueError:
+            return None
+        breakdown = data['portfolio_breakdown'][i]
+        return {
+            'cycle_number': cycle_number,
+            'portfolio_value': data['portfolio_value'][i],
+            'bnb_reserve': data['bnb_reserve'][i],
+            'portfolio_breakdown': fast_json.loads(breakdown) if breakdown else None
+        }
+
+    def remove(self, path: str):
+        for name in (path, self.manifest_path(path)):
+            if os.path.exists(name):
+                os.remove(name)
+        with self._lock:
+            for key in [key for key in self._cache if key[0] == path]:
+                del self._cache[key]
+
+
+class ArchivePipeline:
+    """
+    Background worker exporting, purging and deleting simulations marked by requests
+    """
+
+    def __init__(self, db_manager, archive: SimulationArchive = None):
+        self.db_manager = db_manager
+        self.archive = archive or SimulationArchive()
+        self.delete_batch = int(os.getenv('ARCHIVE_DELETE_BATCH', '5000'))
+        self.batch_pause = float(os.getenv('ARCHIVE_BATCH_PAUSE_SECONDS', '0.05'))
+        self.vacuum_free_ratio = float(os.getenv('ARCHIVE_VACUUM_FREE_RATIO', '0.25'))
+        self._wake = threading.Event()
+        self._pass_lock = threading.Lock()
+        self.stats = {'archived': 0, 'deleted': 0, 'purged_rows': 0, 'failures': 0, 'compactions': 0}
+
+    def wake(self):
+        """Start the next pass now instead of at the next poll"""
+        self._wake.set()
+
+    def purge_cycles(self, simulation_id: int) -> int:
+        """Delete a simulation's cycles in committed batches; returns the rows removed"""
+        table = SimulationCycle.__table__
+        holdings = SimulationCycleHolding.__table__
+        removed = 0
+        while True:
+            with self.db_manager.engine.begin() as conn:
+                ids = [row[0] for row in conn.execute(
+                    select(table.c.id).where(table.c.simulation_id == simulation_id).limit(self.delete_batch))]
+                if ids:
+                    conn.execute(delete(holdings).where(holdings.c.cycle_id.in_(ids)))
+                    conn.execute(delete(table).where(table.c.id.in_(ids)))
+                deleted = len(ids)
+            removed += deleted
+            if deleted < self.delete_batch:
+                return removed
+            time.sleep(self.batch_pause)  # let other writers take the lock between batches
+
+    def compact(self):
+        """Refresh planner statistics; VACUUM SQLite when enough of the file is free pages"""
+        engine = self.db_manager.engine
+        with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+            if self.db_manager.db_type == 'sqlite':
+                conn.execute(text('ANALYZE'))
+                free_pages = conn.execute(text('PRAGMA freelist_count')).scalar() or 0
+                total_pages = conn.execute(text('PRAGMA page_count')).scalar() or 1
+                if free_pages / total_pages >= self.vacuum_free_ratio:
+                    conn.execute(text('VACUUM'))
+                    logger.info(f"🧹 VACUUM reclaimed {free_pages} of {total_pages} pages")
+            else:
+                conn.execute(text('VACUUM (ANALYZE) simulation_cycles'))
+        self.stats['compactions'] += 1
+
+    def run_pending(self) -> Dict[str, int]:
+        """One pass over the simulations waiting for export, purge or deletion"""
+        with self._pass_lock:
+            return self._run_pass()
+
+    def _run_pass(self) -> Dict[str, int]:
+        purged = 0
+        session = self.db_manager.get_session()
+        try:
+            for sim in session.query(Simulation).filter(Simulation.archive_state == ARCHIVE_STATE_QUEUED).all():
+                try:
+                    manifest = self.archive.export(session, sim)
+                    sim.archive_path = self.archive.path_for(sim.id)
+                    sim.archive_state = ARCHIVE_STATE_ARCHIVED
+                    session.commit()
+                    logger.info(f"📦 Archived simulation {sim.id} ({manifest['cycle_count']} cycles) to {sim.archive_path}")
+                except Exception as e:
+                    session.rollback()
+                    self.stats['failures'] += 1
+                    logger.error(f"❌ Archiving simulation {sim.id} failed: {e}")
+
+            for sim in session.query(Simulation).filter(Simulation.archive_state == ARCHIVE_STATE_ARCHIVED,
+                                                        Simulation.archived_at.is_(None)).all():
+                try:
+                    purged += self.purge_cycles(sim.id)
+                    sim.archived_at = datetime.utcnow()
+                    session.commit()
+                    self.stats['archived'] += 1
+                except Exception as e:
+                    session.rollback()
+                    self.stats['failures'] += 1
+                    logger.error(f"❌ Purging archived simulation {sim.id} failed: {e}")
+
+            for sim_id, name, path in session.query(Simulation.id, Simulation.name, Simulation.archive_path) \
+                    .filter(Simulation.status == STATUS_DELETING).all():
+                try:
+                    purged += self.purge_cycles(sim_id)
+                    session.query(CycleRollup).filter(CycleRollup.scope == SCOPE_SIMULATION,
+                                                      CycleRollup.scope_id == sim_id).delete(synchronize_session=False)
+                    session.query(Simulation).filter(Simulation.id == sim_id).delete(synchronize_session=False)
+                    session.commit()
+                    if path:
+                        self.archive.remove(path)
+                    self.stats['deleted'] += 1
+                    logger.info(f"🗑️ Deleted simulation {sim_id} ({name})")
+                except Exception as e:
+                    session.rollback()
+                    self.stats['failures'] += 1
+                    logger.error(f"❌ Deleting simulation {sim_id} failed: {e}")
+        finally:
+            session.close()
+
+        self.stats['purged_rows'] += purged
+        if purged:
+            try:
+                self.compact()
+            except Exception as e:
+                logger.warning(f"⚠️ Database compaction after purge failed: {e}")
+        return {'purged_rows': purged}
+
+    def run_forever(self, interval_seconds: float = None, is_active: Callable[[], bool] = None):
+        """Poll for work (or wake on request) while is_active() holds"""
+        interval_seconds = interval_seconds or float(os.getenv('ARCHIVE_POLL_SECONDS', '30'))
+        while True:
+            if is_active is None or is_active():
+                try:
+                    self.run_pending()
+                except Exception as e:
+                    self.stats['failures'] += 1
+                    logger.error(f"❌ Archive pipeline pass failed: {e}")
+            self._wake.wait(interval_seconds)
+            self._wake.clear()
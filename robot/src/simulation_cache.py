@@ -0,0 +1,128 @@
+"""
+Rendered-artifact cache for completed simulations
+
+A completed simulation never changes: its history page, combined page and
+summary can be rendered once and served from memory. Entries are keyed by
+(simulation_id, completed_at, artifact), so force-completing a simulation
+again produces a new version instead of serving a stale one. Each entry
+carries a strong ETag (hash of the body) so browsers revalidate with a 304.
+
+Every web worker holds its own cache, and invalidate() only runs in the
+worker that handled a delete or status change. Callers therefore look up
+with the simulation's current completed_at, read from the database (one
+primary key lookup). An entry of an older completion is dropped instead of
+served.
+"""
+
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional
+
+
+class CachedArtifact(NamedTuple):
+    body: str
+    mimetype: str
+    etag: str
+
+
+def cache_control_header() -> str:
+    max_age = int(os.getenv('SIMULATION_CACHE_MAX_AGE', '86400'))
+    return f"private, max-age={max_age}, immutable"
+
+
+class SimulationArtifactCache:
+    """LRU cache of rendered artifacts of completed simulations"""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._versions: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def version(completed_at: Optional[datetime]) -> str:
+        return completed_at.isoformat() if completed_at else 'unknown'
+
+    def __contains__(self, simulation_id: int) -> bool:
+        with self._lock:
+            return simulation_id in self._versions
+
+    def lookup(self, simulation_id: int, completed_at: Optional[datetime],
+               artifact: str) -> Optional[CachedArtifact]:
+        """Cached artifact of a simulation completed at `completed_at` (its current version)"""
+        version = self.version(completed_at)
+        with self._lock:
+            if self._versions.get(simulation_id, version) != version:
+                # Completed again (or deleted and reused) through another worker
+                self._drop(simulation_id)
+                self._versions.pop(simulation_id, None)
+            key = (simulation_id, version, artifact)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def store(self, simulation_id: int, completed_at: Optional[datetime], artifact: str,
+              body: str, mimetype: str = 'text/html') -> CachedArtifact:
+        """Cache a rendered artifact of a completed simulation"""
+        version = self.version(completed_at)
+        entry = CachedArtifact(body, mimetype, hashlib.sha256(body.encode('utf-8')).hexdigest()[:32])
+        with self._lock:
+            if self._versions.get(simulation_id) != version:
+                self._drop(simulation_id)
+                self._versions[simulation_id] = version
+            self._entries[(simulation_id, version, artifact)] = entry
+            self._entries.move_to_end((simulation_id, version, artifact))
+            while len(self._entries) > self.maxsize:
+                (evicted_id, _, _), _ = self._entries.popitem(last=False)
+                self.evictions += 1
+                if not any(key[0] == evicted_id for key in self._entries):
+                    self._versions.pop(evicted_id, None)
+        return entry
+
+    def _drop(self, simulation_id: int):
+        for key in [key for key in self._entries if key[0] == simulation_id]:
+            del self._entries[key]
+
+    def invalidate(self, simulation_id: int = None):
+        """Forget one simulation (deleted or status changed), or all of them"""
+        with self._lock:
+            if simulation_id is None:
+                self._entries.clear()
+                self._versions.clear()
+            else:
+                self._drop(simulation_id)
+                self._versions.pop(simulation_id, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'simulations': len(self._versions),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+
+# Global cache instance
+_simulation_cache = None
+_simulation_cache_lock = threading.Lock()
+
+
+def get_simulation_cache() -> SimulationArtifactCache:
+    """Get the process-wide simulation artifact cache (size from SIMULATION_CACHE_SIZE)"""
+    global _simulation_cache
+    with _simulation_cache_lock:
+        if _simulation_cache is None:
+            _simulation_cache = SimulationArtifactCache(int(os.getenv('SIMULATION_CACHE_SIZE', '256')))
+        return _simulation_cache
@@ -0,0 +1,94 @@
+"""
+Single-flight request coalescing
+
+Dashboard tabs poll the same Binance data (account snapshot, ticker prices)
+at the same time. SingleFlight.do(key, fn) runs fn once for all concurrent
+callers with the same key: the first caller fetches, the others wait for its
+result instead of issuing their own request. The result is then shared for
+`ttl` seconds, so upstream calls are bounded by distinct keys per window,
+not by the number of open tabs. Errors are shared with the waiting callers
+but never cached.
+"""
+
+import time
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls and share the result briefly"""
+
+    def __init__(self, ttl: float = 1.0, maxsize: int = 256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, _Call] = {}
+        self._recent: Dict[Hashable, tuple] = {}
+        self.calls = 0
+        self.upstream = 0
+        self.coalesced = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Result of fn(), fetched at most once per key among concurrent and recent callers"""
+        with self._lock:
+            self.calls += 1
+            recent = self._recent.get(key)
+            if recent is not None and time.monotonic() - recent[0] <= self.ttl:
+                self.shared += 1
+                return recent[1]
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = _Call()
+                self.upstream += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+                if call.error is None and self.ttl > 0:
+                    if len(self._recent) >= self.maxsize:
+                        self._recent.clear()
+                    self._recent[key] = (time.monotonic(), call.result)
+            call.done.set()
+        return call.result
+
+    def forget(self, key: Hashable = None):
+        """Drop the shared result of one key (or all), e.g. after placing an order"""
+        with self._lock:
+            if key is None:
+                self._recent.clear()
+            else:
+                self._recent.pop(key, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'upstream': self.upstream,
+                'coalesced': self.coalesced,
+                'shared': self.shared,
+                'in_flight': len(self._in_flight)
+            }
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Append-Only Transaction Journal
+
+Line-delimited JSON journal used for dry-run transactions. Appends are O(1):
+each record is one line written to an open file handle, and fsync is batched
+(every N records or T seconds, and on explicit sync() at commit points). Every
+record carries a sequence number; once the journal grows past a threshold it
+is compacted into a snapshot file (written to a temp file, fsynced, then
+renamed) and truncated. Records that were already folded into the snapshot
+are skipped on read, so a crash at any point loses at most the unsynced tail,
+and a torn last line is ignored instead of corrupting the journal.
+"""
+
+import os
+import json
+import time
+import atexit
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_HEADER = '_snapshot'
+
+
+class TransactionJournal:
+    """
+    Append-only JSONL journal with batched fsync and compacted snapshots
+    """
+
+    def __init__(self, path: str, key_fields: Sequence[str] = None, fsync_every: int = None,
+                 fsync_interval: float = None, compact_every: int = None, start_seq: int = 0):
+        self.path = path
+        self.snapshot_path = f"{os.path.splitext(path)[0]}.snapshot.jsonl"
+        # Records sharing these fields are versions of one record (e.g. status updates);
+        # compaction keeps only the latest version.
+        self.key_fields = tuple(key_fields or ())
+        self.fsync_every = fsync_every or int(os.getenv('JOURNAL_FSYNC_EVERY', '50'))
+        self.fsync_interval = fsync_interval if fsync_interval is not None else float(os.getenv('JOURNAL_FSYNC_INTERVAL', '1.0'))
+        # 0 disables compaction (e.g. when the owner rotates the journal itself)
+        self.compact_every = compact_every if compact_every is not None else int(os.getenv('JOURNAL_COMPACT_EVERY', '10000'))
+
+        self._lock = threading.RLock()
+        self._handle = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._snapshot_seq = self._read_snapshot_header().get('last_seq', 0)
+        self._journal_lines, self._last_seq = self._scan_journal()
+        # Sequence numbers continue after records rotated out of this file
+        self._last_seq = max(self._last_seq, start_seq)
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # Startup
+    # ------------------------------------------------------------------
+
+    def _read_snapshot_header(self) -> Dict:
+        if not os.path.exists(self.snapshot_path):
+            return {}
+        with open(self.snapshot_path, 'r') as f:
+            first = f.readline()
+        try:
+            return json.loads(first).get(SNAPSHOT_HEADER, {})
+        except (json.JSONDecodeError, AttributeError):
+            logger.error(f"Invalid snapshot header in {self.snapshot_path}")
+            return {}
+
+    def _scan_journal(self):
+        """Count journal lines and find the last sequence number; drop a torn tail"""
+        if not os.path.exists(self.path):
+            return 0, self._snapshot_seq
+
+        lines = 0
+        last_seq = self._snapshot_seq
+        valid_bytes = 0
+        with open(self.path, 'rb') as f:
+            for raw in f:
+                try:
+                    record = json.loads(raw)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    break
+                if not raw.endswith(b'\n'):
+                    break
+                valid_bytes += len(raw)
+                lines += 1
+                last_seq = max(last_seq, record.get('_seq', 0))
+
+        if valid_bytes < os.path.getsize(self.path):
+            logger.warning(f"⚠️ Truncating torn tail of journal {self.path}")
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_bytes)
+        return lines, last_seq
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, record: Dict) -> int:
+        """Append one record; returns its sequence number"""
+        with self._lock:
+            self._last_seq += 1
+            line = json.dumps(dict(record, _seq=self._last_seq), separators=(',', ':'), default=str)
+            if self._handle is None:
+                self._handle = open(self.path, 'a', encoding='utf-8')
+            self._handle.write(line + '\n')
+            self._handle.flush()
+            self._journal_lines += 1
+            self._unsynced += 1
+
+            if (self._unsynced >= self.fsync_every
+                    or time.monotonic() - self._last_sync >= self.fsync_interval):
+                self.sync()
+            if self.compact_every and self._journal_lines >= self.compact_every:
+                self.compact()
+            return self._last_seq
+
+    def sync(self):
+        """fsync appended records to disk"""
+        with self._lock:
+            if self._handle is not None and self._unsynced:
+                self._handle.flush()
+                os.fsync(self._handle.fileno())
+            self._unsynced = 0
+            self._last_sync = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            if self._handle is not None:
+                self.sync()
+                self._handle.close()
+                self._handle = None
+
+    def _record_key(self, record: Dict):
+        if not self.key_fields:
+            return record['_seq']
+        return tuple(record.get(field) for field in self.key_fields)
+
+    def compact(self):
+        """Fold snapshot + journal into a new snapshot and truncate the journal"""
+        with self._lock:
+            self.sync()
+            latest = {}
+            for record in self.iter_records(raw=True):
+                key = self._record_key(record)
+                latest.pop(key, None)  # re-insert so order follows the latest version
+                latest[key] = record
+
+            tmp_path = f"{self.snapshot_path}.tmp"
+            header = {SNAPSHOT_HEADER: {'last_seq': self._last_seq,
+                                        'records': len(latest),
+                                        'created_at': datetime.now().isoformat()}}
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(header) + '\n')
+                for record in latest.values():
+                    f.write(json.dumps(record, separators=(',', ':'), default=str) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            self._snapshot_seq = self._last_seq
+
+            # Journal records are now covered by the snapshot's last_seq
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+            open(self.path, 'w').close()
+            self._journal_lines = 0
+            logger.info(f"🗜️ Compacted journal {self.path}: {len(latest)} records in snapshot")
+
+    def rotate(self, archive_path: str):
+        """Move the current journal to `archive_path` and start an empty one (O(1))"""
+        with self._lock:
+            self.sync()
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+            if os.path.exists(self.path):
+                os.replace(self.path, archive_path)
+            self._journal_lines = 0
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def iter_file(path: str) -> Iterator[Dict]:
+        if not os.path.exists(path):
+            return
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.endswith('\n'):
+                    break  # torn tail being written
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    break
+
+    def iter_records(self, raw: bool = False, predicate: Callable[[Dict], bool] = None) -> Iterator[Dict]:
+        """Stream every record (snapshot first, then journal) in append order"""
+        with self._lock:
+            if self._handle is not None:
+                self._handle.flush()
+            snapshot_seq = self._snapshot_seq
+
+        for record in self.iter_file(self.snapshot_path):
+            if SNAPSHOT_HEADER in record:
+                continue
+            if predicate is None or predicate(record):
+                yield record if raw else self._strip(record)
+        for record in self.iter_file(self.path):
+            if record.get('_seq', 0) <= snapshot_seq:
+                continue  # already folded into the snapshot
+            if predicate is None or predicate(record):
+                yield record if raw else self._strip(record)
+
+    def tail(self, count: int) -> List[Dict]:
+        """Last `count` records, reading the journal backwards from its end"""
+        if count <= 0:
+            return []
+        with self._lock:
+            if self._handle is not None:
+                self._handle.flush()
+            snapshot_seq = self._snapshot_seq
+
+        records = []
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                position = f.tell()
+                buffer = b''
+                while position > 0 and len(records) < count:
+                    step = min(64 * 1024, position)
+                    position -= step
+                    f.seek(position)
+                    buffer = f.read(step) + buffer
+                    lines = buffer.split(b'\n')
+                    buffer = lines.pop(0)  # possibly partial first line
+                    for line in reversed(lines):
+                        if len(records) >= count:
+                            break
+                        try:
+                            record = json.loads(line)
+                        except (json.JSONDecodeError, UnicodeDecodeError):
+                            continue
+                        if record.get('_seq', 0) > snapshot_seq:
+                            records.append(record)
+                if buffer and len(records) < count:
+                    try:
+                        record = json.loads(buffer)
+                        if record.get('_seq', 0) > snapshot_seq:
+                            records.append(record)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        pass
+
+        if len(records) < count:
+            # Not enough in the journal: take the newest from the snapshot
+            missing = count - len(records)
+            snapshot_records = [r for r in self.iter_file(self.snapshot_path) if SNAPSHOT_HEADER not in r]
+            records.extend(reversed(snapshot_records[-missing:]))
+
+        return [self._strip(r) for r in reversed(records)]
+
+    @staticmethod
+    def _strip(record: Dict) -> Dict:
+        return {k: v for k, v in record.items() if k != '_seq'}
+
+    def is_empty(self) -> bool:
+        return self._last_seq == 0
+
+    @property
+    def last_seq(self) -> int:
+        return self._last_seq
+
+    def get_stats(self) -> Dict:
+        return {
+            'path': self.path,
+            'last_seq': self._last_seq,
+            'journal_records': self._journal_lines,
+            'snapshot_seq': self._snapshot_seq,
+            'unsynced': self._unsynced
+        }
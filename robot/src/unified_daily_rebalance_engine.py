@@ -7,13 +7,16 @@ Ensures identical logic between simulation and real trading execution
 import os
 import sys
 import logging
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Union
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
 # Import the volatility-optimized strategy
 from daily_rebalance_volatile_strategy import DailyRebalanceVolatileStrategy
+from order_executor import OrderExecutor, net_order_deltas
+from event_store import get_event_store, EVENT_RESERVE_SYNCED, EVENT_HOLDINGS_SYNCED
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +57,32 @@ class ExecutionResult:
             'net_profit': self.ending_capital - self.starting_capital - self.trading_costs
         }
 
+@dataclass
+class ExecutionStats:
+    """Running aggregates over every ExecutionResult (O(1) per cycle and per summary)"""
+    total_executions: int = 0
+    successful_executions: int = 0
+    first_starting_capital: Optional[float] = None
+    last_ending_capital: Optional[float] = None
+    sum_returns: float = 0.0
+    total_trading_costs: float = 0.0
+    volatility_modes: set = field(default_factory=set)
+    usdc_protection_cycles: int = 0
+    
+    def add(self, result: 'ExecutionResult'):
+        self.total_executions += 1
+        if not result.success:
+            return
+        self.successful_executions += 1
+        if self.first_starting_capital is None:
+            self.first_starting_capital = result.starting_capital
+        self.last_ending_capital = result.ending_capital
+        self.sum_returns += result.total_return
+        self.total_trading_costs += result.trading_costs
+        self.volatility_modes.add(result.volatility_mode)
+        if result.usdc_protection:
+            self.usdc_protection_cycles += 1
+
 class UnifiedDailyRebalanceEngine:
     """
     Unified engine that ensures identical logic between simulation and real trading
@@ -69,7 +98,15 @@ class UnifiedDailyRebalanceEngine:
         
         # Execution state
         self.current_capital = 0.0
-        self.execution_history = []
+        # Recent results only; lifetime statistics are kept as running aggregates
+        self.execution_history = deque(maxlen=int(os.getenv('EXECUTION_HISTORY_MAX', '100')))
+        self.execution_stats = ExecutionStats()
+        
+        # Market snapshot prefetched by warm_up() just before a cycle boundary
+        self.prefetched_balance = None
+        self.prefetched_prices = {}
+        self.prefetched_at = None
+        self.last_execution_report = None
         
         # Import os for environment variables
         import os
@@ -256,6 +293,7 @@ class UnifiedDailyRebalanceEngine:
             
             # Store execution history
             self.execution_history.append(result)
+            self.execution_stats.add(result)
             self.current_capital = ending_capital
             
             logger.info(f"*** ✅ Rebalance cycle completed successfully ***")
@@ -331,7 +369,7 @@ class UnifiedDailyRebalanceEngine:
     
     def _execute_real_trades(self, allocations: Dict[str, float], capital: float,
                            trading_costs: float, current_date: datetime) -> Dict:
-        """Execute trades in real trading mode"""
+        """Execute trades in real trading mode (netted, sells then buys, concurrently)"""
         
         actions_taken = []
         
@@ -340,40 +378,83 @@ class UnifiedDailyRebalanceEngine:
             return self._execute_dry_run_trades(allocations, capital, trading_costs, current_date)
         
         try:
-            # Get current account balance
+            reserve_asset = os.getenv('RESERVE_ASSET', 'BNB')
+            
+            # Current reserve, holdings and prices (warm-up snapshot when fresh)
             account_balance = self._get_account_balance()
+            holdings = self._get_crypto_holdings(reserve_asset)
+            if self.prefetched_prices and self._prefetch_is_fresh():
+                prices = dict(self.prefetched_prices)
+            else:
+                all_prices = self.binance_client.get_all_prices()
+                prices = {}
+                for crypto in set(holdings) | set(allocations):
+                    if f"{crypto}{reserve_asset}" in all_prices:
+                        prices[crypto] = all_prices[f"{crypto}{reserve_asset}"]
+            
+            # Exchange balances are the source of truth: reconcile the event log first
+            event_store = get_event_store()
+            event_store.append(EVENT_RESERVE_SYNCED, asset=reserve_asset, reserve=account_balance)
+            event_store.append(EVENT_HOLDINGS_SYNCED, holdings=holdings)
+            
+            holdings_value = sum(qty * prices.get(crypto, 0.0) for crypto, qty in holdings.items())
+            total_value = account_balance + holdings_value
             
             if 'USDC' in allocations:
-                # USDC protection: convert everything to USDC/BUSD
-                actions_taken.append("REAL_TRADE: Converting portfolio to USDC protection")
-                # Implementation would go here for real USDC conversion
-                portfolio_value = 0.0
-                reserve_value = account_balance
-                ending_capital = account_balance
+                # USDC protection: real USDC conversion is not implemented, so
+                # positions are left as they are (selling into the reserve asset
+                # would not protect anything)
+                logger.warning("⚠️ USDC protection requested; real USDC conversion not implemented, holding positions")
+                actions_taken.append("REAL_TRADE: USDC protection requested, no conversion executed (positions held)")
+                targets = dict(holdings)
             else:
-                # Normal crypto rebalancing
+                # Normal crypto rebalancing: 95% invested, 5% reserve
                 actions_taken.append("REAL_TRADE: Executing crypto rebalancing")
-                # Implementation would go here for real crypto trades
-                portfolio_value = account_balance * 0.95
-                reserve_value = account_balance * 0.05
-                ending_capital = account_balance - trading_costs
-                
-                for symbol, allocation in allocations.items():
-                    if allocation > 0:
-                        # Real trade execution would go here
-                        actions_taken.append(f"REAL_TRADE {symbol}: {allocation:.1%}")
+                investable = total_value * 0.95
+                targets = {
+                    crypto: investable * allocation / prices[crypto]
+                    for crypto, allocation in allocations.items()
+                    if allocation > 0 and crypto != reserve_asset and prices.get(crypto, 0) > 0
+                }
+            
+            min_notional = float(os.getenv('ORDER_MIN_NOTIONAL', '0'))
+            intents = net_order_deltas(holdings, targets, prices, min_notional)
+            report = OrderExecutor(self.binance_client, reserve_asset, event_store=event_store).execute(
+                intents, available_quote=account_balance
+            )
+            self.last_execution_report = report
+            actions_taken.extend(f"REAL_TRADE {line}" for line in report.summary_lines())
+            
+            # Value the portfolio from what actually executed
+            for crypto, delta in report.executed_deltas().items():
+                holdings[crypto] = holdings.get(crypto, 0.0) + delta
+            reserve_value = account_balance + report.sold_quote - report.bought_quote
+            portfolio_value = sum(qty * prices.get(crypto, 0.0) for crypto, qty in holdings.items())
+            ending_capital = portfolio_value + reserve_value
             
             return {
                 'ending_capital': ending_capital,
                 'portfolio_value': portfolio_value,
                 'reserve_value': reserve_value,
-                'actions_taken': actions_taken
+                'actions_taken': actions_taken,
+                'execution_report': report.to_dict()
             }
             
         except Exception as e:
             logger.error(f"❌ Real trading execution failed: {e}")
             raise
     
+    def _get_crypto_holdings(self, reserve_asset: str) -> Dict[str, float]:
+        """Free quantities of the strategy's cryptos currently held on Binance"""
+        account_info = self.binance_client.get_account()
+        tracked = set(self.strategy.optimized_cryptos)
+        holdings = {}
+        for balance in account_info['balances']:
+            asset = balance['asset']
+            if asset in tracked and asset != reserve_asset and float(balance['free']) > 0:
+                holdings[asset] = float(balance['free'])
+        return holdings
+    
     def _execute_dry_run_trades(self, allocations: Dict[str, float], capital: float,
                               trading_costs: float, current_date: datetime) -> Dict:
         """Execute trades in dry run mode (simulation of real trading with calibration)"""
@@ -463,11 +544,36 @@ class UnifiedDailyRebalanceEngine:
             logger.warning(f"⚠️ Calibration constraint application failed: {e}")
             return raw_ending_capital
     
-    def _get_account_balance(self) -> float:
-        """Get current account balance from Binance"""
+    def warm_up(self):
+        """Prefetch reserve balance and prices so the next cycle starts without API round-trips"""
+        if not self.binance_client:
+            return
+        
+        reserve_asset = os.getenv('RESERVE_ASSET', 'BNB')
+        self.prefetched_balance = self._get_account_balance(use_prefetched=False)
+        
+        all_prices = self.binance_client.get_all_prices()
+        self.prefetched_prices = {
+            crypto: all_prices[f"{crypto}{reserve_asset}"]
+            for crypto in self.strategy.optimized_cryptos
+            if f"{crypto}{reserve_asset}" in all_prices
+        }
+        self.prefetched_at = datetime.now()
+        logger.info(f"🔥 Warm-up: balance {self.prefetched_balance} {reserve_asset}, {len(self.prefetched_prices)} prices cached")
+    
+    def _prefetch_is_fresh(self) -> bool:
+        max_age = float(os.getenv('CYCLE_PREFETCH_MAX_AGE_SECONDS', '120'))
+        return (self.prefetched_at is not None
+                and (datetime.now() - self.prefetched_at).total_seconds() <= max_age)
+    
+    def _get_account_balance(self, use_prefetched: bool = True) -> float:
+        """Get current account balance from Binance (or the fresh warm-up snapshot)"""
         if not self.binance_client:
             return 0.0
         
+        if use_prefetched and self.prefetched_balance is not None and self._prefetch_is_fresh():
+            return self.prefetched_balance
+        
         try:
             account_info = self.binance_client.get_account()
             
@@ -489,7 +595,8 @@ class UnifiedDailyRebalanceEngine:
     
     def get_performance_summary(self) -> Dict:
         """Get overall performance summary"""
-        if not self.execution_history:
+        stats = self.execution_stats
+        if stats.total_executions == 0:
             return {
                 'total_executions': 0,
                 'success_rate': 0.0,
@@ -500,20 +607,19 @@ class UnifiedDailyRebalanceEngine:
                 'usdc_protection_cycles': 0
             }
         
-        successful_executions = [e for e in self.execution_history if e.success]
-        total_executions = len(self.execution_history)
-        success_rate = len(successful_executions) / total_executions * 100
+        total_executions = stats.total_executions
+        success_rate = stats.successful_executions / total_executions * 100
         
-        if successful_executions:
-            first_capital = successful_executions[0].starting_capital
-            last_capital = successful_executions[-1].ending_capital
+        if stats.successful_executions:
+            first_capital = stats.first_starting_capital
+            last_capital = stats.last_ending_capital
             total_return = ((last_capital / first_capital) - 1) * 100 if first_capital > 0 else 0.0
             
-            average_return = sum(e.total_return for e in successful_executions) / len(successful_executions)
-            total_trading_costs = sum(e.trading_costs for e in successful_executions)
+            average_return = stats.sum_returns / stats.successful_executions
+            total_trading_costs = stats.total_trading_costs
             
-            volatility_modes = list(set(e.volatility_mode for e in successful_executions))
-            usdc_protection_cycles = sum(1 for e in successful_executions if e.usdc_protection)
+            volatility_modes = list(stats.volatility_modes)
+            usdc_protection_cycles = stats.usdc_protection_cycles
         else:
             total_return = 0.0
             average_return = 0.0
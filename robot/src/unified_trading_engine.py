@@ -18,6 +18,13 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass
 from enum import Enum
 
+try:
+    from src.price_history import PriceHistory
+    from src.price_warm_start import warm_start_depth
+except ImportError:
+    from price_history import PriceHistory
+    from price_warm_start import warm_start_depth
+
 logger = logging.getLogger(__name__)
 
 class EngineMode(Enum):
@@ -111,8 +118,12 @@ class UnifiedTradingEngine:
     def __init__(self, mode: EngineMode, config: Optional[EngineConfig] = None):
         self.mode = mode
         self.config = config or EngineConfig.from_env()
-        self.price_history: Dict[str, List[float]] = {}
+        # Only the last lookback_cycles + 1 prices are ever read: keep a bounded ring per symbol
+        capacity = max(self.config.lookback_cycles + 1, int(os.getenv('PRICE_HISTORY_CAPACITY', '0')))
+        self.price_history = PriceHistory(capacity)
         self.cycle_count = 0
+        # Price windows seeded by warm_start(); their depth counts toward lookback
+        self.warm_history: Dict[str, List[float]] = {}
         
         logger.info(f"Initialized UnifiedTradingEngine in {mode.value} mode")
         logger.info(f"Config: portfolio_size={self.config.portfolio_size}, "
@@ -121,10 +132,29 @@ class UnifiedTradingEngine:
     
     def update_price_history(self, current_prices: Dict[str, float]) -> None:
         """Update price history for all coins"""
-        for symbol, price in current_prices.items():
-            if symbol not in self.price_history:
-                self.price_history[symbol] = []
-            self.price_history[symbol].append(price)
+        self.price_history.update(current_prices)
+    
+    def warm_start(self, history: Dict[str, List[float]]) -> int:
+        """
+        Seed the price windows with persisted prices (oldest first) so the
+        first cycle already has lookback history. Returns symbols seeded.
+        """
+        seeded = 0
+        for symbol, prices in history.items():
+            if symbol in self.price_history or not prices:
+                continue  # never rewrite a window the engine already filled
+            window = prices[-self.price_history.capacity:]
+            for price in window:
+                self.price_history.append(symbol, price)
+            self.warm_history[symbol] = window
+            seeded += 1
+        logger.info(f"Warm-started price history for {seeded} symbols "
+                    f"({warm_start_depth(self.warm_history)} past cycles for all of them)")
+        return seeded
+    
+    def warm_cycles(self, symbols) -> int:
+        """Past cycles covered by warm-started history for every one of `symbols`"""
+        return warm_start_depth(self.warm_history, symbols)
     
     def get_top_50_coins(self, available_coins: List[str]) -> List[str]:
         """
@@ -316,7 +346,9 @@ class UnifiedTradingEngine:
             )
         
         # Skip rebalancing if not enough price history
-        if self.cycle_count < self.config.lookback_cycles:
+        # (warm history counts only as deep as the shallowest symbol being ranked)
+        ranked = set(current_portfolio.positions) | set(self.get_top_50_coins(available_coins))
+        if self.cycle_count + self.warm_cycles(ranked) < self.config.lookback_cycles:
             logger.info(f"*** Skipping rebalance: only cycle #{self.cycle_count}, need {self.config.lookback_cycles} cycles ***")
             return RebalanceResult(
                 success=True,
@@ -12,12 +12,13 @@ import logging
 import threading
 import time
 from datetime import datetime, timedelta
-from flask import Flask, render_template, jsonify, request, redirect, url_for, flash
-from flask_socketio import SocketIO, emit, disconnect
+from flask import Flask, render_template, jsonify, request, redirect, url_for, flash, make_response, g, has_request_context
+from flask import Response, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+from flask_socketio import SocketIO, emit, disconnect, join_room, leave_room
 from sqlalchemy import func, inspect
 from dotenv import load_dotenv
 import plotly.graph_objs as go
-import plotly.utils
 
 # Load environment variables from project root
 env_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env')
@@ -33,6 +34,7 @@ from src.robot_state import robot_state_manager
 # Daily Rebalance Integration - The Only Strategy
 from src.daily_rebalance_simulation_engine import DailyRebalanceSimulationEngine
 from src.calibration_manager import get_calibration_manager
+from src.binance_rate_governor import get_binance_governor, set_thread_priority, PRIORITY_DASHBOARD
 
 # Protected Fixed Sim6 v3.0 Integration
 
@@ -73,10 +75,7 @@ def api_simulation_summary_by_name(sim_name):
     sim = sorted(matches, key=lambda s: s.id, reverse=True)[0]
     
     # Get the latest cycle number for this simulation (same logic as by-id endpoint)
-    last_cycle_number = 0
-    latest_cycle = session.query(SimulationCycle).filter(SimulationCycle.simulation_id == sim.id).order_by(SimulationCycle.cycle_number.desc()).first()
-    if latest_cycle:
-        last_cycle_number = latest_cycle.cycle_number
+    last_cycle_number, _ = simulation_cycle_stats(session, sim)
     
     # Compose summary (reuse logic from other summary endpoints if needed)
     summary = {
@@ -97,16 +96,16 @@ def api_simulation_summary_by_name(sim_name):
 @app.route('/api/simulation/<int:simulation_id>/summary')
 def api_simulation_summary_by_id(simulation_id):
     print(f"ENTERED api_simulation_summary_by_id for id={simulation_id}")
+    cached = cached_simulation_response(simulation_id, 'summary')
+    if cached is not None:
+        return cached
     session = db_manager.get_session()
     sim = session.query(Simulation).filter(Simulation.id == simulation_id).first()
     if not sim:
         session.close()
         return jsonify({"error": "Simulation not found"}), 404
     # Get the latest cycle number for this simulation
-    last_cycle_number = 0
-    latest_cycle = session.query(SimulationCycle).filter(SimulationCycle.simulation_id == simulation_id).order_by(SimulationCycle.cycle_number.desc()).first()
-    if latest_cycle:
-        last_cycle_number = latest_cycle.cycle_number
+    last_cycle_number, _ = simulation_cycle_stats(session, sim)
     summary = {
         "id": sim.id,
         "name": sim.name,
@@ -120,6 +119,9 @@ def api_simulation_summary_by_id(simulation_id):
         "last_cycle_number": last_cycle_number,
     }
     session.close()
+    if sim.status == 'completed':
+        entry = simulation_cache.store(sim.id, sim.completed_at, 'summary', fast_json.dumps(summary), 'application/json')
+        return simulation_artifact_response(entry)
     return jsonify(summary)
 
 # --- Daily Rebalance API Routes - The Only Strategy ---
@@ -209,8 +211,23 @@ load_dotenv(env_path)
 # Add parent directory to path so we can import from src
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.database import get_db_manager, TradingCycle, Simulation, SimulationCycle
+from src.database import get_db_manager, CycleRollup, Portfolio, TradingCycle, Simulation, SimulationCycle
 from src.robot_state import robot_state_manager
+from src.event_bus import get_event_bus, TOPIC_STATUS, TOPIC_SIMULATION_PROGRESS
+from src.chart_series import (
+    decimate_series, load_cycle_series, paginate_cycles, normalize_breakdown,
+    default_chart_points, max_page_size, DECIMATION_METHODS, SERIES_COLUMNS
+)
+from src.simulation_cache import get_simulation_cache, cache_control_header
+from src import fast_json
+from src.response_compression import init_compression, negotiate_encoding, encoded_etag
+from src.leader_election import create_leader_election
+from src.single_flight import SingleFlight
+from src.simulation_archive import ArchivePipeline, ARCHIVABLE_STATUSES, ARCHIVE_STATE_QUEUED, STATUS_DELETING
+from src.database_enhancements import SQLiteMaintenance
+from src.cycle_export import build_export_query, stream_export, stream_archive_export, export_filename, available_formats, EXPORT_FORMATS
+from src.holding_analytics import asset_summary, asset_cycles, archive_asset_summary, archive_asset_cycles
+from src.cycle_rollups import load_rollups, rollup_period_cycles, rollup_totals, GRAINS, SCOPE_PORTFOLIO, SCOPE_SIMULATION
 
 # Get the parent directory (project root) for templates and static files
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -219,12 +236,27 @@ static_dir = os.path.join(project_root, 'static')
 
 # Only Daily Rebalance strategy - no additional APIs needed
 
+class FastJSONProvider(DefaultJSONProvider):
+    """jsonify and request.get_json through fast_json (orjson when installed)"""
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs):
+        return fast_json.dumps(obj, sort_keys=kwargs.get('sort_keys', False))
+
+    def loads(self, s, **kwargs):
+        return fast_json.loads(s)
+
 app = Flask(__name__, template_folder=template_dir, static_folder=static_dir)
 app.secret_key = os.getenv('FLASK_SECRET_KEY', 'crypto-robot-secret-key-change-this')
+app.json = FastJSONProvider(app)
+init_compression(app)
 # Only Daily Rebalance strategy - no additional blueprints needed
 
-# Initialize Socket.IO for real-time communication
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
+# Initialize Socket.IO for real-time communication. With several workers, a
+# message queue (e.g. redis://) lets any worker emit to every connected client
+SOCKETIO_MESSAGE_QUEUE = os.getenv('SOCKETIO_MESSAGE_QUEUE') or None
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading',
+                    message_queue=SOCKETIO_MESSAGE_QUEUE)
 
 # Initialize database manager
 db_manager = get_db_manager()
@@ -235,11 +267,68 @@ try:
 except Exception as e:
     print(f"Warning: failed to ensure database tables exist: {e}")
 
-# Global variables for real-time monitoring
-monitoring_thread = None
-monitoring_active = False
-last_status_data = None
-simulation_watchdog_started = False
+# --- Request-scoped database sessions ---
+# Every session opened while serving a request is closed at teardown; one
+# still holding a connection by then was leaked by its route and is logged
+request_session_leaks = 0
+
+def track_request_session(session):
+    """db_manager.session_tracker: remember sessions opened by the current request"""
+    if has_request_context():
+        caller = sys._getframe(2)
+        g.setdefault('db_sessions', []).append((session, f"{caller.f_code.co_name}:{caller.f_lineno}"))
+
+db_manager.session_tracker = track_request_session
+
+def request_session():
+    """The current request's session: opened on first use, closed automatically at teardown"""
+    if 'db_session' not in g:
+        g.db_session = db_manager.get_session()
+    return g.db_session
+
+@app.teardown_request
+def close_request_sessions(exc=None):
+    global request_session_leaks
+    scoped = g.pop('db_session', None)
+    for session, origin in g.pop('db_sessions', []):
+        try:
+            if session is not scoped and session.in_transaction():
+                request_session_leaks += 1
+                logger.warning(f"⚠️ DB session opened in {origin} still open after {request.path}; closed at teardown")
+            session.close()
+        except Exception as e:
+            logger.error(f"❌ Failed to close request session from {origin}: {e}")
+    db_manager.pool_monitor.check_leaks()
+
+@app.route('/api/db/pool')
+def api_db_pool():
+    """Connection pool metrics and leak counters of this worker"""
+    stats = db_manager.get_pool_stats()
+    stats['request_session_leaks'] = request_session_leaks
+    stats['pid'] = os.getpid()
+    if sqlite_maintenance is not None:
+        stats['sqlite_maintenance'] = sqlite_maintenance.get_stats()
+    return jsonify(stats)
+
+# The summary routes at the top of this file were registered on the first app instance
+app.add_url_rule('/api/simulation/by-name/<string:sim_name>/summary', view_func=api_simulation_summary_by_name)
+app.add_url_rule('/api/simulation/<int:simulation_id>/summary', view_func=api_simulation_summary_by_id)
+
+# Rendered pages and summaries of completed simulations
+simulation_cache = get_simulation_cache()
+
+# Real-time monitoring: workers hold no shared state; loops that must run once
+# (watchdog, cross-process event listener) run in the elected leader only
+event_bus = get_event_bus()
+event_forwarding_started = False
+last_forwarded_status = None
+# Fallback poll of the status row and freeze state (lost datagrams, local-only bus, other processes)
+STATUS_POLL_SECONDS = float(os.getenv('STATUS_POLL_SECONDS', '30'))
+leader = create_leader_election('web-background', db_manager)
+# Exports, purges and deletes of simulations marked by requests (leader only)
+archive_pipeline = ArchivePipeline(db_manager)
+# WAL checkpoints, ANALYZE, incremental vacuum and integrity checks (SQLite, leader only)
+sqlite_maintenance = SQLiteMaintenance(db_manager.engine) if db_manager.db_type == 'sqlite' else None
 
 # Template context processor to make domain and HTTPS config available in all templates
 @app.context_processor
@@ -266,6 +355,15 @@ def inject_domain_config():
         'base_asset': base_asset
     }
 
+@app.before_request
+def _tag_binance_priority():
+    # Dashboard requests yield Binance weight to the live robot and simulations
+    set_thread_priority(PRIORITY_DASHBOARD)
+
+@app.teardown_request
+def _untag_binance_priority(exc=None):
+    set_thread_priority(None)
+
 @app.route('/')
 def index():
     """Main dashboard page"""
@@ -282,107 +380,23 @@ def daily_rebalance_dashboard():
         return render_template('daily_rebalance_dashboard.html', 
                              error=str(e))
 
+@app.route('/api/binance-governor')
+def binance_governor_metrics():
+    """Binance request weight usage, queueing and shedding counters"""
+    return jsonify(get_binance_governor().get_metrics())
+
 @app.route('/api/status')
 def get_status():
     """Get robot status API - Shows dry-run data when in dry-run mode, real data otherwise"""
     try:
-        # Get database info
-        db_info = db_manager.get_database_info()
-        
-        # Get robot state
-        robot_status = robot_state_manager.get_status_summary()
-        
-        # Get dry-run mode from environment
-        dry_run_mode = os.getenv('ROBOT_DRY_RUN', 'true').lower() == 'true'
-        
-        if dry_run_mode:
-            # In dry-run mode, show dry-run portfolio data
-            try:
-                from src.dry_run_manager import dry_run_manager
-                portfolio_summary = dry_run_manager.get_portfolio_summary()
-                
-                status = {
-                    'is_frozen': robot_status['is_frozen'],
-                    'freeze_reason': robot_status['freeze_reason'],
-                    'freeze_timestamp': robot_status['freeze_timestamp'],
-                    'cycles_suspended': robot_status['cycles_suspended'],
-                    'current_cycle': portfolio_summary['total_trades'],  # Use trades as cycle indicator
-                    'bnb_reserve': portfolio_summary['reserve_balance'],
-                    'portfolio_value': portfolio_summary['portfolio_value'],
-                    'total_value': portfolio_summary['total_value'],
-                    'last_cycle_time': portfolio_summary['last_update'],
-                    'database': db_info,
-                    'data_source': 'dry_run',
-                    'dry_run_mode': dry_run_mode
-                }
-            except Exception as e:
-                print(f"Error getting dry-run data: {e}")
-                # Fallback to zeros if dry-run manager fails
-                status = {
-                    'is_frozen': robot_status['is_frozen'],
-                    'freeze_reason': robot_status['freeze_reason'],
-                    'freeze_timestamp': robot_status['freeze_timestamp'],
-                    'cycles_suspended': robot_status['cycles_suspended'],
-                    'current_cycle': 0,
-                    'bnb_reserve': 0.0,
-                    'portfolio_value': 0.0,
-                    'total_value': 0.0,
-                    'last_cycle_time': robot_status['last_cycle_time'],
-                    'database': db_info,
-                    'data_source': 'none',
-                    'dry_run_mode': dry_run_mode
-                }
-        else:
-            # In live mode, show real trading cycle data
-            session = db_manager.get_session()
-            latest_cycle = None
-            data_source = "none"
-            
-            try:
-                # Only look for real trading cycle data
-                latest_cycle = session.query(TradingCycle).order_by(TradingCycle.cycle_number.desc()).first()
-                if latest_cycle:
-                    data_source = "real"
-            except Exception as e:
-                print(f"Error with trading cycles: {e}")
-            
-            if latest_cycle:
-                status = {
-                    'is_frozen': robot_status['is_frozen'],
-                    'freeze_reason': robot_status['freeze_reason'],
-                    'freeze_timestamp': robot_status['freeze_timestamp'],
-                    'cycles_suspended': robot_status['cycles_suspended'],
-                    'current_cycle': latest_cycle.cycle_number,
-                    'bnb_reserve': latest_cycle.bnb_reserve,
-                    'portfolio_value': latest_cycle.portfolio_value,
-                    'total_value': latest_cycle.total_value,
-                    'last_cycle_time': robot_status['last_cycle_time'],
-                    'database': db_info,
-                    'data_source': data_source,
-                    'dry_run_mode': dry_run_mode
-                }
-            else:
-                # No real robot data
-                status = {
-                    'is_frozen': robot_status['is_frozen'],
-                    'freeze_reason': robot_status['freeze_reason'],
-                    'freeze_timestamp': robot_status['freeze_timestamp'],
-                    'cycles_suspended': robot_status['cycles_suspended'],
-                    'current_cycle': 0,
-                    'bnb_reserve': 0.0,
-                    'portfolio_value': 0.0,
-                    'total_value': 0.0,
-                    'last_cycle_time': robot_status['last_cycle_time'],
-                    'database': db_info,
-                    'data_source': 'none',
-                    'dry_run_mode': dry_run_mode
-                }
-            
-            session.close()
-        
-        return jsonify(status)
+        latest_status = db_manager.get_latest_status()
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        print(f"Error with trading cycles: {e}")
+        latest_status = {}
+    status = get_current_status_data(latest_status)
+    if 'error' in status:
+        return jsonify(status), 500
+    return jsonify(status)
 
 # Fallback alias for environments where frontend expects /status
 @app.route('/status')
@@ -463,31 +477,20 @@ def get_simulation_status():
 def get_portfolio_history():
     """Get portfolio value history"""
     try:
-        total_values = []
-        for cycle in cycles:
-            total_values.append(cycle.total_value)
-
-        # Create Plotly chart with only (portfolio + reserve)
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=list(range(1, len(total_values) + 1)),
-            y=total_values,
-            mode='lines+markers',
-            name='Portfolio + Reserve',
-            line=dict(color='#28a745', width=3),
-            marker=dict(size=6),
-            hoverinfo='x+y',
-            customdata=[c.as_dict() for c in cycles],
-        ))
-        fig.update_layout(
-            title='Portfolio + Reserve Value Evolution',
-            xaxis_title='Cycle',
-            yaxis_title=f'Total Value ({base_asset})',
-            legend=dict(x=0.01, y=0.99, bgcolor='rgba(255,255,255,0.7)', bordercolor='rgba(0,0,0,0.1)'),
-            template='plotly_white'
-        )
-        chart_json = json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
-        return jsonify(reserve_data)
+        session = request_session()
+        rows = session.query(TradingCycle.cycle_number, TradingCycle.cycle_date, TradingCycle.portfolio_value,
+                             TradingCycle.bnb_reserve, TradingCycle.total_value) \
+            .order_by(TradingCycle.cycle_number).all()
+        return jsonify([
+            {
+                'cycle_number': row.cycle_number,
+                'date': row.cycle_date.isoformat() if row.cycle_date else None,
+                'portfolio_value': row.portfolio_value,
+                'bnb_reserve': row.bnb_reserve,
+                'total_value': row.total_value
+            }
+            for row in rows
+        ])
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -539,18 +542,101 @@ def manual_cycle():
         logger.error(f"Error in manual cycle: {e}")
         return jsonify({'error': str(e)}), 500
 
+# --- Shared Binance snapshots for dashboard endpoints ---
+# Every open tab polls the same account and prices: concurrent identical
+# fetches share one upstream request, and its result for a short window
+binance_single_flight = SingleFlight(ttl=float(os.getenv('SINGLE_FLIGHT_TTL_SECONDS', '1.0')))
+dashboard_client = None
+dashboard_client_lock = threading.Lock()
+
+def binance_credentials_configured() -> bool:
+    api_key = os.getenv('BINANCE_API_KEY')
+    return bool(api_key and os.getenv('BINANCE_SECRET_KEY') and api_key != 'your_binance_api_key_here')
+
+def get_dashboard_binance_client():
+    """One governed client for dashboard reads (creating a client pings Binance)"""
+    global dashboard_client
+    with dashboard_client_lock:
+        if dashboard_client is None:
+            from src.enhanced_binance_client import EnhancedBinanceClient
+            dashboard_client = EnhancedBinanceClient(os.getenv('BINANCE_API_KEY'), os.getenv('BINANCE_SECRET_KEY'),
+                                                     priority=PRIORITY_DASHBOARD)
+        return dashboard_client
+
+def get_account_snapshot() -> dict:
+    """Raw Binance account (balances, permissions), shared by concurrent requests"""
+    return binance_single_flight.do('account', lambda: get_dashboard_binance_client().get_account())
+
+def fetch_all_prices() -> dict:
+    """{symbol: price} from one ticker request; raises on failure so the error is never cached"""
+    tickers = get_dashboard_binance_client().client.get_symbol_ticker()
+    return {ticker['symbol']: float(ticker['price']) for ticker in tickers}
+
+def get_price_snapshot() -> dict:
+    """{symbol: price} for every pair in one ticker request, shared by concurrent requests ({} on error)"""
+    try:
+        return binance_single_flight.do('prices', fetch_all_prices)
+    except Exception as e:
+        logger.error(f"❌ Error getting all prices: {e}")
+        return {}
+
+class SnapshotAccountClient:
+    """Binance client stand-in for BalanceValidator reading the shared account snapshot"""
+
+    def get_account(self):
+        return get_account_snapshot()
+
+def asset_price_in(asset: str, quote: str, prices: dict) -> float:
+    """Price of asset in quote from the ticker snapshot (direct, inverse or via USDT), 0 if unknown"""
+    if asset == quote:
+        return 1.0
+    if f"{asset}{quote}" in prices:
+        return prices[f"{asset}{quote}"]
+    if prices.get(f"{quote}{asset}"):
+        return 1.0 / prices[f"{quote}{asset}"]
+    asset_usdt = 1.0 if asset == 'USDT' else prices.get(f"{asset}USDT")
+    quote_usdt = 1.0 if quote == 'USDT' else prices.get(f"{quote}USDT")
+    if asset_usdt and quote_usdt:
+        return asset_usdt / quote_usdt
+    return 0.0
+
+def build_account_view(account: dict, prices: dict) -> dict:
+    """Non-zero balances valued in the reserve asset, shaped for binance_account.html"""
+    reserve_asset = os.getenv('RESERVE_ASSET', 'BNB')
+    balances = []
+    for balance in account.get('balances', []):
+        free, locked = float(balance['free']), float(balance['locked'])
+        total = free + locked
+        if total <= 0:
+            continue
+        price = asset_price_in(balance['asset'], reserve_asset, prices)
+        balances.append({
+            'asset': balance['asset'],
+            'free': free,
+            'locked': locked,
+            'total': total,
+            'price_bnb': price,
+            'value_bnb': total * price
+        })
+    balances.sort(key=lambda b: b['value_bnb'], reverse=True)
+    update_time = account.get('updateTime')
+    return {
+        'balances': balances,
+        'total_value_bnb': sum(b['value_bnb'] for b in balances),
+        'account_type': account.get('accountType', 'SPOT'),
+        'can_trade': account.get('canTrade', False),
+        'can_deposit': account.get('canDeposit', False),
+        'can_withdraw': account.get('canWithdraw', False),
+        'update_time': datetime.fromtimestamp(update_time / 1000) if update_time else datetime.now()
+    }
+
 @app.route('/api/validate-balance')
 def validate_balance():
     """Validate Binance account balance for robot startup"""
     try:
         from src.balance_validator import BalanceValidator
-        from src.enhanced_binance_client import EnhancedBinanceClient
         
-        # Initialize Binance client
-        api_key = os.getenv('BINANCE_API_KEY')
-        secret_key = os.getenv('BINANCE_SECRET_KEY')
-        
-        if not api_key or not secret_key or api_key == 'your_binance_api_key_here':
+        if not binance_credentials_configured():
             return jsonify({
                 'success': False,
                 'error': 'binance_not_configured',
@@ -558,8 +644,8 @@ def validate_balance():
                 'can_start_robot': False
             }), 400
         
-        binance_client = EnhancedBinanceClient(api_key, secret_key)
-        validator = BalanceValidator(binance_client)
+        # Summary and validation both read the shared account snapshot
+        validator = BalanceValidator(SnapshotAccountClient())
         
         # Get balance summary
         summary = validator.get_balance_summary()
@@ -809,14 +895,7 @@ def portfolio_inject():
 def get_usdc_balance():
     """Get current USDC balance in Binance account"""
     try:
-        from src.enhanced_binance_client import EnhancedBinanceClient
-        
-        binance_client = EnhancedBinanceClient(
-            os.getenv('BINANCE_API_KEY'),
-            os.getenv('BINANCE_SECRET_KEY')
-        )
-        
-        account_info = binance_client.get_account_info()
+        account_info = get_account_snapshot()
         balances = account_info.get('balances', [])
         
         usdc_balance = 0.0
@@ -955,23 +1034,14 @@ def close_portfolio():
 def get_live_prices():
     """Get live prices for assets with balances"""
     try:
-        from src.binance_client import BinanceAPIClient
-        import os
-        from dotenv import load_dotenv
-        
-        load_dotenv()
-        api_key = os.getenv('BINANCE_API_KEY')
-        secret_key = os.getenv('BINANCE_SECRET_KEY')
-        
-        if not api_key or not secret_key or api_key == 'your_binance_api_key_here':
+        if not binance_credentials_configured():
             return jsonify({'error': 'Binance credentials not configured'}), 400
         
-        client = BinanceAPIClient(api_key, secret_key)
-        
-        # Get account info
-        account_info = client.get_account_info()
+        # Shared snapshots: one account request and one ticker request for all tabs
+        account_info = get_account_snapshot()
         if not account_info:
             return jsonify({'error': 'Unable to get account info'}), 500
+        prices = get_price_snapshot()
         
         live_prices = {}
         total_value_usdt = 0
@@ -993,11 +1063,9 @@ def get_live_prices():
                     }
                     total_value_usdt += total_balance
                 else:
-                    # Get price for this asset
                     symbol = f"{asset}USDT"
-                    try:
-                        price_data = client.client.get_symbol_ticker(symbol=symbol)
-                        price = float(price_data['price'])
+                    price = asset_price_in(asset, 'USDT', prices)
+                    if price > 0:
                         value_usdt = total_balance * price
                         
                         live_prices[asset] = {
@@ -1007,7 +1075,7 @@ def get_live_prices():
                             'balance': total_balance
                         }
                         total_value_usdt += value_usdt
-                    except Exception as e:
+                    else:
                         # If pair doesn't exist, mark as unavailable
                         live_prices[asset] = {
                             'price': 0,
@@ -1060,10 +1128,11 @@ def portfolio_history():
         dates = []
         
         session = db_manager.get_session()
-        cycle_data = session.query(TradingCycle).order_by(TradingCycle.cycle_number).all()
+        # Decimated series only; breakdowns are fetched per clicked cycle
+        series = decimate_series(trading_history_series(session), default_chart_points())
         
         # Handle empty data case
-        if not cycle_data:
+        if not series['cycle_number']:
             print("No trading cycles found - creating empty chart")
             # Create empty chart with message
             fig = go.Figure()
@@ -1082,22 +1151,9 @@ def portfolio_history():
                 showlegend=False
             )
         else:
-            for cycle in cycle_data:
-                cycles.append(cycle.cycle_number)
-                portfolio_values.append(cycle.portfolio_value)
-                total_values.append(cycle.total_value)
-                dates.append(cycle.cycle_date.strftime('%d/%m/%Y %H:%M'))
-            
-            # Prepare portfolio breakdown data for customdata
-            portfolio_breakdowns = [cycle.portfolio_breakdown for cycle in cycle_data]
-            
-            # Combine portfolio breakdown and reserve data for customdata
-            combined_data = []
-            for i in range(len(cycle_data)):
-                combined_data.append({
-                    'portfolio_breakdown': portfolio_breakdowns[i],
-                    'bnb_reserve': cycle_data[i].bnb_reserve
-                })
+            cycles = series['cycle_number']
+            portfolio_values = series['portfolio_value']
+            total_values = series['total_value']
             
             # Create Plotly charts with data
             fig = go.Figure()
@@ -1108,7 +1164,6 @@ def portfolio_history():
                 mode='lines+markers',
                 name=f'Portfolio Value ({os.getenv("RESERVE_ASSET", "BNB")})',
                 line=dict(color='blue', width=2),
-                customdata=combined_data,
                 hovertemplate=f'Cycle: %{{x}}<br>Portfolio Value: %{{y:.6f}} {os.getenv("RESERVE_ASSET", "BNB")}<br><i>Click to see portfolio breakdown</i><extra></extra>'
             ))
             
@@ -1118,7 +1173,6 @@ def portfolio_history():
                 mode='lines+markers',
                 name=f'Total Value ({os.getenv("RESERVE_ASSET", "BNB")})',
                 line=dict(color='green', width=2),
-                customdata=combined_data,
                 hovertemplate=f'Cycle: %{{x}}<br>Total Value: %{{y:.6f}} {os.getenv("RESERVE_ASSET", "BNB")}<br><i>Click to see portfolio breakdown</i><extra></extra>'
             ))
             
@@ -1134,7 +1188,7 @@ def portfolio_history():
         
         # Convert to JSON safely
         try:
-            chart_json = json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+            chart_json = fast_json.dumps(fig)
         except Exception as json_error:
             print(f"JSON encoding error: {json_error}")
             # Fallback to simple empty chart
@@ -1145,7 +1199,7 @@ def portfolio_history():
                 x=0.5, y=0.5,
                 showarrow=False
             )
-            chart_json = json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+            chart_json = fast_json.dumps(fig)
         
         return render_template('portfolio_history.html', chart_json=chart_json)
         
@@ -1165,12 +1219,11 @@ def reserve_history():
         dates = []
         
         session = db_manager.get_session()
-        cycle_data = session.query(TradingCycle).order_by(TradingCycle.cycle_number).all()
-        
-        for cycle in cycle_data:
-            cycles.append(cycle.cycle_number)
-            reserves.append(cycle.bnb_reserve)
-            dates.append(cycle.cycle_date.strftime('%Y-%m-%d %H:%M'))
+        # min/max decimation keeps every dip below the reserve limit visible
+        series = decimate_series(trading_history_series(session, columns=('bnb_reserve',)),
+                                 default_chart_points(), method='minmax', y_key='bnb_reserve')
+        cycles = series['cycle_number']
+        reserves = series['bnb_reserve']
         
         session.close()
         
@@ -1205,7 +1258,7 @@ def reserve_history():
             template='plotly_white'
         )
         
-        chart_json = json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+        chart_json = fast_json.dumps(fig)
         
         return render_template('reserve_history.html', chart_json=chart_json)
         
@@ -1220,7 +1273,7 @@ def reserve_history():
             template='plotly_white'
         )
         
-        chart_json = json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+        chart_json = fast_json.dumps(fig)
         
         return render_template('reserve_history.html', chart_json=chart_json)
         
@@ -1300,7 +1353,7 @@ def combined_history():
             )
         )
         
-        chart_json = json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+        chart_json = fast_json.dumps(fig)
         
         return render_template('combined_history.html', chart_json=chart_json)
         
@@ -1335,23 +1388,31 @@ def simulator_start():
 def simulator_list():
     """List all simulations"""
     try:
-        session = db_manager.get_session()
-        simulations = session.query(Simulation).order_by(Simulation.name.asc()).all()
+        session = request_session()
+        simulations = session.query(Simulation).filter(Simulation.status != STATUS_DELETING) \
+            .order_by(Simulation.name.asc()).all()
+        
+        # Latest cycle number and total fees of every simulation from the monthly rollups;
+        # one grouped cycle query covers simulations not rolled up yet
+        cycle_stats = rollup_totals(session, CycleRollup, SCOPE_SIMULATION)
+        missing = [sim.id for sim in simulations if sim.id not in cycle_stats and not sim.archive_path]
+        if missing:
+            cycle_stats.update({
+                row.simulation_id: (row.last_cycle or 0, row.total_fees or 0.0)
+                for row in session.query(SimulationCycle.simulation_id,
+                                         func.max(SimulationCycle.cycle_number).label('last_cycle'),
+                                         func.sum(SimulationCycle.trading_costs).label('total_fees'))
+                .filter(SimulationCycle.simulation_id.in_(missing))
+                .group_by(SimulationCycle.simulation_id)
+            })
         
         # Add current cycle information and calculate total fees for each simulation
         simulation_data = []
         for sim in simulations:
-            # Get the latest cycle number for this simulation
-            latest_cycle = session.query(SimulationCycle).filter(
-                SimulationCycle.simulation_id == sim.id
-            ).order_by(SimulationCycle.cycle_number.desc()).first()
-            
-            current_cycle = latest_cycle.cycle_number if latest_cycle else 0
-            
-            # Calculate total fees from simulation cycles
-            total_cycle_fees = session.query(func.sum(SimulationCycle.trading_costs)).filter(
-                SimulationCycle.simulation_id == sim.id
-            ).scalar() or 0.0
+            if sim.archive_path and sim.id not in cycle_stats:
+                current_cycle, total_cycle_fees = simulation_cycle_stats(session, sim)
+            else:
+                current_cycle, total_cycle_fees = cycle_stats.get(sim.id, (0, 0.0))
             
             # Use cycle fees if available, otherwise use existing fee fields
             if total_cycle_fees > 0:
@@ -1377,10 +1438,9 @@ def simulator_list():
                 'final_total_value_net': final_total_value_net
             }
             simulation_data.append(sim_data)
-            
-        session.close()
         
-        return render_template('simulator_list.html', simulation_data=simulation_data)
+        return render_template('simulator_list.html', simulation_data=simulation_data,
+                               archivable_statuses=ARCHIVABLE_STATUSES)
     except Exception as e:
         print(f"[ERROR] Exception in simulator_list: {e}")
         import traceback
@@ -1471,6 +1531,9 @@ def run_simulation():
 @app.route('/simulator/<int:simulation_id>/history')
 def simulation_history(simulation_id):
     """View simulation portfolio history"""
+    cached = cached_simulation_response(simulation_id, 'history')
+    if cached is not None:
+        return cached
     try:
         session = db_manager.get_session()
         simulation = session.query(Simulation).get(simulation_id)
@@ -1478,67 +1541,17 @@ def simulation_history(simulation_id):
             session.close()
             return render_template('error.html', error='Simulation not found')
 
-        cycles = session.query(SimulationCycle).filter_by(
-            simulation_id=simulation_id
-        ).order_by(SimulationCycle.cycle_number).all()
+        # Decimated series only; breakdowns are fetched per clicked cycle
+        series = decimate_series(simulation_series(session, simulation), default_chart_points())
 
         # Calculate total fees from simulation cycles
-        total_cycle_fees = session.query(func.sum(SimulationCycle.trading_costs)).filter(
-            SimulationCycle.simulation_id == simulation_id
-        ).scalar() or 0.0
+        _, total_cycle_fees = simulation_cycle_stats(session, simulation)
 
         session.close()
 
-        if not cycles:
+        if not series['cycle_number']:
             return render_template('error.html', error='No cycle data found for this simulation')
 
-        # Extract data for the chart
-        cycle_numbers = [cycle.cycle_number for cycle in cycles]
-        total_values = [float(cycle.total_value) for cycle in cycles]
-        portfolio_values = [float(cycle.portfolio_value or 0.0) for cycle in cycles]
-
-        # Extract combined customdata for popup functionality (portfolio_breakdown + bnb_reserve)
-        portfolio_breakdowns = []
-        reserves = [float(cycle.bnb_reserve or 0.0) for cycle in cycles]
-        for i, cycle in enumerate(cycles):
-            breakdown = cycle.portfolio_breakdown
-            if isinstance(breakdown, str):
-                try:
-                    breakdown = json.loads(breakdown)
-                except Exception:
-                    breakdown = {}
-            if breakdown is None:
-                breakdown = {}
-            # Always output {crypto: {value, performance}} for popup
-            new_breakdown = {}
-            for coin, val in breakdown.items():
-                if isinstance(val, dict) and 'value' in val:
-                    # Already new format, but ensure performance exists
-                    new_breakdown[coin] = {
-                        'value': val.get('value', 0),
-                        'performance': val.get('performance', 0)
-                    }
-                elif isinstance(val, dict) and 'quantity' in val and ('price' in val or 'entry_price' in val):
-                    # Legacy format: convert
-                    price = val.get('price', val.get('entry_price', 0))
-                    new_breakdown[coin] = {
-                        'value': val['quantity'] * price,
-                        'performance': 0
-                    }
-                elif isinstance(val, (int, float)):
-                    new_breakdown[coin] = {'value': val, 'performance': 0}
-                else:
-                    # Unknown format, skip
-                    continue
-            # If portfolio is empty, add a placeholder
-            if not new_breakdown:
-                new_breakdown['NO_ASSETS'] = {'value': 0, 'performance': 0}
-            portfolio_breakdowns.append({
-                'portfolio_breakdown': new_breakdown,
-                'bnb_reserve': reserves[i],
-                'portfolio_value': portfolio_values[i]
-            })
-
         # Normalize data_source for UI compatibility
         if hasattr(simulation, 'data_source') and simulation.data_source:
             ds = simulation.data_source.lower()
@@ -1548,16 +1561,15 @@ def simulation_history(simulation_id):
                 simulation.data_source = 'simulated (100%)'
 
         # Create a chart configuration with combined customdata
-        chart_json = json.dumps({
+        chart_json = fast_json.dumps({
             "data": [{
-                "x": cycle_numbers,
-                "y": total_values,
+                "x": series['cycle_number'],
+                "y": series['total_value'],
                 "type": "scatter",
                 "mode": "lines+markers",
                 "name": "Portfolio + Reserve",
                 "line": {"color": "#28a745", "width": 3},
                 "marker": {"color": "#28a745", "size": 8},
-                "customdata": portfolio_breakdowns,
                 "hovertemplate": f"Cycle: %{{x}}<br>Total Value: %{{y:.6f}} {os.getenv('RESERVE_ASSET', 'BNB')}<extra></extra>"
             }],
             "layout": {
@@ -1573,20 +1585,134 @@ def simulation_history(simulation_id):
         if simulation.final_total_value and total_cycle_fees > 0:
             final_total_value_net = simulation.final_total_value - total_cycle_fees
 
-        return render_template('simulation_history.html', 
+        html = render_template('simulation_history.html', 
                              simulation=simulation, 
                              chart_json=chart_json,
                              total_fees=total_cycle_fees,
                              final_total_value_net=final_total_value_net)
+        if simulation.status == 'completed':
+            return simulation_artifact_response(
+                simulation_cache.store(simulation.id, simulation.completed_at, 'history', html))
+        return html
     except Exception as e:
         import traceback
         traceback.print_exc()
         return render_template('error.html', error=f'Error loading simulation history: {str(e)}')
 
+def simulation_artifact_response(entry):
+    """Serve a cached artifact with its strong ETag (304 when the client already has it)"""
+    response = make_response(entry.body)
+    response.mimetype = entry.mimetype
+    # The ETag names the representation the compression hook will send
+    encoding = negotiate_encoding(request.headers.get('Accept-Encoding', ''),
+                                  len(response.get_data()), entry.mimetype)
+    response.set_etag(encoded_etag(entry.etag, encoding))
+    response.headers['Cache-Control'] = cache_control_header()
+    return response.make_conditional(request)
+
+def cached_simulation_response(simulation_id, artifact):
+    """Response for an already rendered artifact of a completed simulation, or None"""
+    if simulation_id not in simulation_cache:
+        return None
+    # Another worker may have deleted or re-completed it: check the current version first
+    session = db_manager.get_session()
+    try:
+        current = session.query(Simulation.status, Simulation.completed_at) \
+            .filter(Simulation.id == simulation_id).first()
+    finally:
+        session.close()
+    if current is None or current.status != 'completed':
+        simulation_cache.invalidate(simulation_id)
+        return None
+    entry = simulation_cache.lookup(simulation_id, current.completed_at, artifact)
+    return simulation_artifact_response(entry) if entry is not None else None
+
+def simulation_archive_path(session, simulation_id):
+    """Archive file of an archived simulation, None while its cycles are in the database"""
+    return session.query(Simulation.archive_path).filter(Simulation.id == simulation_id).scalar()
+
+def history_series(session, model, scope, scope_id, columns=SERIES_COLUMNS, **filters):
+    """Value series for a history chart: every cycle within the chart point budget,
+    past it only the closing cycle of each rollup period (day, else week, else month)"""
+    points = default_chart_points()
+    last_cycle, _ = rollup_totals(session, CycleRollup, scope, [scope_id]).get(scope_id, (0, 0.0))
+    if last_cycle > points:
+        cycle_numbers = rollup_period_cycles(session, CycleRollup, scope, scope_id, points)
+        if cycle_numbers:
+            owner = 'portfolio_id' if scope == SCOPE_PORTFOLIO else 'simulation_id'
+            return load_cycle_series(session, model, columns, cycle_numbers=cycle_numbers, **{owner: scope_id})
+    return load_cycle_series(session, model, columns, **filters)
+
+def trading_history_series(session, columns=SERIES_COLUMNS):
+    """Value series of the live trading cycles (rollups of the latest portfolio for long ranges)"""
+    portfolio_id = session.query(func.max(Portfolio.id)).scalar()
+    return history_series(session, TradingCycle, SCOPE_PORTFOLIO, portfolio_id, columns)
+
+def simulation_series(session, simulation, columns=SERIES_COLUMNS):
+    """Value series of a simulation, read from its archive once archived"""
+    if simulation.archive_path:
+        return archive_pipeline.archive.load_series(simulation.archive_path, columns)
+    return history_series(session, SimulationCycle, SCOPE_SIMULATION, simulation.id, columns,
+                          simulation_id=simulation.id)
+
+def simulation_cycle_stats(session, simulation):
+    """(last cycle number, total cycle fees) of a simulation"""
+    totals = rollup_totals(session, CycleRollup, SCOPE_SIMULATION, [simulation.id])
+    if simulation.id in totals:
+        return totals[simulation.id]
+    if simulation.archive_path:
+        manifest = archive_pipeline.archive.manifest(simulation.archive_path)
+        return manifest['last_cycle_number'], manifest['total_trading_costs']
+    last_cycle, total_fees = session.query(func.max(SimulationCycle.cycle_number),
+                                           func.sum(SimulationCycle.trading_costs)) \
+        .filter(SimulationCycle.simulation_id == simulation.id).one()
+    return last_cycle or 0, total_fees or 0.0
+
+def simulation_room(simulation_id) -> str:
+    return f"simulation-{simulation_id}"
+
+def publish_simulation_progress(simulation, last_cycle_number=None, last_cycle_time=None, total_value=None):
+    """Publish a simulation's live progress (status change or completed cycle)"""
+    previous = event_bus.latest(TOPIC_SIMULATION_PROGRESS, simulation.id) or {}
+    event_bus.publish(TOPIC_SIMULATION_PROGRESS, {
+        'id': simulation.id,
+        'status': simulation.status,
+        'total_cycles': simulation.total_cycles,
+        'last_cycle_number': last_cycle_number if last_cycle_number is not None else previous.get('last_cycle_number', 0),
+        'last_cycle_time': last_cycle_time or previous.get('last_cycle_time'),
+        'total_value': total_value if total_value is not None else previous.get('total_value'),
+        'created_at': simulation.created_at.isoformat() if simulation.created_at else None,
+        'completed_at': simulation.completed_at.isoformat() if simulation.completed_at else None
+    }, key=simulation.id)
+
+def build_simulation_progress(progress: dict) -> dict:
+    """Add the time-derived fields (elapsed, stuck detection) to a progress record"""
+    now = datetime.utcnow()
+    created_at = datetime.fromisoformat(progress['created_at']) if progress.get('created_at') else now
+    last_cycle_time = datetime.fromisoformat(progress['last_cycle_time']) if progress.get('last_cycle_time') else created_at
+
+    # Determine if potentially stuck: no new cycle for > 15s
+    threshold_seconds = 15  # 15 seconds for fast stuck detection
+    seconds_since_last_cycle = (now - last_cycle_time).total_seconds()
+    return dict(
+        progress,
+        last_cycle_time=last_cycle_time.isoformat(),
+        created_at=created_at.isoformat(),
+        elapsed_seconds=(now - created_at).total_seconds(),
+        seconds_since_last_cycle=seconds_since_last_cycle,
+        stuck=progress.get('status') == 'running' and seconds_since_last_cycle > threshold_seconds,
+        stuck_threshold_seconds=threshold_seconds
+    )
+
 @app.route('/api/simulation/<int:simulation_id>/progress')
 def api_simulation_progress(simulation_id):
     """Return JSON with live simulation progress for dynamic UI updates."""
     try:
+        # Simulations run in this process publish every cycle: serve from memory
+        progress = event_bus.latest(TOPIC_SIMULATION_PROGRESS, simulation_id)
+        if progress:
+            return jsonify(build_simulation_progress(progress))
+
         session = db_manager.get_session()
         sim = session.query(Simulation).get(simulation_id)
         if not sim:
@@ -1597,34 +1723,221 @@ def api_simulation_progress(simulation_id):
         latest_cycle = session.query(SimulationCycle).filter_by(simulation_id=simulation_id) \
             .order_by(SimulationCycle.cycle_number.desc()).first()
 
-        now = datetime.utcnow()
-        created_at = sim.created_at if sim.created_at else now
-        last_cycle_time = latest_cycle.cycle_date if latest_cycle else created_at
-
-        # Determine if potentially stuck: no new cycle for > 15s
-        cycle_minutes = sim.cycle_length_minutes or 1
-        threshold_seconds = 15  # 15 seconds for fast stuck detection
-        seconds_since_last_cycle = (now - last_cycle_time).total_seconds()
-        is_stuck = sim.status == 'running' and seconds_since_last_cycle > threshold_seconds
-
-        payload = {
+        payload = build_simulation_progress({
             'id': sim.id,
             'status': sim.status,
             'total_cycles': sim.total_cycles,
             'last_cycle_number': latest_cycle.cycle_number if latest_cycle else 0,
-            'last_cycle_time': last_cycle_time.isoformat() if last_cycle_time else None,
-            'created_at': created_at.isoformat() if created_at else None,
-            'completed_at': sim.completed_at.isoformat() if sim.completed_at else None,
-            'elapsed_seconds': (now - created_at).total_seconds(),
-            'seconds_since_last_cycle': seconds_since_last_cycle,
-            'stuck': is_stuck,
-            'stuck_threshold_seconds': threshold_seconds
+            'last_cycle_time': latest_cycle.cycle_date.isoformat() if latest_cycle and latest_cycle.cycle_date else None,
+            'created_at': sim.created_at.isoformat() if sim.created_at else None,
+            'completed_at': sim.completed_at.isoformat() if sim.completed_at else None
+        })
+        session.close()
+        return jsonify(payload)
+    except Exception as e:
+        return jsonify({'error': 'server_error', 'message': str(e)}), 500
+
+def chart_series_args():
+    """(points, method) from the query string, bounded so a request cannot ask for every cycle"""
+    default_points = default_chart_points()
+    points = request.args.get('points', default_points, type=int)
+    points = max(3, min(points, default_points * 10))
+    method = request.args.get('method', 'lttb')
+    if method not in DECIMATION_METHODS:
+        raise ValueError(f"Unknown method '{method}' (use one of {', '.join(DECIMATION_METHODS)})")
+    return points, method
+
+def rollup_grain_arg():
+    """?grain=day|week|month for long-range views served from the rollups, None for cycle series"""
+    grain = request.args.get('grain')
+    if grain is not None and grain not in GRAINS:
+        raise ValueError(f"Unknown grain '{grain}' (use one of {', '.join(GRAINS)})")
+    return grain
+
+@app.route('/api/simulation/<int:simulation_id>/series')
+def api_simulation_series(simulation_id):
+    """Decimated value series of a simulation (?points=N&method=lttb|minmax), or its rollups (?grain=week)"""
+    try:
+        points, method = chart_series_args()
+        grain = rollup_grain_arg()
+    except ValueError as e:
+        return jsonify({'error': 'bad_request', 'message': str(e)}), 400
+    try:
+        session = request_session()
+        if grain:
+            return jsonify(load_rollups(session, CycleRollup, SCOPE_SIMULATION, simulation_id, grain))
+        archive_path = simulation_archive_path(session, simulation_id)
+        if archive_path:
+            series = archive_pipeline.archive.load_series(archive_path, SERIES_COLUMNS)
+        else:
+            series = load_cycle_series(session, SimulationCycle, simulation_id=simulation_id)
+        return jsonify(decimate_series(series, points, method))
+    except Exception as e:
+        return jsonify({'error': 'server_error', 'message': str(e)}), 500
+
+@app.route('/api/simulation/<int:simulation_id>/cycles')
+def api_simulation_cycles(simulation_id):
+    """Cycle summaries of a simulation, one page after the ?after=<cycle_number> cursor"""
+    try:
+        session = request_session()
+        after = request.args.get('after', type=int)
+        limit = request.args.get('limit', 100, type=int)
+        archive_path = simulation_archive_path(session, simulation_id)
+        if archive_path:
+            page = archive_pipeline.archive.paginate(archive_path, after, max(1, min(limit, max_page_size())))
+        else:
+            page = paginate_cycles(session, SimulationCycle, after=after, limit=limit, simulation_id=simulation_id)
+        return jsonify(page)
+    except Exception as e:
+        return jsonify({'error': 'server_error', 'message': str(e)}), 500
+
+@app.route('/api/simulation/<int:simulation_id>/cycles/<int:cycle_number>/breakdown')
+def api_simulation_cycle_breakdown(simulation_id, cycle_number):
+    """Portfolio breakdown of one simulation cycle, loaded when its chart point is clicked"""
+    try:
+        session = request_session()
+        archive_path = simulation_archive_path(session, simulation_id)
+        if archive_path:
+            cycle = archive_pipeline.archive.find_cycle(archive_path, cycle_number)
+        else:
+            cycle = session.query(SimulationCycle.cycle_number, SimulationCycle.portfolio_breakdown,
+                                  SimulationCycle.bnb_reserve, SimulationCycle.portfolio_value) \
+                .filter_by(simulation_id=simulation_id, cycle_number=cycle_number).first()
+            cycle = cycle._asdict() if cycle else None
+        if not cycle:
+            return jsonify({'error': 'not_found'}), 404
+        return jsonify({
+            'cycle_number': cycle['cycle_number'],
+            'portfolio_breakdown': normalize_breakdown(cycle['portfolio_breakdown']),
+            'bnb_reserve': cycle['bnb_reserve'],
+            'portfolio_value': cycle['portfolio_value']
+        })
+    except Exception as e:
+        return jsonify({'error': 'server_error', 'message': str(e)}), 500
+
+@app.route('/api/simulation/<int:simulation_id>/assets')
+def api_simulation_assets(simulation_id):
+    """Per-asset weight and value statistics of a simulation, aggregated by the database"""
+    try:
+        session = request_session()
+        archive_path = simulation_archive_path(session, simulation_id)
+        if archive_path:
+            assets = archive_asset_summary(archive_pipeline.archive, archive_path)
+        else:
+            assets = asset_summary(session, simulation_id)
+        return jsonify({'simulation_id': simulation_id, 'assets': assets})
+    except Exception as e:
+        return jsonify({'error': 'server_error', 'message': str(e)}), 500
+
+@app.route('/api/simulation/<int:simulation_id>/assets/<symbol>/cycles')
+def api_simulation_asset_cycles(simulation_id, symbol):
+    """Cycles holding one asset, e.g. ?min_weight=0.2 for the cycles where it is above 20% of the total value"""
+    try:
+        session = request_session()
+        kwargs = dict(min_weight=request.args.get('min_weight', type=float),
+                      max_weight=request.args.get('max_weight', type=float),
+                      after=request.args.get('after', type=int),
+                      limit=request.args.get('limit', 100, type=int))
+        symbol = symbol.upper()
+        archive_path = simulation_archive_path(session, simulation_id)
+        if archive_path:
+            page = archive_asset_cycles(archive_pipeline.archive, archive_path, symbol, **kwargs)
+        else:
+            page = asset_cycles(session, simulation_id, symbol, **kwargs)
+        return jsonify(page)
+    except Exception as e:
+        return jsonify({'error': 'server_error', 'message': str(e)}), 500
+
+@app.route('/api/trading/series')
+def api_trading_series():
+    """Decimated value series of the live trading cycles, or the portfolio rollups (?grain=week[&portfolio_id=N])"""
+    try:
+        points, method = chart_series_args()
+        grain = rollup_grain_arg()
+    except ValueError as e:
+        return jsonify({'error': 'bad_request', 'message': str(e)}), 400
+    try:
+        session = request_session()
+        if grain:
+            portfolio_id = request.args.get('portfolio_id', type=int) or session.query(func.max(Portfolio.id)).scalar()
+            return jsonify(load_rollups(session, CycleRollup, SCOPE_PORTFOLIO, portfolio_id, grain))
+        series = load_cycle_series(session, TradingCycle)
+        return jsonify(decimate_series(series, points, method))
+    except Exception as e:
+        return jsonify({'error': 'server_error', 'message': str(e)}), 500
+
+@app.route('/api/trading/cycles')
+def api_trading_cycles():
+    """Live trading cycle summaries, one page after the ?after=<cycle_number> cursor"""
+    try:
+        session = db_manager.get_session()
+        page = paginate_cycles(session, TradingCycle,
+                               after=request.args.get('after', type=int),
+                               limit=request.args.get('limit', 100, type=int))
+        session.close()
+        return jsonify(page)
+    except Exception as e:
+        return jsonify({'error': 'server_error', 'message': str(e)}), 500
+
+@app.route('/api/trading/cycles/<int:cycle_number>/breakdown')
+def api_trading_cycle_breakdown(cycle_number):
+    """Portfolio breakdown of one live trading cycle, loaded when its chart point is clicked"""
+    try:
+        session = db_manager.get_session()
+        cycle = session.query(TradingCycle).filter_by(cycle_number=cycle_number) \
+            .order_by(TradingCycle.id.desc()).first()
+        if not cycle:
+            session.close()
+            return jsonify({'error': 'not_found'}), 404
+        payload = {
+            'cycle_number': cycle.cycle_number,
+            'portfolio_breakdown': cycle.portfolio_breakdown,
+            'bnb_reserve': cycle.bnb_reserve,
+            'portfolio_value': cycle.portfolio_value
         }
         session.close()
         return jsonify(payload)
     except Exception as e:
         return jsonify({'error': 'server_error', 'message': str(e)}), 500
 
+# --- Bulk export: streamed from a server-side cursor, chunked, constant memory ---
+def export_response(dataset, simulation_id=None, archive_path=None):
+    """Chunked download of a dataset (?format=csv|csv.gz|parquet&from_cycle=&to_cycle=)"""
+    fmt = request.args.get('format', 'csv')
+    if fmt not in available_formats():
+        return jsonify({'error': 'bad_request', 'message': f"format must be one of {', '.join(available_formats())}"}), 400
+    from_cycle = request.args.get('from_cycle', type=int)
+    to_cycle = request.args.get('to_cycle', type=int)
+    if archive_path:
+        chunks = stream_archive_export(archive_pipeline.archive, archive_path, fmt, from_cycle, to_cycle)
+    else:
+        statement = build_export_query(dataset, simulation_id, from_cycle=from_cycle, to_cycle=to_cycle)
+        # The generator reads on its own connection: request sessions are closed at teardown
+        chunks = stream_export(db_manager.engine, statement, fmt)
+    return Response(stream_with_context(chunks), mimetype=EXPORT_FORMATS[fmt][0], headers={
+        'Content-Disposition': f'attachment; filename="{export_filename(dataset, fmt, simulation_id)}"',
+        'X-Accel-Buffering': 'no'  # let reverse proxies pass chunks through
+    })
+
+@app.route('/api/export/simulation/<int:simulation_id>/cycles')
+def api_export_simulation_cycles(simulation_id):
+    """All cycles of one simulation; archived simulations are exported from their archive file"""
+    session = request_session()
+    simulation = session.query(Simulation).get(simulation_id)
+    if not simulation:
+        return jsonify({'error': 'not_found'}), 404
+    return export_response('simulation-cycles', simulation_id, archive_path=simulation.archive_path)
+
+@app.route('/api/export/trading/cycles')
+def api_export_trading_cycles():
+    """All live trading cycles"""
+    return export_response('trading-cycles')
+
+@app.route('/api/export/trading/positions')
+def api_export_trading_positions():
+    """Positions held at each live trading cycle, with their cycle number"""
+    return export_response('cycle-positions')
+
 def simulation_watchdog_loop(interval_seconds: int = 15):
     """Background loop that auto-resolves stuck simulations.
 
@@ -1634,6 +1947,10 @@ def simulation_watchdog_loop(interval_seconds: int = 15):
       - Else: mark as failed with an informative error_message.
     """
     while True:
+        if not leader.is_leader:
+            # Leadership lost (db lease): another worker runs the watchdog
+            time.sleep(interval_seconds)
+            continue
         try:
             session = db_manager.get_session()
             try:
@@ -1705,29 +2022,30 @@ def simulation_watchdog_loop(interval_seconds: int = 15):
             print(f"[Watchdog] Error: {e}")
         time.sleep(interval_seconds)
 
-def start_simulation_watchdog():
-    """Start the simulation watchdog in a background task once."""
-    global simulation_watchdog_started
-    if not simulation_watchdog_started:
-        try:
-            socketio.start_background_task(simulation_watchdog_loop)
-            simulation_watchdog_started = True
-            print("[Watchdog] Started")
-        except Exception as e:
-            print(f"[Watchdog] Failed to start: {e}")
-
-# Try to start watchdog on import (safe no-op if it fails). It will also
-# be started lazily on the first request below, so imports won't break.
-try:
-    start_simulation_watchdog()
-except Exception as _e:
-    print(f"[Watchdog] Deferred start: {_e}")
-
-# Lazy ensure on first index hit
-@app.before_request
-def _ensure_watchdog():
-    if not simulation_watchdog_started:
-        start_simulation_watchdog()
+def start_background_loops():
+    """Start the single-instance loops; called once, when this worker is elected leader"""
+    socketio.start_background_task(simulation_watchdog_loop)
+    print(f"[Watchdog] Started (leader pid {os.getpid()})")
+    start_event_forwarding()
+    socketio.start_background_task(archive_pipeline.run_forever, None, lambda: leader.is_leader)
+    if sqlite_maintenance is not None:
+        socketio.start_background_task(sqlite_maintenance.run_forever, 60, lambda: leader.is_leader)
+
+def follow_leadership(is_leader):
+    """Hold the event bus port while leader only, so a demoted worker frees it for the new leader"""
+    if not is_leader:
+        event_bus.stop_listening()
+        return
+    if event_bus.backend is None:
+        app.logger.warning("Event bus is local-only (EVENT_BUS_BACKEND=local): robot cycles and freezes "
+                           f"reach dashboards only through the status poll every {STATUS_POLL_SECONDS}s")
+        return
+    socketio.start_background_task(listen_while_leader)
+
+def listen_while_leader():
+    """Receive cycles published by the trading robot process, retrying while the old leader still holds the port"""
+    while leader.is_leader and not event_bus.start_listening():
+        socketio.sleep(leader.retry_seconds)
 
 @app.route('/simulator/<int:simulation_id>/history-debug')
 def simulation_history_debug(simulation_id):
@@ -1766,6 +2084,9 @@ def simulation_history_debug(simulation_id):
 @app.route('/simulator/<int:simulation_id>/combined')
 def simulation_combined_history(simulation_id):
     """View simulation combined portfolio and reserve history"""
+    cached = cached_simulation_response(simulation_id, 'combined')
+    if cached is not None:
+        return cached
     try:
         session = db_manager.get_session()
         simulation = session.query(Simulation).get(simulation_id)
@@ -1773,47 +2094,21 @@ def simulation_combined_history(simulation_id):
             session.close()
             return render_template('error.html', error='Simulation not found')
         
-        cycles = session.query(SimulationCycle).filter_by(
-            simulation_id=simulation_id
-        ).order_by(SimulationCycle.cycle_number).all()
+        # Decimated series only; breakdowns are fetched per clicked cycle
+        series = decimate_series(simulation_series(session, simulation), default_chart_points(),
+                                 y_key='portfolio_value')
         
         # Calculate total fees from simulation cycles
-        total_cycle_fees = session.query(func.sum(SimulationCycle.trading_costs)).filter(
-            SimulationCycle.simulation_id == simulation_id
-        ).scalar() or 0.0
+        _, total_cycle_fees = simulation_cycle_stats(session, simulation)
         
         session.close()
         
-        if not cycles:
+        if not series['cycle_number']:
             return render_template('error.html', error='No cycle data found for this simulation')
         
-    # Trades windows removed
-        
-        # Create combined chart
-        cycle_numbers = [cycle.cycle_number for cycle in cycles]
-        portfolio_values = [cycle.portfolio_value for cycle in cycles]
-        reserves = [cycle.bnb_reserve for cycle in cycles]
-        # Normalize portfolio_breakdown into dicts
-        portfolio_breakdowns = []
-        for cycle in cycles:
-            pb = cycle.portfolio_breakdown
-            if isinstance(pb, str):
-                try:
-                    pb = json.loads(pb)
-                except Exception:
-                    pb = {}
-            if pb is None:
-                pb = {}
-            portfolio_breakdowns.append(pb)
-        
-        # Combine portfolio breakdown and reserve data for customdata
-        combined_data = []
-        for i in range(len(cycles)):
-            combined_data.append({
-                'portfolio_breakdown': portfolio_breakdowns[i],
-                'bnb_reserve': float(reserves[i] or 0.0),
-                'portfolio_value': float(portfolio_values[i] or 0.0)
-            })
+        cycle_numbers = series['cycle_number']
+        portfolio_values = series['portfolio_value']
+        reserves = series['bnb_reserve']
         
         fig = go.Figure()
         
@@ -1825,8 +2120,7 @@ def simulation_combined_history(simulation_id):
             name=f'Portfolio Value ({os.getenv("RESERVE_ASSET", "BNB")})',
             line=dict(color='blue', width=3),
             marker=dict(color='blue', size=8),
-            hovertemplate=f'Cycle: %{{x}}<br>Portfolio Value: %{{y:.6f}} {os.getenv("RESERVE_ASSET", "BNB")}<br>Click for details<extra></extra>',
-            customdata=combined_data  # Pass both portfolio and reserve data for click events
+            hovertemplate=f'Cycle: %{{x}}<br>Portfolio Value: %{{y:.6f}} {os.getenv("RESERVE_ASSET", "BNB")}<br>Click for details<extra></extra>'
         ))
         
         # Reserve in Red
@@ -1854,97 +2148,109 @@ def simulation_combined_history(simulation_id):
             )
         )
         
-        chart_json = json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+        chart_json = fast_json.dumps(fig)
         
         # Calculate net final value (after fees)
         final_total_value_net = None
         if simulation.final_total_value and total_cycle_fees > 0:
             final_total_value_net = simulation.final_total_value - total_cycle_fees
 
-        return render_template('simulation_combined_history.html', 
+        html = render_template('simulation_combined_history.html', 
                              simulation=simulation, 
                              chart_json=chart_json,
                              total_fees=total_cycle_fees,
                              final_total_value_net=final_total_value_net)
+        if simulation.status == 'completed':
+            return simulation_artifact_response(
+                simulation_cache.store(simulation.id, simulation.completed_at, 'combined', html))
+        return html
         
     except Exception as e:
         return render_template('error.html', error=str(e))
 
 @app.route('/simulator/<int:simulation_id>/delete', methods=['POST', 'GET'])
 def delete_simulation(simulation_id):
-    """Delete a simulation and all its cycles"""
+    """Queue a simulation for deletion; its cycles are removed in background batches"""
+    session = request_session()
     try:
-        session = db_manager.get_session()
         simulation = session.query(Simulation).get(simulation_id)
         
         if not simulation:
             flash('Simulation not found', 'error')
-            session.close()
             return redirect(url_for('simulator_list'))
         
-        simulation_name = simulation.name
-        
-    # Delete the simulation (cascade will delete simulation_cycles)
-        session.delete(simulation)
+        simulation.status = STATUS_DELETING
         session.commit()
-        session.close()
+        simulation_cache.invalidate(simulation_id)
+        archive_pipeline.wake()
         
-        flash(f'Simulation "{simulation_name}" has been deleted successfully', 'success')
+        flash(f'Simulation "{simulation.name}" is being deleted', 'success')
         return redirect(url_for('simulator_list'))
         
     except Exception as e:
-        if session:
-            session.close()
+        session.rollback()
         flash(f'Error deleting simulation: {str(e)}', 'error')
         return redirect(url_for('simulator_list'))
 
+@app.route('/simulator/<int:simulation_id>/archive', methods=['POST', 'GET'])
+def archive_simulation(simulation_id):
+    """Queue a finished simulation for archival: cycles move to a compressed file, off the hot table"""
+    session = request_session()
+    try:
+        simulation = session.query(Simulation).get(simulation_id)
+        
+        if not simulation:
+            flash('Simulation not found', 'error')
+            return redirect(url_for('simulator_list'))
+        if simulation.status not in ARCHIVABLE_STATUSES:
+            flash(f'Only finished simulations can be archived (status: {simulation.status})', 'error')
+            return redirect(url_for('simulator_list'))
+        if simulation.archive_state:
+            flash(f'Simulation "{simulation.name}" is already {simulation.archive_state}', 'info')
+            return redirect(url_for('simulator_list'))
+        
+        simulation.archive_state = ARCHIVE_STATE_QUEUED
+        session.commit()
+        archive_pipeline.wake()
+        
+        flash(f'Simulation "{simulation.name}" is being archived', 'success')
+        return redirect(url_for('simulator_list'))
+        
+    except Exception as e:
+        session.rollback()
+        flash(f'Error archiving simulation: {str(e)}', 'error')
+        return redirect(url_for('simulator_list'))
+
 @app.route('/simulator/delete-all', methods=['POST', 'GET'])
 def delete_all_simulations():
-    """Delete all simulations and their cycles"""
+    """Queue all simulations for deletion; their cycles are removed in background batches"""
     print(f"DELETE ALL SIMULATIONS route called - Method: {request.method}")
+    session = request_session()
     try:
-        session = db_manager.get_session()
         
         # Count simulations before deletion
-        nb_simulations = session.query(Simulation).count()
-        nb_cycles = session.query(SimulationCycle).count()
-        print(f"Found {nb_simulations} simulations and {nb_cycles} cycles to delete")
+        nb_simulations = session.query(Simulation).filter(Simulation.status != STATUS_DELETING).count()
+        print(f"Found {nb_simulations} simulations to delete")
         
         if nb_simulations == 0:
             print("No simulations to delete")
             flash('No simulations to delete', 'info')
-            session.close()
             return redirect(url_for('simulator_list'))
         
-        # Delete all simulation cycles first
-        print("Deleting all simulation cycles...")
-        deleted_cycles = session.query(SimulationCycle).delete(synchronize_session=False)
-        print(f"Deleted {deleted_cycles} cycles")
-        
-        # Delete all simulations
-        print("Deleting all simulations...")
-        deleted_sims = session.query(Simulation).delete(synchronize_session=False)
-        print(f"Deleted {deleted_sims} simulations")
-        
+        # One UPDATE; the archive pipeline purges cycles in batches, then removes the rows
+        queued = session.query(Simulation).filter(Simulation.status != STATUS_DELETING) \
+            .update({'status': STATUS_DELETING}, synchronize_session=False)
         session.commit()
-        print("Database changes committed")
-        session.close()
+        simulation_cache.invalidate()
+        archive_pipeline.wake()
         
-        # Use actual deleted counts if available
-        if deleted_sims is not None and deleted_cycles is not None:
-            print(f"SUCCESS: Deleted {deleted_sims} simulations and {deleted_cycles} cycles")
-            flash(f'Successfully deleted {deleted_sims} simulations and {deleted_cycles} cycles', 'success')
-        else:
-            print(f"SUCCESS: Deleted {nb_simulations} simulations and {nb_cycles} cycles")
-            flash(f'Successfully deleted {nb_simulations} simulations and {nb_cycles} cycles', 'success')
-        
-        print("Redirecting to simulator_list")
+        print(f"SUCCESS: Queued {queued} simulations for deletion")
+        flash(f'{queued} simulations are being deleted', 'success')
         return redirect(url_for('simulator_list'))
         
     except Exception as e:
         print(f"ERROR during deletion: {str(e)}")
-        if 'session' in locals():
-            session.close()
+        session.rollback()
         flash(f'Error during deletion: {str(e)}', 'error')
         return redirect(url_for('simulator_list'))
 
@@ -1978,6 +2284,7 @@ def force_complete_simulation(simulation_id):
         sim.status = 'completed'
         sim.completed_at = datetime.utcnow()
         session.commit()
+        simulation_cache.invalidate(simulation_id)
         flash(f'Simulation "{sim.name}" force-completed successfully', 'success')
         return redirect(url_for('simulator_list'))
     except Exception as e:
@@ -2004,6 +2311,7 @@ def force_cancel_simulation(simulation_id):
         sim.error_message = f"Force-canceled by user at {datetime.utcnow().isoformat()}"
         sim.completed_at = datetime.utcnow()
         session.commit()
+        simulation_cache.invalidate(simulation_id)
         flash(f'Simulation "{sim.name}" has been force-canceled', 'success')
         return redirect(url_for('simulator_list'))
     except Exception as e:
@@ -2257,7 +2565,7 @@ def run_historical_simulation_background(simulation_id, trades_count=1):
                     bnb_reserve=cycle_data.get('bnb_reserve', cycle_data.get('reserve', 0.0)),
                     portfolio_value=cycle_data.get('portfolio_value', 0.0),
                     total_value=cycle_data.get('total_value', 0.0),
-                    portfolio_breakdown=json.dumps(cycle_data.get('portfolio_breakdown', cycle_data.get('portfolio', {}))),
+                    portfolio_breakdown=cycle_data.get('portfolio_breakdown', cycle_data.get('portfolio', {})),
                     # Enhanced realistic mode data
                     trading_costs=cycle_data.get('trading_costs', 0.0),
                     execution_delay=cycle_data.get('execution_delay', 0.0),
@@ -2348,6 +2656,7 @@ def run_historical_simulation_background(simulation_id, trades_count: int = 1):
         # Update status to running
         simulation.status = 'running'
         session.commit()
+        publish_simulation_progress(simulation, last_cycle_number=0)
         print(f"[SIMBG] Simulation {simulation_id} set to running.")
 
         base_asset = os.getenv('RESERVE_ASSET', 'BNB')
@@ -2388,6 +2697,14 @@ def run_historical_simulation_background(simulation_id, trades_count: int = 1):
         for i in range(trades_count):
             window_start = simulation.start_date + timedelta(days=i * simulation.duration_days)
             print(f"[SIMBG] Running engine for window {i+1}/{trades_count}...")
+            def on_cycle(cycle_result, offset=combined_total_cycles):
+                # Cycles are stored in one batch at the end; push progress live
+                publish_simulation_progress(
+                    simulation,
+                    last_cycle_number=offset + cycle_result.get('cycle', cycle_result.get('cycle_number', 0)),
+                    last_cycle_time=datetime.utcnow().isoformat(),
+                    total_value=cycle_result.get('total_value')
+                )
             try:
                 # Call Daily Rebalance engine
                 results = engine.run_simulation(
@@ -2395,7 +2712,8 @@ def run_historical_simulation_background(simulation_id, trades_count: int = 1):
                     duration_days=simulation.duration_days,
                     cycle_length_minutes=simulation.cycle_length_minutes,
                     starting_reserve=simulation.starting_reserve,
-                    verbose=True
+                    verbose=True,
+                    progress_callback=on_cycle
                 )
                 if results is None:
                     print(f"[SIMBG] Simulation returned None for window {i+1}/{trades_count}")
@@ -2621,6 +2939,13 @@ def run_historical_simulation_background(simulation_id, trades_count: int = 1):
                 print(f"Error updating simulation status: {update_error}")
     finally:
         if session:
+            # Push the final status to live viewers
+            try:
+                final_simulation = session.query(Simulation).get(simulation_id)
+                if final_simulation is not None:
+                    publish_simulation_progress(final_simulation)
+            except Exception as publish_error:
+                print(f"[SIMBG] Could not publish final progress: {publish_error}")
             session.close()
 
 # Binance Account Routes
@@ -2629,56 +2954,34 @@ def run_historical_simulation_background(simulation_id, trades_count: int = 1):
 def binance_account():
     """Page pour consulter le compte Binance"""
     try:
-        # Importer et initialiser le client Binance
-        from src.binance_client import BinanceAPIClient
-        import os
-        from dotenv import load_dotenv
-        
-        load_dotenv()
-        api_key = os.getenv('BINANCE_API_KEY')
-        secret_key = os.getenv('BINANCE_SECRET_KEY')
-        
-        if not api_key or not secret_key or api_key == 'your_binance_api_key_here':
+        if not binance_credentials_configured():
             return render_template('error.html', 
                                  error="Les credentials Binance ne sont pas configurés. Veuillez configurer vos clés API dans le fichier .env")
         
-        client = BinanceAPIClient(api_key, secret_key)
-        
-        # Récupérer les informations du compte
-        account_info = client.get_account_info()
+        # Récupérer les informations du compte (snapshots partagés entre onglets)
+        account = get_account_snapshot()
         
-        if not account_info:
+        if not account:
             return render_template('error.html', 
                                  error="Impossible de récupérer les informations du compte Binance. Vérifiez vos credentials.")
         
+        prices = get_price_snapshot()
+        account_info = build_account_view(account, prices)
+        
         # Check if live prices are requested
         show_live_prices = request.args.get('live_prices', 'false').lower() == 'true'
         live_prices = {}
         
         if show_live_prices:
-            try:
-                # Get live prices for balances > 0
-                for balance in account_info.get('balances', []):
-                    asset = balance['asset']
-                    free_balance = float(balance['free'])
-                    locked_balance = float(balance['locked'])
-                    total_balance = free_balance + locked_balance
-                    
-                    if total_balance > 0 and asset != 'USDT':
-                        # Get price for this asset
-                        symbol = f"{asset}USDT"
-                        try:
-                            price_data = client.client.get_symbol_ticker(symbol=symbol)
-                            live_prices[asset] = {
-                                'price': float(price_data['price']),
-                                'symbol': symbol,
-                                'value_usdt': total_balance * float(price_data['price'])
-                            }
-                        except Exception:
-                            # If pair doesn't exist, try alternative or skip
-                            pass
-            except Exception as e:
-                print(f"Error getting live prices: {e}")
+            for balance in account_info['balances']:
+                asset = balance['asset']
+                price = asset_price_in(asset, 'USDT', prices)
+                if asset != 'USDT' and price > 0:
+                    live_prices[asset] = {
+                        'price': price,
+                        'symbol': f"{asset}USDT",
+                        'value_usdt': balance['total'] * price
+                    }
         
         return render_template('binance_account.html', 
                              account_info=account_info, 
@@ -2842,9 +3145,12 @@ def get_crypto_name_with_symbol(crypto_id):
             return f"CryptoToken {crypto_id} (CT{crypto_id})"
 
 # Real-time monitoring functions
-def get_current_status_data():
-    """Get current status data for real-time updates"""
-    global last_status_data
+def get_current_status_data(latest_status=None):
+    """
+    Status served by /api/status and pushed as status_update: the dry-run
+    portfolio in dry-run mode, else the latest committed cycle (`latest_status`,
+    or the last published status, or the status row when not given)
+    """
     try:
         # Get database info
         db_info = db_manager.get_database_info()
@@ -2852,69 +3158,115 @@ def get_current_status_data():
         # Get robot state
         robot_status = robot_state_manager.get_status_summary()
         
-        # Get latest cycle data
-        session = db_manager.get_session()
-        latest_cycle = session.query(TradingCycle).order_by(TradingCycle.cycle_number.desc()).first()
+        # Get dry-run mode from environment
+        dry_run_mode = os.getenv('ROBOT_DRY_RUN', 'true').lower() == 'true'
         
-        if latest_cycle:
-            status = {
-                'is_frozen': robot_status['is_frozen'],
-                'freeze_reason': robot_status['freeze_reason'],
-                'freeze_timestamp': robot_status['freeze_timestamp'],
-                'cycles_suspended': robot_status['cycles_suspended'],
-                'current_cycle': latest_cycle.cycle_number,
-                'bnb_reserve': latest_cycle.bnb_reserve,
-                'portfolio_value': latest_cycle.portfolio_value,
-                'total_value': latest_cycle.total_value,
-                'last_cycle_time': robot_status['last_cycle_time'],
-                'database': db_info,
-                'timestamp': datetime.now().isoformat()
-            }
+        status = {
+            'is_frozen': robot_status['is_frozen'],
+            'freeze_reason': robot_status['freeze_reason'],
+            'freeze_timestamp': robot_status['freeze_timestamp'],
+            'cycles_suspended': robot_status['cycles_suspended'],
+            'current_cycle': 0,
+            'bnb_reserve': 0.0,
+            'portfolio_value': 0.0,
+            'total_value': 0.0,
+            'last_cycle_time': robot_status['last_cycle_time'],
+            'database': db_info,
+            'data_source': 'none',
+            'dry_run_mode': dry_run_mode,
+            'timestamp': datetime.now().isoformat()
+        }
+        
+        if dry_run_mode:
+            # In dry-run mode, show dry-run portfolio data (zeros if the dry-run manager fails)
+            try:
+                from src.dry_run_manager import dry_run_manager
+                portfolio_summary = dry_run_manager.get_portfolio_summary()
+                status.update({
+                    'current_cycle': portfolio_summary['total_trades'],  # Use trades as cycle indicator
+                    'bnb_reserve': portfolio_summary['reserve_balance'],
+                    'portfolio_value': portfolio_summary['portfolio_value'],
+                    'total_value': portfolio_summary['total_value'],
+                    'last_cycle_time': portfolio_summary['last_update'],
+                    'data_source': 'dry_run'
+                })
+            except Exception as e:
+                print(f"Error getting dry-run data: {e}")
         else:
-            status = {
-                'is_frozen': robot_status['is_frozen'],
-                'freeze_reason': robot_status['freeze_reason'],
-                'freeze_timestamp': robot_status['freeze_timestamp'],
-                'cycles_suspended': robot_status['cycles_suspended'],
-                'current_cycle': 0,
-                'bnb_reserve': 0.0,
-                'portfolio_value': 0.0,
-                'total_value': 0.0,
-                'last_cycle_time': robot_status['last_cycle_time'],
-                'database': db_info,
-                'timestamp': datetime.now().isoformat()
-            }
+            # Latest committed cycle: last published status, else primary key lookup on the status row
+            if latest_status is None:
+                latest_status = event_bus.latest(TOPIC_STATUS) or db_manager.get_latest_status()
+            if latest_status:
+                status.update({
+                    'current_cycle': latest_status['current_cycle'],
+                    'bnb_reserve': latest_status['bnb_reserve'],
+                    'portfolio_value': latest_status['portfolio_value'],
+                    'total_value': latest_status['total_value'],
+                    'data_source': 'real'
+                })
         
-        session.close()
-        last_status_data = status
         return status
     except Exception as e:
         app.logger.error(f"Error getting status data: {e}")
         return {'error': str(e), 'timestamp': datetime.now().isoformat()}
 
-def monitor_status_changes():
-    """Background thread to monitor status changes and emit updates"""
-    global monitoring_active, last_status_data
-    
-    monitoring_active = True
-    previous_data = None
-    
-    while monitoring_active:
+def forwards_to_clients():
+    """
+    Whether this worker emits bus messages to Socket.IO. With a shared message
+    queue one emit reaches every worker's clients, so only the leader forwards
+    (it also receives the other workers' publishes over the bus); otherwise
+    each worker forwards to its own clients.
+    """
+    return not SOCKETIO_MESSAGE_QUEUE or event_bus.backend is None or leader.is_leader
+
+def forward_status_update(key, latest_status, message):
+    """Push a committed cycle's status to every dashboard (event bus subscriber)"""
+    global last_forwarded_status
+    previous_data = last_forwarded_status
+    current_data = get_current_status_data(latest_status)
+    last_forwarded_status = current_data
+    if not forwards_to_clients():
+        return
+    if previous_data is None or has_significant_change(previous_data, current_data):
+        socketio.emit('status_update', current_data, namespace='/')
+        app.logger.info("Status update emitted to clients")
+
+def forward_simulation_progress(simulation_id, progress, message):
+    """Push simulation progress to the clients watching that simulation"""
+    if not forwards_to_clients():
+        return
+    socketio.emit('simulation_progress', build_simulation_progress(progress),
+                  room=simulation_room(simulation_id), namespace='/')
+
+def status_poll_loop(should_run=None):
+    """Low-frequency fallback: push status and freeze changes that no event announced"""
+    global last_forwarded_status
+    while True:
+        socketio.sleep(STATUS_POLL_SECONDS)
+        if should_run is not None and not should_run():
+            continue  # paused while another worker forwards for everyone
         try:
-            current_data = get_current_status_data()
-            
-            # Check if data has changed significantly
-            if previous_data is None or has_significant_change(previous_data, current_data):
-                # Emit update to all connected clients
-                socketio.emit('status_update', current_data, namespace='/')
-                app.logger.info("Status update emitted to clients")
-                previous_data = current_data
-            
-            time.sleep(5)  # Check every 5 seconds
-            
+            robot_state_manager.reload_state()  # freezes from the robot and the portfolio tools
+            current_data = get_current_status_data(db_manager.get_latest_status())
+            previous_data = last_forwarded_status
+            if previous_data is not None and not has_significant_change(previous_data, current_data):
+                continue
+            last_forwarded_status = current_data
+            socketio.emit('status_update', current_data, namespace='/')
         except Exception as e:
-            app.logger.error(f"Error in monitoring thread: {e}")
-            time.sleep(10)  # Wait longer on error
+            app.logger.error(f"Error in status poll: {e}")
+
+def start_event_forwarding():
+    """Subscribe Socket.IO forwarding to the event bus (idempotent)"""
+    global event_forwarding_started
+    if event_forwarding_started:
+        return
+    event_forwarding_started = True
+    event_bus.subscribe(TOPIC_STATUS, forward_status_update)
+    event_bus.subscribe(TOPIC_SIMULATION_PROGRESS, forward_simulation_progress)
+    if STATUS_POLL_SECONDS > 0:
+        # Every worker with clients polls for them, unless the leader's emits reach everyone
+        socketio.start_background_task(status_poll_loop, forwards_to_clients)
 
 def has_significant_change(old_data, new_data):
     """Check if there's a significant change worth pushing to clients"""
@@ -2942,11 +3294,30 @@ def handle_connect():
     current_status = get_current_status_data()
     emit('status_update', current_status)
     
-    # Start monitoring thread if not already running
-    global monitoring_thread, monitoring_active
-    if monitoring_thread is None or not monitoring_thread.is_alive():
-        monitoring_thread = threading.Thread(target=monitor_status_changes, daemon=True)
-        monitoring_thread.start()
+    # Later updates are pushed as cycles are published
+    start_event_forwarding()
+
+@socketio.on('join_simulation')
+def handle_join_simulation(data):
+    """Subscribe this client to one simulation's progress events"""
+    try:
+        simulation_id = int((data or {}).get('simulation_id'))
+    except (TypeError, ValueError):
+        emit('simulation_progress', {'error': 'invalid simulation_id'})
+        return
+    start_event_forwarding()
+    join_room(simulation_room(simulation_id))
+    progress = event_bus.latest(TOPIC_SIMULATION_PROGRESS, simulation_id)
+    if progress:
+        emit('simulation_progress', build_simulation_progress(progress))
+
+@socketio.on('leave_simulation')
+def handle_leave_simulation(data):
+    """Stop sending a simulation's progress events to this client"""
+    try:
+        leave_room(simulation_room(int((data or {}).get('simulation_id'))))
+    except (TypeError, ValueError):
+        pass
 
 @socketio.on('disconnect')
 def handle_disconnect():
@@ -2999,6 +3370,14 @@ def handle_unfreeze_robot():
     except Exception as e:
         emit('unfreeze_result', {'success': False, 'error': str(e)})
 
+# Elect the worker that runs the background loops (after every loop is defined)
+leader.on_elected(start_background_loops)
+leader.on_change(follow_leadership)
+try:
+    leader.start(socketio.start_background_task)
+except Exception as _e:
+    print(f"[Watchdog] Leader election not started: {_e}")
+
 if __name__ == '__main__':
     # Read configuration from .env file
     flask_port = int(os.getenv('FLASK_PORT', 5000))
@@ -29,7 +29,9 @@ def cleanup_all_simulation_data():
     
     try:
         # Import database components
-        from src.database import get_db_manager, Simulation, SimulationCycle, TradingCycle
+        from src.database import (
+            get_db_manager, CycleRollup, LatestStatus, Simulation, SimulationCycle, SimulationCycleHolding, TradingCycle
+        )
         
         # Initialize database
         db_manager = get_db_manager()
@@ -41,6 +43,7 @@ def cleanup_all_simulation_data():
             # Count and delete simulation cycles
             sim_cycle_count = session.query(SimulationCycle).count()
             if sim_cycle_count > 0:
+                session.query(SimulationCycleHolding).delete()
                 deleted_sim_cycles = session.query(SimulationCycle).delete()
                 cleanup_summary['database_records_deleted'] += deleted_sim_cycles
                 print(f"   ✅ Deleted {deleted_sim_cycles} simulation cycles")
@@ -59,6 +62,10 @@ def cleanup_all_simulation_data():
                 cleanup_summary['database_records_deleted'] += deleted_simulations
                 print(f"   ✅ Deleted {deleted_simulations} simulations")
             
+            # Status row and rollups summarize the cycles deleted above
+            session.query(LatestStatus).delete()
+            session.query(CycleRollup).delete()
+            
             # Commit all deletions
             session.commit()
             session.close()
@@ -180,7 +187,9 @@ def start_fresh_portfolio_fast():
     
     try:
         # Import only what we need
-        from src.database import get_db_manager, Simulation, SimulationCycle, TradingCycle
+        from src.database import (
+            get_db_manager, CycleRollup, LatestStatus, Simulation, SimulationCycle, SimulationCycleHolding, TradingCycle
+        )
         
         # Get starting capital from environment or use default
         starting_capital = float(os.getenv('STARTING_CAPITAL', '100'))
@@ -195,11 +204,15 @@ def start_fresh_portfolio_fast():
         # Quick count and cleanup
         sim_count = session.query(Simulation).count()
         cycle_count = session.query(SimulationCycle).count()
+        trading_count = session.query(TradingCycle).count() + session.query(LatestStatus).count()
         
-        if sim_count > 0 or cycle_count > 0:
+        if sim_count > 0 or cycle_count > 0 or trading_count > 0:
             print(f"   🗑️  Cleaning {sim_count} simulations and {cycle_count} cycles...")
+            session.query(SimulationCycleHolding).delete()
             session.query(SimulationCycle).delete()
             session.query(TradingCycle).delete()
+            session.query(LatestStatus).delete()
+            session.query(CycleRollup).delete()
             session.query(Simulation).delete()
             session.commit()
             print(f"   ✅ Database cleaned")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Binance Rate Governor Tests
+Tests weight accounting, priority reserves, shedding and header synchronisation
+"""
+
+import os
+import sys
+import time
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "robot"))
+sys.path.insert(0, str(project_root / "robot" / "src"))
+
+from binance_rate_governor import (
+    BinanceRateGovernor, BinanceRequestShed, estimate_weight,
+    PRIORITY_LIVE, PRIORITY_SIMULATION, PRIORITY_DASHBOARD
+)
+
+
+class TestBinanceRateGovernor(unittest.TestCase):
+    """Test the shared Binance weight token bucket"""
+
+    def setUp(self):
+        self.governor = BinanceRateGovernor(weight_limit=100, state_file='')
+
+    def test_endpoint_weights(self):
+        """Test weight estimation for single-symbol and all-market calls"""
+        self.assertEqual(estimate_weight('/api/v3/klines', {'symbol': 'BTCUSDT'}), 2)
+        self.assertEqual(estimate_weight('/api/v3/ticker/24hr', {}), 80)
+        self.assertEqual(estimate_weight('/api/v3/ticker/24hr', {'symbol': 'BTCUSDT'}), 2)
+        self.assertEqual(estimate_weight('/api/v3/exchangeInfo'), 20)
+
+    def test_dashboard_shed_before_live(self):
+        """Test dashboard calls are shed while live calls still get weight"""
+        self.governor.acquire(40, PRIORITY_LIVE)
+        with self.assertRaises(BinanceRequestShed):
+            self.governor.acquire(10, PRIORITY_DASHBOARD)
+        self.governor.acquire(10, PRIORITY_SIMULATION)
+        self.governor.acquire(25, PRIORITY_LIVE)
+
+        metrics = self.governor.get_metrics()
+        self.assertEqual(metrics['priorities'][PRIORITY_DASHBOARD]['shed'], 1)
+        self.assertEqual(metrics['priorities'][PRIORITY_LIVE]['weight'], 65)
+
+    def test_used_weight_header_and_ban(self):
+        """Test X-MBX-USED-WEIGHT sync and Retry-After pause"""
+        self.governor.observe(200, {'X-MBX-USED-WEIGHT-1M': '75'})
+        self.assertLessEqual(self.governor.get_metrics()['tokens_available'], 5.1)
+
+        self.governor.observe(429, {'Retry-After': '1'})
+        started = time.time()
+        self.governor.acquire(1, PRIORITY_LIVE)
+        self.assertGreaterEqual(time.time() - started, 0.9)
+
+    def test_shared_state_between_governors(self):
+        """Test two governors pointing at one state file share the budget"""
+        with tempfile.TemporaryDirectory() as tmp:
+            state_file = os.path.join(tmp, 'governor.json')
+            robot = BinanceRateGovernor(weight_limit=100, state_file=state_file)
+            web = BinanceRateGovernor(weight_limit=100, state_file=state_file)
+            robot.acquire(60, PRIORITY_LIVE)
+            self.assertLess(web.get_metrics()['tokens_available'], 25)
+
+
+if __name__ == "__main__":
+    unittest.main()
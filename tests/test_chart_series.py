@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Chart Series Tests
+Tests series decimation and keyset pagination of cycle history
+"""
+
+import sys
+import math
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "robot"))
+sys.path.insert(0, str(project_root / "robot" / "src"))
+
+from src.database import DatabaseManager, Simulation, SimulationCycle
+from src.chart_series import decimate_series, load_cycle_series, paginate_cycles, normalize_breakdown
+
+
+class TestDecimation(unittest.TestCase):
+    """Test bounded chart series"""
+
+    def setUp(self):
+        self.series = {
+            'cycle_number': list(range(1, 10001)),
+            'total_value': [math.sin(i / 200.0) * 10 + 100 for i in range(10000)]
+        }
+        self.series['total_value'][4321] = 500.0  # spike
+        self.series['total_value'][7654] = -50.0  # crash
+
+    def test_lttb_bounds_points_and_keeps_endpoints(self):
+        """Test LTTB returns the requested number of points, ends included"""
+        result = decimate_series(self.series, 500)
+
+        self.assertEqual(result['returned_points'], 500)
+        self.assertEqual(result['total_points'], 10000)
+        self.assertEqual(result['cycle_number'][0], 1)
+        self.assertEqual(result['cycle_number'][-1], 10000)
+        self.assertEqual(result['cycle_number'], sorted(result['cycle_number']))
+        self.assertIn(500.0, result['total_value'])
+
+    def test_minmax_keeps_every_extreme(self):
+        """Test min/max decimation never drops the extremes"""
+        result = decimate_series(self.series, 200, method='minmax')
+
+        self.assertLessEqual(result['returned_points'], 202)
+        self.assertIn(500.0, result['total_value'])
+        self.assertIn(-50.0, result['total_value'])
+
+    def test_short_series_is_returned_as_is(self):
+        """Test series below the resolution are not decimated"""
+        series = {'cycle_number': [1, 2, 3], 'total_value': [1.0, 2.0, 3.0]}
+        result = decimate_series(series, 1000)
+
+        self.assertEqual(result['cycle_number'], [1, 2, 3])
+        self.assertEqual(result['method'], 'none')
+
+    def test_unknown_method_rejected(self):
+        with self.assertRaises(ValueError):
+            decimate_series(self.series, 100, method='average')
+
+    def test_breakdown_normalized(self):
+        """Test legacy breakdown formats map to {value, performance}"""
+        breakdown = normalize_breakdown({'ETH': {'quantity': 2.0, 'price': 1.5}, 'ADA': 3.0})
+
+        self.assertEqual(breakdown['ETH'], {'value': 3.0, 'performance': 0})
+        self.assertEqual(breakdown['ADA'], {'value': 3.0, 'performance': 0})
+        self.assertIn('NO_ASSETS', normalize_breakdown(None))
+
+
+class TestCyclePagination(unittest.TestCase):
+    """Test keyset pagination of simulation cycles"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db = DatabaseManager(f"sqlite:///{self.tmp_dir.name}/chart.db")
+        self.db.create_tables()
+        self.session = self.db.get_session()
+        start = datetime(2025, 1, 1)
+        for simulation_id in (1, 2):
+            self.session.add(Simulation(id=simulation_id, name=f'sim {simulation_id}', start_date=start,
+                                        duration_days=1, cycle_length_minutes=60, starting_reserve=10.0,
+                                        status='completed'))
+            for n in range(1, 26):
+                self.session.add(SimulationCycle(simulation_id=simulation_id, cycle_number=n,
+                                                 portfolio_value=float(n), bnb_reserve=1.0,
+                                                 total_value=float(n) + 1.0,
+                                                 portfolio_breakdown={'ETH': float(n)},
+                                                 cycle_date=start + timedelta(hours=n)))
+        self.session.commit()
+
+    def tearDown(self):
+        self.session.close()
+        self.db.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def test_pages_follow_cursor(self):
+        """Test pages resume after the cursor and the last page has no cursor"""
+        seen = []
+        after = None
+        while True:
+            page = paginate_cycles(self.session, SimulationCycle, after=after, limit=10, simulation_id=1)
+            seen.extend(c['cycle_number'] for c in page['cycles'])
+            after = page['next_cursor']
+            if after is None:
+                break
+
+        self.assertEqual(seen, list(range(1, 26)))
+
+    def test_series_filtered_by_simulation(self):
+        series = load_cycle_series(self.session, SimulationCycle, simulation_id=2)
+
+        self.assertEqual(series['cycle_number'], list(range(1, 26)))
+        self.assertEqual(series['total_value'][-1], 26.0)
+        self.assertNotIn('portfolio_breakdown', series)
+
+
+if __name__ == "__main__":
+    unittest.main()
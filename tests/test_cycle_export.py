@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Cycle Export Tests
+Tests streamed CSV exports of simulation cycles, trading cycles and positions
+"""
+
+import io
+import csv
+import sys
+import gzip
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "robot"))
+sys.path.insert(0, str(project_root / "robot" / "src"))
+
+from src.database import DatabaseManager, Portfolio, TradingCycle, CyclePosition, Simulation, SimulationCycle
+from src.cycle_export import build_export_query, stream_export, stream_archive_export, export_to_file
+from src.simulation_archive import SimulationArchive
+
+
+class TestCycleExport(unittest.TestCase):
+    """Test exports stream every row, in cycle order, one chunk per batch"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db = DatabaseManager(f"sqlite:///{self.tmp}/export.db")
+        self.db.create_tables()
+
+        session = self.db.get_session()
+        start = datetime(2025, 1, 1)
+        session.add(Portfolio(id=1, bnb_reserve=10.0))
+        session.add(Simulation(id=1, name='sim', start_date=start, duration_days=10,
+                               cycle_length_minutes=1440, starting_reserve=100.0, status='completed'))
+        for n in range(1, 11):
+            cycle = TradingCycle(portfolio_id=1, cycle_number=n, bnb_reserve=10.0, portfolio_value=n,
+                                 total_value=10.0 + n, cycle_date=start + timedelta(days=n),
+                                 actions_taken=[{'action': 'buy', 'symbol': 'ETH'}])
+            cycle.cycle_positions.append(CyclePosition(symbol='ETH', quantity=1.0, entry_price=1.0,
+                                                       current_price=1.0 + n, current_value=1.0 + n,
+                                                       pnl_percentage=n, entry_date=start))
+            session.add(cycle)
+            session.add(SimulationCycle(simulation_id=1, cycle_number=n, portfolio_value=n, bnb_reserve=1.0,
+                                        total_value=1.0 + n, cycle_date=start + timedelta(days=n)))
+        session.commit()
+        session.close()
+
+    def tearDown(self):
+        self.db.engine.dispose()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _rows(self, data: bytes):
+        return list(csv.DictReader(io.StringIO(data.decode('utf-8'))))
+
+    def test_csv_streams_one_chunk_per_batch(self):
+        chunks = list(stream_export(self.db.engine, build_export_query('trading-cycles'), 'csv', batch_size=3))
+        rows = self._rows(b''.join(chunks))
+
+        self.assertEqual(len(chunks), 4)  # 10 rows in batches of 3
+        self.assertEqual([int(row['cycle_number']) for row in rows], list(range(1, 11)))
+        self.assertEqual(rows[0]['actions_taken'], '[{"action":"buy","symbol":"ETH"}]')
+        self.assertTrue(rows[0]['cycle_date'].startswith('2025-01-02'))
+
+    def test_positions_and_cycle_range(self):
+        statement = build_export_query('cycle-positions', from_cycle=3, to_cycle=5)
+        rows = self._rows(b''.join(stream_export(self.db.engine, statement, 'csv')))
+
+        self.assertEqual([row['cycle_number'] for row in rows], ['3', '4', '5'])
+        self.assertEqual(rows[0]['symbol'], 'ETH')
+
+    def test_gzip_file_export(self):
+        path = f"{self.tmp}/sim.csv.gz"
+        result = export_to_file(self.db, path, 'simulation-cycles', simulation_id=1)
+
+        with gzip.open(path, 'rb') as handle:
+            rows = self._rows(handle.read())
+        self.assertEqual(result['format'], 'csv.gz')
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(rows[-1]['total_value'], '11.0')
+
+    def test_archived_simulation_honours_format_and_range(self):
+        archive = SimulationArchive(directory=f"{self.tmp}/archive", fmt='csv')
+        session = self.db.get_session()
+        simulation = session.query(Simulation).get(1)
+        archive.export(session, simulation)
+        simulation.archive_path = archive.path_for(1)
+        session.commit()
+        session.close()
+
+        rows = self._rows(b''.join(stream_archive_export(archive, archive.path_for(1), 'csv', 4, 6, batch_size=2)))
+        self.assertEqual([row['cycle_number'] for row in rows], ['4', '5', '6'])
+        self.assertEqual(rows[0]['total_value'], '5.0')
+        self.assertTrue(rows[0]['cycle_date'].startswith('2025-01-05'))
+
+        path = f"{self.tmp}/archived.csv.gz"
+        result = export_to_file(self.db, path, 'simulation-cycles', simulation_id=1, to_cycle=3)
+        with gzip.open(path, 'rb') as handle:
+            rows = self._rows(handle.read())
+        self.assertTrue(result['archived'])
+        self.assertEqual([row['cycle_number'] for row in rows], ['1', '2', '3'])
+
+    def test_unknown_dataset_or_format_rejected(self):
+        with self.assertRaises(ValueError):
+            build_export_query('positions')
+        with self.assertRaises(ValueError):
+            build_export_query('simulation-cycles')
+        with self.assertRaises(ValueError):
+            stream_export(self.db.engine, build_export_query('trading-cycles'), 'xlsx')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Cycle Holdings Tests
+Tests the normalized holdings written with each simulation cycle and the per-asset analytics
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "robot"))
+sys.path.insert(0, str(project_root / "robot" / "src"))
+
+from sqlalchemy import text
+
+from src.database import (
+    DatabaseManager, Simulation, SimulationCycle, SimulationCycleHolding, SchemaMigration,
+    jsonb_conversion_statements
+)
+from src.holding_analytics import asset_summary, asset_cycles, archive_asset_summary, archive_asset_cycles
+from src.simulation_archive import ArchivePipeline, SimulationArchive, ARCHIVE_STATE_QUEUED
+
+
+def breakdown(n):
+    """BTC grows from 10% to 34% of a 100 total over the cycles; ETH stays at 30"""
+    return {'BTC': {'value': 10.0 + n, 'performance': 0.0}, 'ETH': {'value': 30.0, 'performance': 0.0}}
+
+
+class TestCycleHoldings(unittest.TestCase):
+    """Test holdings follow the cycles and analytics agree between database and archive"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db = DatabaseManager(f"sqlite:///{self.tmp}/holdings.db")
+        self.db.create_tables()
+        self.start = datetime(2025, 1, 1)
+
+        session = self.db.get_session()
+        session.add(Simulation(id=1, name='sim-1', start_date=self.start, duration_days=30,
+                               cycle_length_minutes=1440, starting_reserve=100.0, status='completed'))
+        session.add_all([SimulationCycle(
+            simulation_id=1, cycle_number=n, portfolio_value=40.0 + n, bnb_reserve=60.0 - n, total_value=100.0,
+            cycle_date=self.start + timedelta(days=n), portfolio_breakdown=breakdown(n), market_conditions='{}')
+            for n in range(1, 25)])
+        session.commit()
+        session.close()
+
+    def tearDown(self):
+        self.db.engine.dispose()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _holdings(self, **filters):
+        session = self.db.get_session()
+        try:
+            return session.query(SimulationCycleHolding).filter_by(**filters) \
+                .order_by(SimulationCycleHolding.cycle_number, SimulationCycleHolding.symbol).all()
+        finally:
+            session.close()
+
+    def test_holdings_written_with_cycles(self):
+        holdings = self._holdings(cycle_number=10)
+        self.assertEqual([(h.symbol, h.value) for h in holdings], [('BTC', 20.0), ('ETH', 30.0)])
+        self.assertAlmostEqual(holdings[0].weight, 0.2)
+        self.assertEqual(len(self._holdings(simulation_id=1)), 48)
+
+        session = self.db.get_session()
+        cycle = session.query(SimulationCycle).filter_by(cycle_number=10).one()
+        self.assertEqual(cycle.market_conditions, {})  # JSON text stored as the document, not a string
+        session.close()
+
+    def test_legacy_plain_text_market_conditions(self):
+        """Test free-text values from before the JSON column are read back, not lost"""
+        with self.db.engine.begin() as conn:
+            conn.execute(text("UPDATE simulation_cycles SET market_conditions = 'high volatility, up trend' "
+                              "WHERE cycle_number = 3"))
+        session = self.db.get_session()
+        cycle = session.query(SimulationCycle).filter_by(cycle_number=3).one()
+        self.assertEqual(cycle.market_conditions, 'high volatility, up trend')
+        cycle.market_conditions = 'calm'  # plain text written now round-trips too
+        session.commit()
+        session.expire_all()
+        self.assertEqual(session.query(SimulationCycle).filter_by(cycle_number=3).one().market_conditions, 'calm')
+        cycle = session.query(SimulationCycle).filter_by(cycle_number=3).one()
+        cycle.market_conditions = '42'  # JSON scalars in a string stay strings
+        session.commit()
+        session.expire_all()
+        self.assertEqual(session.query(SimulationCycle).filter_by(cycle_number=3).one().market_conditions, '42')
+        session.close()
+
+        # PostgreSQL upgrade: non-JSON text is wrapped as a JSON string instead of aborting the ALTER
+        alter, unwrap = jsonb_conversion_statements('simulation_cycles', 'market_conditions')
+        self.assertIn('COALESCE(pg_temp.try_jsonb(market_conditions), to_jsonb(market_conditions))', alter)
+        self.assertNotIn('::jsonb', alter)
+        self.assertIn('pg_temp.try_jsonb(market_conditions #>> \'{}\') IS NOT NULL', unwrap)
+
+    def test_string_breakdown_and_updates(self):
+        session = self.db.get_session()
+        session.add(SimulationCycle(simulation_id=1, cycle_number=25, portfolio_value=50.0, bnb_reserve=50.0,
+                                    total_value=200.0, cycle_date=self.start,
+                                    portfolio_breakdown='{"SOL": {"value": 50.0, "performance": 1.0}}'))
+        session.commit()
+        self.assertEqual([(h.symbol, h.weight) for h in self._holdings(cycle_number=25)], [('SOL', 0.25)])
+
+        cycle = session.query(SimulationCycle).filter_by(cycle_number=25).one()
+        cycle.portfolio_breakdown = {'ADA': {'value': 100.0, 'performance': 0.0}}
+        session.commit()
+        self.assertEqual([(h.symbol, h.weight) for h in self._holdings(cycle_number=25)], [('ADA', 0.5)])
+
+        session.delete(cycle)
+        session.commit()
+        session.close()
+        self.assertEqual(self._holdings(cycle_number=25), [])
+
+    def test_analytics_run_in_database(self):
+        session = self.db.get_session()
+        summary = asset_summary(session, 1)
+        self.assertEqual([row['symbol'] for row in summary], ['ETH', 'BTC'])
+        btc = summary[1]
+        self.assertEqual((btc['cycles'], btc['first_cycle'], btc['last_cycle']), (24, 1, 24))
+        self.assertAlmostEqual(btc['max_weight'], 0.34)
+
+        page = asset_cycles(session, 1, 'BTC', min_weight=0.2, limit=3)
+        self.assertEqual([c['cycle_number'] for c in page['cycles']], [10, 11, 12])
+        self.assertEqual(page['next_cursor'], 12)
+        page = asset_cycles(session, 1, 'BTC', min_weight=0.2, after=page['next_cursor'], limit=100)
+        self.assertEqual(page['cycles'][-1]['cycle_number'], 24)
+        self.assertIsNone(page['next_cursor'])
+        session.close()
+
+    def test_backfill_fills_empty_table(self):
+        with self.db.engine.begin() as conn:
+            conn.execute(SimulationCycleHolding.__table__.delete())
+            conn.execute(SchemaMigration.__table__.delete())
+        self.db.upgrade_schema_backfill_cycle_holdings(batch_size=5)
+        self.assertEqual(len(self._holdings(simulation_id=1)), 48)
+        self.db.upgrade_schema_backfill_cycle_holdings()  # idempotent
+        self.assertEqual(len(self._holdings(simulation_id=1)), 48)
+
+    def test_backfill_runs_once(self):
+        # create_tables recorded the backfill: an empty holdings table is not rescanned
+        with self.db.engine.begin() as conn:
+            conn.execute(SimulationCycleHolding.__table__.delete())
+        self.db.upgrade_schema_backfill_cycle_holdings()
+        self.assertEqual(self._holdings(simulation_id=1), [])
+
+    def test_interrupted_backfill_resumes(self):
+        with self.db.engine.begin() as conn:
+            conn.execute(SimulationCycleHolding.__table__.delete()
+                         .where(SimulationCycleHolding.cycle_number > 10))
+            conn.execute(SchemaMigration.__table__.delete())
+        self.db.upgrade_schema_backfill_cycle_holdings(batch_size=5)
+        self.assertEqual(len(self._holdings(simulation_id=1)), 48)
+
+    def test_archive_purges_holdings_and_serves_analytics(self):
+        session = self.db.get_session()
+        expected_summary = asset_summary(session, 1)
+        expected_page = asset_cycles(session, 1, 'BTC', min_weight=0.2, limit=5)
+        session.get(Simulation, 1).archive_state = ARCHIVE_STATE_QUEUED
+        session.commit()
+        session.close()
+
+        archive = SimulationArchive(directory=os.path.join(self.tmp, 'archive'), fmt='csv')
+        ArchivePipeline(self.db, archive).run_pending()
+
+        self.assertEqual(self._holdings(simulation_id=1), [])
+        session = self.db.get_session()
+        path = session.get(Simulation, 1).archive_path
+        session.close()
+        summary = archive_asset_summary(archive, path)
+        self.assertEqual([row['symbol'] for row in summary], [row['symbol'] for row in expected_summary])
+        for row, expected in zip(summary, expected_summary):
+            self.assertAlmostEqual(row['avg_weight'], expected['avg_weight'])
+        page = archive_asset_cycles(archive, path, 'BTC', min_weight=0.2, limit=5)
+        self.assertEqual([c['cycle_number'] for c in page['cycles']],
+                         [c['cycle_number'] for c in expected_page['cycles']])
+        self.assertEqual(page['next_cursor'], expected_page['next_cursor'])
+
+
+if __name__ == "__main__":
+    unittest.main()
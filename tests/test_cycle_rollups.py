@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Cycle Rollup Tests
+Tests the daily/weekly/monthly rollups maintained as cycles are written and their rebuild
+"""
+
+import sys
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "robot"))
+sys.path.insert(0, str(project_root / "robot" / "src"))
+
+from src.database import DatabaseManager, CycleRollup, Portfolio, Simulation, SimulationCycle, TradingCycle
+from src.chart_series import load_cycle_series
+from src.cycle_rollups import (
+    load_rollups, period_start, rollup_period_cycles, rollup_totals, is_protection_cycle,
+    SCOPE_PORTFOLIO, SCOPE_SIMULATION
+)
+
+# Six-hourly cycles from Friday 2025-01-31: up to 120, down to 90 (protected), back to 105
+VALUES = [100.0, 110.0, 120.0, 115.0, 100.0, 90.0, 95.0, 105.0]
+START = datetime(2025, 1, 31, 6)
+
+
+class TestCycleRollups(unittest.TestCase):
+    """Test rollups fold cycles incrementally and match a full rebuild"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db = DatabaseManager(f"sqlite:///{self.tmp}/rollups.db")
+        self.db.create_tables()
+        session = self.db.get_session()
+        session.add(Simulation(id=1, name='sim-1', start_date=START, duration_days=2,
+                               cycle_length_minutes=360, starting_reserve=100.0, status='completed'))
+        session.commit()
+        # One commit per cycle, as the simulation and trading loops write them
+        for n, value in enumerate(VALUES, start=1):
+            session.add(SimulationCycle(
+                simulation_id=1, cycle_number=n, portfolio_value=value, bnb_reserve=0.0, total_value=value,
+                trading_costs=0.5, cycle_date=START + timedelta(hours=6 * (n - 1)),
+                actions_taken={'actions': ['USDC_PROTECTION']} if value < 100 else {'actions': []}))
+            session.commit()
+        session.close()
+
+    def tearDown(self):
+        self.db.engine.dispose()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _rollups(self, grain, scope=SCOPE_SIMULATION, scope_id=1):
+        session = self.db.get_session()
+        try:
+            return load_rollups(session, CycleRollup, scope, scope_id, grain)
+        finally:
+            session.close()
+
+    def test_period_start_and_protection(self):
+        self.assertEqual(period_start(datetime(2025, 2, 2, 13), 'week'), datetime(2025, 1, 27))
+        self.assertEqual(period_start(datetime(2025, 2, 2, 13), 'month'), datetime(2025, 2, 1))
+        self.assertTrue(is_protection_cycle(['DRY_RUN: USDC Protection (would convert to stablecoin)']))
+        self.assertFalse(is_protection_cycle({'actions': ['BUY ETH']}))
+
+    def test_daily_ohlc_drawdown_and_protection(self):
+        day = self._rollups('day')
+        self.assertEqual(day['period_start'], ['2025-01-31T00:00:00', '2025-02-01T00:00:00', '2025-02-02T00:00:00'])
+        self.assertEqual(day['open'], [100.0, 115.0, 105.0])
+        self.assertEqual(day['high'], [120.0, 115.0, 105.0])
+        self.assertEqual(day['low'], [100.0, 90.0, 105.0])
+        self.assertEqual(day['close'], [120.0, 95.0, 105.0])
+        self.assertEqual(day['fees'], [1.5, 2.0, 0.5])
+        self.assertEqual(day['protection_days'], [0, 1, 0])
+        self.assertAlmostEqual(day['max_drawdown'][1], 0.25)            # 90 against the 120 peak
+        self.assertAlmostEqual(day['max_drawdown'][2], 15.0 / 120.0)    # peak carried across days
+
+    def test_weekly_and_monthly(self):
+        week = self._rollups('week')
+        self.assertEqual(week['period_start'], ['2025-01-27T00:00:00'])  # Friday to Sunday: one ISO week
+        self.assertEqual((week['open'], week['close'], week['first_cycle'], week['last_cycle']),
+                         ([100.0], [105.0], [1], [8]))
+        month = self._rollups('month')
+        self.assertEqual(month['close'], [120.0, 105.0])
+        self.assertEqual(month['protection_days'], [0, 1])
+
+        session = self.db.get_session()
+        self.assertEqual(rollup_totals(session, CycleRollup, SCOPE_SIMULATION), {1: (8, 4.0)})
+        session.close()
+
+    def test_rebuild_matches_incremental(self):
+        expected = {grain: self._rollups(grain) for grain in ('day', 'week', 'month')}
+        batches = self.db.iter_rollup_cycles(SCOPE_SIMULATION, 1, batch_size=3)  # periods span batches
+        self.assertEqual(self.db.rebuild_cycle_rollups(SCOPE_SIMULATION, 1, batches), len(VALUES))
+        for grain, rollups in expected.items():
+            self.assertEqual(self._rollups(grain), rollups)
+
+    def test_period_cycles_fit_the_point_budget(self):
+        session = self.db.get_session()
+        try:
+            self.assertEqual(rollup_period_cycles(session, CycleRollup, SCOPE_SIMULATION, 1, 3), [3, 7, 8])
+            self.assertEqual(rollup_period_cycles(session, CycleRollup, SCOPE_SIMULATION, 1, 2), [8])  # one week
+            self.assertEqual(rollup_period_cycles(session, CycleRollup, SCOPE_SIMULATION, 1, 0), [3, 8])  # months
+            self.assertIsNone(rollup_period_cycles(session, CycleRollup, SCOPE_SIMULATION, 2, 3))
+            series = load_cycle_series(session, SimulationCycle, ('total_value',), cycle_numbers=[3, 7, 8],
+                                       simulation_id=1)
+            self.assertEqual(series, {'cycle_number': [3, 7, 8], 'total_value': [120.0, 95.0, 105.0]})
+        finally:
+            session.close()
+
+    def test_trading_cycles_roll_up_per_portfolio(self):
+        session = self.db.get_session()
+        session.add(Portfolio(id=1, bnb_reserve=1.0))
+        session.add_all([TradingCycle(portfolio_id=1, cycle_number=n, bnb_reserve=1.0, portfolio_value=value,
+                                      total_value=value, actions_taken=[], cycle_date=START + timedelta(days=n))
+                         for n, value in enumerate((10.0, 12.0, 11.0))])
+        session.commit()
+        session.close()
+        day = self._rollups('day', SCOPE_PORTFOLIO, 1)
+        self.assertEqual(day['close'], [10.0, 12.0, 11.0])
+        self.assertEqual(day['fees'], [0.0, 0.0, 0.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Cycle Scheduler Tests
+Tests boundary alignment, catch-up policies, retries and cancellation
+"""
+
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "robot"))
+sys.path.insert(0, str(project_root / "robot" / "src"))
+
+from cycle_scheduler import CycleScheduler, CATCH_UP_ALL, CATCH_UP_LATEST, CATCH_UP_NONE
+
+
+class FakeResult:
+    def __init__(self, success):
+        self.success = success
+        self.error_message = '' if success else 'transient'
+
+
+class TestCycleScheduler(unittest.TestCase):
+    """Test the aligned cycle scheduler"""
+
+    def _scheduler(self, **kwargs):
+        defaults = dict(period_minutes=360, offset_minutes=30, jitter_seconds=0,
+                        warmup_seconds=0, max_retries=2, retry_delay_seconds=0.01)
+        defaults.update(kwargs)
+        return CycleScheduler(**defaults)
+
+    def test_boundaries_aligned_to_offset(self):
+        """Test boundaries fall on 00:30 UTC + k * 6h"""
+        scheduler = self._scheduler()
+        moment = datetime(2024, 3, 1, 13, 10, tzinfo=timezone.utc)
+        self.assertEqual(scheduler.previous_boundary(moment), datetime(2024, 3, 1, 12, 30, tzinfo=timezone.utc))
+        self.assertEqual(scheduler.next_boundary(moment), datetime(2024, 3, 1, 18, 30, tzinfo=timezone.utc))
+
+        early = datetime(2024, 3, 1, 0, 10, tzinfo=timezone.utc)
+        self.assertEqual(scheduler.previous_boundary(early), datetime(2024, 2, 29, 18, 30, tzinfo=timezone.utc))
+
+    def test_period_not_dividing_a_day_stays_constant(self):
+        """Test boundaries follow the epoch grid, so no short cycle appears at midnight"""
+        scheduler = self._scheduler(period_minutes=420, offset_minutes=0)
+        boundary = scheduler.previous_boundary(datetime(2024, 3, 1, 22, 0, tzinfo=timezone.utc))
+        for _ in range(8):
+            following = scheduler.next_boundary(boundary)
+            self.assertEqual(following - boundary, timedelta(minutes=420))
+            boundary = following
+
+    def test_naive_datetimes_are_utc(self):
+        """Test naive moments are read as UTC, not local time"""
+        scheduler = self._scheduler()
+        self.assertEqual(scheduler.previous_boundary(datetime(2024, 3, 1, 13, 10)),
+                         datetime(2024, 3, 1, 12, 30, tzinfo=timezone.utc))
+
+    def test_catch_up_policies(self):
+        """Test none / latest / all catch-up of missed boundaries"""
+        last_run = datetime(2024, 3, 1, 0, 30, tzinfo=timezone.utc)
+        now = datetime(2024, 3, 1, 19, 0, tzinfo=timezone.utc)
+
+        missed = self._scheduler().missed_boundaries(last_run, now)
+        self.assertEqual(len(missed), 3)
+
+        self.assertEqual(self._scheduler(catch_up=CATCH_UP_NONE)._apply_catch_up(missed), [])
+        self.assertEqual(self._scheduler(catch_up=CATCH_UP_LATEST)._apply_catch_up(missed), missed[-1:])
+        self.assertEqual(self._scheduler(catch_up=CATCH_UP_ALL)._apply_catch_up(missed), missed)
+
+    def test_transient_failure_is_retried(self):
+        """Test a failed attempt is retried inside the cycle window"""
+        scheduler = self._scheduler()
+        outcomes = [FakeResult(False), FakeResult(True)]
+        boundary = scheduler.previous_boundary(datetime.now(timezone.utc))
+
+        self.assertTrue(scheduler._run_cycle(lambda b: outcomes.pop(0), boundary))
+        self.assertEqual(outcomes, [])
+
+    def test_run_on_start_and_cancel(self):
+        """Test the first cycle runs immediately and cancel() stops the loop"""
+        scheduler = self._scheduler(run_on_start=True)
+        calls = []
+
+        def cycle(boundary):
+            calls.append(boundary)
+            scheduler.cancel()
+            return FakeResult(True)
+
+        scheduler.run(cycle)
+        self.assertEqual(len(calls), 1)
+        self.assertLess(scheduler.start_latencies[0], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+DB Pool Monitor Tests
+Tests pool counters and detection of connections that are never returned
+"""
+
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "robot"))
+sys.path.insert(0, str(project_root / "robot" / "src"))
+
+from src.database import DatabaseManager
+
+
+class TestPoolMonitor(unittest.TestCase):
+    """Test checkouts are counted and long-held connections reported"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db = DatabaseManager(f"sqlite:///{self.tmp}/pool.db")
+        self.db.create_tables()
+
+    def tearDown(self):
+        self.db.engine.dispose()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_held_connection_reported_until_closed(self):
+        session = self.db.get_session()
+        session.connection()  # check out a connection and keep it
+
+        self.assertEqual(self.db.pool_monitor.check_leaks(), [])  # below the default threshold
+        leaks = self.db.pool_monitor.find_leaks(threshold=0)
+        self.assertEqual(len(leaks), 1)
+        self.assertEqual(leaks[0]['thread'], 'MainThread')
+
+        self.db.pool_monitor.leak_threshold = 0
+        self.db.pool_monitor.check_leaks()
+        self.db.pool_monitor.check_leaks()
+        self.assertEqual(self.db.get_pool_stats()['leaks_reported'], 1)  # logged once
+
+        session.close()
+        self.assertEqual(self.db.pool_monitor.find_leaks(threshold=0), [])
+
+    def test_counters(self):
+        for _ in range(3):
+            session = self.db.get_session()
+            session.connection()
+            session.close()
+
+        stats = self.db.get_pool_stats()
+        self.assertEqual(stats['checkouts'], stats['checkins'])
+        self.assertGreaterEqual(stats['checkouts'], 3)
+        self.assertEqual(stats['checked_out'], 0)
+        self.assertGreaterEqual(stats['peak_checked_out'], 1)
+
+    def test_session_tracker_sees_every_session(self):
+        seen = []
+        self.db.session_tracker = seen.append
+        session = self.db.get_session()
+        session.close()
+        self.assertEqual(seen, [session])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Dry-Run Manager Tests
+Tests coalesced portfolio snapshots and transaction group commit/rollback
+"""
+
+import os
+import sys
+import json
+import tempfile
+import unittest
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "robot"))
+sys.path.insert(0, str(project_root / "robot" / "src"))
+
+from dry_run_manager import DryRunManager
+
+
+class TestDryRunManager(unittest.TestCase):
+    """Test transaction groups and snapshot writes"""
+
+    def setUp(self):
+        self.previous_cwd = os.getcwd()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp_dir.name)
+        os.environ['ROBOT_DRY_RUN'] = 'true'
+        os.environ['INITIAL_RESERVE'] = '100'
+        self.manager = DryRunManager()
+
+    def tearDown(self):
+        self.manager.journal.close()
+        os.chdir(self.previous_cwd)
+        self.tmp_dir.cleanup()
+
+    def _saved_reserve(self):
+        with open(self.manager.portfolio_file) as f:
+            return Decimal(json.load(f)['reserve_balance'])
+
+    def test_one_snapshot_per_committed_group(self):
+        """Test a ten-order cycle writes the portfolio once, at commit"""
+        self.manager.begin_transaction_group(1)
+        for symbol in ('A', 'B', 'C', 'D', 'E'):
+            self.manager.simulate_buy_order(symbol, Decimal('1'), Decimal('2'), cycle_number=1)
+        self.manager.update_position_prices({'A': Decimal('3')})
+        for symbol in ('A', 'B', 'C', 'D'):
+            self.manager.simulate_sell_order(symbol, Decimal('1'), Decimal('2'), cycle_number=1)
+        self.assertEqual(self.manager.snapshot_writes, 0)
+        self.assertFalse(os.path.exists(self.manager.portfolio_file))
+
+        self.manager.commit_transaction_group()
+        self.assertEqual(self.manager.snapshot_writes, 1)
+        self.assertEqual(self._saved_reserve(), self.manager.portfolio.reserve_balance)
+        self.assertEqual(self.manager.get_portfolio_summary()['total_trades'], 9)
+
+        statuses = {r['status'] for r in self.manager.iter_transactions(cycle_number=1)}
+        self.assertEqual(statuses, {'COMPLETED'})
+        self.assertEqual(len(self.manager.get_recent_transactions(100)), 9)
+
+    def test_rollback_restores_committed_snapshot(self):
+        """Test rollback discards in-memory changes of the open group"""
+        self.manager.simulate_buy_order('A', Decimal('1'), Decimal('2'))
+        committed_reserve = self.manager.portfolio.reserve_balance
+
+        self.manager.begin_transaction_group(2)
+        self.manager.simulate_buy_order('B', Decimal('1'), Decimal('2'), cycle_number=2)
+        self.manager.rollback_transaction_group()
+
+        self.assertEqual(self.manager.portfolio.reserve_balance, committed_reserve)
+        self.assertNotIn('B', self.manager.portfolio.positions)
+        self.assertEqual([r['status'] for r in self.manager.iter_transactions(cycle_number=2)], ['ROLLED_BACK'])
+
+
+if __name__ == "__main__":
+    unittest.main()
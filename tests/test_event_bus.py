@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Event Bus Tests
+Tests publish/subscribe, retained messages and the loopback backend
+"""
+
+import os
+import sys
+import time
+import socket
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "robot"))
+sys.path.insert(0, str(project_root / "robot" / "src"))
+
+import event_bus
+from event_bus import EventBus, UdpBackend, TOPIC_STATUS, TOPIC_SIMULATION_PROGRESS
+
+
+def _free_udp_port():
+    probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    probe.bind(('127.0.0.1', 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    return port
+
+
+class TestEventBus(unittest.TestCase):
+    """Test the in-process bus and its cross-process stand-in"""
+
+    def test_subscribers_and_retained_messages(self):
+        """Test delivery per topic and last-value lookup per key"""
+        bus = EventBus()
+        received = []
+        bus.subscribe(TOPIC_SIMULATION_PROGRESS, lambda key, payload, message: received.append((key, payload['cycle'])))
+
+        bus.publish(TOPIC_SIMULATION_PROGRESS, {'cycle': 1}, key=7)
+        bus.publish(TOPIC_SIMULATION_PROGRESS, {'cycle': 1}, key=8)
+        bus.publish(TOPIC_SIMULATION_PROGRESS, {'cycle': 2}, key=7)
+        bus.publish(TOPIC_STATUS, {'current_cycle': 3})
+
+        self.assertEqual(received, [(7, 1), (8, 1), (7, 2)])
+        self.assertEqual(bus.latest(TOPIC_SIMULATION_PROGRESS, 7), {'cycle': 2})
+        self.assertEqual(bus.latest(TOPIC_STATUS), {'current_cycle': 3})
+        self.assertIsNone(bus.latest(TOPIC_SIMULATION_PROGRESS, 9))
+
+    def test_failing_subscriber_does_not_block_others(self):
+        """Test one broken subscriber does not stop delivery"""
+        bus = EventBus()
+        received = []
+
+        def broken(key, payload, message):
+            raise RuntimeError('boom')
+
+        bus.subscribe(TOPIC_STATUS, broken)
+        bus.subscribe(TOPIC_STATUS, lambda key, payload, message: received.append(payload))
+        bus.publish(TOPIC_STATUS, {'current_cycle': 1})
+        self.assertEqual(received, [{'current_cycle': 1}])
+
+    def test_udp_backend_forwards_between_buses(self):
+        """Test a publisher bus reaches a listening bus exactly once"""
+        port = _free_udp_port()
+        web = EventBus(UdpBackend(port))
+        robot = EventBus(UdpBackend(port))
+        delivered = threading.Event()
+        received = []
+
+        def on_status(key, payload, message):
+            received.append(payload)
+            delivered.set()
+
+        web.subscribe(TOPIC_STATUS, on_status)
+        self.assertTrue(web.start_listening())
+        try:
+            robot.publish(TOPIC_STATUS, {'current_cycle': 5})
+            self.assertTrue(delivered.wait(2.0))
+            self.assertEqual(web.latest(TOPIC_STATUS), {'current_cycle': 5})
+
+            # The listener's own publishes are not delivered twice
+            web.publish(TOPIC_STATUS, {'current_cycle': 6})
+            time.sleep(0.1)
+            self.assertEqual(received, [{'current_cycle': 5}, {'current_cycle': 6}])
+        finally:
+            web.backend.stop()
+
+    def test_cross_process_backend_by_default(self):
+        """Test robot cycles reach the web app unless EVENT_BUS_BACKEND=local"""
+        for value, backend in ((None, 'udp'), ('local', 'local')):
+            with mock.patch.dict(os.environ), mock.patch.object(event_bus, '_event_bus', None):
+                os.environ.pop('EVENT_BUS_BACKEND', None)
+                if value:
+                    os.environ['EVENT_BUS_BACKEND'] = value
+                self.assertEqual(event_bus.get_event_bus().get_stats()['backend'], backend)
+
+if __name__ == "__main__":
+    unittest.main()
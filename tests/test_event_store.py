@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Event Store Tests
+Tests state folding, snapshot + replay recovery and projections
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "robot"))
+sys.path.insert(0, str(project_root / "robot" / "src"))
+
+from event_store import (
+    EventStore, EVENT_ORDER_FILLED, EVENT_RESERVE_SYNCED, EVENT_ROBOT_FROZEN, EVENT_ROBOT_UNFROZEN,
+    EVENT_CYCLE_STARTED, EVENT_CYCLE_COMPLETED
+)
+from robot_state import RobotStateManager
+
+
+class TestEventStore(unittest.TestCase):
+    """Test the event-sourced trading log"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'events.jsonl')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _fill(self, store, side, symbol, quantity, quote):
+        store.append(EVENT_ORDER_FILLED, symbol=symbol, side=side,
+                     executed_quantity=quantity, quote_quantity=quote)
+
+    def test_state_folds_fills_and_cycles(self):
+        """Test fills move holdings and reserve; cycles and freezes are tracked"""
+        store = EventStore(self.path, snapshot_every=100)
+        store.append(EVENT_RESERVE_SYNCED, reserve=10.0)
+        store.append(EVENT_CYCLE_STARTED, boundary='2024-03-01T00:00:00')
+        self._fill(store, 'BUY', 'ETH', 2.0, 4.0)
+        self._fill(store, 'SELL', 'ETH', 0.5, 1.5)
+        store.append(EVENT_CYCLE_COMPLETED, success=True, current_capital=12.0)
+        store.append(EVENT_ROBOT_FROZEN, reason='maintenance')
+
+        state = store.state
+        self.assertAlmostEqual(state.reserve, 7.5)
+        self.assertEqual(state.holdings, {'ETH': 1.5})
+        self.assertEqual(state.cycle_number, 1)
+        self.assertIsNone(state.cycle_in_progress)
+        self.assertTrue(state.is_frozen)
+        store.close()
+
+    def test_recovery_replays_only_events_since_snapshot(self):
+        """Test restart rebuilds identical state from snapshot + journal tail"""
+        store = EventStore(self.path, snapshot_every=10)
+        store.append(EVENT_RESERVE_SYNCED, reserve=100.0)
+        for i in range(24):
+            self._fill(store, 'BUY', f"C{i % 3}", 1.0, 1.0)
+        store.append(EVENT_CYCLE_STARTED, boundary='interrupted')
+        expected = store.state.to_dict()
+        store.close()
+
+        recovered = EventStore(self.path, snapshot_every=10)
+        self.assertEqual(recovered.state.to_dict(), expected)
+        self.assertEqual(recovered.replayed_events, 6)  # 26 events, snapshots at 10 and 20
+        self.assertEqual(recovered.state.cycle_in_progress, 'interrupted')
+
+        self._fill(recovered, 'SELL', 'C0', 8.0, 8.0)
+        self.assertEqual(recovered.state.last_seq, 27)
+        self.assertEqual(len(list(recovered.iter_events())), 27)
+        self.assertEqual([e['seq'] for e in recovered.iter_events(since_seq=25)], [26, 27])
+        recovered.close()
+
+    def test_robot_state_is_a_projection(self):
+        """Test RobotStateManager recovers cycles from and is updated by the event log"""
+        store = EventStore(self.path)
+        store.append(EVENT_ROBOT_FROZEN, reason='from log')
+        store.append(EVENT_CYCLE_COMPLETED, success=True, time='2024-03-01T00:00:00', total_return=1.5)
+
+        manager = RobotStateManager(os.path.join(self.tmp_dir.name, 'robot_state.json'))
+        manager.freeze_robot('from file')
+        manager.attach_event_store(store)
+        self.assertTrue(manager.is_frozen())
+        self.assertEqual(manager.get_last_cycle_time(), '2024-03-01T00:00:00')
+        self.assertEqual(store.state.freeze_reason, 'from file')  # the log follows the state file
+
+        manager.unfreeze_robot()
+        self.assertFalse(store.state.is_frozen)
+        self.assertFalse(manager.is_frozen())
+
+        manager.set_robot_running(True)
+        self.assertFalse(manager.is_robot_running())  # our own pid does not block startup
+        store.close()
+
+    def test_freeze_without_store_survives_attach(self):
+        """Test freezes made without a store (dashboard, portfolio tools) are not undone at startup"""
+        store = EventStore(self.path)
+        store.append(EVENT_ROBOT_FROZEN, reason='old')
+        store.append(EVENT_ROBOT_UNFROZEN)
+        state_file = os.path.join(self.tmp_dir.name, 'robot_state.json')
+
+        dashboard = RobotStateManager(state_file)
+        dashboard.freeze_robot('frozen from dashboard')
+        frozen_at = dashboard.get_freeze_timestamp()
+
+        manager = RobotStateManager(state_file)
+        manager.attach_event_store(store)
+        self.assertTrue(manager.is_frozen())
+        self.assertEqual(manager.get_freeze_reason(), 'frozen from dashboard')
+        self.assertEqual(manager.get_freeze_timestamp(), frozen_at)
+        self.assertTrue(store.state.is_frozen)
+
+        dashboard.unfreeze_robot()
+        restarted = RobotStateManager(state_file)
+        restarted.attach_event_store(store)
+        self.assertFalse(restarted.is_frozen())
+        self.assertFalse(store.state.is_frozen)
+        store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
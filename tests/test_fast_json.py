@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Fast JSON Tests
+Tests the pluggable JSON serializer and HTTP response compression
+"""
+
+import sys
+import gzip
+import json
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+from flask import Flask, jsonify
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "robot"))
+sys.path.insert(0, str(project_root / "robot" / "src"))
+
+from src import fast_json
+from src.response_compression import init_compression, negotiate_encoding
+
+
+class TestFastJson(unittest.TestCase):
+    """Test both backends encode the same JSON"""
+
+    def setUp(self):
+        self.previous = fast_json.backend
+        self.payload = {
+            'date': datetime(2025, 1, 2, 3, 4, 5),
+            'values': np.array([1.5, np.nan, 2.0]),
+            'count': np.int64(3),
+            'nested': {'ETH': {'value': 1.0, 'performance': float('inf')}}
+        }
+        self.expected = {
+            'date': '2025-01-02T03:04:05',
+            'values': [1.5, None, 2.0],
+            'count': 3,
+            'nested': {'ETH': {'value': 1.0, 'performance': None}}
+        }
+
+    def tearDown(self):
+        fast_json.backend = self.previous
+
+    def test_backends_agree(self):
+        """Test datetimes, NumPy values and NaN are handled by every backend"""
+        backends = ['stdlib'] + (['orjson'] if fast_json.orjson is not None else [])
+        for backend in backends:
+            with self.subTest(backend=backend):
+                fast_json.set_backend(backend)
+                self.assertEqual(json.loads(fast_json.dumps(self.payload)), self.expected)
+                self.assertEqual(fast_json.loads(fast_json.dumps_bytes(self.payload)), self.expected)
+
+    def test_unknown_type_rejected(self):
+        with self.assertRaises(TypeError):
+            fast_json.dumps({'x': object()})
+
+
+class TestResponseCompression(unittest.TestCase):
+    """Test large responses are compressed for clients that accept it"""
+
+    def setUp(self):
+        app = Flask(__name__)
+        init_compression(app)
+
+        @app.route('/large')
+        def large():
+            response = jsonify({'values': list(range(2000))})
+            response.set_etag('abc')
+            return response
+
+        @app.route('/small')
+        def small():
+            return jsonify({'ok': True})
+
+        self.client = app.test_client()
+
+    def test_large_response_gzipped(self):
+        response = self.client.get('/large', headers={'Accept-Encoding': 'gzip, deflate'})
+
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(response.headers['ETag'], '"abc-gzip"')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertEqual(json.loads(gzip.decompress(response.data))['values'][-1], 1999)
+
+    def test_uncompressed_when_not_accepted_or_small(self):
+        self.assertNotIn('Content-Encoding', self.client.get('/large').headers)
+        self.assertNotIn('Content-Encoding', self.client.get('/small', headers={'Accept-Encoding': 'gzip'}).headers)
+        self.assertIsNone(negotiate_encoding('gzip;q=0', 10 ** 6, 'application/json'))
+
+
+if __name__ == "__main__":
+    unittest.main()
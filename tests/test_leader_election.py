@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Leader Election Tests
+Tests that exactly one worker runs the background loops
+"""
+
+import sys
+import socket
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "robot"))
+sys.path.insert(0, str(project_root / "robot" / "src"))
+
+from src.database import DatabaseManager, LeaderLease
+from src.leader_election import LeaderElection, FileLockBackend, DatabaseLeaseBackend
+from src.event_bus import EventBus, UdpBackend
+
+
+def _free_udp_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+class TestLeaderElection(unittest.TestCase):
+    """Test file-lock and database-lease elections"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_file_lock_single_leader(self):
+        """Test a second worker only becomes leader once the first releases the lock"""
+        path = f"{self.tmp_dir.name}/web.leader.lock"
+        first, second = FileLockBackend(path), FileLockBackend(path)
+
+        self.assertTrue(first.try_acquire())
+        self.assertTrue(first.try_acquire())
+        self.assertFalse(second.try_acquire())
+        first.release()
+        self.assertTrue(second.try_acquire())
+        second.release()
+
+    def test_db_lease_single_leader(self):
+        """Test the lease is renewed by its holder and taken over once expired"""
+        db = DatabaseManager(f"sqlite:///{self.tmp_dir.name}/leader.db")
+        db.create_tables()
+        first = DatabaseLeaseBackend('web', 'worker-1', 30, db)
+        second = DatabaseLeaseBackend('web', 'worker-2', 30, db)
+
+        self.assertTrue(first.try_acquire())
+        self.assertTrue(first.try_acquire())
+        self.assertFalse(second.try_acquire())
+
+        with db.get_session() as session:
+            session.get(LeaderLease, 'web').expires_at = datetime.utcnow() - timedelta(seconds=1)
+            session.commit()
+        self.assertTrue(second.try_acquire())
+        self.assertFalse(first.try_acquire())
+        db.engine.dispose()
+
+    def test_loops_started_once_when_elected(self):
+        """Test the callbacks run on first election only"""
+        path = f"{self.tmp_dir.name}/web.leader.lock"
+        holder = FileLockBackend(path)
+        holder.try_acquire()
+        election = LeaderElection('web', FileLockBackend(path))
+        started = []
+        election.on_elected(lambda: started.append(election.is_leader))  # loops see they lead
+
+        self.assertFalse(election.poll())
+        holder.release()
+        self.assertTrue(election.poll())
+        self.assertTrue(election.poll())
+        self.assertEqual(started, [True])
+        self.assertTrue(election.get_stats()['is_leader'])
+        election.stop()
+
+    def test_demoted_worker_releases_event_bus_port(self):
+        """Test a worker that loses the db lease stops listening so the new leader can bind the port"""
+        db = DatabaseManager(f"sqlite:///{self.tmp_dir.name}/leader.db")
+        db.create_tables()
+        port = _free_udp_port()
+        workers = []
+        for holder in ('worker-1', 'worker-2'):
+            election = LeaderElection('web', DatabaseLeaseBackend('web', holder, 30, db))
+            bus = EventBus(UdpBackend(port))
+            changes = []
+            election.on_change(changes.append)
+            election.on_change(lambda leading, bus=bus: bus.start_listening() if leading else bus.stop_listening())
+            workers.append((election, bus, changes))
+        (first, first_bus, first_changes), (second, second_bus, second_changes) = workers
+
+        self.assertTrue(first.poll())
+        self.assertFalse(second.poll())
+        self.assertIsNotNone(first_bus.backend._listener)
+
+        with db.get_session() as session:
+            session.get(LeaderLease, 'web').expires_at = datetime.utcnow() - timedelta(seconds=1)
+            session.commit()
+        self.assertTrue(second.poll())
+        self.assertFalse(first.poll())
+        self.assertEqual(first_changes, [True, False])
+        self.assertIsNone(first_bus.backend._listener)
+        self.assertTrue(second_bus.start_listening())  # the new leader's retry binds the freed port
+
+        second.stop()
+        self.assertEqual(second_changes, [True, False])
+        self.assertIsNone(second_bus.backend._listener)
+        db.engine.dispose()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Market Analyzer Cache Tests
+Tests TTLCache eviction and expiry and that price/indicator entries follow the candle
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "robot"))
+sys.path.insert(0, str(project_root / "robot" / "src"))
+
+import market_analyzer
+from market_analyzer import MarketAnalyzer, TTLCache
+
+DAY_MS = 24 * 3600 * 1000
+
+
+def klines(days, last_open_ms):
+    """`days` daily candles closing up by 1 each day, the last one opening at last_open_ms"""
+    return [[last_open_ms - (days - 1 - n) * DAY_MS, '1', '1', '1', str(100.0 + n), '1',
+             0, '0', 0, '0', '0', '0'] for n in range(days)]
+
+
+class TestTTLCache(unittest.TestCase):
+    """Test the bounded LRU cache with expiry"""
+
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)  # 'a' becomes most recently used
+        cache.set('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual((cache.get('a'), cache.get('c'), len(cache)), (1, 3, 2))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_ttl_expiry(self):
+        cache = TTLCache(maxsize=8, ttl=10)
+        with mock.patch.object(market_analyzer.time, 'monotonic', return_value=100.0):
+            cache.set('a', 1)
+        with mock.patch.object(market_analyzer.time, 'monotonic', return_value=109.0):
+            self.assertEqual(cache.get('a'), 1)
+        with mock.patch.object(market_analyzer.time, 'monotonic', return_value=111.0):
+            self.assertEqual(cache.get('a', 'gone'), 'gone')
+        stats = cache.stats()
+        self.assertEqual((stats['size'], stats['expirations'], stats['hits'], stats['misses']), (0, 1, 1, 1))
+
+
+class TestCandleKeyedCache(unittest.TestCase):
+    """Test cached prices and indicators are reused within a candle and refreshed by the next one"""
+
+    def setUp(self):
+        self.analyzer = MarketAnalyzer()
+        self.candle_open = 1_700_006_400_000 - 1_700_006_400_000 % DAY_MS
+
+    def _fetch(self, now_ms, candle_open):
+        response = mock.Mock(status_code=200)
+        response.json.return_value = klines(30, candle_open)
+        with mock.patch.object(market_analyzer, 'governed_get', return_value=response) as get, \
+                mock.patch.object(market_analyzer.time, 'time', return_value=now_ms / 1000):
+            df = self.analyzer.fetch_historical_prices('BTC', 30)
+            score = self.analyzer.calculate_momentum_score('BTC')
+        return df, score, get.call_count
+
+    def test_same_candle_hits_cache(self):
+        _, score, calls = self._fetch(self.candle_open + 1000, self.candle_open)
+        self.assertEqual(calls, 1)
+        _, again, calls = self._fetch(self.candle_open + 3600 * 1000, self.candle_open)
+        self.assertEqual((calls, again), (0, score))
+        self.assertGreater(self.analyzer.get_cache_stats()['indicators']['hits'], 0)
+
+    def test_next_candle_invalidates(self):
+        self._fetch(self.candle_open + 1000, self.candle_open)
+        indicators = len(self.analyzer.indicator_cache)
+        df, _, calls = self._fetch(self.candle_open + DAY_MS + 1000, self.candle_open + DAY_MS)
+        self.assertEqual(calls, 1)
+        self.assertEqual(df['timestamp'].iloc[-1].value // 10 ** 6, self.candle_open + DAY_MS)
+        # Indicators of the new last candle are computed alongside the old ones, not served from them
+        self.assertGreater(len(self.analyzer.indicator_cache), indicators)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Order Executor Tests
+Tests delta netting, sell-before-buy waves, concurrency, partial fills and exchange filters
+"""
+
+import sys
+import time
+from decimal import Decimal
+import threading
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "robot"))
+sys.path.insert(0, str(project_root / "robot" / "src"))
+
+from order_executor import OrderExecutor, SymbolFilterCache, SymbolFilters, net_order_deltas, net_deltas
+
+
+def symbol_info(pair, step='0.001', min_qty='0.001', min_notional='0.001'):
+    return {'symbol': pair, 'filters': [
+        {'filterType': 'LOT_SIZE', 'minQty': min_qty, 'maxQty': '9000000.0', 'stepSize': step},
+        {'filterType': 'MARKET_LOT_SIZE', 'minQty': '0.0', 'maxQty': '5000.0', 'stepSize': '0.0'},
+        {'filterType': 'NOTIONAL', 'minNotional': min_notional, 'applyMinToMarket': True},
+    ]}
+
+
+class FakeBinanceClient:
+    """Records order timing; fills everything except rejected symbols"""
+
+    def __init__(self, delay=0.2, rejected=(), partial=(), filters=None, timeouts=()):
+        self.delay = delay
+        self.rejected = rejected
+        self.partial = partial
+        self.timeouts = timeouts  # pairs whose order executes but whose response is lost
+        self.filters = filters or {}
+        self.orders = []
+        self.by_client_id = {}
+        self.quantities = {}
+        self.exchange_info_calls = 0
+        self._lock = threading.Lock()
+
+    def get_exchange_info(self):
+        self.exchange_info_calls += 1
+        pairs = {f"{s}BNB" for s in 'ABCDEF'} | set(self.filters)
+        return {'symbols': [self.filters.get(pair) or symbol_info(pair) for pair in sorted(pairs)]}
+
+    def place_market_order(self, symbol, side, quantity, client_order_id=None):
+        started = time.monotonic()
+        time.sleep(self.delay)
+        with self._lock:
+            self.orders.append((side, symbol, started))
+            self.quantities[symbol] = quantity
+        if symbol in self.rejected:
+            return {}
+        quantity = float(quantity)
+        executed = quantity / 2 if symbol in self.partial else quantity
+        order = {
+            'orderId': len(self.orders),
+            'clientOrderId': client_order_id,
+            'status': 'FILLED' if executed == quantity else 'PARTIALLY_FILLED',
+            'executedQty': str(executed),
+            'cummulativeQuoteQty': str(executed * 2.0),
+            'fills': []
+        }
+        self.by_client_id[client_order_id] = order
+        if symbol in self.timeouts:
+            raise TimeoutError('read timed out')
+        return order
+
+    def get_order(self, symbol, client_order_id):
+        return self.by_client_id.get(client_order_id, {})
+
+
+class TestOrderExecutor(unittest.TestCase):
+    """Test the concurrent order executor"""
+
+    def test_netting(self):
+        """Test one order per symbol and dust orders dropped"""
+        self.assertEqual(net_deltas([('ETH', 1.0), ('ETH', -0.4), ('BTC', 0.5), ('BTC', -0.5)]), {'ETH': 0.6})
+
+        prices = {'BTC': 2.0, 'ETH': 2.0, 'ADA': 2.0}
+        intents = net_order_deltas({'BTC': 1.0, 'ETH': 1.0}, {'ETH': 1.001, 'ADA': 3.0}, prices, min_notional=0.01)
+        self.assertEqual([(i.symbol, i.side, i.quantity) for i in intents],
+                         [('ADA', 'BUY', 3.0), ('BTC', 'SELL', 1.0)])
+
+    def test_sells_before_buys_and_concurrent(self):
+        """Test the buy wave starts after every sell and waves run in parallel"""
+        client = FakeBinanceClient(delay=0.2)
+        prices = {s: 2.0 for s in ('A', 'B', 'C', 'D', 'E', 'F')}
+        intents = net_order_deltas({'A': 1, 'B': 1, 'C': 1}, {'D': 1, 'E': 1, 'F': 1}, prices)
+
+        started = time.monotonic()
+        report = OrderExecutor(client, 'BNB', max_orders_per_second=1000,
+                               symbol_filters=SymbolFilterCache()).execute(intents)
+        elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 1.0)  # sequential would take 1.2s
+        last_sell = max(t for side, _, t in client.orders if side == 'SELL')
+        first_buy = min(t for side, _, t in client.orders if side == 'BUY')
+        self.assertGreater(first_buy, last_sell)
+        self.assertEqual(report.to_dict()['filled'], 6)
+
+    def test_partial_and_failed_fills_reported(self):
+        """Test partial fills, rejections and buy funding from actual proceeds"""
+        client = FakeBinanceClient(delay=0, rejected=('BBNB',), partial=('CBNB',))
+        prices = {'A': 2.0, 'B': 2.0, 'C': 2.0}
+        intents = net_order_deltas({'A': 1, 'B': 1}, {'C': 2}, prices)
+
+        report = OrderExecutor(client, 'BNB', symbol_filters=SymbolFilterCache()).execute(intents, available_quote=0.0)
+
+        self.assertEqual(len(report.failed), 1)
+        self.assertEqual(len(report.partial), 1)
+        self.assertAlmostEqual(report.sold_quote, 2.0)
+        # Only the 2.0 raised by selling A funds the buy of C (planned 4.0)
+        self.assertAlmostEqual(report.fills[-1].requested_quantity, 1.0)
+        self.assertAlmostEqual(report.executed_deltas()['C'], 0.5)
+
+    def test_timed_out_order_reconciled(self):
+        """Test an order whose response was lost is looked up before it counts as unfilled"""
+        client = FakeBinanceClient(delay=0, timeouts=('ABNB',))
+        executor = OrderExecutor(client, 'BNB', symbol_filters=SymbolFilterCache(), reconcile_delay_seconds=0)
+
+        report = executor.execute(net_order_deltas({'A': 1}, {}, {'A': 2.0}))
+
+        fill = report.fills[0]
+        self.assertEqual((fill.status, fill.executed_quantity, fill.error), ('FILLED', 1.0, ''))
+        self.assertIn(fill.client_order_id, client.by_client_id)
+        self.assertAlmostEqual(report.sold_quote, 2.0)
+
+    def test_unreachable_order_left_unknown(self):
+        """Test an order that cannot be looked up is reported UNKNOWN, not as a clean failure"""
+        client = FakeBinanceClient(delay=0, timeouts=('ABNB',))
+
+        def unreachable(symbol, client_order_id):
+            raise ConnectionError('exchange unreachable')
+
+        client.get_order = unreachable
+        executor = OrderExecutor(client, 'BNB', symbol_filters=SymbolFilterCache(),
+                                 reconcile_attempts=2, reconcile_delay_seconds=0)
+
+        fill = executor.execute(net_order_deltas({'A': 1}, {}, {'A': 2.0})).fills[0]
+
+        self.assertEqual((fill.status, fill.executed_quantity), ('UNKNOWN', 0.0))
+        self.assertIn('not reconciled', fill.error)
+
+
+class TestExchangeFilters(unittest.TestCase):
+    """Test quantities are step-aligned and sub-minimum orders never reach the exchange"""
+
+    def assertStepAligned(self, quantity, step):
+        self.assertIsInstance(quantity, str)  # no float exponents such as 1e-05
+        self.assertEqual(Decimal(quantity) % Decimal(step), 0, f"{quantity} is not a multiple of {step}")
+
+    def test_symbol_filters(self):
+        filters = SymbolFilters.from_symbol_info(symbol_info('ABNB', step='0.01', min_qty='0.1', min_notional='5'))
+        self.assertEqual((filters.step_size, filters.min_qty, filters.max_qty, filters.min_notional),
+                         (Decimal('0.01'), 0.1, 5000.0, 5.0))
+        self.assertEqual(filters.round_quantity(1.23999), 1.23)
+        self.assertEqual(filters.round_quantity(0.3), 0.3)  # no float drift below the step
+        self.assertEqual(filters.round_quantity(9999.0), 5000.0)
+        self.assertTrue(filters.rejection(0.05, 100.0))      # below minQty
+        self.assertTrue(filters.rejection(0.2, 10.0))        # 2.0 below minNotional
+        self.assertEqual(filters.rejection(1.0, 10.0), '')
+
+    def test_orders_rounded_down_to_step(self):
+        client = FakeBinanceClient(delay=0, filters={'ABNB': symbol_info('ABNB', step='0.01'),
+                                                     'DBNB': symbol_info('DBNB', step='0.00001', min_qty='0.00001',
+                                                                         min_notional='0.00001')})
+        intents = net_order_deltas({'A': 1.23456789}, {'D': 0.0000123456}, {'A': 2.0, 'D': 3.0})
+
+        report = OrderExecutor(client, 'BNB', symbol_filters=SymbolFilterCache()).execute(intents)
+
+        self.assertEqual(client.quantities, {'ABNB': '1.23', 'DBNB': '0.00001'})
+        self.assertStepAligned(client.quantities['ABNB'], '0.01')
+        self.assertStepAligned(client.quantities['DBNB'], '0.00001')
+        self.assertEqual([f.requested_quantity for f in report.fills], [1.23, 0.00001])
+
+    def test_scaled_buys_realigned_and_dust_dropped(self):
+        client = FakeBinanceClient(delay=0, filters={
+            'ABNB': symbol_info('ABNB', step='0.001', min_notional='0.5'),
+            'BBNB': symbol_info('BBNB', step='0.001', min_notional='0.5')})
+        prices = {'A': 3.0, 'B': 3.0}
+        intents = net_order_deltas({}, {'A': 1.0, 'B': 0.5}, prices)
+
+        # 4.5 needed, 1.0 available: scaled quantities 0.2222.. and 0.1111..
+        report = OrderExecutor(client, 'BNB', symbol_filters=SymbolFilterCache()).execute(intents, available_quote=1.0)
+
+        self.assertEqual(client.quantities, {'ABNB': '0.222'})  # B (0.111 * 3 = 0.333) is below minNotional
+        self.assertStepAligned(client.quantities['ABNB'], '0.001')
+        self.assertEqual(len(report.fills), 1)
+
+    def test_filters_cached_and_unknown_pairs_skipped(self):
+        client = FakeBinanceClient(delay=0)
+        cache = SymbolFilterCache(ttl=3600)
+        executor = OrderExecutor(client, 'BNB', symbol_filters=cache)
+        for _ in range(3):
+            executor.execute(net_order_deltas({}, {'A': 1.0, 'ZZZ': 1.0}, {'A': 2.0, 'ZZZ': 2.0}))
+        self.assertEqual(client.exchange_info_calls, 1)
+        self.assertEqual([o[1] for o in client.orders], ['ABNB'] * 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Portfolio Manager Tests
+Tests the in-memory portfolio aggregate and its single-transaction flush
+"""
+
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.orm.exc import StaleDataError
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "robot"))
+sys.path.insert(0, str(project_root / "robot" / "src"))
+
+import src.database as database
+from src.database import DatabaseManager, Portfolio, Position, TradingCycle, CyclePosition, LatestStatus
+from src.portfolio_manager import PortfolioManager
+from src.event_bus import get_event_bus, TOPIC_STATUS
+
+
+class TestPortfolioManager(unittest.TestCase):
+    """Test the unit-of-work portfolio aggregate"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.previous_manager = database.db_manager
+        database.db_manager = DatabaseManager(f"sqlite:///{self.tmp_dir.name}/portfolio.db")
+        self.pm = PortfolioManager()
+        self.pm.initialize_portfolio(10.0)
+
+        self.statements = []
+        event.listen(database.db_manager.engine, 'before_cursor_execute', self._count)
+
+    def tearDown(self):
+        event.remove(database.db_manager.engine, 'before_cursor_execute', self._count)
+        database.db_manager.engine.dispose()
+        database.db_manager = self.previous_manager
+        self.tmp_dir.cleanup()
+
+    def _count(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def test_reads_inside_unit_of_work_hit_db_once(self):
+        """Test all reads in a cycle are served from one load"""
+        self.pm.add_position('ETH', 1.0, 2.0)
+        self.statements.clear()
+
+        with self.pm.unit_of_work():
+            self.assertAlmostEqual(self.pm.get_total_value(), 12.0)
+            self.assertEqual(self.pm.get_position_weights(), {'ETH': 100.0})
+            self.pm.update_prices({'ETH': 3.0})
+            self.assertAlmostEqual(self.pm.get_portfolio_value(), 3.0)
+            self.assertEqual(len(self.pm.positions), 1)
+
+        selects = [s for s in self.statements if s.lstrip().upper().startswith('SELECT')]
+        self.assertEqual(len(selects), 1)  # portfolio row joined with its active positions
+
+    def test_standalone_read_is_one_query(self):
+        """Test a read outside a unit of work loads with a single statement"""
+        self.pm.add_position('ETH', 1.0, 2.0)
+        self.statements.clear()
+        self.assertAlmostEqual(self.pm.get_total_value(), 12.0)
+        self.assertEqual(len(self.statements), 1)
+
+    def test_unit_of_work_is_per_thread(self):
+        """Test another thread neither joins nor sees a cycle in progress"""
+        seen = {}
+        entered, checked = threading.Event(), threading.Event()
+
+        def cycle():
+            with self.pm.unit_of_work():
+                self.pm.update_bnb_reserve(99.0)
+                entered.set()
+                checked.wait(5)
+
+        worker = threading.Thread(target=cycle)
+        worker.start()
+        entered.wait(5)
+        seen['reserve'] = self.pm.get_bnb_reserve()
+        seen['in_unit_of_work'] = self.pm._unit_of_work is not None
+        checked.set()
+        worker.join(5)
+
+        self.assertEqual(seen, {'reserve': 10.0, 'in_unit_of_work': False})
+        self.assertEqual(self.pm.get_bnb_reserve(), 99.0)  # flushed when the worker's block ended
+
+    def test_cycle_flushed_in_one_transaction(self):
+        """Test trades and cycle bookkeeping are persisted together at block end"""
+        with self.pm.unit_of_work():
+            self.pm.execute_trade('ETH', 'BUY', 1.0, 2.0)
+            self.pm.execute_trade('ADA', 'BUY', 2.0, 1.0)
+            self.pm.execute_trade('ADA', 'SELL', 2.0, 1.0)
+            self.pm.record_cycle(['rebalance'])
+            with database.db_manager.get_session() as session:
+                self.assertEqual(session.query(TradingCycle).count(), 0)
+
+        with database.db_manager.get_session() as session:
+            cycle = session.query(TradingCycle).one()
+            self.assertEqual(cycle.cycle_number, 1)
+            self.assertEqual([cp.symbol for cp in session.query(CyclePosition).all()], ['ETH'])
+            active = session.query(Position).filter_by(is_active=True).all()
+            self.assertEqual([p.symbol for p in active], ['ETH'])
+
+        self.assertEqual(self.pm.current_cycle, 1)
+        self.assertAlmostEqual(self.pm.bnb_reserve, 10.0 - 2.002 - 2.002 + 1.998)
+
+    def test_history_and_price_matrix_query_count(self):
+        """Test history and recent prices do not issue a query per cycle"""
+        self.pm.add_position('ETH', 1.0, 2.0)
+        self.pm.add_position('ADA', 1.0, 1.0)
+        for price in (2.0, 3.0, 6.0, 3.0):
+            with self.pm.unit_of_work():
+                self.pm.update_prices({'ETH': price, 'ADA': 1.0})
+                self.pm.record_cycle()
+        self.statements.clear()
+
+        history = self.pm.cycle_history
+        self.assertEqual(len(history), 4)
+        self.assertEqual(len(history[-1].positions), 2)
+        self.assertEqual(len(self.statements), 2)
+
+        self.statements.clear()
+        matrix = self.pm.get_cycle_price_matrix(max_cycles=3)
+        self.assertEqual(len(self.statements), 1)
+        self.assertEqual(matrix, {'ETH': [3.0, 6.0, 3.0], 'ADA': [1.0, 1.0, 1.0]})
+
+        self.assertEqual(self.pm.compute_symbol_cycle_returns('ETH', lookback=2), [100.0, -50.0])
+        self.assertEqual(self.pm.compute_cycle_returns(['ADA', 'BTC'], lookback=2), {'ADA': [0.0, 0.0], 'BTC': []})
+
+    def test_latest_status_committed_with_cycle(self):
+        """Test the status row follows each committed cycle and is read by key"""
+        self.assertIsNone(database.db_manager.get_latest_status())
+        published = []
+        handler = lambda key, payload, message: published.append(payload['current_cycle'])
+        get_event_bus().subscribe(TOPIC_STATUS, handler)
+
+        self.pm.add_position('ETH', 1.0, 2.0)
+        with self.pm.unit_of_work():
+            self.pm.update_prices({'ETH': 3.0})
+            self.pm.record_cycle()
+        with self.pm.unit_of_work():
+            self.pm.record_cycle()
+        get_event_bus().unsubscribe(TOPIC_STATUS, handler)
+        self.assertEqual(published, [1, 2])  # pushed once per committed cycle
+
+        expected_total = self.pm.get_total_value()
+        self.statements.clear()
+        status = database.db_manager.get_latest_status()
+        self.assertEqual(len(self.statements), 1)
+        self.assertEqual(status['current_cycle'], 2)
+        self.assertAlmostEqual(status['total_value'], expected_total)
+        self.assertNotIn('trading_cycles', self.statements[0])
+
+        # Databases with history but no status row are backfilled on startup
+        with database.db_manager.get_session() as session:
+            session.query(LatestStatus).delete()
+            session.commit()
+        database.db_manager.create_tables()
+        self.assertEqual(database.db_manager.get_latest_status()['current_cycle'], 2)
+
+    def test_error_discards_pending_changes(self):
+        """Test a failing cycle leaves the database untouched"""
+        with self.assertRaises(ValueError):
+            with self.pm.unit_of_work():
+                self.pm.update_bnb_reserve(0.0)
+                raise ValueError('cycle failed')
+
+        self.assertEqual(self.pm.bnb_reserve, 10.0)
+
+    def _commit_elsewhere(self, **values):
+        """Change the portfolio row as another process would"""
+        with database.db_manager.get_session() as session:
+            session.query(Portfolio).filter_by(id=self.pm.portfolio_id).update(values)
+            session.commit()
+
+    def test_flush_writes_only_changed_fields(self):
+        """Test a freeze committed during a cycle survives the cycle's flush"""
+        with self.pm.unit_of_work():
+            self.pm.update_prices({'ETH': 3.0})
+            self.pm.record_cycle(['HOLD'])
+            self._commit_elsewhere(is_frozen=True, freeze_reason='dashboard')
+
+        with database.db_manager.get_session() as session:
+            portfolio = session.query(Portfolio).get(self.pm.portfolio_id)
+            self.assertEqual((portfolio.is_frozen, portfolio.freeze_reason, portfolio.current_cycle),
+                             (True, 'dashboard', 1))
+
+    def test_conflicting_change_is_not_overwritten(self):
+        """Test a field changed by both sides fails the compare-and-set"""
+        with self.assertRaises(StaleDataError):
+            with self.pm.unit_of_work():
+                self.pm.update_bnb_reserve(7.0)
+                self.pm.record_cycle(['BUY'])
+                self._commit_elsewhere(bnb_reserve=4.0)
+
+        self.assertEqual(self.pm.bnb_reserve, 4.0)
+        self.assertEqual(self.pm.current_cycle, 0)
+
+    def test_current_portfolio_is_fresh_outside_unit_of_work(self):
+        """Test the snapshot handed out is reloaded, and changes to it are not saved"""
+        snapshot = self.pm.get_current_portfolio()
+        self._commit_elsewhere(bnb_reserve=4.0)
+        self.assertEqual(self.pm.get_current_portfolio().bnb_reserve, 4.0)
+        snapshot.bnb_reserve = 1.0
+        self.assertEqual(self.pm.bnb_reserve, 4.0)
+        with self.pm.unit_of_work() as uow:
+            self.assertIs(self.pm.get_current_portfolio(), uow)
+
+
+if __name__ == "__main__":
+    unittest.main()
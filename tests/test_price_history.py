@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Price History Tests
+Tests the bounded ring buffers used by the unified trading engine
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "robot"))
+sys.path.insert(0, str(project_root / "robot" / "src"))
+
+from price_history import PriceRingBuffer, PriceHistory
+from unified_trading_engine import UnifiedTradingEngine, EngineMode, EngineConfig
+
+
+class TestPriceHistory(unittest.TestCase):
+    """Test ring buffer semantics and engine integration"""
+
+    def test_ring_buffer_behaves_like_bounded_list(self):
+        """Test wrap-around keeps the newest prices with list-style indexing"""
+        buffer = PriceRingBuffer(3)
+        buffer.extend([1.0, 2.0, 3.0, 4.0, 5.0])
+
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(list(buffer), [3.0, 4.0, 5.0])
+        self.assertEqual(buffer[-1], 5.0)
+        self.assertEqual(buffer[0], 3.0)
+        self.assertEqual(buffer[-2:], [4.0, 5.0])
+        with self.assertRaises(IndexError):
+            buffer[3]
+
+    def test_engine_memory_is_bounded(self):
+        """Test months of cycles keep lookback_cycles + 1 prices per symbol"""
+        engine = UnifiedTradingEngine(EngineMode.SIMULATION, EngineConfig(lookback_cycles=4))
+        for cycle in range(1000):
+            engine.update_price_history({'ETH': 100.0 + cycle, 'ADA': 1.0})
+
+        self.assertEqual(len(engine.price_history['ETH']), 5)
+        self.assertAlmostEqual(engine.calculate_performance_over_cycles('ETH'), (1099.0 - 1095.0) / 1095.0)
+        self.assertEqual(engine.calculate_performance_over_cycles('BTC'), 0.0)
+        self.assertEqual(engine.price_history.to_dict()['ADA'], [1.0] * 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Price Warm Start Tests
+Tests seeding engine price history from recorded klines and cycle snapshots
+"""
+
+import os
+import sys
+import json
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "robot"))
+sys.path.insert(0, str(project_root / "robot" / "src"))
+
+from price_warm_start import load_kline_price_history, load_warm_start_history, is_simulation_warm_start_enabled
+from unified_trading_engine import UnifiedTradingEngine, EngineMode, EngineConfig, Portfolio, CryptoPosition
+
+
+def _klines_interaction(pair, interval, closes, start=0):
+    rows = [[start + i, '0', '0', '0', str(close), '0'] for i, close in enumerate(closes)]
+    return {'method': 'GET', 'path': '/api/v3/klines',
+            'params': [['symbol', pair], ['interval', interval], ['limit', str(len(closes))]],
+            'status': 200, 'headers': {}, 'body': json.dumps(rows)}
+
+
+class CycleSnapshots:
+    """Portfolio manager stand-in serving recorded cycle prices"""
+
+    def __init__(self, matrix):
+        self.matrix = matrix
+
+    def get_cycle_price_matrix(self, symbols=None, max_cycles=5):
+        return {s: prices[-max_cycles:] for s, prices in self.matrix.items()}
+
+
+class TestPriceWarmStart(unittest.TestCase):
+    """Test warm-starting engine price windows"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cassette = os.path.join(self.tmp_dir.name, 'cassette.json')
+        interactions = [
+            _klines_interaction('ETHBNB', '1d', [1.0, 2.0, 3.0]),
+            _klines_interaction('ETHBNB', '1d', [3.0, 4.0, 5.0, 6.0], start=2),  # overlapping recording
+            _klines_interaction('ADABNB', '1d', [0.5, 0.4, 0.3, 0.2, 0.1, 0.05]),
+            _klines_interaction('BTCUSDT', '1d', [100.0, 101.0]),
+            _klines_interaction('ETHBNB', '1h', [9.0, 9.0]),
+        ]
+        with open(self.cassette, 'w') as f:
+            json.dump({'version': 1, 'interactions': interactions}, f)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_klines_are_merged_per_base_asset(self):
+        """Test recordings are deduplicated by open time and filtered by quote and interval"""
+        history = load_kline_price_history('BNB', 5, interval='1d', cassette_path=self.cassette)
+
+        self.assertEqual(history['ETH'], [2.0, 3.0, 4.0, 5.0, 6.0])
+        self.assertEqual(history['ADA'], [0.4, 0.3, 0.2, 0.1, 0.05])
+        self.assertNotIn('BTC', history)
+
+    def test_history_ends_before_simulation_start(self):
+        """Test only candles closed by end_time are used, so a simulation never sees its future"""
+        day = 24 * 3600 * 1000
+        start = datetime(2024, 1, 10)
+        start_ms = int(start.replace(tzinfo=timezone.utc).timestamp() * 1000)
+        with open(self.cassette, 'w') as f:
+            json.dump({'version': 1, 'interactions': [
+                {**_klines_interaction('SOLUSDT', '1d', []), 'body': json.dumps(
+                    [[start_ms + offset * day, '0', '0', '0', str(float(offset)), '0'] for offset in range(-3, 3)])}
+            ]}, f)
+
+        history = load_kline_price_history('USDT', 30, interval='1d', cassette_path=self.cassette, end_time=start)
+        self.assertEqual(history['SOL'], [-3.0, -2.0, -1.0])  # the candle opening at the start is excluded
+        self.assertEqual(load_kline_price_history('USDT', 30, interval='1d', cassette_path=self.cassette,
+                                                  end_time=datetime(2023, 1, 1)), {})
+        self.assertFalse(is_simulation_warm_start_enabled())  # opt-in for simulations
+
+    def _recent_cassette(self, now, pairs):
+        """Cassette of daily klines per pair, the newest closing `age` before `now`"""
+        day = 24 * 3600 * 1000
+        interactions = []
+        for pair, (closes, age) in pairs.items():
+            last_open = int((now - age).timestamp() * 1000) - day
+            rows = [[last_open - (len(closes) - 1 - i) * day, '0', '0', '0', str(close), '0']
+                    for i, close in enumerate(closes)]
+            interactions.append({**_klines_interaction(pair, '1d', []), 'body': json.dumps(rows)})
+        with open(self.cassette, 'w') as f:
+            json.dump({'version': 1, 'interactions': interactions}, f)
+
+    def test_live_klines_need_cycle_cadence_and_freshness(self):
+        """Test stale or off-cadence klines never replace the engine's own cycle snapshots"""
+        now = datetime(2024, 6, 1, 12, tzinfo=timezone.utc)
+        self._recent_cassette(now, {'ADABNB': ([0.4, 0.3, 0.2, 0.1, 0.05], timedelta(hours=3)),
+                                    'XRPBNB': ([1.0, 1.1, 1.2, 1.3, 1.4], timedelta(days=40))})
+        snapshots = CycleSnapshots({'ADA': [0.5], 'XRP': [2.0]})
+
+        fresh = load_warm_start_history(5, 'BNB', snapshots, self.cassette, '1d', cycle_minutes=1440, now=now)
+        self.assertEqual(fresh['ADA'], [0.4, 0.3, 0.2, 0.1, 0.05])
+        self.assertEqual(fresh['XRP'], [2.0])  # benchmark-era candles are ignored
+
+        hourly_cycles = load_warm_start_history(5, 'BNB', snapshots, self.cassette, '1d', cycle_minutes=60, now=now)
+        self.assertEqual(hourly_cycles, {'ADA': [0.5], 'XRP': [2.0]})
+
+    def test_engine_rebalances_on_first_cycle_after_warm_start(self):
+        """Test a warm engine no longer waits lookback_cycles before rebalancing"""
+        now = datetime(2024, 6, 1, 12, tzinfo=timezone.utc)
+        self._recent_cassette(now, {'ADABNB': ([0.5, 0.4, 0.3, 0.2, 0.1, 0.05], timedelta(hours=3))})
+        snapshots = CycleSnapshots({'ETH': [5.0, 5.0, 5.0, 5.0, 6.0], 'ADA': [0.5]})
+        history = load_warm_start_history(5, 'BNB', portfolio_manager=snapshots, cassette_path=self.cassette,
+                                          interval='1d', cycle_minutes=1440, now=now)
+        self.assertEqual(history['ETH'], [5.0, 5.0, 5.0, 5.0, 6.0])
+        self.assertEqual(history['ADA'], [0.4, 0.3, 0.2, 0.1, 0.05])  # longer kline window wins
+
+        engine = UnifiedTradingEngine(EngineMode.REAL_TRADING, EngineConfig(lookback_cycles=4, portfolio_size=1))
+        self.assertEqual(engine.warm_start(history), 2)
+        self.assertEqual(engine.warm_cycles(['ADA', 'ETH']), 4)
+        self.assertEqual(engine.warm_cycles(['ADA', 'ETH', 'SOL']), 0)  # SOL would score 0.0
+        self.assertLess(engine.calculate_performance_over_cycles('ADA'), -0.8)
+
+        engine.cycle_count = 1  # initial portfolio already exists
+        portfolio = Portfolio({'ADA': CryptoPosition('ADA', 10.0, 0.05, 0.05)}, 10.0, 10.5)
+        result = engine.rebalance_portfolio(portfolio, ['ADA', 'ETH'], {'ADA': 0.05, 'ETH': 6.0})
+
+        self.assertTrue(result.success)
+        self.assertFalse(any('Waiting' in action for action in result.actions_taken))
+        self.assertIn('ETH', result.new_portfolio.positions)
+
+        waiting = engine.rebalance_portfolio(portfolio, ['ADA', 'ETH', 'SOL'], {'ADA': 0.05, 'ETH': 6.0, 'SOL': 1.0})
+        self.assertTrue(any('Waiting' in action for action in waiting.actions_taken))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Simulation Archive Tests
+Tests archival export, batched purges and reads served from the archive
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "robot"))
+sys.path.insert(0, str(project_root / "robot" / "src"))
+
+from src.database import DatabaseManager, Simulation, SimulationCycle
+from src.chart_series import load_cycle_series, paginate_cycles
+from src.simulation_archive import ArchivePipeline, SimulationArchive, ARCHIVE_STATE_QUEUED, STATUS_DELETING
+
+
+class TestSimulationArchive(unittest.TestCase):
+    """Test archived simulations read back the same as their database rows"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db = DatabaseManager(f"sqlite:///{self.tmp}/archive.db")
+        self.db.create_tables()
+        self.archive = SimulationArchive(directory=os.path.join(self.tmp, 'archive'), fmt='csv', batch_size=7)
+        self.pipeline = ArchivePipeline(self.db, self.archive)
+        self.pipeline.delete_batch = 10
+        self.pipeline.batch_pause = 0
+
+        session = self.db.get_session()
+        start = datetime(2025, 1, 1)
+        for sim_id in (1, 2):
+            session.add(Simulation(id=sim_id, name=f'sim-{sim_id}', start_date=start, duration_days=30,
+                                   cycle_length_minutes=1440, starting_reserve=100.0, status='completed'))
+            for n in range(1, 26):
+                session.add(SimulationCycle(
+                    simulation_id=sim_id, cycle_number=n, portfolio_value=50.0 + n, bnb_reserve=50.0,
+                    total_value=100.0 + n, trading_costs=0.1, cycle_date=start + timedelta(days=n),
+                    portfolio_breakdown={'ETH': {'value': float(n), 'performance': 1.5}},
+                    actions_taken=['buy ETH'] if n % 2 else None))
+        session.commit()
+        self.expected_series = load_cycle_series(session, SimulationCycle, simulation_id=1)
+        self.expected_page = paginate_cycles(session, SimulationCycle, after=5, limit=4, simulation_id=1)
+        session.close()
+
+    def tearDown(self):
+        self.db.engine.dispose()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _cycle_count(self, sim_id):
+        session = self.db.get_session()
+        try:
+            return session.query(SimulationCycle).filter_by(simulation_id=sim_id).count()
+        finally:
+            session.close()
+
+    def test_archive_exports_purges_and_reads_back(self):
+        session = self.db.get_session()
+        session.get(Simulation, 1).archive_state = ARCHIVE_STATE_QUEUED
+        session.commit()
+        session.close()
+
+        self.pipeline.run_pending()
+
+        session = self.db.get_session()
+        sim = session.get(Simulation, 1)
+        self.assertEqual(sim.archive_state, 'archived')
+        self.assertIsNotNone(sim.archived_at)
+        path = sim.archive_path
+        session.close()
+
+        self.assertEqual(self._cycle_count(1), 0)
+        self.assertEqual(self._cycle_count(2), 25)  # other simulations untouched
+        self.assertEqual(self.pipeline.stats['purged_rows'], 25)
+
+        manifest = self.archive.manifest(path)
+        self.assertEqual((manifest['cycle_count'], manifest['last_cycle_number']), (25, 25))
+        self.assertAlmostEqual(manifest['total_trading_costs'], 2.5)
+        self.assertEqual(self.archive.load_series(path, ('total_value', 'portfolio_value', 'bnb_reserve')),
+                         self.expected_series)
+        self.assertEqual(self.archive.paginate(path, after=5, limit=4), self.expected_page)
+        cycle = self.archive.find_cycle(path, 3)
+        self.assertEqual(cycle['portfolio_breakdown'], {'ETH': {'value': 3.0, 'performance': 1.5}})
+        self.assertIsNone(self.archive.find_cycle(path, 99))
+
+    def test_delete_removes_cycles_then_simulation(self):
+        session = self.db.get_session()
+        session.get(Simulation, 2).status = STATUS_DELETING
+        session.commit()
+        session.close()
+
+        self.pipeline.run_pending()
+
+        session = self.db.get_session()
+        self.assertIsNone(session.get(Simulation, 2))
+        self.assertIsNotNone(session.get(Simulation, 1))
+        session.close()
+        self.assertEqual(self._cycle_count(2), 0)
+        self.assertEqual(self._cycle_count(1), 25)
+        self.assertEqual(self.pipeline.stats['deleted'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
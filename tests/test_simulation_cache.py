@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Simulation Cache Tests
+Tests the rendered-artifact cache of completed simulations
+"""
+
+import sys
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "robot"))
+sys.path.insert(0, str(project_root / "robot" / "src"))
+
+from src.simulation_cache import SimulationArtifactCache
+
+
+class TestSimulationArtifactCache(unittest.TestCase):
+    """Test caching, versioning and invalidation of rendered artifacts"""
+
+    def setUp(self):
+        self.cache = SimulationArtifactCache(maxsize=3)
+        self.completed_at = datetime(2025, 1, 2, 3, 4, 5)
+
+    def test_lookup_after_store(self):
+        """Test repeat views are served with a stable strong ETag"""
+        self.assertIsNone(self.cache.lookup(1, self.completed_at, 'history'))
+        stored = self.cache.store(1, self.completed_at, 'history', '<html>1</html>')
+        cached = self.cache.lookup(1, self.completed_at, 'history')
+
+        self.assertEqual(cached, stored)
+        self.assertEqual(cached.etag, self.cache.store(1, self.completed_at, 'history', '<html>1</html>').etag)
+        self.assertNotEqual(cached.etag, self.cache.store(2, self.completed_at, 'history', '<html>2</html>').etag)
+        self.assertEqual(self.cache.get_stats()['hits'], 1)
+
+    def test_new_completion_replaces_old_version(self):
+        """Test a simulation completed again does not serve artifacts of the old completion"""
+        self.cache.store(1, self.completed_at, 'history', 'old')
+        self.cache.store(1, self.completed_at, 'summary', '{}', 'application/json')
+        self.cache.store(1, datetime(2025, 2, 1), 'history', 'new')
+
+        self.assertEqual(self.cache.lookup(1, datetime(2025, 2, 1), 'history').body, 'new')
+        self.assertIsNone(self.cache.lookup(1, datetime(2025, 2, 1), 'summary'))
+
+    def test_stale_version_not_served(self):
+        """Test a worker whose cache missed the invalidation still serves the current completion only"""
+        self.cache.store(1, self.completed_at, 'history', 'old')
+        self.assertIn(1, self.cache)
+        # Completed again through another worker: this worker is asked for the new version
+        self.assertIsNone(self.cache.lookup(1, datetime(2025, 2, 1), 'history'))
+        self.assertNotIn(1, self.cache)
+        self.assertIsNone(self.cache.lookup(1, self.completed_at, 'history'))
+
+    def test_invalidate_on_delete(self):
+        self.cache.store(1, self.completed_at, 'history', 'a')
+        self.cache.store(2, self.completed_at, 'history', 'b')
+        self.cache.invalidate(1)
+
+        self.assertIsNone(self.cache.lookup(1, self.completed_at, 'history'))
+        self.assertIsNotNone(self.cache.lookup(2, self.completed_at, 'history'))
+        self.cache.invalidate()
+        self.assertIsNone(self.cache.lookup(2, self.completed_at, 'history'))
+
+    def test_least_recently_used_evicted(self):
+        for simulation_id in (1, 2, 3):
+            self.cache.store(simulation_id, self.completed_at, 'history', str(simulation_id))
+        self.cache.lookup(1, self.completed_at, 'history')
+        self.cache.store(4, self.completed_at, 'history', '4')
+
+        self.assertIsNone(self.cache.lookup(2, self.completed_at, 'history'))
+        self.assertIsNotNone(self.cache.lookup(1, self.completed_at, 'history'))
+        self.assertEqual(self.cache.get_stats()['simulations'], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Single Flight Tests
+Tests coalescing of concurrent identical upstream fetches
+"""
+
+import sys
+import time
+import threading
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "robot"))
+sys.path.insert(0, str(project_root / "robot" / "src"))
+
+from src.single_flight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test upstream calls are bounded by distinct keys, not callers"""
+
+    def _concurrently(self, flight, key, fn, callers=10):
+        results, errors = [], []
+        barrier = threading.Barrier(callers)
+
+        def call():
+            barrier.wait()
+            try:
+                results.append(flight.do(key, fn))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results, errors
+
+    def test_concurrent_callers_share_one_fetch(self):
+        flight = SingleFlight(ttl=1.0)
+        fetches = []
+
+        def fetch():
+            fetches.append(1)
+            time.sleep(0.1)
+            return {'balances': []}
+
+        results, errors = self._concurrently(flight, 'account', fetch)
+
+        self.assertEqual(len(fetches), 1)
+        self.assertEqual(len(results), 10)
+        self.assertFalse(errors)
+        self.assertEqual(flight.do('account', fetch), {'balances': []})  # shared within the window
+        self.assertEqual(len(fetches), 1)
+        self.assertEqual(flight.get_stats()['upstream'], 1)
+
+    def test_distinct_keys_and_expired_results_fetch_again(self):
+        flight = SingleFlight(ttl=0.05)
+        fetches = []
+
+        flight.do('account', lambda: fetches.append('account'))
+        flight.do('prices', lambda: fetches.append('prices'))
+        time.sleep(0.1)
+        flight.do('account', lambda: fetches.append('account'))
+
+        self.assertEqual(fetches, ['account', 'prices', 'account'])
+
+    def test_errors_shared_but_not_cached(self):
+        flight = SingleFlight(ttl=10.0)
+
+        def failing():
+            time.sleep(0.05)
+            raise ConnectionError('binance down')
+
+        results, errors = self._concurrently(flight, 'prices', failing, callers=5)
+
+        self.assertEqual(len(errors), 5)
+        self.assertEqual(flight.get_stats()['upstream'], 1)
+        self.assertEqual(flight.do('prices', lambda: {'ETHUSDT': 1.0}), {'ETHUSDT': 1.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
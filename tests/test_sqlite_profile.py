@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+SQLite Profile Tests
+Tests the per-connection pragma profile and the maintenance tasks
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+from sqlalchemy import text
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "robot"))
+sys.path.insert(0, str(project_root / "robot" / "src"))
+
+from src.database import DatabaseManager, Simulation
+from src.database_enhancements import SQLiteMaintenance, sqlite_profile
+
+
+class TestSQLiteProfile(unittest.TestCase):
+    """Test DatabaseManager applies the profile and maintenance keeps the file healthy"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _pragmas(self, db, *names):
+        with db.engine.connect() as conn:
+            return [conn.execute(text(f"PRAGMA {name}")).scalar() for name in names]
+
+    def test_profile_applied_to_connections(self):
+        db = DatabaseManager(f"sqlite:///{self.tmp}/profile.db")
+        db.create_tables()
+
+        journal_mode, synchronous, busy_timeout, cache_size, auto_vacuum = self._pragmas(
+            db, 'journal_mode', 'synchronous', 'busy_timeout', 'cache_size', 'auto_vacuum')
+        self.assertEqual(journal_mode, 'wal')
+        self.assertEqual(synchronous, 1)  # NORMAL
+        self.assertEqual(busy_timeout, 5000)
+        self.assertEqual(cache_size, -(65536 // 15))  # budget split over pool_size + max_overflow
+        self.assertEqual(auto_vacuum, 2)  # INCREMENTAL (new file)
+        self.assertEqual(db.get_pool_stats()['pool_class'], 'QueuePool')
+        db.engine.dispose()
+
+    def test_cache_size_follows_pool_size(self):
+        with mock.patch.dict(os.environ, {'SQLITE_POOL_SIZE': '2', 'SQLITE_MAX_OVERFLOW': '2'}):
+            self.assertEqual(sqlite_profile()['cache_size'], -16384)
+        with mock.patch.dict(os.environ, {'SQLITE_POOL_SIZE': '40', 'SQLITE_MAX_OVERFLOW': '20'}):
+            self.assertEqual(sqlite_profile()['cache_size'], -2048)
+        with mock.patch.dict(os.environ, {'SQLITE_CACHE_SIZE_KB': '8000'}):
+            self.assertEqual(sqlite_profile()['cache_size'], -8000)
+
+    def test_profile_can_be_disabled(self):
+        with mock.patch.dict(os.environ, {'SQLITE_PROFILE': 'false'}):
+            db = DatabaseManager(f"sqlite:///{self.tmp}/plain.db")
+        self.assertEqual(self._pragmas(db, 'journal_mode'), ['delete'])
+        db.engine.dispose()
+
+    def test_maintenance_tasks(self):
+        db = DatabaseManager(f"sqlite:///{self.tmp}/maintenance.db")
+        db.create_tables()
+        session = db.get_session()
+        session.add_all([Simulation(name='x' * 200, start_date=datetime(2025, 1, 1), duration_days=1,
+                                    cycle_length_minutes=1, starting_reserve=1.0, error_message='e' * 2000)
+                         for _ in range(500)])
+        session.commit()
+        session.query(Simulation).delete()
+        session.commit()
+        session.close()
+
+        maintenance = SQLiteMaintenance(db.engine)
+        results = maintenance.run_due()
+
+        self.assertEqual(set(results), {'checkpoint', 'analyze', 'vacuum', 'integrity'})
+        self.assertTrue(results['integrity']['ok'])
+        self.assertFalse(results['checkpoint']['busy'])
+        self.assertGreater(results['vacuum']['released_pages'], 0)
+        self.assertEqual(maintenance.run_due(), {})  # nothing due until the intervals elapse
+        db.engine.dispose()
+
+
+if __name__ == "__main__":
+    unittest.main()
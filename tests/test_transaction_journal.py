@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Transaction Journal Tests
+Tests appends, torn-tail recovery, compaction and tail reads
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "robot"))
+sys.path.insert(0, str(project_root / "robot" / "src"))
+
+from transaction_journal import TransactionJournal
+
+
+class TestTransactionJournal(unittest.TestCase):
+    """Test the append-only JSONL journal"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'transactions.jsonl')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _journal(self, **kwargs):
+        defaults = dict(key_fields=('transaction_id',), fsync_every=10, fsync_interval=60, compact_every=1000)
+        defaults.update(kwargs)
+        return TransactionJournal(self.path, **defaults)
+
+    def test_append_and_torn_tail_recovery(self):
+        """Test a half-written last line is dropped and appends continue"""
+        journal = self._journal()
+        for i in range(3):
+            journal.append({'transaction_id': f"T{i}", 'status': 'COMPLETED'})
+        journal.close()
+
+        with open(self.path, 'a') as f:
+            f.write('{"transaction_id": "T3", "sta')  # crash mid-write
+
+        journal = self._journal()
+        journal.append({'transaction_id': 'T4', 'status': 'COMPLETED'})
+        ids = [r['transaction_id'] for r in journal.iter_records()]
+        self.assertEqual(ids, ['T0', 'T1', 'T2', 'T4'])
+        journal.close()
+
+    def test_compaction_keeps_latest_version(self):
+        """Test compaction folds status updates and reads stay consistent"""
+        journal = self._journal(compact_every=5)
+        journal.append({'transaction_id': 'A', 'status': 'PENDING'})
+        journal.append({'transaction_id': 'B', 'status': 'PENDING'})
+        journal.append({'transaction_id': 'A', 'status': 'COMPLETED'})
+        journal.append({'transaction_id': 'C', 'status': 'COMPLETED'})
+        journal.append({'transaction_id': 'B', 'status': 'ROLLED_BACK'})  # triggers compaction
+        journal.append({'transaction_id': 'D', 'status': 'COMPLETED'})
+
+        self.assertEqual(journal.get_stats()['journal_records'], 1)
+        records = [(r['transaction_id'], r['status']) for r in journal.iter_records()]
+        self.assertEqual(records, [('A', 'COMPLETED'), ('C', 'COMPLETED'), ('B', 'ROLLED_BACK'), ('D', 'COMPLETED')])
+        journal.close()
+
+        reopened = self._journal()
+        self.assertEqual([r['transaction_id'] for r in reopened.iter_records()], ['A', 'C', 'B', 'D'])
+        reopened.append({'transaction_id': 'E'})
+        self.assertEqual([r['transaction_id'] for r in reopened.tail(3)], ['B', 'D', 'E'])
+        reopened.close()
+
+    def test_tail_reads_from_end(self):
+        """Test tail returns the newest records in order"""
+        journal = self._journal(fsync_every=1000)
+        for i in range(2000):
+            journal.append({'transaction_id': f"T{i}", 'padding': 'x' * 50})
+
+        self.assertEqual([r['transaction_id'] for r in journal.tail(3)], ['T1997', 'T1998', 'T1999'])
+        self.assertEqual(len(journal.tail(5000)), 2000)
+        journal.close()
+
+
+if __name__ == "__main__":
+    unittest.main()